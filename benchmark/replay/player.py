@@ -7,9 +7,11 @@ with enhanced support for streaming data and comprehensive telemetry.
 Phase 1: Enhanced Telemetry Integration
 """
 
+import io
 import json
 import gzip
 import zstandard as zstd
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Iterator, AsyncIterator
 from datetime import datetime
@@ -56,9 +58,43 @@ except ImportError:
 from typing import Callable, TypeVar
 from functools import wraps
 
+from .recorder import index_path_for, dictionary_path_for
+
 T = TypeVar('T')
 logger = logging.getLogger(__name__)
 
+# Every zstd frame starts with this magic number; recorder output is detected
+# by content rather than by file suffix.
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def zstd_decompressor_for(path: Path) -> zstd.ZstdDecompressor:
+    """Create a decompressor using the dictionary saved next to path, if any."""
+    dictionary_file = dictionary_path_for(path)
+    if dictionary_file.exists():
+        return zstd.ZstdDecompressor(dict_data=zstd.ZstdCompressionDict(dictionary_file.read_bytes()))
+    return zstd.ZstdDecompressor()
+
+
+@contextmanager
+def open_jsonl_stream(path: Path) -> Iterator[Iterator[str]]:
+    """
+    Open a JSONL file (plain or zstd, possibly multi-frame) as a line iterator.
+    
+    Lines are decoded incrementally, so memory use is bounded by the longest
+    line rather than by the size of the file. A frame truncated by a crash
+    yields its partial tail, which JSON parsing then rejects.
+    """
+    with open(path, 'rb') as raw:
+        if raw.read(4) == ZSTD_MAGIC:
+            raw.seek(0)
+            reader = zstd_decompressor_for(path).stream_reader(raw, read_across_frames=True)
+            stream = io.BufferedReader(reader)
+        else:
+            raw.seek(0)
+            stream = raw
+        yield io.TextIOWrapper(stream, encoding='utf-8')
+
 
 class ReplayMismatchError(Exception):
     """Raised when replay encounters a mismatch with recorded data."""
@@ -71,7 +107,8 @@ class EnhancedPlayer:
     def __init__(self, 
                  storage_path: Optional[Path] = None,
                  replay_mode: str = "strict",
-                 enable_streaming: bool = True):
+                 enable_streaming: bool = True,
+                 lazy_loading: bool = True):
         """
         Initialize enhanced player.
         
@@ -79,13 +116,18 @@ class EnhancedPlayer:
             storage_path: Path to stored recordings
             replay_mode: Replay mode (strict, warn, hybrid)
             enable_streaming: Enable streaming replay support
+            lazy_loading: Use the recording's lookup-key index, when present,
+                to fetch IOs on demand instead of loading them all up front
         """
         self.storage_path = storage_path or Path("artifacts")
         self.replay_mode = replay_mode
         self.enable_streaming = enable_streaming
+        self.lazy_loading = lazy_loading
         
         # Recording data
         self._recorded_ios: Dict[str, Dict[str, Any]] = {}
+        self._io_index: Dict[str, Tuple[int, int, int, int]] = {}
+        self._indexed_events_file: Optional[Path] = None
         self._recorded_streams: Dict[str, List[StreamToken]] = {}
         self._current_run_id: Optional[str] = None
         self._recording_manifest: Optional[Dict[str, Any]] = None
@@ -228,6 +270,8 @@ class EnhancedPlayer:
         # Load recorded IO edges and streaming data
         self._recorded_ios.clear()
         self._recorded_streams.clear()
+        self._io_index.clear()
+        self._indexed_events_file = None
         
         # Find events file
         events_file = run_dir / "events.jsonl.zst"
@@ -250,7 +294,8 @@ class EnhancedPlayer:
         self._current_run_id = run_id
         
         logger.info(f"Loaded recording: {run_id}")
-        logger.info(f"IO edges: {len(self._recorded_ios)}, Streams: {len(self._recorded_streams)}")
+        logger.info(f"IO edges: {len(self._recorded_ios)}, Indexed IO edges: {len(self._io_index)}, "
+                    f"Streams: {len(self._recorded_streams)}")
         
         return True
     
@@ -343,7 +388,8 @@ class EnhancedPlayer:
         
         lookup_key = io_key.to_string()
         
-        if lookup_key not in self._recorded_ios:
+        recorded_io = self._fetch_recorded_io(lookup_key)
+        if recorded_io is None:
             self._handle_replay_mismatch(
                 "missing_recording",
                 lookup_key,
@@ -353,8 +399,6 @@ class EnhancedPlayer:
             )
             return False, None
         
-        recorded_io = self._recorded_ios[lookup_key]
-        
         # Verify input fingerprint matches
         recorded_fingerprint = recorded_io.get('input_fingerprint')
         actual_fingerprint = io_key.input_fingerprint
@@ -618,78 +662,131 @@ class EnhancedPlayer:
         return output_data
     
     def _load_events_from_file(self, events_file: Path):
-        """Load recorded IO events from compressed JSONL file."""
+        """Load recorded IO events, or just their lookup index, from a JSONL file."""
+        index_file = index_path_for(events_file)
+        if self.lazy_loading and index_file.exists():
+            try:
+                self._load_event_index(events_file, index_file)
+                return
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable index {index_file}: {e}")
+                self._io_index.clear()
+                self._indexed_events_file = None
+        
         try:
-            # Handle both compressed and uncompressed files
-            if events_file.suffix == '.zst':
-                import zstandard as zstd
-                with open(events_file, 'rb') as f:
-                    dctx = zstd.ZstdDecompressor()
-                    content = dctx.decompress(f.read()).decode('utf-8')
-            else:
-                with open(events_file, 'r') as f:
-                    content = f.read()
-            
-            # Parse JSONL
-            for line in content.strip().split('\n'):
-                if not line.strip():
-                    continue
-                
-                try:
-                    event_data = json.loads(line)
+            with open_jsonl_stream(events_file) as lines:
+                for line in lines:
+                    if not line.strip():
+                        continue
                     
-                    # Only process recording notes with IO data
-                    if (event_data.get('event_type') == 'recording.note' and 
-                        event_data.get('replay_mode') == 'record' and
-                        event_data.get('lookup_key')):
-                        
-                        lookup_key = event_data['lookup_key']
-                        self._recorded_ios[lookup_key] = {
-                            'input_fingerprint': event_data.get('input_fingerprint'),
-                            'input_data': event_data.get('input_data', {}),
-                            'output_data': event_data.get('output_data', {}),
-                            'io_type': event_data.get('io_type'),
-                            'call_index': event_data.get('call_index')
-                        }
-                        
-                except json.JSONDecodeError:
-                    continue  # Skip malformed lines
+                    try:
+                        event_data = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Skip malformed lines
+                    
+                    recorded = self._recorded_io_from_event(event_data)
+                    if recorded:
+                        lookup_key, recorded_io = recorded
+                        self._recorded_ios[lookup_key] = recorded_io
                     
         except Exception as e:
             logger.warning(f"Failed to load events from {events_file}: {e}")
     
+    def _load_event_index(self, events_file: Path, index_file: Path):
+        """Load the lookup-key -> byte-offset index written by the recorder."""
+        with open(index_file, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._io_index[entry['key']] = (
+                    int(entry['offset']),
+                    int(entry['length']),
+                    int(entry.get('line_offset', 0)),
+                    int(entry['line_length'])
+                )
+        
+        self._indexed_events_file = events_file
+        logger.debug(f"Loaded {len(self._io_index)} indexed IO edges from {index_file}")
+    
+    def _fetch_recorded_io(self, lookup_key: str) -> Optional[Dict[str, Any]]:
+        """Return the recorded IO for a key, reading it from disk via the index if needed."""
+        recorded_io = self._recorded_ios.get(lookup_key)
+        if recorded_io is not None or lookup_key not in self._io_index:
+            return recorded_io
+        
+        offset, length, line_offset, line_length = self._io_index[lookup_key]
+        try:
+            with open(self._indexed_events_file, 'rb') as f:
+                f.seek(offset)
+                block = f.read(length)
+            
+            if block[:4] == ZSTD_MAGIC:
+                block = zstd_decompressor_for(self._indexed_events_file).decompressobj().decompress(block)
+            
+            event_data = json.loads(block[line_offset:line_offset + line_length].decode('utf-8'))
+        except (OSError, ValueError, zstd.ZstdError) as e:
+            logger.warning(f"Failed to read indexed IO {lookup_key}: {e}")
+            return None
+        
+        recorded = self._recorded_io_from_event(event_data)
+        if not recorded:
+            return None
+        
+        self._recorded_ios[lookup_key] = recorded[1]
+        return recorded[1]
+    
+    @staticmethod
+    def _recorded_io_from_event(event_data: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Extract (lookup_key, recorded IO) from a telemetry note or recorder event."""
+        # Telemetry recording notes carrying IO data
+        if (event_data.get('event_type') == 'recording.note' and
+            event_data.get('replay_mode') == 'record' and
+            event_data.get('lookup_key')):
+            
+            return event_data['lookup_key'], {
+                'input_fingerprint': event_data.get('input_fingerprint'),
+                'input_data': event_data.get('input_data', {}),
+                'output_data': event_data.get('output_data', {}),
+                'io_type': event_data.get('io_type'),
+                'call_index': event_data.get('call_index')
+            }
+        
+        # Events written directly by EnhancedRecorder
+        if event_data.get('io_key') and 'outputs' in event_data:
+            return event_data['io_key'], {
+                'input_fingerprint': event_data.get('input_fingerprint'),
+                'input_data': event_data.get('inputs', {}),
+                'output_data': event_data.get('outputs', {}),
+                'io_type': event_data.get('event_type'),
+                'call_index': event_data.get('call_index')
+            }
+        
+        return None
+    
     def _load_streaming_chunks(self, chunks_file: Path):
         """Load recorded streaming chunks from file."""
         try:
-            # Handle both compressed and uncompressed files
-            if chunks_file.suffix == '.zst':
-                with open(chunks_file, 'rb') as f:
-                    dctx = zstd.ZstdDecompressor()
-                    content = dctx.decompress(f.read()).decode('utf-8')
-            else:
-                with open(chunks_file, 'r') as f:
-                    content = f.read()
-            
-            # Parse JSONL chunks
-            for line in content.strip().split('\n'):
-                if not line.strip():
-                    continue
-                
-                try:
-                    chunk_data = json.loads(line)
-                    
-                    # Create StreamToken from chunk data
-                    token = StreamToken.from_dict(chunk_data)
-                    stream_id = token.metadata.get('stream_id', chunk_data.get('stream_id'))
+            with open_jsonl_stream(chunks_file) as lines:
+                for line in lines:
+                    if not line.strip():
+                        continue
                     
-                    if stream_id:
-                        if stream_id not in self._recorded_streams:
-                            self._recorded_streams[stream_id] = []
-                        self._recorded_streams[stream_id].append(token)
+                    try:
+                        chunk_data = json.loads(line)
                         
-                except (json.JSONDecodeError, KeyError, ValueError) as e:
-                    logger.warning(f"Failed to parse chunk: {e}")
-                    continue
+                        # Create StreamToken from chunk data
+                        token = StreamToken.from_dict(chunk_data)
+                        stream_id = token.metadata.get('stream_id', chunk_data.get('stream_id'))
+                        
+                        if stream_id:
+                            if stream_id not in self._recorded_streams:
+                                self._recorded_streams[stream_id] = []
+                            self._recorded_streams[stream_id].append(token)
+                            
+                    except (json.JSONDecodeError, KeyError, ValueError) as e:
+                        logger.warning(f"Failed to parse chunk: {e}")
+                        continue
             
             # Sort tokens by index within each stream
             for stream_id in self._recorded_streams:
@@ -782,6 +879,7 @@ class EnhancedPlayer:
                 if self._total_replays > 0 else 0.0
             ),
             "loaded_ios": len(self._recorded_ios),
+            "indexed_ios": len(self._io_index),
             "loaded_streams": len(self._recorded_streams),
             "replay_mode": self.replay_mode,
             "streaming_enabled": self.enable_streaming,
@@ -847,12 +945,12 @@ class EnhancedPlayer:
         return self._current_run_id
     
     def get_recorded_io_count(self) -> int:
-        """Get the number of recorded IO edges loaded."""
-        return len(self._recorded_ios)
+        """Get the number of recorded IO edges loaded or available via the index."""
+        return len(self._recorded_ios.keys() | self._io_index.keys())
     
     def list_recorded_io_keys(self) -> List[str]:
         """List all recorded IO lookup keys."""
-        return list(self._recorded_ios.keys())
+        return list(dict.fromkeys([*self._recorded_ios, *self._io_index]))
 
 
 # Backward compatibility alias
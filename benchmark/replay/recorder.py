@@ -14,9 +14,10 @@ import time
 import zstandard as zstd
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TextIO
+from typing import Any, BinaryIO, Dict, List, Optional, TextIO, Tuple
 from dataclasses import dataclass, asdict
 from contextlib import contextmanager
+from functools import lru_cache
 from queue import Queue, Empty
 import threading
 import uuid
@@ -52,6 +53,23 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Sidecar file mapping IO lookup keys to byte offsets in an events file
+INDEX_SUFFIX = ".idx"
+# Sidecar file holding the zstd dictionary a compressed file was written with
+DICTIONARY_SUFFIX = ".dict"
+
+
+def index_path_for(events_path: Path) -> Path:
+    """Return the lookup-key index path for an events file."""
+    events_path = Path(events_path)
+    return events_path.with_name(events_path.name + INDEX_SUFFIX)
+
+
+def dictionary_path_for(data_path: Path) -> Path:
+    """Return the compression dictionary path for an events or chunks file."""
+    data_path = Path(data_path)
+    return data_path.with_name(data_path.name + DICTIONARY_SUFFIX)
+
 
 @dataclass
 class RecordedEvent:
@@ -169,6 +187,110 @@ class StreamingChunk:
         )
 
 
+@lru_cache(maxsize=1)
+def default_event_dictionary() -> zstd.ZstdCompressionDict:
+    """
+    Raw-content zstd dictionary built from representative event and chunk records.
+    
+    Recorded lines share most of their field names and structure, so priming
+    each frame with them recovers most of what per-line frames lose.
+    """
+    sample_time = datetime(2025, 1, 1, 0, 0, 0, 0)
+    samples: List[Dict[str, Any]] = []
+    for event_type, tool_name in (("tool_call", "tool"), ("llm_call", "model")):
+        samples.append(RecordedEvent(
+            event_id="00000000-0000-0000-0000-000000000000",
+            timestamp=sample_time,
+            event_type=event_type,
+            agent_id="agent",
+            tool_name=tool_name,
+            inputs={"prompt": "", "model": "", "temperature": 0.0},
+            outputs={"response": "", "content": ""},
+            duration=0.0,
+            metadata={},
+            step=0,
+            parent_step=0,
+            call_index=0,
+            io_key=f"{event_type}:adapter:agent:{tool_name}:0:" + "0" * 64,
+            input_fingerprint="0" * 64
+        ).to_dict())
+    samples.append(StreamingChunk(
+        chunk_id="stream_00000000_chunk_0000",
+        stream_id="stream_00000000",
+        chunk_index=0,
+        content="",
+        timestamp=sample_time,
+        metadata={},
+        is_final=False
+    ).to_dict())
+    
+    content = "".join(json.dumps(sample) + "\n" for sample in samples).encode('utf-8')
+    return zstd.ZstdCompressionDict(content, dict_type=zstd.DICT_TYPE_RAWCONTENT)
+
+
+def train_event_dictionary(samples: List[bytes], dict_size: int = 16 * 1024) -> zstd.ZstdCompressionDict:
+    """
+    Train a zstd dictionary on event lines from earlier recordings.
+    
+    Args:
+        samples: Serialized JSONL event lines (a few hundred or more)
+        dict_size: Target dictionary size in bytes
+        
+    Returns:
+        Dictionary to pass as EnhancedRecorder(compression_dict=...)
+    """
+    return zstd.train_dictionary(dict_size, samples)
+
+
+class GroupCommitWriter:
+    """
+    Append-only JSONL output committed in groups.
+    
+    With a compressor, lines go through one long-lived zstd stream and every
+    commit closes a frame, so everything up to the last commit decompresses
+    even if the process dies mid-group. Without one, a commit is a flush.
+    """
+    
+    def __init__(self, path: Path, compressor: Optional[zstd.ZstdCompressor] = None):
+        self.path = Path(path)
+        self._raw: BinaryIO = open(self.path, 'wb')
+        self._stream = compressor.stream_writer(self._raw, closefd=False) if compressor else self._raw
+        self._compressed = compressor is not None
+        self.committed_bytes = 0
+        self.pending_lines = 0
+        self.pending_bytes = 0
+    
+    def write_line(self, encoded: bytes) -> int:
+        """Append a line; returns its offset within the uncommitted group."""
+        line_offset = self.pending_bytes
+        self._stream.write(encoded)
+        self.pending_lines += 1
+        self.pending_bytes += len(encoded)
+        return line_offset
+    
+    def commit(self) -> Optional[Tuple[int, int]]:
+        """Make pending lines durable; returns the (offset, length) of the group on disk."""
+        if not self.pending_lines:
+            return None
+        
+        if self._compressed:
+            self._stream.flush(zstd.FLUSH_FRAME)
+        self._raw.flush()
+        
+        group_offset = self.committed_bytes
+        self.committed_bytes = self._raw.tell()
+        self.pending_lines = 0
+        self.pending_bytes = 0
+        return group_offset, self.committed_bytes - group_offset
+    
+    def close(self) -> Optional[Tuple[int, int]]:
+        """Commit any pending lines and close the file."""
+        span = self.commit()
+        # Closing the zstd stream itself would append an empty frame
+        self._raw.close()
+        return span
+
+
 @dataclass
 class RecordingManifest:
     """Manifest for a recording session with provenance information."""
@@ -187,6 +309,8 @@ class RecordingManifest:
     total_events: int
     total_chunks: int
     artifacts_size_bytes: int
+    bytes_per_event: float = 0.0
+    events_per_sec: float = 0.0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -204,7 +328,9 @@ class RecordingManifest:
             "compression_enabled": self.compression_enabled,
             "total_events": self.total_events,
             "total_chunks": self.total_chunks,
-            "artifacts_size_bytes": self.artifacts_size_bytes
+            "artifacts_size_bytes": self.artifacts_size_bytes,
+            "bytes_per_event": self.bytes_per_event,
+            "events_per_sec": self.events_per_sec
         }
 
 
@@ -216,7 +342,12 @@ class EnhancedRecorder:
                  adapter_name: str,
                  adapter_version: str = "1.0.0",
                  compression_enabled: bool = True,
-                 max_file_size_mb: int = 100):
+                 max_file_size_mb: int = 100,
+                 build_index: bool = True,
+                 group_commit_events: int = 64,
+                 group_commit_interval_ms: float = 100.0,
+                 compression_level: int = 3,
+                 compression_dict: Optional[zstd.ZstdCompressionDict] = None):
         """
         Initialize enhanced recorder.
         
@@ -226,6 +357,14 @@ class EnhancedRecorder:
             adapter_version: Version of the adapter
             compression_enabled: Enable zstd compression
             max_file_size_mb: Maximum file size before rotation
+            build_index: Write a lookup-key -> byte-offset index next to each
+                events file so players can fetch IOs lazily
+            group_commit_events: Commit (close a zstd frame and flush) after
+                this many buffered events
+            group_commit_interval_ms: Commit buffered writes at least this often
+            compression_level: zstd compression level
+            compression_dict: zstd dictionary for compressed output, e.g. from
+                train_event_dictionary(); defaults to default_event_dictionary()
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -233,6 +372,11 @@ class EnhancedRecorder:
         self.adapter_name = adapter_name
         self.adapter_version = adapter_version
         self.compression_enabled = compression_enabled
+        self.build_index = build_index
+        self.group_commit_events = max(1, group_commit_events)
+        self.group_commit_interval = group_commit_interval_ms / 1000.0
+        self.compression_dict = compression_dict
+        self.compression_level = compression_level
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
         
         # Recording state
@@ -247,8 +391,12 @@ class EnhancedRecorder:
         self.streaming_chunks: Dict[str, List[StreamingChunk]] = {}
         
         # File handles
-        self.events_file: Optional[TextIO] = None
-        self.chunks_file: Optional[TextIO] = None
+        self.events_file: Optional[GroupCommitWriter] = None
+        self.chunks_file: Optional[GroupCommitWriter] = None
+        self.index_file: Optional[TextIO] = None
+        self._pending_index: List[Tuple[str, int, int]] = []
+        self._last_commit = time.monotonic()
+        self.event_bytes_written = 0
         
         # Telemetry integration
         self.telemetry_logger = get_telemetry_logger() if TELEMETRY_AVAILABLE else None
@@ -293,6 +441,7 @@ class EnhancedRecorder:
         self.start_time = datetime.utcnow()
         self.current_file_index = 0
         self.current_file_size = 0
+        self.event_bytes_written = 0
         
         # Clear previous data
         self.events.clear()
@@ -616,6 +765,9 @@ class EnhancedRecorder:
             if f.is_file()
         )
         
+        total_events = len(self.events)
+        duration = (end_time - self.start_time).total_seconds()
+        
         # Create manifest
         manifest = RecordingManifest(
             recording_id=self.recording_id,
@@ -629,9 +781,11 @@ class EnhancedRecorder:
             seeds=[],  # Would be provided by caller
             redaction_applied=True,
             compression_enabled=self.compression_enabled,
-            total_events=len(self.events),
+            total_events=total_events,
             total_chunks=total_chunks,
-            artifacts_size_bytes=artifacts_size
+            artifacts_size_bytes=artifacts_size,
+            bytes_per_event=self.event_bytes_written / total_events if total_events else 0.0,
+            events_per_sec=total_events / duration if duration > 0 else 0.0
         )
         
         # Save manifest
@@ -641,7 +795,8 @@ class EnhancedRecorder:
         
         logger.info(f"Recording stopped: {self.recording_id}")
         logger.info(f"Total events: {len(self.events)}, Total chunks: {total_chunks}")
-        logger.info(f"Artifacts size: {artifacts_size / 1024 / 1024:.1f} MB")
+        logger.info(f"Artifacts size: {artifacts_size / 1024 / 1024:.1f} MB "
+                    f"({manifest.bytes_per_event:.1f} bytes/event, {manifest.events_per_sec:.1f} events/sec)")
         logger.info(f"Manifest saved: {manifest_path}")
         
         return manifest
@@ -657,16 +812,22 @@ class EnhancedRecorder:
         self.writer_thread.start()
     
     def _stop_writer_thread(self):
-        """Stop background writer thread."""
-        self.shutdown_event.set()
+        """Stop background writer thread after it drains queued writes."""
         if self.writer_thread and self.writer_thread.is_alive():
+            self.write_queue.put(None)
             self.writer_thread.join(timeout=5.0)
+        self.shutdown_event.set()
     
     def _writer_loop(self):
-        """Background writer loop."""
+        """Background writer loop with group commit."""
         while not self.shutdown_event.is_set():
             try:
-                item = self.write_queue.get(timeout=1.0)
+                # Wake up in time to commit a partially filled group
+                if self._has_pending_writes():
+                    timeout = max(0.0, self._last_commit + self.group_commit_interval - time.monotonic())
+                else:
+                    timeout = 1.0
+                item = self.write_queue.get(timeout=timeout)
                 if item is None:
                     break
                 
@@ -679,24 +840,59 @@ class EnhancedRecorder:
                 elif item_type == 'checkpoint':
                     self._write_checkpoint(data)
                 
+                if time.monotonic() - self._last_commit >= self.group_commit_interval:
+                    self._commit_writes()
+                
             except Empty:
-                continue
+                self._commit_writes()
             except Exception as e:
                 logger.error(f"Error in writer thread: {e}")
     
+    def _has_pending_writes(self) -> bool:
+        """Check whether any output has uncommitted lines."""
+        return any(f is not None and f.pending_lines for f in (self.events_file, self.chunks_file))
+    
+    def _commit_writes(self):
+        """Commit buffered events and chunks, then publish their index entries."""
+        if self.events_file:
+            span = self.events_file.commit()
+            if span:
+                self._write_index_entries(span)
+        
+        if self.chunks_file:
+            self.chunks_file.commit()
+        
+        self._last_commit = time.monotonic()
+    
+    def _write_index_entries(self, span: Tuple[int, int]):
+        """Write index entries for events in a just-committed group."""
+        offset, length = span
+        if self.index_file and self._pending_index:
+            for key, line_offset, line_length in self._pending_index:
+                self.index_file.write(json.dumps({
+                    "key": key,
+                    "offset": offset,
+                    "length": length,
+                    "line_offset": line_offset,
+                    "line_length": line_length
+                }) + '\n')
+            self.index_file.flush()
+        self._pending_index.clear()
+    
     def _write_event(self, event: RecordedEvent):
         """Write event to file."""
         if self.events_file:
-            line = json.dumps(event.to_dict()) + '\n'
+            encoded = (json.dumps(event.to_dict()) + '\n').encode('utf-8')
+            line_offset = self.events_file.write_line(encoded)
+            
+            # Offsets are only known once the group is committed
+            if self.index_file and event.io_key:
+                self._pending_index.append((event.io_key, line_offset, len(encoded)))
             
-            if self.compression_enabled:
-                # Write compressed
-                compressed = zstd.compress(line.encode('utf-8'))
-                self.events_file.write(compressed)
-            else:
-                self.events_file.write(line)
+            self.current_file_size += len(encoded)
             
-            self.current_file_size += len(line)
+            if self.events_file.pending_lines >= self.group_commit_events:
+                self._commit_writes()
             
             # Check for rotation
             if self.current_file_size > self.max_file_size_bytes:
@@ -705,13 +901,10 @@ class EnhancedRecorder:
     def _write_chunk(self, chunk: StreamingChunk):
         """Write streaming chunk to file."""
         if self.chunks_file:
-            line = json.dumps(chunk.to_dict()) + '\n'
+            self.chunks_file.write_line((json.dumps(chunk.to_dict()) + '\n').encode('utf-8'))
             
-            if self.compression_enabled:
-                compressed = zstd.compress(line.encode('utf-8'))
-                self.chunks_file.write(compressed)
-            else:
-                self.chunks_file.write(line)
+            if self.chunks_file.pending_lines >= self.group_commit_events:
+                self._commit_writes()
     
     def _write_checkpoint(self, checkpoint_data: Dict[str, Any]):
         """Write checkpoint to file."""
@@ -719,31 +912,58 @@ class EnhancedRecorder:
         with open(checkpoint_path, 'a') as f:
             f.write(json.dumps(checkpoint_data) + '\n')
     
+    def _open_writer(self, path: Path) -> GroupCommitWriter:
+        """Open a group-commit writer, saving the dictionary needed to read it back."""
+        if not self.compression_enabled:
+            return GroupCommitWriter(path)
+        
+        dictionary = self.compression_dict or default_event_dictionary()
+        dictionary_path_for(path).write_bytes(dictionary.as_bytes())
+        compressor = zstd.ZstdCompressor(level=self.compression_level, dict_data=dictionary)
+        return GroupCommitWriter(path, compressor)
+    
     def _open_output_files(self):
         """Open output files for writing."""
-        events_path = self.output_dir / f"{self.recording_id}_events_{self.current_file_index:03d}.jsonl"
         chunks_path = self.output_dir / f"{self.recording_id}_chunks.jsonl"
+        self.chunks_file = self._open_writer(chunks_path)
+        self._open_events_file()
+        self._last_commit = time.monotonic()
+    
+    def _open_events_file(self):
+        """Open the current events file and its index."""
+        events_path = self.output_dir / f"{self.recording_id}_events_{self.current_file_index:03d}.jsonl"
+        self.events_file = self._open_writer(events_path)
         
-        mode = 'wb' if self.compression_enabled else 'w'
-        self.events_file = open(events_path, mode)
-        self.chunks_file = open(chunks_path, mode)
+        if self.build_index:
+            self.index_file = open(index_path_for(events_path), 'w')
     
-    def _close_output_files(self):
-        """Close output files."""
+    def _close_events_file(self):
+        """Commit and close the current events file and its index."""
         if self.events_file:
-            self.events_file.close()
+            span = self.events_file.close()
+            if span:
+                self._write_index_entries(span)
+            self.event_bytes_written += self.events_file.committed_bytes
             self.events_file = None
         
+        if self.index_file:
+            self.index_file.close()
+            self.index_file = None
+    
+    def _close_output_files(self):
+        """Close output files."""
+        self._close_events_file()
+        
         if self.chunks_file:
             self.chunks_file.close()
             self.chunks_file = None
     
     def _rotate_files(self):
-        """Rotate output files when they get too large."""
-        self._close_output_files()
+        """Rotate the events file when it gets too large."""
+        self._close_events_file()
         self.current_file_index += 1
         self.current_file_size = 0
-        self._open_output_files()
+        self._open_events_file()
         
         logger.info(f"Rotated to file index: {self.current_file_index}")
     
@@ -11,10 +11,15 @@ import sys
 import subprocess
 import tempfile
 import ast
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple, Union, Set
-from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple, Union, Set, Callable, Iterable
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import json
 import re
@@ -90,20 +95,231 @@ class StaticAnalysisResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Ignore lists applied outside strict mode (line length, line break before
+# binary operator, whitespace before ':')
+RELAXED_IGNORE = ["E501", "W503", "E203"]
+
+# Pylint checks that compare modules against each other (duplicate code
+# across files, import cycles); always off so batches match single runs
+PYLINT_CROSS_MODULE_CHECKS = ["duplicate-code", "cyclic-import"]
+
+# Pylint exit status bits per message-id prefix (fatal, error, warning,
+# refactor, convention); bit 32 means pylint itself was misused
+PYLINT_STATUS_BITS = {"F": 1, "E": 2, "W": 4, "R": 8, "C": 16}
+PYLINT_USAGE_ERROR = 32
+PYLINT_SUCCESS_CODES = (0, 1, 2, 4, 8, 16)
+
+# Tools that can run in-process instead of as a subprocess
+IN_PROCESS_TOOLS = {LintTool.FLAKE8, LintTool.PYCODESTYLE}
+
+_tool_versions: Optional[Dict[LintTool, str]] = None
+_tool_versions_lock = threading.Lock()
+
+
+def _import_tool(tool: LintTool):
+    """Import a tool's Python API, or return None when it is not installed."""
+    try:
+        if tool == LintTool.FLAKE8:
+            import flake8.api.legacy
+            return flake8
+        if tool == LintTool.PYCODESTYLE:
+            import pycodestyle
+            return pycodestyle
+    except ImportError:
+        pass
+    return None
+
+
+def _probe_tool(tool: LintTool) -> Optional[str]:
+    """Return a tool's version string, or None when it is not available."""
+    module = _import_tool(tool) if tool in IN_PROCESS_TOOLS else None
+    if module is not None:
+        return f"{tool.value} {module.__version__} (in-process)"
+
+    try:
+        result = subprocess.run(
+            [tool.value, "--version"],
+            capture_output=True,
+            timeout=5
+        )
+        if result.returncode == 0:
+            version = result.stdout.decode().strip()
+            logger.debug(f"Found {tool.value}: {version}")
+            return version
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        logger.debug(f"Tool {tool.value} not available")
+    return None
+
+
+def detect_tool_versions(refresh: bool = False) -> Dict[LintTool, str]:
+    """
+    Detect available lint tools and their versions.
+
+    Tools are probed concurrently once per process; the versions are part of
+    the result cache key, so upgrading a tool invalidates its cached results.
+
+    Args:
+        refresh: Probe the environment again instead of using earlier results.
+
+    Returns:
+        Mapping of available tools to their version strings.
+    """
+    global _tool_versions
+    with _tool_versions_lock:
+        if _tool_versions is None or refresh:
+            with ThreadPoolExecutor(max_workers=len(LintTool)) as executor:
+                versions = dict(zip(LintTool, executor.map(_probe_tool, LintTool)))
+            _tool_versions = {tool: version for tool, version in versions.items() if version}
+        return dict(_tool_versions)
+
+
+class LintResultCache:
+    """
+    Bounded LRU cache of per-snippet tool results.
+
+    Entries are keyed by (code hash, tool, tool version, strict flag), so a
+    result is reused only when the same tool build would see the same input
+    under the same rules. Lookups return copies, leaving cached results
+    untouched by callers.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Union[LintResult, TypeCheckResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def code_hash(code: str) -> str:
+        """Hash snippet source for use in cache keys."""
+        return hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def get(self, key: tuple) -> Optional[Union[LintResult, TypeCheckResult]]:
+        """Look up a cached result, returning a copy marked as cached."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return replace(result, issues=list(result.issues),
+                       metadata={**result.metadata, 'cached': True})
+
+    def put(self, key: tuple, result: Union[LintResult, TypeCheckResult]) -> None:
+        """Store a result unless the tool failed to run."""
+        if result.metadata.get('error'):
+            return
+        with self._lock:
+            self._entries[key] = replace(result, issues=list(result.issues),
+                                         metadata=dict(result.metadata))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Results are shared by every verifier in the process
+_result_cache = LintResultCache()
+
+
+def get_lint_cache() -> LintResultCache:
+    """Get the process-wide lint result cache."""
+    return _result_cache
+
+
+def _pycodestyle_in_process(paths: List[str], ignore: Optional[List[str]]) -> subprocess.CompletedProcess:
+    """Run pycodestyle through its API, producing the same output as the CLI."""
+    import pycodestyle
+
+    lines: List[str] = []
+
+    class CollectingReport(pycodestyle.BaseReport):
+        def error(self, line_number, offset, text, check):
+            code = super().error(line_number, offset, text, check)
+            if code:
+                lines.append(f"{self.filename}:{line_number}:{offset + 1}: {text}")
+            return code
+
+    options = {'quiet': True, 'reporter': CollectingReport}
+    if ignore is not None:
+        options['ignore'] = ignore
+    report = pycodestyle.StyleGuide(**options).check_files(paths)
+    return subprocess.CompletedProcess(
+        ["pycodestyle", *paths], 1 if report.total_errors else 0, "\n".join(lines), ""
+    )
+
+
+def _flake8_in_process(paths: List[str], ignore: Optional[List[str]]) -> subprocess.CompletedProcess:
+    """Run flake8 through its legacy API, producing the same output as the CLI."""
+    from flake8.api import legacy
+    from flake8.formatting.base import BaseFormatter
+    from flake8.main.options import JobsArgument
+
+    lines: List[str] = []
+
+    class CollectingFormatter(BaseFormatter):
+        def handle(self, error):
+            lines.append(
+                f"{error.filename}:{error.line_number}:{error.column_number}: {error.code} {error.text}"
+            )
+
+    # Checks run on a worker thread, where forking a multiprocessing pool is unsafe
+    options: Dict[str, Any] = {'jobs': JobsArgument("1")}
+    if ignore is not None:
+        options['ignore'] = ignore
+    style_guide = legacy.get_style_guide(**options)
+    style_guide.init_report(CollectingFormatter)
+    report = style_guide.check_files(paths)
+    return subprocess.CompletedProcess(
+        ["flake8", *paths], 1 if report.total_errors else 0, "\n".join(lines), ""
+    )
+
+
 class LintTypeVerifier:
     """Performs static analysis including linting and type checking."""
     
-    def __init__(self, timeout_seconds: int = 30):
+    def __init__(self, timeout_seconds: int = 30,
+                 max_workers: Optional[int] = None,
+                 use_cache: bool = True):
         """
         Initialize lint and type verifier.
         
         Args:
             timeout_seconds: Maximum time to allow for each tool execution.
+            max_workers: Maximum number of tools run concurrently
+                (None for one per supported tool).
+            use_cache: Whether to reuse results from the process-wide cache.
         """
         self.timeout_seconds = timeout_seconds
+        self.max_workers = max_workers or len(LintTool)
+        self.use_cache = use_cache
+        self.cache = get_lint_cache()
         self.temp_dirs = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         
         # Check which tools are available
+        self.tool_versions = detect_tool_versions()
         self.available_tools = self._check_available_tools()
     
     def verify_code(self, code: str, 
@@ -122,344 +338,438 @@ class LintTypeVerifier:
         Returns:
             StaticAnalysisResult with comprehensive analysis results.
         """
-        if lint_tools is None:
-            lint_tools = [tool for tool in LintTool if tool in self.available_tools]
+        return self.verify_batch([code], enable_type_checking, lint_tools, strict_mode)[0]
+    
+    def verify_batch(self, codes: List[str],
+                     enable_type_checking: bool = True,
+                     lint_tools: Optional[List[LintTool]] = None,
+                     strict_mode: bool = False) -> List[StaticAnalysisResult]:
+        """
+        Perform static analysis on many snippets at once.
         
-        lint_results = []
-        type_check_result = None
+        Each tool is invoked once for all snippets that miss the result
+        cache, with the tools running concurrently; results are split back
+        per snippet. Identical snippets are analyzed once.
         
-        # Create temporary file for analysis
-        temp_dir = tempfile.mkdtemp()
-        self.temp_dirs.append(temp_dir)
-        code_file = Path(temp_dir) / "code_to_analyze.py"
+        Args:
+            codes: The snippets to analyze.
+            enable_type_checking: Whether to perform type checking.
+            lint_tools: Specific lint tools to use (None for all available).
+            strict_mode: Whether to use strict checking rules.
+            
+        Returns:
+            One StaticAnalysisResult per snippet, in input order.
+        """
+        if lint_tools is None:
+            # Mypy runs as the type checker rather than as a lint tool
+            lint_tools = [tool for tool in LintTool if tool != LintTool.MYPY]
+        lint_tools = [tool for tool in lint_tools if tool in self.available_tools]
+        type_checking = enable_type_checking and LintTool.MYPY in self.available_tools
+        
+        hashes = [LintResultCache.code_hash(code) for code in codes]
+        unique = dict(zip(hashes, codes))
+        lint_results: Dict[str, Dict[LintTool, LintResult]] = {code_hash: {} for code_hash in unique}
+        type_results: Dict[str, TypeCheckResult] = {}
         
         try:
-            with open(code_file, 'w') as f:
-                f.write(code)
-            
-            # Run lint tools
-            for tool in lint_tools:
-                if tool in self.available_tools:
-                    result = self._run_lint_tool(tool, code_file, strict_mode)
-                    lint_results.append(result)
-            
-            # Run type checking
-            if enable_type_checking and LintTool.MYPY in self.available_tools:
-                type_check_result = self._run_type_checking(code_file, strict_mode)
-            
-            # Calculate overall results
-            overall_score = self._calculate_overall_score(lint_results, type_check_result)
-            issue_summary = self._summarize_issues(lint_results, type_check_result)
-            recommendations = self._generate_recommendations(lint_results, type_check_result)
+            # Serve what we can from the cache; everything else goes to the tools
+            pending: Dict[Optional[LintTool], List[str]] = {}
+            for code_hash in unique:
+                for tool in lint_tools:
+                    cached = self._cache_get(code_hash, tool, strict_mode)
+                    if cached is not None:
+                        lint_results[code_hash][tool] = cached
+                    else:
+                        pending.setdefault(tool, []).append(code_hash)
+                if type_checking:
+                    cached = self._cache_get(code_hash, None, strict_mode)
+                    if cached is not None:
+                        type_results[code_hash] = cached
+                    else:
+                        pending.setdefault(None, []).append(code_hash)
             
-            # Add metadata
-            metadata = {
-                'code_length': len(code),
-                'line_count': len(code.split('\n')),
-                'tools_used': [result.tool.value for result in lint_results],
-                'type_checking_enabled': enable_type_checking,
-                'strict_mode': strict_mode
-            }
-            
-            return StaticAnalysisResult(
-                lint_results=lint_results,
-                type_check_result=type_check_result,
-                overall_score=overall_score,
-                issue_summary=issue_summary,
-                recommendations=recommendations,
-                metadata=metadata
-            )
+            if pending:
+                missing_hashes = {code_hash for missing in pending.values() for code_hash in missing}
+                code_files = self._write_snippets(
+                    unique, [code_hash for code_hash in unique if code_hash in missing_hashes]
+                )
+                
+                # Run every tool concurrently, each over all of its pending snippets
+                futures = {}
+                for tool, missing in pending.items():
+                    files = [code_files[code_hash] for code_hash in missing]
+                    if tool is None:
+                        futures[tool] = self._submit(self._run_type_checking_batch, files, strict_mode)
+                    else:
+                        futures[tool] = self._submit(self._run_lint_tool_batch, tool, files, strict_mode)
+                
+                for tool, future in futures.items():
+                    per_file = future.result()
+                    for code_hash in pending[tool]:
+                        result = per_file[str(code_files[code_hash])]
+                        self._cache_put(code_hash, tool, strict_mode, result)
+                        if tool is None:
+                            type_results[code_hash] = result
+                        else:
+                            lint_results[code_hash][tool] = result
         
         except Exception as e:
             logger.error(f"Error during static analysis: {e}")
-            return StaticAnalysisResult(
-                lint_results=lint_results,
-                type_check_result=type_check_result,
-                overall_score=0.0,
-                issue_summary={severity: 0 for severity in LintSeverity},
-                recommendations=[f"Analysis failed: {str(e)}"]
-            )
+            return [
+                StaticAnalysisResult(
+                    lint_results=[lint_results[code_hash][tool] for tool in lint_tools
+                                  if tool in lint_results[code_hash]],
+                    type_check_result=type_results.get(code_hash),
+                    overall_score=0.0,
+                    issue_summary={severity: 0 for severity in LintSeverity},
+                    recommendations=[f"Analysis failed: {str(e)}"]
+                )
+                for code_hash in hashes
+            ]
+        
+        results = []
+        for code, code_hash in zip(codes, hashes):
+            results.append(self._build_result(
+                code,
+                [lint_results[code_hash][tool] for tool in lint_tools],
+                type_results.get(code_hash),
+                enable_type_checking,
+                strict_mode
+            ))
+        return results
     
-    def _check_available_tools(self) -> Set[LintTool]:
-        """Check which linting tools are available in the environment."""
-        available = set()
-        
-        tools_to_check = {
-            LintTool.PYLINT: "pylint",
-            LintTool.FLAKE8: "flake8",
-            LintTool.PYCODESTYLE: "pycodestyle",
-            LintTool.MYPY: "mypy",
-            LintTool.BANDIT: "bandit",
-            LintTool.BLACK: "black",
-            LintTool.ISORT: "isort"
+    def _build_result(self, code: str,
+                      lint_results: List[LintResult],
+                      type_check_result: Optional[TypeCheckResult],
+                      enable_type_checking: bool,
+                      strict_mode: bool) -> StaticAnalysisResult:
+        """Assemble the analysis result for one snippet."""
+        # Calculate overall results
+        overall_score = self._calculate_overall_score(lint_results, type_check_result)
+        issue_summary = self._summarize_issues(lint_results, type_check_result)
+        recommendations = self._generate_recommendations(lint_results, type_check_result)
+        
+        # Add metadata
+        metadata = {
+            'code_length': len(code),
+            'line_count': len(code.split('\n')),
+            'tools_used': [result.tool.value for result in lint_results],
+            'type_checking_enabled': enable_type_checking,
+            'strict_mode': strict_mode,
+            'cached_tools': [result.tool.value for result in lint_results if result.metadata.get('cached')]
         }
         
-        for tool, command in tools_to_check.items():
-            try:
-                result = subprocess.run(
-                    [command, "--version"],
-                    capture_output=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    available.add(tool)
-                    logger.debug(f"Found {command}: {result.stdout.decode().strip()}")
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                logger.debug(f"Tool {command} not available")
+        return StaticAnalysisResult(
+            lint_results=lint_results,
+            type_check_result=type_check_result,
+            overall_score=overall_score,
+            issue_summary=issue_summary,
+            recommendations=recommendations,
+            metadata=metadata
+        )
+    
+    def _write_snippets(self, unique: Dict[str, str], code_hashes: List[str]) -> Dict[str, Path]:
+        """Write snippets to uniquely named files in one temporary directory."""
+        temp_dir = tempfile.mkdtemp()
+        self.temp_dirs.append(temp_dir)
         
-        return available
+        code_files = {}
+        for index, code_hash in enumerate(code_hashes):
+            # Module names must differ so mypy can check the files together
+            name = "code_to_analyze.py" if len(code_hashes) == 1 else f"snippet_{index}.py"
+            code_file = Path(temp_dir) / name
+            with open(code_file, 'w') as f:
+                f.write(unique[code_hash])
+            code_files[code_hash] = code_file
+        return code_files
+    
+    def _submit(self, fn: Callable, *args):
+        """Run a tool on the shared worker pool."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="lint-tool"
+                )
+            return self._executor.submit(fn, *args)
+    
+    def _cache_key(self, code_hash: str, tool: Optional[LintTool], strict_mode: bool) -> tuple:
+        # Type checking results are stored apart from mypy lint results
+        name = tool.value if tool is not None else "mypy-types"
+        version = self.tool_versions.get(tool or LintTool.MYPY, "")
+        return (code_hash, name, version, strict_mode)
+    
+    def _cache_get(self, code_hash: str, tool: Optional[LintTool], strict_mode: bool):
+        if not self.use_cache:
+            return None
+        return self.cache.get(self._cache_key(code_hash, tool, strict_mode))
+    
+    def _cache_put(self, code_hash: str, tool: Optional[LintTool], strict_mode: bool, result) -> None:
+        if self.use_cache:
+            self.cache.put(self._cache_key(code_hash, tool, strict_mode), result)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get statistics for the lint result cache."""
+        return self.cache.get_stats()
+    
+    def _check_available_tools(self) -> Set[LintTool]:
+        """Check which linting tools are available in the environment."""
+        return set(self.tool_versions)
     
     def _run_lint_tool(self, tool: LintTool, code_file: Path, strict_mode: bool) -> LintResult:
         """Run a specific linting tool on the code file."""
-        import time
+        return self._run_lint_tool_batch(tool, [code_file], strict_mode)[str(code_file)]
+    
+    def _run_lint_tool_batch(self, tool: LintTool, code_files: List[Path],
+                             strict_mode: bool) -> Dict[str, LintResult]:
+        """Run a specific linting tool once over several code files."""
         start_time = time.time()
         
         try:
             if tool == LintTool.PYLINT:
-                return self._run_pylint(code_file, strict_mode, start_time)
+                return self._run_pylint(code_files, strict_mode, start_time)
             elif tool == LintTool.FLAKE8:
-                return self._run_flake8(code_file, strict_mode, start_time)
+                return self._run_flake8(code_files, strict_mode, start_time)
             elif tool == LintTool.PYCODESTYLE:
-                return self._run_pycodestyle(code_file, strict_mode, start_time)
+                return self._run_pycodestyle(code_files, strict_mode, start_time)
             elif tool == LintTool.BANDIT:
-                return self._run_bandit(code_file, strict_mode, start_time)
+                return self._run_bandit(code_files, strict_mode, start_time)
             elif tool == LintTool.BLACK:
-                return self._run_black(code_file, strict_mode, start_time)
+                return self._run_black(code_files, strict_mode, start_time)
             elif tool == LintTool.ISORT:
-                return self._run_isort(code_file, strict_mode, start_time)
+                return self._run_isort(code_files, strict_mode, start_time)
             else:
-                return LintResult(
-                    tool=tool,
-                    success=False,
-                    issues=[],
-                    error_output=f"Tool {tool.value} not implemented",
-                    duration=time.time() - start_time
+                return self._failed_results(
+                    tool, code_files, f"Tool {tool.value} not implemented", time.time() - start_time
                 )
         
+        except subprocess.TimeoutExpired:
+            return self._failed_results(
+                tool, code_files, f"{tool.value.capitalize()} execution timed out",
+                self.timeout_seconds, error='timeout'
+            )
         except Exception as e:
-            return LintResult(
+            return self._failed_results(
+                tool, code_files, str(e), time.time() - start_time, error='exception'
+            )
+    
+    def _failed_results(self, tool: LintTool, code_files: List[Path], message: str,
+                        duration: float, error: Optional[str] = None) -> Dict[str, LintResult]:
+        """Build a failed result for every file of a tool invocation."""
+        return {
+            str(code_file): LintResult(
                 tool=tool,
                 success=False,
                 issues=[],
-                error_output=str(e),
-                duration=time.time() - start_time
+                error_output=message,
+                duration=duration,
+                metadata={'error': error} if error else {}
             )
+            for code_file in code_files
+        }
     
-    def _run_pylint(self, code_file: Path, strict_mode: bool, start_time: float) -> LintResult:
-        """Run pylint on the code file."""
-        cmd = ["pylint", str(code_file), "--output-format=json"]
-        
-        if not strict_mode:
-            # Disable some overly strict checks for benchmark code
-            cmd.extend([
-                "--disable=missing-docstring,invalid-name,too-few-public-methods",
-                "--disable=missing-module-docstring,missing-function-docstring"
-            ])
+    def _run_command(self, cmd: List[str], code_files: List[Path]) -> subprocess.CompletedProcess:
+        """Run a tool command over the code files."""
+        return subprocess.run(
+            cmd + [str(code_file) for code_file in code_files],
+            capture_output=True,
+            text=True,
+            timeout=self.timeout_seconds
+        )
+    
+    def _split_results(self, tool: LintTool, code_files: List[Path], issues: List[LintIssue],
+                       result: subprocess.CompletedProcess, success: bool, start_time: float,
+                       score: Optional[float] = None,
+                       issue_returncodes: Tuple[int, ...] = (1,),
+                       file_success: Optional[Callable[[List[LintIssue]], bool]] = None,
+                       failed_files: Iterable[str] = ()) -> Dict[str, LintResult]:
+        """
+        Split one tool invocation back into a result per code file.
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_seconds
-            )
-            
-            duration = time.time() - start_time
-            issues = []
-            score = None
-            
-            # Parse JSON output
-            if result.stdout:
-                try:
-                    pylint_data = json.loads(result.stdout)
-                    for item in pylint_data:
-                        if isinstance(item, dict) and 'type' in item:
-                            severity = self._map_pylint_severity(item['type'])
-                            issues.append(LintIssue(
-                                tool=LintTool.PYLINT,
-                                severity=severity,
-                                line=item.get('line', 0),
-                                column=item.get('column', 0),
-                                code=item.get('symbol', ''),
-                                message=item.get('message', ''),
-                                rule=item.get('message-id', ''),
-                                file_path=str(code_file)
-                            ))
-                except json.JSONDecodeError:
-                    # Fallback to parsing text output
-                    issues = self._parse_pylint_text_output(result.stdout, code_file)
-            
-            # Extract score from stderr (pylint prints score there)
-            if result.stderr:
-                score_match = re.search(r'Your code has been rated at ([\d.]+)/10', result.stderr)
-                if score_match:
-                    score = float(score_match.group(1))
-            
-            return LintResult(
-                tool=LintTool.PYLINT,
-                success=result.returncode in [0, 1, 2, 4, 8, 16],  # Pylint exit codes
+        A single file keeps the invocation's own success, score and output.
+        In a batch, a file succeeds when the tool ran cleanly or exited with
+        one of ``issue_returncodes`` and ``file_success`` accepts the file's
+        issues; the shared score and output are dropped.
+        """
+        duration = time.time() - start_time
+        if len(code_files) == 1:
+            code_file = code_files[0]
+            for issue in issues:
+                issue.file_path = str(code_file)
+            return {str(code_file): LintResult(
+                tool=tool,
+                success=success,
                 issues=issues,
                 score=score,
                 output=result.stdout,
                 error_output=result.stderr,
                 duration=duration
-            )
+            )}
         
-        except subprocess.TimeoutExpired:
-            return LintResult(
-                tool=LintTool.PYLINT,
-                success=False,
-                issues=[],
-                error_output="Pylint execution timed out",
-                duration=self.timeout_seconds
+        by_name: Dict[str, List[LintIssue]] = {code_file.name: [] for code_file in code_files}
+        for issue in issues:
+            by_name.setdefault(Path(issue.file_path or "").name, []).append(issue)
+        
+        file_success = file_success or (lambda file_issues: not file_issues)
+        failed = set(failed_files)
+        ran = success or result.returncode in issue_returncodes
+        
+        results = {}
+        for code_file in code_files:
+            file_issues = by_name[code_file.name]
+            for issue in file_issues:
+                issue.file_path = str(code_file)
+            results[str(code_file)] = LintResult(
+                tool=tool,
+                success=ran and code_file.name not in failed and file_success(file_issues),
+                issues=file_issues,
+                duration=duration / len(code_files),
+                metadata={'batch_size': len(code_files), 'batch_duration': duration}
             )
+        return results
     
-    def _run_flake8(self, code_file: Path, strict_mode: bool, start_time: float) -> LintResult:
-        """Run flake8 on the code file."""
-        cmd = ["flake8", str(code_file), "--format=json"]
+    def _run_pylint(self, code_files: List[Path], strict_mode: bool, start_time: float) -> Dict[str, LintResult]:
+        """Run pylint on the code files."""
+        # Snippets in a batch are unrelated modules checked in one run, so
+        # cross-module checks would report on snippet pairs rather than on
+        # each snippet, and those per-snippet results are cached
+        cmd = ["pylint", "--output-format=json", f"--disable={','.join(PYLINT_CROSS_MODULE_CHECKS)}"]
         
         if not strict_mode:
-            # Relax some rules for benchmark code
-            cmd.extend(["--ignore=E501,W503,E203"])  # Line length, line break before binary operator
+            # Disable some overly strict checks for benchmark code
+            cmd.extend([
+                "--disable=missing-docstring,invalid-name,too-few-public-methods",
+                "--disable=missing-module-docstring,missing-function-docstring"
+            ])
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_seconds
-            )
-            
-            duration = time.time() - start_time
-            issues = []
-            
-            # Parse output (flake8 doesn't always support JSON, fallback to text parsing)
-            if result.stdout:
-                issues = self._parse_flake8_output(result.stdout, code_file)
-            
-            return LintResult(
-                tool=LintTool.FLAKE8,
-                success=result.returncode == 0,
-                issues=issues,
-                output=result.stdout,
-                error_output=result.stderr,
-                duration=duration
-            )
+        result = self._run_command(cmd, code_files)
+        issues = []
+        score = None
         
-        except subprocess.TimeoutExpired:
-            return LintResult(
-                tool=LintTool.FLAKE8,
-                success=False,
-                issues=[],
-                error_output="Flake8 execution timed out",
-                duration=self.timeout_seconds
-            )
+        # Parse JSON output
+        if result.stdout:
+            try:
+                pylint_data = json.loads(result.stdout)
+                for item in pylint_data:
+                    if isinstance(item, dict) and 'type' in item:
+                        severity = self._map_pylint_severity(item['type'])
+                        issues.append(LintIssue(
+                            tool=LintTool.PYLINT,
+                            severity=severity,
+                            line=item.get('line', 0),
+                            column=item.get('column', 0),
+                            code=item.get('symbol', ''),
+                            message=item.get('message', ''),
+                            rule=item.get('message-id', ''),
+                            file_path=item.get('path') or str(code_files[0])
+                        ))
+            except json.JSONDecodeError:
+                # Fallback to parsing text output
+                issues = self._parse_pylint_text_output(result.stdout, code_files[0])
+        
+        # Extract score from stderr (pylint prints score there); it covers
+        # the whole invocation, so only a single file keeps it
+        if result.stderr:
+            score_match = re.search(r'Your code has been rated at ([\d.]+)/10', result.stderr)
+            if score_match:
+                score = float(score_match.group(1))
+        
+        # Pylint exit codes are bit flags for the message categories emitted.
+        # A batch ORs every file's categories together, so each file's status
+        # is rebuilt from its own messages; only a usage error fails them all
+        success = result.returncode in PYLINT_SUCCESS_CODES
+        return self._split_results(
+            LintTool.PYLINT, code_files, issues, result, success, start_time,
+            score=score, issue_returncodes=tuple(range(1, PYLINT_USAGE_ERROR)),
+            file_success=lambda file_issues: self._pylint_status(file_issues) in PYLINT_SUCCESS_CODES
+        )
+    
+    def _pylint_status(self, issues: List[LintIssue]) -> int:
+        """Rebuild the pylint exit status a run over just these issues would give."""
+        status = 0
+        for issue in issues:
+            status |= PYLINT_STATUS_BITS.get((issue.rule or issue.code)[:1].upper(), 0)
+        return status
     
-    def _run_pycodestyle(self, code_file: Path, strict_mode: bool, start_time: float) -> LintResult:
-        """Run pycodestyle on the code file."""
-        cmd = ["pycodestyle", str(code_file)]
+    def _run_flake8(self, code_files: List[Path], strict_mode: bool, start_time: float) -> Dict[str, LintResult]:
+        """Run flake8 on the code files, in-process when flake8 is importable."""
+        ignore = None if strict_mode else RELAXED_IGNORE
         
-        if not strict_mode:
-            cmd.extend(["--ignore=E501,W503,E203"])
+        if _import_tool(LintTool.FLAKE8) is not None:
+            result = _flake8_in_process([str(code_file) for code_file in code_files], ignore)
+        else:
+            cmd = ["flake8"]
+            if ignore is not None:
+                cmd.append(f"--ignore={','.join(ignore)}")
+            result = self._run_command(cmd, code_files)
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_seconds
-            )
-            
-            duration = time.time() - start_time
-            issues = self._parse_pycodestyle_output(result.stdout, code_file)
-            
-            return LintResult(
-                tool=LintTool.PYCODESTYLE,
-                success=result.returncode == 0,
-                issues=issues,
-                output=result.stdout,
-                error_output=result.stderr,
-                duration=duration
-            )
+        issues = self._parse_flake8_output(result.stdout, code_files[0]) if result.stdout else []
+        return self._split_results(
+            LintTool.FLAKE8, code_files, issues, result, result.returncode == 0, start_time
+        )
+    
+    def _run_pycodestyle(self, code_files: List[Path], strict_mode: bool, start_time: float) -> Dict[str, LintResult]:
+        """Run pycodestyle on the code files, in-process when pycodestyle is importable."""
+        ignore = None if strict_mode else RELAXED_IGNORE
         
-        except subprocess.TimeoutExpired:
-            return LintResult(
-                tool=LintTool.PYCODESTYLE,
-                success=False,
-                issues=[],
-                error_output="Pycodestyle execution timed out",
-                duration=self.timeout_seconds
-            )
+        if _import_tool(LintTool.PYCODESTYLE) is not None:
+            result = _pycodestyle_in_process([str(code_file) for code_file in code_files], ignore)
+        else:
+            cmd = ["pycodestyle"]
+            if ignore is not None:
+                cmd.append(f"--ignore={','.join(ignore)}")
+            result = self._run_command(cmd, code_files)
+        
+        issues = self._parse_pycodestyle_output(result.stdout, code_files[0])
+        return self._split_results(
+            LintTool.PYCODESTYLE, code_files, issues, result, result.returncode == 0, start_time
+        )
     
-    def _run_bandit(self, code_file: Path, strict_mode: bool, start_time: float) -> LintResult:
-        """Run bandit security linter on the code file."""
-        cmd = ["bandit", "-f", "json", str(code_file)]
+    def _run_bandit(self, code_files: List[Path], strict_mode: bool, start_time: float) -> Dict[str, LintResult]:
+        """Run bandit security linter on the code files."""
+        result = self._run_command(["bandit", "-f", "json"], code_files)
+        issues = []
+        failed_files = []
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_seconds
-            )
-            
-            duration = time.time() - start_time
-            issues = []
-            
-            # Parse JSON output
-            if result.stdout:
-                try:
-                    bandit_data = json.loads(result.stdout)
-                    for item in bandit_data.get('results', []):
-                        severity = self._map_bandit_severity(item.get('issue_severity', 'LOW'))
-                        issues.append(LintIssue(
-                            tool=LintTool.BANDIT,
-                            severity=severity,
-                            line=item.get('line_number', 0),
-                            column=item.get('col_offset', 0),
-                            code=item.get('test_id', ''),
-                            message=item.get('issue_text', ''),
-                            rule=item.get('test_name', ''),
-                            file_path=str(code_file)
-                        ))
-                except json.JSONDecodeError:
-                    pass
-            
-            return LintResult(
-                tool=LintTool.BANDIT,
-                success=result.returncode == 0,
-                issues=issues,
-                output=result.stdout,
-                error_output=result.stderr,
-                duration=duration
-            )
+        # Parse JSON output
+        if result.stdout:
+            try:
+                bandit_data = json.loads(result.stdout)
+                for item in bandit_data.get('results', []):
+                    severity = self._map_bandit_severity(item.get('issue_severity', 'LOW'))
+                    issues.append(LintIssue(
+                        tool=LintTool.BANDIT,
+                        severity=severity,
+                        line=item.get('line_number', 0),
+                        column=item.get('col_offset', 0),
+                        code=item.get('test_id', ''),
+                        message=item.get('issue_text', ''),
+                        rule=item.get('test_name', ''),
+                        file_path=item.get('filename') or str(code_files[0])
+                    ))
+                failed_files = [Path(error.get('filename', '')).name
+                                for error in bandit_data.get('errors', [])]
+            except json.JSONDecodeError:
+                pass
         
-        except subprocess.TimeoutExpired:
-            return LintResult(
-                tool=LintTool.BANDIT,
-                success=False,
-                issues=[],
-                error_output="Bandit execution timed out",
-                duration=self.timeout_seconds
-            )
+        return self._split_results(
+            LintTool.BANDIT, code_files, issues, result, result.returncode == 0, start_time,
+            failed_files=failed_files
+        )
     
-    def _run_black(self, code_file: Path, strict_mode: bool, start_time: float) -> LintResult:
-        """Run black formatter check on the code file."""
-        cmd = ["black", "--check", "--diff", str(code_file)]
+    def _run_black(self, code_files: List[Path], strict_mode: bool, start_time: float) -> Dict[str, LintResult]:
+        """Run black formatter check on the code files."""
+        result = self._run_command(["black", "--check", "--diff"], code_files)
+        issues = []
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_seconds
-            )
-            
-            duration = time.time() - start_time
-            issues = []
-            
-            # If black suggests changes, create an issue
-            if result.returncode != 0 and result.stdout:
+        # Black reports each file it would reformat or failed to parse on stderr
+        reformat = set(re.findall(r'^would reformat (.+)$', result.stderr, re.MULTILINE))
+        failed_files = [code_file.name for code_file in code_files
+                        if re.search(rf'^error: .*{re.escape(code_file.name)}', result.stderr, re.MULTILINE)]
+        
+        # If black suggests changes, create an issue
+        for code_file in code_files:
+            if (str(code_file) in reformat
+                    or (len(code_files) == 1 and result.returncode != 0 and result.stdout)):
                 issues.append(LintIssue(
                     tool=LintTool.BLACK,
                     severity=LintSeverity.STYLE,
@@ -467,44 +777,27 @@ class LintTypeVerifier:
                     column=1,
                     code="format",
                     message="Code formatting could be improved",
-                    rule="black-format"
+                    rule="black-format",
+                    file_path=str(code_file)
                 ))
-            
-            return LintResult(
-                tool=LintTool.BLACK,
-                success=result.returncode == 0,
-                issues=issues,
-                output=result.stdout,
-                error_output=result.stderr,
-                duration=duration
-            )
         
-        except subprocess.TimeoutExpired:
-            return LintResult(
-                tool=LintTool.BLACK,
-                success=False,
-                issues=[],
-                error_output="Black execution timed out",
-                duration=self.timeout_seconds
-            )
+        return self._split_results(
+            LintTool.BLACK, code_files, issues, result, result.returncode == 0, start_time,
+            issue_returncodes=(1, 123), failed_files=failed_files
+        )
     
-    def _run_isort(self, code_file: Path, strict_mode: bool, start_time: float) -> LintResult:
-        """Run isort import sorting check on the code file."""
-        cmd = ["isort", "--check-only", "--diff", str(code_file)]
+    def _run_isort(self, code_files: List[Path], strict_mode: bool, start_time: float) -> Dict[str, LintResult]:
+        """Run isort import sorting check on the code files."""
+        result = self._run_command(["isort", "--check-only", "--diff"], code_files)
+        issues = []
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_seconds
-            )
-            
-            duration = time.time() - start_time
-            issues = []
-            
-            # If isort suggests changes, create an issue
-            if result.returncode != 0 and result.stdout:
+        # Isort reports each incorrectly sorted file on stderr
+        unsorted = set(re.findall(r'^ERROR: (.+?) Imports are incorrectly sorted', result.stderr, re.MULTILINE))
+        
+        # If isort suggests changes, create an issue
+        for code_file in code_files:
+            if (str(code_file) in unsorted
+                    or (len(code_files) == 1 and result.returncode != 0 and result.stdout)):
                 issues.append(LintIssue(
                     tool=LintTool.ISORT,
                     severity=LintSeverity.STYLE,
@@ -512,33 +805,23 @@ class LintTypeVerifier:
                     column=1,
                     code="import-order",
                     message="Import order could be improved",
-                    rule="isort-order"
+                    rule="isort-order",
+                    file_path=str(code_file)
                 ))
-            
-            return LintResult(
-                tool=LintTool.ISORT,
-                success=result.returncode == 0,
-                issues=issues,
-                output=result.stdout,
-                error_output=result.stderr,
-                duration=duration
-            )
         
-        except subprocess.TimeoutExpired:
-            return LintResult(
-                tool=LintTool.ISORT,
-                success=False,
-                issues=[],
-                error_output="Isort execution timed out",
-                duration=self.timeout_seconds
-            )
+        return self._split_results(
+            LintTool.ISORT, code_files, issues, result, result.returncode == 0, start_time
+        )
     
     def _run_type_checking(self, code_file: Path, strict_mode: bool) -> TypeCheckResult:
         """Run mypy type checking on the code file."""
-        import time
+        return self._run_type_checking_batch([code_file], strict_mode)[str(code_file)]
+    
+    def _run_type_checking_batch(self, code_files: List[Path], strict_mode: bool) -> Dict[str, TypeCheckResult]:
+        """Run mypy once over several code files."""
         start_time = time.time()
         
-        cmd = ["mypy", str(code_file), "--show-error-codes", "--no-error-summary"]
+        cmd = ["mypy", "--show-error-codes", "--no-error-summary"]
         
         if not strict_mode:
             cmd.extend([
@@ -548,38 +831,70 @@ class LintTypeVerifier:
             ])
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_seconds
-            )
+            result = self._run_command(cmd, code_files)
+            
+            # A blocking error such as a syntax error stops mypy for every
+            # file, so check the offending files alone and rerun the rest
+            if result.returncode == 2 and len(code_files) > 1:
+                blocking = {Path(issue.file_path).name
+                            for issue in self._parse_mypy_output(result.stdout, code_files[0])}
+                rest = [code_file for code_file in code_files if code_file.name not in blocking]
+                if blocking and rest:
+                    groups = [[code_file] for code_file in code_files if code_file.name in blocking] + [rest]
+                else:
+                    groups = [[code_file] for code_file in code_files]
+                results = {}
+                for group in groups:
+                    results.update(self._run_type_checking_batch(group, strict_mode))
+                return results
             
             duration = time.time() - start_time
-            issues = self._parse_mypy_output(result.stdout, code_file)
+            issues = self._parse_mypy_output(result.stdout, code_files[0])
             
-            return TypeCheckResult(
-                success=result.returncode == 0,
-                issues=issues,
-                output=result.stdout,
-                error_output=result.stderr,
-                duration=duration
-            )
+            if len(code_files) == 1:
+                return {str(code_files[0]): TypeCheckResult(
+                    success=result.returncode == 0,
+                    issues=issues,
+                    output=result.stdout,
+                    error_output=result.stderr,
+                    duration=duration
+                )}
+            
+            by_name: Dict[str, List[LintIssue]] = {code_file.name: [] for code_file in code_files}
+            for issue in issues:
+                by_name.setdefault(Path(issue.file_path).name, []).append(issue)
+            
+            results = {}
+            for code_file in code_files:
+                file_issues = by_name[code_file.name]
+                for issue in file_issues:
+                    issue.file_path = str(code_file)
+                results[str(code_file)] = TypeCheckResult(
+                    success=result.returncode in (0, 1) and not any(
+                        issue.severity == LintSeverity.ERROR for issue in file_issues
+                    ),
+                    issues=file_issues,
+                    duration=duration / len(code_files),
+                    metadata={'batch_size': len(code_files), 'batch_duration': duration}
+                )
+            return results
         
         except subprocess.TimeoutExpired:
-            return TypeCheckResult(
+            return {str(code_file): TypeCheckResult(
                 success=False,
                 issues=[],
                 error_output="Mypy execution timed out",
-                duration=self.timeout_seconds
-            )
+                duration=self.timeout_seconds,
+                metadata={'error': 'timeout'}
+            ) for code_file in code_files}
         except Exception as e:
-            return TypeCheckResult(
+            return {str(code_file): TypeCheckResult(
                 success=False,
                 issues=[],
                 error_output=str(e),
-                duration=time.time() - start_time
-            )
+                duration=time.time() - start_time,
+                metadata={'error': 'exception'}
+            ) for code_file in code_files}
     
     def _map_pylint_severity(self, pylint_type: str) -> LintSeverity:
         """Map pylint message types to our severity levels."""
@@ -620,7 +935,7 @@ class LintTypeVerifier:
                     column=int(col_num),
                     code=code,
                     message=message,
-                    file_path=str(code_file)
+                    file_path=file_path
                 ))
         
         return issues
@@ -655,7 +970,7 @@ class LintTypeVerifier:
                     column=int(col_num),
                     code=code,
                     message=message,
-                    file_path=str(code_file)
+                    file_path=file_path
                 ))
         
         return issues
@@ -690,7 +1005,7 @@ class LintTypeVerifier:
                     column=int(col_num),
                     code=code,
                     message=message,
-                    file_path=str(code_file)
+                    file_path=file_path
                 ))
         
         return issues
@@ -718,7 +1033,7 @@ class LintTypeVerifier:
                     code=code or '',
                     message=message,
                     rule=code,
-                    file_path=str(code_file)
+                    file_path=file_path
                 ))
         
         return issues
@@ -827,7 +1142,12 @@ class LintTypeVerifier:
         return recommendations[:5]  # Limit to top 5 recommendations
     
     def cleanup(self):
-        """Clean up temporary directories."""
+        """Shut down the tool workers and clean up temporary directories."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        
         for temp_dir in self.temp_dirs:
             try:
                 import shutil
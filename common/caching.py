@@ -8,14 +8,21 @@ strategies, performance-based optimization, and context-aware cache management.
 
 import os
 import json
+import asyncio
 import hashlib
 import time
 import logging
 import pickle
+import random
+import re
+import struct
 import threading
+import weakref
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Any, Optional, Union, Tuple, Callable
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Awaitable, TypeVar
+from concurrent.futures import Future
 from enum import Enum
 from pathlib import Path
 import sqlite3
@@ -24,6 +31,8 @@ from contextlib import contextmanager
 # Configure logging
 logger = logging.getLogger("ai_dev_squad.caching")
 
+T = TypeVar("T")
+
 
 class CacheStrategy(Enum):
     """Cache strategies for different types of content."""
@@ -58,6 +67,7 @@ class CacheEntry:
     performance_score: float
     context_hash: Optional[str] = None
     ttl_seconds: Optional[int] = None
+    prompt_text: Optional[str] = None
     
     def is_expired(self) -> bool:
         """Check if the cache entry has expired."""
@@ -98,6 +108,7 @@ class CacheStats:
     avg_response_time_cached: float = 0.0
     avg_response_time_uncached: float = 0.0
     invalidations: Dict[str, int] = None
+    coalesced_requests: int = 0
     
     def __post_init__(self):
         if self.invalidations is None:
@@ -183,15 +194,212 @@ class PromptSimilarityCalculator:
         return similar
 
 
+class SingleFlight:
+    """
+    Deduplicate concurrent calls that share a key.
+    
+    The first caller for a key (the leader) runs the computation; callers that
+    arrive while it is in flight wait for and share its result or exception.
+    Blocking and asyncio callers are tracked separately.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._async_calls: Dict[Tuple[int, str], asyncio.Future] = {}
+    
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Run fn once per in-flight key.
+        
+        Args:
+            key: Deduplication key.
+            fn: Computation to run if no call for key is in flight.
+            
+        Returns:
+            Tuple of (result, shared) where shared is True for waiting callers.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        
+        if not leader:
+            return future.result(), True
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+    
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Async counterpart of do for coroutine computations.
+        
+        Args:
+            key: Deduplication key.
+            fn: Coroutine function to await if no call for key is in flight.
+            
+        Returns:
+            Tuple of (result, shared) where shared is True for waiting callers.
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+        
+        future = self._async_calls.get(call_key)
+        if future is not None:
+            return await asyncio.shield(future), True
+        
+        future = loop.create_future()
+        self._async_calls[call_key] = future
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure is not logged by asyncio
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._async_calls.pop(call_key, None)
+    
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt for similarity indexing (case and whitespace)."""
+    return " ".join(prompt.lower().split())
+
+
+class PromptMinHasher:
+    """
+    MinHash signatures and LSH band keys for near-duplicate prompt lookup.
+    
+    Shingles are the same word tokens that PromptSimilarityCalculator uses, so
+    the signature agreement rate estimates the Jaccard score it computes. With
+    the defaults (32 permutations, 8 bands of 4 rows) a pair with Jaccard 0.8
+    shares at least one band ~98% of the time while unrelated prompts rarely do.
+    """
+    
+    _PRIME = (1 << 61) - 1
+    _MAX_HASH = (1 << 32) - 1
+    
+    def __init__(self, num_perm: int = 32, bands: int = 8, seed: int = 1):
+        """
+        Initialize the hasher.
+        
+        Args:
+            num_perm: Number of hash permutations in a signature.
+            bands: Number of LSH bands; must divide num_perm.
+            seed: Seed for the permutation coefficients (must be stable).
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randint(1, self._PRIME - 1), rng.randint(0, self._PRIME - 1))
+            for _ in range(num_perm)
+        ]
+    
+    def shingles(self, prompt: str) -> set:
+        """Return the word shingles of a prompt."""
+        return set(re.findall(r'\b\w+\b', prompt.lower()))
+    
+    def signature(self, prompt: str) -> List[int]:
+        """Compute the MinHash signature of a prompt."""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+            for shingle in self.shingles(prompt)
+        ]
+        
+        if not hashes:
+            return [self._MAX_HASH] * self.num_perm
+        
+        prime = self._PRIME
+        max_hash = self._MAX_HASH
+        return [
+            min((a * h + b) % prime for h in hashes) & max_hash
+            for a, b in self._permutations
+        ]
+    
+    def band_keys(self, signature: List[int]) -> List[str]:
+        """Split a signature into LSH band keys."""
+        keys = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(
+                struct.pack(f"<{self.rows}I", *rows), digest_size=8
+            ).hexdigest()
+            keys.append(f"{band}:{digest}")
+        return keys
+    
+    def pack(self, signature: List[int]) -> bytes:
+        """Serialize a signature for storage."""
+        return struct.pack(f"<{self.num_perm}I", *signature)
+    
+    def unpack(self, data: bytes) -> List[int]:
+        """Deserialize a stored signature."""
+        return list(struct.unpack(f"<{self.num_perm}I", data))
+    
+    @staticmethod
+    def estimate_similarity(sig1: List[int], sig2: List[int]) -> float:
+        """Estimate Jaccard similarity from two signatures."""
+        if not sig1 or len(sig1) != len(sig2):
+            return 0.0
+        return sum(1 for a, b in zip(sig1, sig2) if a == b) / len(sig1)
+
+
 class IntelligentCache:
     """Intelligent caching system with multiple strategies and optimization."""
     
+    # Only responses scoring above this are reused for similar prompts
+    SIMILARITY_MIN_PERFORMANCE = 7.0
+    
+    # Maximum number of LSH candidates re-ranked per similarity lookup
+    SIMILARITY_MAX_CANDIDATES = 32
+    
+    # Pending access updates that trigger an early background flush
+    ACCESS_FLUSH_BATCH = 256
+    
+    # Background eviction starts above the high watermark and frees space
+    # down to the low watermark (fractions of max_size_bytes)
+    EVICTION_HIGH_WATERMARK = 0.9
+    EVICTION_LOW_WATERMARK = 0.75
+    
+    # Eviction order for each strategy; each has a covering index
+    _EVICTION_ORDER = {
+        CacheStrategy.LRU: "last_accessed ASC",
+        CacheStrategy.LFU: "access_count ASC, last_accessed ASC",
+        CacheStrategy.PERFORMANCE_BASED: "performance_score ASC, access_count ASC",
+    }
+    
     def __init__(self, 
                  cache_dir: str = None,
                  max_size_mb: int = 500,
                  default_ttl_seconds: int = 3600,
                  strategy: CacheStrategy = CacheStrategy.PERFORMANCE_BASED,
-                 similarity_threshold: float = 0.8):
+                 similarity_threshold: float = 0.8,
+                 hot_cache_entries: int = 1024,
+                 access_flush_interval: float = 1.0):
         """
         Initialize the intelligent cache.
         
@@ -201,6 +409,8 @@ class IntelligentCache:
             default_ttl_seconds: Default TTL for cache entries.
             strategy: Default caching strategy.
             similarity_threshold: Threshold for prompt similarity matching.
+            hot_cache_entries: Size of the in-process LRU tier (0 disables it).
+            access_flush_interval: Seconds between batched access-stat flushes.
         """
         self.cache_dir = Path(cache_dir or os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "cache"
@@ -211,24 +421,49 @@ class IntelligentCache:
         self.default_ttl_seconds = default_ttl_seconds
         self.strategy = strategy
         self.similarity_threshold = similarity_threshold
+        self.hot_cache_entries = hot_cache_entries
+        self.access_flush_interval = access_flush_interval
         
         # Initialize database
         self.db_path = self.cache_dir / "cache.db"
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._init_database()
         
         # Initialize components
         self.similarity_calculator = PromptSimilarityCalculator()
+        self.min_hasher = PromptMinHasher()
         self.stats = CacheStats()
         self._lock = threading.RLock()
         
-        # Load existing stats
+        # Hot tier and pending access-stat updates
+        self._hot_entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._hot_generation = 0
+        self._pending_access: Dict[str, Tuple[str, int]] = {}
+        self._hot_lock = threading.Lock()
+        
+        # Identical in-flight misses share one upstream call
+        self._single_flight = SingleFlight()
+        
+        # Load existing stats, and the size of entries already on disk
         self._load_stats()
+        self._load_size_stats()
+        
+        self._closed = False
+        self._flush_wakeup = threading.Event()
+        self._start_maintenance_thread()
+        if self.stats.total_size_bytes > self.max_size_bytes * self.EVICTION_HIGH_WATERMARK:
+            self._flush_wakeup.set()
         
         logger.info(f"Initialized intelligent cache at {self.cache_dir}")
     
     def _init_database(self) -> None:
         """Initialize SQLite database for cache storage."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_db_connection() as conn:
+            # WAL lets readers proceed while another connection writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS cache_entries (
                     key TEXT PRIMARY KEY,
@@ -242,10 +477,39 @@ class IntelligentCache:
                     performance_score REAL NOT NULL,
                     context_hash TEXT,
                     ttl_seconds INTEGER,
-                    size_bytes INTEGER NOT NULL
+                    size_bytes INTEGER NOT NULL,
+                    prompt_text TEXT,
+                    minhash BLOB
                 )
             """)
             
+            # Databases created before similarity indexing lack these columns
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(cache_entries)")}
+            for column, column_type in (("prompt_text", "TEXT"), ("minhash", "BLOB")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE cache_entries ADD COLUMN {column} {column_type}")
+            
+            # LSH bucket index: one row per (band key, entry)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_lsh_buckets (
+                    band_key TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (band_key, key)
+                ) WITHOUT ROWID
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_lsh_key ON cache_lsh_buckets(key)
+            """)
+            
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_cache_entries_lsh_delete
+                AFTER DELETE ON cache_entries
+                BEGIN
+                    DELETE FROM cache_lsh_buckets WHERE key = OLD.key;
+                END
+            """)
+            
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_prompt_hash ON cache_entries(prompt_hash)
             """)
@@ -254,28 +518,174 @@ class IntelligentCache:
                 CREATE INDEX IF NOT EXISTS idx_model_name ON cache_entries(model_name)
             """)
             
+            # Covering indexes for eviction scans (order columns, size, key)
+            conn.execute("DROP INDEX IF EXISTS idx_last_accessed")
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_evict_lru
+                ON cache_entries(last_accessed, size_bytes, key)
+            """)
+            
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_last_accessed ON cache_entries(last_accessed)
+                CREATE INDEX IF NOT EXISTS idx_evict_lfu
+                ON cache_entries(access_count, last_accessed, size_bytes, key)
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_evict_performance
+                ON cache_entries(performance_score, access_count, size_bytes, key)
             """)
             
             conn.commit()
     
     @contextmanager
     def _get_db_connection(self):
-        """Get database connection with proper error handling."""
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
+        """
+        Get this thread's database connection with proper error handling.
+        
+        Connections are opened once per thread and reused, so the hot path
+        does not pay for sqlite3.connect on every call.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
             conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        
+        try:
             yield conn
         except Exception as e:
-            if conn:
-                conn.rollback()
+            conn.rollback()
             logger.error(f"Database error: {e}")
             raise
-        finally:
-            if conn:
+    
+    def _hot_get(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry in the in-process LRU tier."""
+        with self._hot_lock:
+            entry = self._hot_entries.get(key)
+            if entry is not None:
+                self._hot_entries.move_to_end(key)
+            return entry
+    
+    def _hot_put(self, key: str, entry: CacheEntry, generation: Optional[int] = None) -> None:
+        """
+        Insert an entry into the in-process LRU tier.
+        
+        Args:
+            key: Cache key.
+            entry: Entry to keep in memory.
+            generation: Hot-tier generation observed before the entry was read
+                from disk; the insert is skipped if an invalidation happened since.
+        """
+        if self.hot_cache_entries <= 0:
+            return
+        
+        with self._hot_lock:
+            if generation is not None and generation != self._hot_generation:
+                return
+            
+            self._hot_entries[key] = entry
+            self._hot_entries.move_to_end(key)
+            while len(self._hot_entries) > self.hot_cache_entries:
+                self._hot_entries.popitem(last=False)
+    
+    def _hot_discard(self, keys: List[str] = None) -> None:
+        """Drop entries (or everything) from the in-process tier."""
+        with self._hot_lock:
+            self._hot_generation += 1
+            if keys is None:
+                self._hot_entries.clear()
+                self._pending_access.clear()
+                return
+            
+            for key in keys:
+                self._hot_entries.pop(key, None)
+                self._pending_access.pop(key, None)
+    
+    def _record_access(self, key: str, entry: CacheEntry) -> None:
+        """Queue an access-stat update for the next batched flush."""
+        with self._hot_lock:
+            _, count = self._pending_access.get(key, (None, 0))
+            self._pending_access[key] = (entry.last_accessed.isoformat(), count + 1)
+            backlog = len(self._pending_access)
+        
+        if backlog >= self.ACCESS_FLUSH_BATCH:
+            self._flush_wakeup.set()
+    
+    def _flush_access_updates(self) -> int:
+        """
+        Write queued access-stat updates to the database in one transaction.
+        
+        Returns:
+            Number of entries updated.
+        """
+        with self._hot_lock:
+            if not self._pending_access:
+                return 0
+            pending, self._pending_access = self._pending_access, {}
+        
+        with self._get_db_connection() as conn:
+            conn.executemany("""
+                UPDATE cache_entries 
+                SET last_accessed = ?, access_count = access_count + ?
+                WHERE key = ?
+            """, [(last_accessed, count, key) for key, (last_accessed, count) in pending.items()])
+            conn.commit()
+        
+        return len(pending)
+    
+    def _start_maintenance_thread(self) -> None:
+        """Start the background thread that flushes access stats and evicts."""
+        # The thread only holds a weak reference so the cache can still be collected
+        cache_ref = weakref.ref(self)
+        wakeup = self._flush_wakeup
+        interval = self.access_flush_interval
+        
+        def run():
+            while True:
+                wakeup.wait(interval)
+                wakeup.clear()
+                
+                cache = cache_ref()
+                if cache is None or cache._closed:
+                    return
+                try:
+                    cache._flush_access_updates()
+                except Exception as e:
+                    logger.warning(f"Failed to flush cache access statistics: {e}")
+                try:
+                    cache._evict_to_watermark()
+                except Exception as e:
+                    logger.warning(f"Background cache eviction failed: {e}")
+                del cache
+        
+        self._maintenance_thread = threading.Thread(target=run, name="cache-maintenance", daemon=True)
+        self._maintenance_thread.start()
+    
+    def close(self) -> None:
+        """Flush pending access statistics and close database connections."""
+        if getattr(self, '_closed', True):
+            return
+        
+        try:
+            self._flush_access_updates()
+        except Exception as e:
+            logger.warning(f"Failed to flush cache access statistics: {e}")
+        
+        self._closed = True
+        self._flush_wakeup.set()
+        
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
                 conn.close()
+            except Exception:
+                pass
+        self._local = threading.local()
     
     def _generate_cache_key(self, prompt: str, model_name: str, 
                           context: Dict[str, Any] = None) -> str:
@@ -310,8 +720,14 @@ class IntelligentCache:
         size += len(entry.prompt_hash.encode('utf-8'))
         size += len(entry.model_name.encode('utf-8'))
         size += len(json.dumps(entry.metadata).encode('utf-8'))
+        if entry.prompt_text:
+            size += len(entry.prompt_text.encode('utf-8'))
         return size
     
+    def _lsh_band_keys(self, model_name: str, signature: List[int]) -> List[str]:
+        """Get LSH band keys scoped to a model."""
+        return [f"{model_name}|{band_key}" for band_key in self.min_hasher.band_keys(signature)]
+    
     def get(self, prompt: str, model_name: str, 
             context: Dict[str, Any] = None) -> Optional[str]:
         """
@@ -327,45 +743,53 @@ class IntelligentCache:
         """
         with self._lock:
             self.stats.total_requests += 1
-            
-            # Try exact match first
-            cache_key = self._generate_cache_key(prompt, model_name, context)
-            
+        
+        # Try exact match first, in memory then on disk
+        cache_key = self._generate_cache_key(prompt, model_name, context)
+        
+        entry = self._hot_get(cache_key)
+        if entry is None:
+            generation = self._hot_generation
             with self._get_db_connection() as conn:
-                cursor = conn.execute(
+                row = conn.execute(
                     "SELECT * FROM cache_entries WHERE key = ?",
                     (cache_key,)
-                )
-                row = cursor.fetchone()
-                
-                if row:
-                    entry = self._row_to_cache_entry(row)
-                    
-                    # Check if expired
-                    if entry.is_expired():
-                        self._invalidate_entry(cache_key, CacheInvalidationReason.EXPIRED)
-                        self.stats.cache_misses += 1
-                        return None
-                    
-                    # Update access statistics
-                    entry.update_access()
-                    self._update_entry_access(cache_key, entry)
-                    
-                    self.stats.cache_hits += 1
-                    logger.debug(f"Cache hit for key: {cache_key}")
-                    return entry.response
+                ).fetchone()
             
-            # Try similarity-based matching if enabled
-            if self.strategy == CacheStrategy.SIMILARITY_BASED:
-                similar_response = self._find_similar_cached_response(
-                    prompt, model_name, context
-                )
-                if similar_response:
-                    self.stats.cache_hits += 1
-                    return similar_response
+            if row:
+                entry = self._row_to_cache_entry(row)
+                self._hot_put(cache_key, entry, generation)
+        
+        if entry is not None:
+            # Check if expired
+            if entry.is_expired():
+                with self._lock:
+                    self._invalidate_entry(cache_key, CacheInvalidationReason.EXPIRED)
+                    self.stats.cache_misses += 1
+                return None
+            
+            # Access statistics are written back in batches
+            entry.update_access()
+            self._record_access(cache_key, entry)
             
+            with self._lock:
+                self.stats.cache_hits += 1
+            logger.debug(f"Cache hit for key: {cache_key}")
+            return entry.response
+        
+        # Try similarity-based matching if enabled
+        if self.strategy == CacheStrategy.SIMILARITY_BASED:
+            similar_response = self._find_similar_cached_response(
+                prompt, model_name, context
+            )
+            if similar_response:
+                with self._lock:
+                    self.stats.cache_hits += 1
+                return similar_response
+        
+        with self._lock:
             self.stats.cache_misses += 1
-            return None
+        return None
     
     def put(self, prompt: str, model_name: str, response: str,
             metadata: Dict[str, Any] = None, context: Dict[str, Any] = None,
@@ -403,41 +827,112 @@ class IntelligentCache:
                 access_count=1,
                 performance_score=performance_score,
                 context_hash=context_hash,
-                ttl_seconds=ttl_seconds or self.default_ttl_seconds
+                ttl_seconds=ttl_seconds or self.default_ttl_seconds,
+                prompt_text=normalize_prompt(prompt)
             )
             
+            signature = self.min_hasher.signature(entry.prompt_text)
             entry_size = self._calculate_entry_size(entry)
             
-            # Check if we need to make space
+            # Space is normally reclaimed in the background; only evict inline
+            # when this entry would exceed the hard limit
             self._ensure_cache_space(entry_size)
             
             # Store in database
             with self._get_db_connection() as conn:
+                conn.execute("DELETE FROM cache_lsh_buckets WHERE key = ?", (cache_key,))
                 conn.execute("""
                     INSERT OR REPLACE INTO cache_entries 
                     (key, prompt_hash, model_name, response, metadata, created_at, 
                      last_accessed, access_count, performance_score, context_hash, 
-                     ttl_seconds, size_bytes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     ttl_seconds, size_bytes, prompt_text, minhash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     entry.key, entry.prompt_hash, entry.model_name, entry.response,
                     json.dumps(entry.metadata), entry.created_at.isoformat(),
                     entry.last_accessed.isoformat(), entry.access_count,
                     entry.performance_score, entry.context_hash,
-                    entry.ttl_seconds, entry_size
+                    entry.ttl_seconds, entry_size, entry.prompt_text,
+                    self.min_hasher.pack(signature)
                 ))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO cache_lsh_buckets (band_key, key) VALUES (?, ?)",
+                    [(band_key, cache_key) for band_key in self._lsh_band_keys(model_name, signature)]
+                )
                 conn.commit()
             
+            self._hot_discard([cache_key])
+            self._hot_put(cache_key, entry)
+            
             self.stats.cache_size += 1
             self.stats.total_size_bytes += entry_size
             
+            if self.stats.total_size_bytes > self.max_size_bytes * self.EVICTION_HIGH_WATERMARK:
+                self._flush_wakeup.set()
+            
             logger.debug(f"Cached response for key: {cache_key}")
     
+    def coalesce(self, prompt: str, model_name: str, compute: Callable[[], T],
+                 context: Dict[str, Any] = None) -> T:
+        """
+        Run compute once for concurrent callers with the same cache key.
+        
+        Callers that arrive while an identical request is in flight wait for
+        it and receive the same result; they are counted as coalesced.
+        
+        Args:
+            prompt: The input prompt.
+            model_name: Name of the model.
+            compute: Upstream call producing the response.
+            context: Additional context.
+            
+        Returns:
+            The result of compute (possibly from another caller).
+        """
+        cache_key = self._generate_cache_key(prompt, model_name, context)
+        result, shared = self._single_flight.do(cache_key, compute)
+        
+        if shared:
+            with self._lock:
+                self.stats.coalesced_requests += 1
+            logger.debug(f"Coalesced request for key: {cache_key}")
+        
+        return result
+    
+    async def acoalesce(self, prompt: str, model_name: str,
+                        compute: Callable[[], Awaitable[T]],
+                        context: Dict[str, Any] = None) -> T:
+        """
+        Async counterpart of coalesce for coroutine upstream calls.
+        
+        Args:
+            prompt: The input prompt.
+            model_name: Name of the model.
+            compute: Coroutine function producing the response.
+            context: Additional context.
+            
+        Returns:
+            The result of compute (possibly from another caller).
+        """
+        cache_key = self._generate_cache_key(prompt, model_name, context)
+        result, shared = await self._single_flight.ado(cache_key, compute)
+        
+        if shared:
+            with self._lock:
+                self.stats.coalesced_requests += 1
+            logger.debug(f"Coalesced request for key: {cache_key}")
+        
+        return result
+    
     def _find_similar_cached_response(self, prompt: str, model_name: str,
                                     context: Dict[str, Any] = None) -> Optional[str]:
         """
         Find similar cached responses using prompt similarity.
         
+        Candidates come from the LSH bucket index, so the lookup only touches
+        entries sharing at least one MinHash band with the prompt. They are
+        re-ranked with the exact Jaccard score from PromptSimilarityCalculator.
+        
         Args:
             prompt: The input prompt.
             model_name: Name of the model.
@@ -446,45 +941,55 @@ class IntelligentCache:
         Returns:
             Similar cached response if found, None otherwise.
         """
+        normalized = normalize_prompt(prompt)
+        band_keys = self._lsh_band_keys(model_name, self.min_hasher.signature(normalized))
+        
+        context_hash = None
+        if context:
+            context_hash = hashlib.sha256(
+                json.dumps(context, sort_keys=True).encode('utf-8')
+            ).hexdigest()
+        
+        placeholders = ",".join("?" * len(band_keys))
         with self._get_db_connection() as conn:
-            # Get all cached prompts for the same model
-            cursor = conn.execute(
-                "SELECT prompt_hash, response, performance_score FROM cache_entries WHERE model_name = ?",
-                (model_name,)
-            )
-            
-            cached_entries = cursor.fetchall()
-            
-            if not cached_entries:
-                return None
-            
-            # Find similar prompts (this is a simplified approach)
-            # In a production system, you might want to use more sophisticated
-            # similarity measures or vector embeddings
+            cursor = conn.execute(f"""
+                SELECT c.prompt_text, c.response, c.created_at, c.ttl_seconds
+                FROM (
+                    SELECT key, COUNT(*) AS shared_bands FROM cache_lsh_buckets
+                    WHERE band_key IN ({placeholders})
+                    GROUP BY key
+                    ORDER BY shared_bands DESC
+                    LIMIT ?
+                ) AS candidates
+                JOIN cache_entries c ON c.key = candidates.key
+                WHERE c.model_name = ? AND c.context_hash IS ?
+                  AND c.performance_score > ?
+            """, (*band_keys, self.SIMILARITY_MAX_CANDIDATES, model_name,
+                  context_hash, self.SIMILARITY_MIN_PERFORMANCE))
             
-            best_similarity = 0.0
-            best_response = None
-            
-            for entry in cached_entries:
-                # For now, we'll use a simple heuristic based on prompt length
-                # and common words. In practice, you'd want to store the original
-                # prompts or use embeddings for better similarity matching.
-                
-                # This is a placeholder - in reality you'd need to store
-                # the original prompts or use embeddings
-                if entry['performance_score'] > 7.0:  # Only use high-quality responses
-                    # Simple heuristic: if prompts are similar length, they might be similar
-                    # This is very basic and should be improved with proper similarity
-                    similarity = min(len(prompt), 100) / 100.0  # Placeholder
-                    
-                    if similarity > best_similarity and similarity >= self.similarity_threshold:
-                        best_similarity = similarity
-                        best_response = entry['response']
-            
-            if best_response:
-                logger.debug(f"Found similar cached response with similarity: {best_similarity}")
+            candidates = cursor.fetchall()
+        
+        best_similarity = 0.0
+        best_response = None
+        now = datetime.now()
+        
+        for row in candidates:
+            if row['ttl_seconds'] is not None:
+                age = (now - datetime.fromisoformat(row['created_at'])).total_seconds()
+                if age > row['ttl_seconds']:
+                    continue
             
-            return best_response
+            similarity = self.similarity_calculator.calculate_similarity(
+                normalized, row['prompt_text']
+            )
+            if similarity > best_similarity and similarity >= self.similarity_threshold:
+                best_similarity = similarity
+                best_response = row['response']
+        
+        if best_response:
+            logger.debug(f"Found similar cached response with similarity: {best_similarity}")
+        
+        return best_response
     
     def _ensure_cache_space(self, required_bytes: int) -> None:
         """
@@ -493,84 +998,111 @@ class IntelligentCache:
         Args:
             required_bytes: Bytes required for the new entry.
         """
-        if self.stats.total_size_bytes + required_bytes <= self.max_size_bytes:
+        overflow = self.stats.total_size_bytes + required_bytes - self.max_size_bytes
+        if overflow <= 0:
             return
         
-        # Need to free up space based on strategy
-        if self.strategy == CacheStrategy.LRU:
-            self._evict_lru_entries(required_bytes)
-        elif self.strategy == CacheStrategy.LFU:
-            self._evict_lfu_entries(required_bytes)
-        elif self.strategy == CacheStrategy.PERFORMANCE_BASED:
-            self._evict_low_performance_entries(required_bytes)
-        else:
-            self._evict_lru_entries(required_bytes)  # Default to LRU
+        self._evict_entries(overflow)
     
-    def _evict_lru_entries(self, required_bytes: int) -> None:
-        """Evict least recently used entries."""
+    def _evict_to_watermark(self) -> int:
+        """
+        Evict entries down to the low watermark once the high watermark is crossed.
+        
+        Returns:
+            Number of entries evicted.
+        """
+        with self._lock:
+            if self.stats.total_size_bytes <= self.max_size_bytes * self.EVICTION_HIGH_WATERMARK:
+                return 0
+            
+            target = int(self.max_size_bytes * self.EVICTION_LOW_WATERMARK)
+            return self._evict_entries(self.stats.total_size_bytes - target)
+    
+    def _evict_entries(self, required_bytes: int,
+                       strategy: CacheStrategy = None) -> int:
+        """
+        Evict entries in a strategy's order until enough space is freed.
+        
+        Args:
+            required_bytes: Bytes to free.
+            strategy: Eviction strategy (defaults to the cache strategy).
+            
+        Returns:
+            Number of entries evicted.
+        """
+        # Eviction order depends on up-to-date access statistics
+        self._flush_access_updates()
+        
+        # Default to LRU for strategies without their own ordering
+        order_by = self._EVICTION_ORDER.get(
+            strategy or self.strategy, self._EVICTION_ORDER[CacheStrategy.LRU]
+        )
+        
         with self._get_db_connection() as conn:
-            cursor = conn.execute("""
-                SELECT key, size_bytes FROM cache_entries 
-                ORDER BY last_accessed ASC
-            """)
+            cursor = conn.execute(
+                f"SELECT key, size_bytes FROM cache_entries ORDER BY {order_by}"
+            )
             
             freed_bytes = 0
-            keys_to_delete = []
+            victims = []
             
             for row in cursor:
-                keys_to_delete.append(row['key'])
+                victims.append((row['key'], row['size_bytes']))
                 freed_bytes += row['size_bytes']
                 
                 if freed_bytes >= required_bytes:
                     break
-            
-            # Delete the entries
-            for key in keys_to_delete:
-                self._invalidate_entry(key, CacheInvalidationReason.SIZE_LIMIT)
+            cursor.close()
+        
+        return self._delete_entries(victims, CacheInvalidationReason.SIZE_LIMIT)
+    
+    def _evict_lru_entries(self, required_bytes: int) -> None:
+        """Evict least recently used entries."""
+        self._evict_entries(required_bytes, CacheStrategy.LRU)
     
     def _evict_lfu_entries(self, required_bytes: int) -> None:
         """Evict least frequently used entries."""
-        with self._get_db_connection() as conn:
-            cursor = conn.execute("""
-                SELECT key, size_bytes FROM cache_entries 
-                ORDER BY access_count ASC, last_accessed ASC
-            """)
-            
-            freed_bytes = 0
-            keys_to_delete = []
-            
-            for row in cursor:
-                keys_to_delete.append(row['key'])
-                freed_bytes += row['size_bytes']
-                
-                if freed_bytes >= required_bytes:
-                    break
-            
-            # Delete the entries
-            for key in keys_to_delete:
-                self._invalidate_entry(key, CacheInvalidationReason.SIZE_LIMIT)
+        self._evict_entries(required_bytes, CacheStrategy.LFU)
     
     def _evict_low_performance_entries(self, required_bytes: int) -> None:
         """Evict entries with low performance scores."""
-        with self._get_db_connection() as conn:
-            cursor = conn.execute("""
-                SELECT key, size_bytes FROM cache_entries 
-                ORDER BY performance_score ASC, access_count ASC
-            """)
-            
-            freed_bytes = 0
-            keys_to_delete = []
-            
-            for row in cursor:
-                keys_to_delete.append(row['key'])
-                freed_bytes += row['size_bytes']
-                
-                if freed_bytes >= required_bytes:
-                    break
+        self._evict_entries(required_bytes, CacheStrategy.PERFORMANCE_BASED)
+    
+    def _delete_entries(self, entries: List[Tuple[str, int]],
+                        reason: CacheInvalidationReason) -> int:
+        """
+        Delete a batch of entries in a single transaction.
+        
+        Args:
+            entries: (key, size_bytes) pairs to delete.
+            reason: Reason for invalidation.
             
-            # Delete the entries
-            for key in keys_to_delete:
-                self._invalidate_entry(key, CacheInvalidationReason.SIZE_LIMIT)
+        Returns:
+            Number of entries deleted.
+        """
+        if not entries:
+            return 0
+        
+        keys = [key for key, _ in entries]
+        self._hot_discard(keys)
+        
+        # Stay under SQLite's bound-parameter limit
+        chunk_size = 500
+        with self._get_db_connection() as conn:
+            for start in range(0, len(keys), chunk_size):
+                chunk = keys[start:start + chunk_size]
+                conn.execute(
+                    f"DELETE FROM cache_entries WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+            conn.commit()
+        
+        self.stats.cache_size -= len(entries)
+        self.stats.total_size_bytes -= sum(size for _, size in entries)
+        self.stats.invalidations[reason.value] += len(entries)
+        
+        logger.debug(f"Invalidated {len(entries)} cache entries due to {reason.value}")
+        return len(entries)
     
     def _invalidate_entry(self, key: str, reason: CacheInvalidationReason) -> None:
         """
@@ -580,6 +1112,8 @@ class IntelligentCache:
             key: Cache key to invalidate.
             reason: Reason for invalidation.
         """
+        self._hot_discard([key])
+        
         with self._get_db_connection() as conn:
             # Get entry size before deletion
             cursor = conn.execute("SELECT size_bytes FROM cache_entries WHERE key = ?", (key,))
@@ -599,16 +1133,6 @@ class IntelligentCache:
                 
                 logger.debug(f"Invalidated cache entry {key} due to {reason.value}")
     
-    def _update_entry_access(self, key: str, entry: CacheEntry) -> None:
-        """Update access statistics for an entry."""
-        with self._get_db_connection() as conn:
-            conn.execute("""
-                UPDATE cache_entries 
-                SET last_accessed = ?, access_count = ?
-                WHERE key = ?
-            """, (entry.last_accessed.isoformat(), entry.access_count, key))
-            conn.commit()
-    
     def _row_to_cache_entry(self, row: sqlite3.Row) -> CacheEntry:
         """Convert database row to CacheEntry object."""
         return CacheEntry(
@@ -622,7 +1146,8 @@ class IntelligentCache:
             access_count=row['access_count'],
             performance_score=row['performance_score'],
             context_hash=row['context_hash'],
-            ttl_seconds=row['ttl_seconds']
+            ttl_seconds=row['ttl_seconds'],
+            prompt_text=row['prompt_text']
         )
     
     def invalidate_by_model(self, model_name: str) -> int:
@@ -638,16 +1163,13 @@ class IntelligentCache:
         with self._lock:
             with self._get_db_connection() as conn:
                 cursor = conn.execute(
-                    "SELECT key FROM cache_entries WHERE model_name = ?",
+                    "SELECT key, size_bytes FROM cache_entries WHERE model_name = ?",
                     (model_name,)
                 )
                 
-                keys = [row['key'] for row in cursor.fetchall()]
-                
-                for key in keys:
-                    self._invalidate_entry(key, CacheInvalidationReason.MODEL_HEALTH_CHANGE)
-                
-                return len(keys)
+                entries = [(row['key'], row['size_bytes']) for row in cursor.fetchall()]
+            
+            return self._delete_entries(entries, CacheInvalidationReason.MODEL_HEALTH_CHANGE)
     
     def invalidate_expired(self) -> int:
         """
@@ -661,23 +1183,20 @@ class IntelligentCache:
                 current_time = datetime.now()
                 
                 cursor = conn.execute("""
-                    SELECT key, created_at, ttl_seconds FROM cache_entries 
+                    SELECT key, created_at, ttl_seconds, size_bytes FROM cache_entries 
                     WHERE ttl_seconds IS NOT NULL
                 """)
                 
-                expired_keys = []
+                expired = []
                 
                 for row in cursor:
                     created_at = datetime.fromisoformat(row['created_at'])
                     ttl_seconds = row['ttl_seconds']
                     
                     if (current_time - created_at).total_seconds() > ttl_seconds:
-                        expired_keys.append(row['key'])
-                
-                for key in expired_keys:
-                    self._invalidate_entry(key, CacheInvalidationReason.EXPIRED)
-                
-                return len(expired_keys)
+                        expired.append((row['key'], row['size_bytes']))
+            
+            return self._delete_entries(expired, CacheInvalidationReason.EXPIRED)
     
     def clear(self) -> None:
         """Clear all cache entries."""
@@ -686,6 +1205,8 @@ class IntelligentCache:
                 conn.execute("DELETE FROM cache_entries")
                 conn.commit()
             
+            self._hot_discard()
+            
             self.stats = CacheStats()
             logger.info("Cache cleared")
     
@@ -722,11 +1243,19 @@ class IntelligentCache:
                 self.stats.avg_response_time_uncached = data.get('avg_response_time_uncached', 0.0)
                 self.stats.invalidations = data.get('invalidations', 
                     {reason.value: 0 for reason in CacheInvalidationReason})
+                self.stats.coalesced_requests = data.get('coalesced_requests', 0)
                 
                 logger.debug("Loaded cache statistics from file")
             except Exception as e:
                 logger.warning(f"Failed to load cache statistics: {e}")
     
+    def _load_size_stats(self) -> None:
+        """Initialize entry count and total size from the database."""
+        with self._get_db_connection() as conn:
+            row = conn.execute("SELECT COUNT(*), SUM(size_bytes) FROM cache_entries").fetchone()
+        self.stats.cache_size = row[0] or 0
+        self.stats.total_size_bytes = row[1] or 0
+    
     def _save_stats(self) -> None:
         """Save statistics to persistent storage."""
         stats_file = self.cache_dir / "cache_stats.json"
@@ -738,7 +1267,8 @@ class IntelligentCache:
                 'cache_misses': self.stats.cache_misses,
                 'avg_response_time_cached': self.stats.avg_response_time_cached,
                 'avg_response_time_uncached': self.stats.avg_response_time_uncached,
-                'invalidations': self.stats.invalidations
+                'invalidations': self.stats.invalidations,
+                'coalesced_requests': self.stats.coalesced_requests
             }
             
             with open(stats_file, 'w') as f:
@@ -788,6 +1318,7 @@ class IntelligentCache:
         """Cleanup when cache is destroyed."""
         try:
             self._save_stats()
+            self.close()
         except:
             pass
 
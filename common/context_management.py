@@ -13,15 +13,23 @@ import hashlib
 import threading
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Iterator, AsyncIterator
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Iterator, AsyncIterator, Iterable, Deque
 from enum import Enum
 from pathlib import Path
 import asyncio
 import time
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from common.tokenization import TokenizerService, get_tokenizer_service
 
 # Configure logging
 logger = logging.getLogger("ai_dev_squad.context_management")
 
+# Largest share of a window's max_tokens a rolling summary may take; longer
+# summaries are trimmed so they never crowd out the messages they sit beside
+SUMMARY_TOKEN_SHARE = 0.25
+
 
 class ContextStrategy(Enum):
     """Strategies for context window management."""
@@ -73,22 +81,267 @@ class ContextMessage:
         }
 
 
+class MessageBuffer:
+    """
+    Ordered message store backing ContextWindow.
+    
+    Messages live in two deques split at a movable gap, so removals at either
+    end are O(1) and repeated removals around one position (the middle, or
+    just after a leading system message) cost amortized O(1) gap moves.
+    Per-importance queues and running token totals let importance-based
+    trimming evict the oldest message of a class in O(1); such evictions are
+    tombstoned and compacted once they outnumber live messages.
+    """
+    
+    def __init__(self, messages: Iterable[ContextMessage] = ()):
+        self._head: Deque[Tuple[int, ContextMessage]] = deque()
+        self._tail: Deque[Tuple[int, ContextMessage]] = deque()
+        self._live: set = set()
+        self._next_seq = 0
+        self._queued = 0  # entries across the per-importance queues
+        self.by_importance: Dict[MessageImportance, Deque[Tuple[int, ContextMessage]]] = {
+            importance: deque() for importance in MessageImportance
+        }
+        self.token_totals: Dict[MessageImportance, int] = {
+            importance: 0 for importance in MessageImportance
+        }
+        self.importance_counts: Dict[MessageImportance, int] = {
+            importance: 0 for importance in MessageImportance
+        }
+        for message in messages:
+            self.append(message)
+    
+    def __len__(self) -> int:
+        return len(self._live)
+    
+    def __bool__(self) -> bool:
+        return bool(self._live)
+    
+    def __iter__(self) -> Iterator[ContextMessage]:
+        live = self._live
+        for entries in (self._head, self._tail):
+            for seq, message in entries:
+                if seq in live:
+                    yield message
+    
+    def __getitem__(self, index: int) -> ContextMessage:
+        self._require_compact()
+        head_len = len(self._head)
+        if index < 0:
+            index += head_len + len(self._tail)
+        if index < head_len:
+            return self._head[index][1]
+        return self._tail[index - head_len][1]
+    
+    def _entry(self, message: ContextMessage) -> Tuple[int, ContextMessage]:
+        seq = self._next_seq
+        self._next_seq += 1
+        self._live.add(seq)
+        self.by_importance[message.importance].append((seq, message))
+        self._queued += 1
+        self.token_totals[message.importance] += message.token_count
+        self.importance_counts[message.importance] += 1
+        return seq, message
+    
+    def _forget(self, entry: Tuple[int, ContextMessage]) -> ContextMessage:
+        seq, message = entry
+        self._live.discard(seq)
+        self.token_totals[message.importance] -= message.token_count
+        self.importance_counts[message.importance] -= 1
+        if self._queued > 2 * len(self._live) + 64:
+            self._compact()
+        return message
+    
+    def _require_compact(self) -> None:
+        """Drop tombstones so positions in the deques match logical indexes."""
+        if len(self._head) + len(self._tail) != len(self._live):
+            self._compact()
+    
+    def _compact(self) -> None:
+        live = self._live
+        self._head = deque(entry for entry in self._head if entry[0] in live)
+        self._tail = deque(entry for entry in self._tail if entry[0] in live)
+        for importance, queue in self.by_importance.items():
+            self.by_importance[importance] = deque(entry for entry in queue if entry[0] in live)
+        self._queued = len(live)
+    
+    def _move_gap(self, index: int) -> None:
+        head, tail = self._head, self._tail
+        while len(head) > index:
+            tail.appendleft(head.pop())
+        while len(head) < index:
+            head.append(tail.popleft())
+    
+    def append(self, message: ContextMessage) -> None:
+        """Add a message at the end."""
+        self._tail.append(self._entry(message))
+    
+    def appendleft(self, message: ContextMessage) -> None:
+        """Add a message at the front."""
+        entry = self._entry(message)
+        self._head.appendleft(entry)
+        # Treat it as the oldest message of its class
+        queue = self.by_importance[message.importance]
+        queue.pop()
+        queue.appendleft(entry)
+    
+    def insert(self, index: int, message: ContextMessage) -> None:
+        """Insert a message so that it ends up at ``index``."""
+        self._require_compact()
+        self._move_gap(index)
+        self._head.append(self._entry(message))
+    
+    def popleft(self) -> ContextMessage:
+        """Remove and return the first message."""
+        self._require_compact()
+        entries = self._head or self._tail
+        return self._forget(entries.popleft())
+    
+    def pop(self, index: int = -1) -> ContextMessage:
+        """Remove and return the message at ``index``."""
+        self._require_compact()
+        size = len(self._head) + len(self._tail)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("pop index out of range")
+        if index == size - 1 and self._tail:
+            return self._forget(self._tail.pop())
+        self._move_gap(index)
+        return self._forget(self._tail.popleft())
+    
+    def evict_oldest(self, importance: MessageImportance) -> Optional[ContextMessage]:
+        """Remove the oldest live message of an importance class."""
+        queue = self.by_importance[importance]
+        live = self._live
+        while queue:
+            seq, message = queue.popleft()
+            self._queued -= 1
+            if seq in live:
+                return self._forget((seq, message))
+        return None
+    
+    def retokenize(self, message: ContextMessage, token_count: int) -> int:
+        """
+        Update the token count of a message held in the buffer.
+        
+        Returns:
+            Change in tokens.
+        """
+        delta = token_count - message.token_count
+        self.token_totals[message.importance] += delta
+        message.token_count = token_count
+        return delta
+    
+    def total_tokens(self) -> int:
+        """Sum of token counts of live messages."""
+        return sum(self.token_totals.values())
+
+
 @dataclass
 class ContextWindow:
     """Represents a managed context window."""
-    messages: List[ContextMessage]
+    messages: MessageBuffer
     max_tokens: int
     current_tokens: int
     strategy: ContextStrategy
     model_name: str
     conversation_id: Optional[str] = None
+    summary_message: Optional[ContextMessage] = None
+    summarized_messages: int = 0
+    summarizer: Optional["RollingSummarizer"] = None
+    summary_text: Optional[str] = None
+    token_counter: Optional[Callable[[str], int]] = None
+    
+    def __post_init__(self):
+        if not isinstance(self.messages, MessageBuffer):
+            self.messages = MessageBuffer(self.messages)
+        # (summary text, messages covered) handed over by the summarizer thread
+        self._delivered_summary: Optional[Tuple[str, int]] = None
+        self._summary_lock = threading.Lock()
+        self._summary_covered = 0
+        self.latest_summary: Optional[str] = None
     
     def add_message(self, message: ContextMessage) -> None:
         """Add a message to the context window."""
+        self.apply_pending_summary()
         self.messages.append(message)
         self.current_tokens += message.token_count
         self._manage_context()
     
+    def deliver_summary(self, text: str, covered: int) -> None:
+        """
+        Hand over a finished background summary.
+        
+        Called from the summarizer thread; the summary is applied on the
+        next read or write of the window, so callers never wait on it.
+        
+        Args:
+            text: Summary of every message evicted so far.
+            covered: Number of evicted messages the summary covers.
+        """
+        text = self._cap_summary(text)
+        with self._summary_lock:
+            self.latest_summary = text
+            self._delivered_summary = (text, covered)
+    
+    def _cap_summary(self, text: str) -> str:
+        """Trim a summary to its share of the token budget, keeping the newest part."""
+        budget = int(self.max_tokens * SUMMARY_TOKEN_SHARE)
+        tokens = self._count_tokens(text)
+        while tokens > budget and text:
+            # Shrink in proportion to the overshoot, then back to a word boundary
+            keep = int(len(text) * budget / tokens)
+            text = text[len(text) - keep:] if keep > 0 else ""
+            if " " in text:
+                text = text[text.index(" ") + 1:]
+            tokens = self._count_tokens(text)
+        return text
+    
+    def apply_pending_summary(self) -> bool:
+        """
+        Swap a delivered background summary into the summary message.
+        
+        Returns:
+            True if a summary was applied.
+        """
+        if self._delivered_summary is None:
+            return False
+        with self._summary_lock:
+            delivered, self._delivered_summary = self._delivered_summary, None
+        if delivered is None:
+            return False
+        
+        text, covered = delivered
+        self.summary_text = text
+        self._summary_covered = covered
+        if self.summary_message is not None:
+            self._set_summary_content(self.summary_message, self._summary_content())
+            self._manage_context()
+        return True
+    
+    def _summary_content(self) -> str:
+        """Content for the summary message given what has been summarized so far."""
+        if self.summary_text is None:
+            return f"[Previous conversation summary: {self.summarized_messages} messages exchanged about various topics]"
+        
+        pending = self.summarized_messages - self._summary_covered
+        content = f"[Previous conversation summary]\n{self.summary_text}"
+        if pending > 0:
+            content += f"\n[{pending} later messages not yet summarized]"
+        return content
+    
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens the same way as the window's other messages."""
+        if self.token_counter is not None:
+            return self.token_counter(text)
+        return get_tokenizer_service().count(text, self.model_name)
+    
+    def _set_summary_content(self, message: ContextMessage, content: str) -> None:
+        """Replace the content of the summary message, keeping token totals in step."""
+        message.content = content
+        self.current_tokens += self.messages.retokenize(message, self._count_tokens(content))
+    
     def _manage_context(self) -> None:
         """Manage context size according to strategy."""
         if self.current_tokens <= self.max_tokens:
@@ -115,7 +368,7 @@ class ContextWindow:
                 else:
                     break
             else:
-                removed = self.messages.pop(0)
+                removed = self.messages.popleft()
             
             self.current_tokens -= removed.token_count
     
@@ -131,54 +384,72 @@ class ContextWindow:
         while (self.current_tokens > self.max_tokens and 
                len(self.messages) > keep_start + keep_recent):
             
-            # Find middle message to remove (avoid system and recent)
+            # Find middle message to remove (avoid system and recent); the
+            # buffer's gap stays at the middle, so each pop is O(1) amortized
             middle_idx = keep_start + (len(self.messages) - keep_start - keep_recent) // 2
             removed = self.messages.pop(middle_idx)
             self.current_tokens -= removed.token_count
     
     def _summarize_oldest(self) -> None:
-        """Summarize oldest messages to reduce token count."""
-        # This is a placeholder - in practice, you'd use a summarization model
-        # For now, we'll use truncation with a summary message
+        """
+        Summarize oldest messages to reduce token count.
         
+        Evicted messages are replaced by a single summary message right
+        away. With a summarizer attached they are also handed to it, and its
+        rolling summary replaces the placeholder text once it is ready.
+        """
         if len(self.messages) <= 2:
             return
         
-        # Calculate how many messages to summarize
+        # Take the oldest non-system messages off the front until enough
+        # tokens are freed; system messages met on the way are put back
         target_reduction = self.current_tokens - self.max_tokens + 500  # Buffer
         messages_to_summarize = []
+        skipped_system = []
         tokens_to_remove = 0
         
-        for i, msg in enumerate(self.messages):
+        while self.messages:
+            msg = self.messages[0]
+            if msg is self.summary_message:
+                # The previous summary is folded into the new one
+                self.messages.popleft()
+                self.current_tokens -= msg.token_count
+                self.summary_message = None
+                continue
             if msg.role == "system":
+                skipped_system.append(self.messages.popleft())
                 continue
             if tokens_to_remove >= target_reduction:
                 break
             
-            messages_to_summarize.append(msg)
+            messages_to_summarize.append(self.messages.popleft())
             tokens_to_remove += msg.token_count
         
-        if messages_to_summarize:
+        for msg in reversed(skipped_system):
+            self.messages.appendleft(msg)
+        self.current_tokens -= tokens_to_remove
+        
+        if messages_to_summarize or self.summarized_messages:
             # Create summary message
-            summary_content = f"[Previous conversation summary: {len(messages_to_summarize)} messages exchanged about various topics]"
+            self.summarized_messages += len(messages_to_summarize)
+            if self.summarizer is not None and messages_to_summarize:
+                self.summarizer.submit(self, messages_to_summarize, self.summarized_messages)
+            summary_content = self._summary_content()
             summary_msg = ContextMessage(
                 role="system",
                 content=summary_content,
                 timestamp=datetime.now(),
                 importance=MessageImportance.MEDIUM,
-                token_count=len(summary_content.split()) * 1.3,  # Rough estimate
+                token_count=self._count_tokens(summary_content),
                 message_id="summary_" + str(int(time.time()))
             )
             
-            # Remove summarized messages and add summary
-            for msg in messages_to_summarize:
-                if msg in self.messages:
-                    self.messages.remove(msg)
-                    self.current_tokens -= msg.token_count
-            
             # Insert summary after system message
-            insert_idx = 1 if self.messages and self.messages[0].role == "system" else 0
-            self.messages.insert(insert_idx, summary_msg)
+            if self.messages and self.messages[0].role == "system":
+                self.messages.insert(1, summary_msg)
+            else:
+                self.messages.appendleft(summary_msg)
+            self.summary_message = summary_msg
             self.current_tokens += summary_msg.token_count
     
     def _sliding_window(self) -> None:
@@ -187,75 +458,30 @@ class ContextWindow:
         if not self.messages:
             return
         
-        # Always keep system message
-        system_msg = None
-        if self.messages[0].role == "system":
-            system_msg = self.messages[0]
-            remaining_messages = self.messages[1:]
-            available_tokens = self.max_tokens - system_msg.token_count
-        else:
-            remaining_messages = self.messages
-            available_tokens = self.max_tokens
-        
-        # Keep as many recent messages as possible
-        kept_messages = []
-        used_tokens = 0
-        
-        for msg in reversed(remaining_messages):
-            if used_tokens + msg.token_count <= available_tokens:
-                kept_messages.insert(0, msg)
-                used_tokens += msg.token_count
-            else:
-                break
-        
-        # Update messages list
-        if system_msg:
-            self.messages = [system_msg] + kept_messages
-            self.current_tokens = system_msg.token_count + used_tokens
-        else:
-            self.messages = kept_messages
-            self.current_tokens = used_tokens
+        # Always keep system message; dropping from the oldest end keeps the
+        # longest run of recent messages that fits
+        keep_start = 1 if self.messages[0].role == "system" else 0
+        while self.current_tokens > self.max_tokens and len(self.messages) > keep_start:
+            removed = self.messages.pop(keep_start) if keep_start else self.messages.popleft()
+            self.current_tokens -= removed.token_count
     
     def _importance_based_management(self) -> None:
         """Manage context based on message importance."""
         if self.current_tokens <= self.max_tokens:
             return
         
-        # Sort messages by importance (keep critical and high importance)
-        critical_msgs = [msg for msg in self.messages if msg.importance == MessageImportance.CRITICAL]
-        high_msgs = [msg for msg in self.messages if msg.importance == MessageImportance.HIGH]
-        medium_msgs = [msg for msg in self.messages if msg.importance == MessageImportance.MEDIUM]
-        low_msgs = [msg for msg in self.messages if msg.importance == MessageImportance.LOW]
-        
-        # Calculate tokens for each importance level
-        critical_tokens = sum(msg.token_count for msg in critical_msgs)
-        high_tokens = sum(msg.token_count for msg in high_msgs)
-        medium_tokens = sum(msg.token_count for msg in medium_msgs)
-        
-        # Keep messages in order of importance
-        kept_messages = critical_msgs.copy()
-        used_tokens = critical_tokens
-        
-        # Add high importance messages if space allows
-        for msg in high_msgs:
-            if used_tokens + msg.token_count <= self.max_tokens:
-                kept_messages.append(msg)
-                used_tokens += msg.token_count
-        
-        # Add medium importance messages if space allows
-        for msg in medium_msgs:
-            if used_tokens + msg.token_count <= self.max_tokens:
-                kept_messages.append(msg)
-                used_tokens += msg.token_count
-        
-        # Sort by timestamp to maintain conversation order
-        kept_messages.sort(key=lambda x: x.timestamp)
-        
-        self.messages = kept_messages
-        self.current_tokens = used_tokens
+        # Evict the oldest messages of the least important class first;
+        # critical messages are never evicted
+        for importance in (MessageImportance.LOW, MessageImportance.MEDIUM, MessageImportance.HIGH):
+            while self.current_tokens > self.max_tokens:
+                removed = self.messages.evict_oldest(importance)
+                if removed is None:
+                    break
+                self.current_tokens -= removed.token_count
     
     def get_ollama_messages(self) -> List[Dict[str, str]]:
         """Get messages in Ollama format."""
+        self.apply_pending_summary()
         return [msg.to_ollama_message() for msg in self.messages]
     
     def get_context_summary(self) -> Dict[str, Any]:
@@ -267,12 +493,192 @@ class ContextWindow:
             "utilization": self.current_tokens / self.max_tokens,
             "strategy": self.strategy.value,
             "importance_distribution": {
-                importance.value: len([msg for msg in self.messages if msg.importance == importance])
+                importance.value: self.messages.importance_counts[importance]
                 for importance in MessageImportance
             }
         }
 
 
+class RollingSummarizer:
+    """
+    Background, incremental summarization of evicted context messages.
+    
+    Each batch of evicted messages is merged into the conversation's previous
+    summary instead of re-summarizing the whole history; batches evicted
+    while a summary is in flight are coalesced into the next call, and a
+    batch whose summary fails is folded into the next one. Results
+    are cached by a hash of the previous summary and the message range, so
+    replayed or forked conversations do not pay for the same summary twice.
+    """
+    
+    def __init__(self,
+                 summarize_fn: Callable[[Optional[str], List[ContextMessage]], str],
+                 cache_size: int = 256,
+                 max_workers: int = 1):
+        """
+        Initialize rolling summarizer.
+        
+        Args:
+            summarize_fn: Called as ``summarize_fn(previous_summary, messages)``
+                and returns the merged summary; usually backed by an LLM.
+            cache_size: Maximum number of cached summaries.
+            max_workers: Number of background summarization threads.
+        """
+        self.summarize_fn = summarize_fn
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._pending: Dict[int, Tuple[ContextWindow, List[ContextMessage], int]] = {}
+        # Batches whose summary failed, retried with the context's next batch
+        self._failed: Dict[int, Tuple[ContextWindow, List[ContextMessage]]] = {}
+        self._scheduled: set = set()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="context-summarizer")
+        self.stats = {
+            "batches_submitted": 0,
+            "batches_coalesced": 0,
+            "summaries_generated": 0,
+            "cache_hits": 0,
+            "failures": 0
+        }
+    
+    @staticmethod
+    def build_prompt(previous_summary: Optional[str], messages: List[ContextMessage]) -> str:
+        """
+        Build the prompt asking a model to fold messages into a summary.
+        
+        Args:
+            previous_summary: Summary of earlier messages, if any.
+            messages: Newly evicted messages, oldest first.
+            
+        Returns:
+            Summarization prompt.
+        """
+        transcript = "\n".join(f"{msg.role}: {msg.content}" for msg in messages)
+        if previous_summary:
+            return (
+                "Update the conversation summary below with the new messages. Keep decisions, "
+                "facts, open questions and anything the assistant was asked to remember; "
+                "drop small talk. Reply with the updated summary only.\n\n"
+                f"Current summary:\n{previous_summary}\n\nNew messages:\n{transcript}"
+            )
+        return (
+            "Summarize the conversation below. Keep decisions, facts, open questions and "
+            "anything the assistant was asked to remember; drop small talk. Reply with "
+            f"the summary only.\n\nMessages:\n{transcript}"
+        )
+    
+    def submit(self, context: ContextWindow, messages: List[ContextMessage], covered: int) -> None:
+        """
+        Queue evicted messages for summarization without blocking.
+        
+        Args:
+            context: Context window the messages were evicted from.
+            messages: Evicted messages, oldest first.
+            covered: Total number of messages evicted from the window so far.
+        """
+        key = id(context)
+        with self._lock:
+            self.stats["batches_submitted"] += 1
+            failed = self._failed.pop(key, None)
+            if failed is not None:
+                messages = failed[1] + list(messages)
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.stats["batches_coalesced"] += 1
+                self._pending[key] = (context, pending[1] + list(messages), covered)
+            else:
+                self._pending[key] = (context, list(messages), covered)
+            
+            if key not in self._scheduled:
+                self._scheduled.add(key)
+                self._executor.submit(self._drain, key)
+    
+    def _drain(self, key: int) -> None:
+        """Summarize a context's queued batches until none are left."""
+        while True:
+            with self._lock:
+                entry = self._pending.pop(key, None)
+                if entry is None:
+                    self._scheduled.discard(key)
+                    self._idle.notify_all()
+                    return
+            
+            context, messages, covered = entry
+            summary = self._summarize(context.latest_summary, messages)
+            if summary is not None:
+                context.deliver_summary(summary, covered)
+                continue
+            
+            # Keep the messages: a later summary must still cover them
+            with self._lock:
+                pending = self._pending.get(key)
+                if pending is not None:
+                    self._pending[key] = (context, messages + pending[1], pending[2])
+                else:
+                    self._failed[key] = (context, messages)
+    
+    def _summarize(self, previous_summary: Optional[str], messages: List[ContextMessage]) -> Optional[str]:
+        """Merge messages into the previous summary, consulting the cache first."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update((previous_summary or "").encode("utf-8"))
+        for msg in messages:
+            digest.update(b"\x00" + msg.role.encode("utf-8") + b"\x01" + msg.content.encode("utf-8"))
+        cache_key = digest.hexdigest()
+        
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                self.stats["cache_hits"] += 1
+                return cached
+        
+        try:
+            summary = self.summarize_fn(previous_summary, messages).strip()
+        except Exception as e:
+            logger.warning(f"Background summarization failed: {e}")
+            with self._lock:
+                self.stats["failures"] += 1
+            return None
+        if not summary:
+            return None
+        
+        with self._lock:
+            self.stats["summaries_generated"] += 1
+            self._cache[cache_key] = summary
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return summary
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued batches have been summarized.
+        
+        Args:
+            timeout: Maximum seconds to wait.
+            
+        Returns:
+            True if the summarizer is idle.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._scheduled, timeout)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get summarizer statistics."""
+        with self._lock:
+            return {
+                **self.stats,
+                "cache_entries": len(self._cache),
+                "pending_contexts": len(self._pending),
+                "failed_contexts": len(self._failed)
+            }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the background workers."""
+        self._executor.shutdown(wait=wait)
+
+
 class StreamingResponseHandler:
     """Handles streaming responses with real-time processing."""
     
@@ -289,6 +695,7 @@ class StreamingResponseHandler:
         self.start_time = None
         self.chunk_count = 0
         self.total_tokens = 0
+        self._token_counter = get_tokenizer_service().incremental()
         
     def start_streaming(self) -> None:
         """Start streaming session."""
@@ -297,6 +704,7 @@ class StreamingResponseHandler:
         self.complete_response = ""
         self.chunk_count = 0
         self.total_tokens = 0
+        self._token_counter.reset()
     
     def process_chunk(self, chunk: str) -> str:
         """
@@ -312,8 +720,8 @@ class StreamingResponseHandler:
         self.buffer += chunk
         self.complete_response += chunk
         
-        # Estimate tokens (rough approximation)
-        self.total_tokens = len(self.complete_response.split()) * 1.3
+        # Count only the newly appended text
+        self.total_tokens = self._token_counter.append(chunk)
         
         # Call callback if provided
         if self.callback:
@@ -350,7 +758,8 @@ class ContextManager:
     def __init__(self, 
                  default_strategy: ContextStrategy = ContextStrategy.SLIDING_WINDOW,
                  default_max_tokens: int = 4096,
-                 token_estimator: Optional[Callable[[str], int]] = None):
+                 token_estimator: Optional[Callable[[str], int]] = None,
+                 tokenizer: Optional[TokenizerService] = None):
         """
         Initialize context manager.
         
@@ -358,31 +767,41 @@ class ContextManager:
             default_strategy: Default context management strategy.
             default_max_tokens: Default maximum tokens for context.
             token_estimator: Optional function to estimate token count.
+                Overrides the tokenizer service when given.
+            tokenizer: Tokenizer service; defaults to the shared instance.
         """
         self.default_strategy = default_strategy
         self.default_max_tokens = default_max_tokens
+        self.tokenizer = tokenizer or get_tokenizer_service()
         self.token_estimator = token_estimator or self._estimate_tokens
         self.active_contexts: Dict[str, ContextWindow] = {}
         self._lock = threading.RLock()
     
-    def _estimate_tokens(self, text: str) -> int:
+    def _estimate_tokens(self, text: str, model_name: str = "") -> int:
         """
         Estimate token count for text.
         
         Args:
             text: Text to estimate tokens for.
+            model_name: Model whose tokenizer should be used.
             
         Returns:
             Estimated token count.
         """
-        # Simple approximation: ~1.3 tokens per word
-        return int(len(text.split()) * 1.3)
+        return self.tokenizer.count(text, model_name)
+    
+    def _count_tokens(self, texts: List[str], model_name: str) -> List[int]:
+        """Count tokens for message contents, batching through the tokenizer service."""
+        if self.token_estimator == self._estimate_tokens:
+            return self.tokenizer.count_batch(texts, model_name)
+        return [self.token_estimator(text) for text in texts]
     
     def create_context(self, 
                       conversation_id: str,
                       model_name: str,
                       max_tokens: Optional[int] = None,
-                      strategy: Optional[ContextStrategy] = None) -> ContextWindow:
+                      strategy: Optional[ContextStrategy] = None,
+                      summarizer: Optional[RollingSummarizer] = None) -> ContextWindow:
         """
         Create a new context window.
         
@@ -391,18 +810,22 @@ class ContextManager:
             model_name: Name of the model for context sizing.
             max_tokens: Maximum tokens for this context.
             strategy: Context management strategy.
+            summarizer: Background summarizer used by the summarize_oldest
+                strategy; without one, evicted messages get a placeholder.
             
         Returns:
             New context window.
         """
         with self._lock:
             context = ContextWindow(
-                messages=[],
+                messages=MessageBuffer(),
                 max_tokens=max_tokens or self.default_max_tokens,
                 current_tokens=0,
                 strategy=strategy or self.default_strategy,
                 model_name=model_name,
-                conversation_id=conversation_id
+                conversation_id=conversation_id,
+                summarizer=summarizer,
+                token_counter=lambda text: self._count_tokens([text], model_name)[0]
             )
             
             self.active_contexts[conversation_id] = context
@@ -450,7 +873,7 @@ class ContextManager:
                 content=content,
                 timestamp=datetime.now(),
                 importance=importance,
-                token_count=self.token_estimator(content),
+                token_count=self._count_tokens([content], context.model_name)[0],
                 message_id=f"{conversation_id}_{len(context.messages)}",
                 metadata=metadata
             )
@@ -458,10 +881,50 @@ class ContextManager:
             context.add_message(message)
             return message
     
+    def add_messages(self,
+                     conversation_id: str,
+                     messages: List[Dict[str, Any]]) -> List[ContextMessage]:
+        """
+        Add several messages to a context, counting their tokens in one batch.
+        
+        Args:
+            conversation_id: Conversation identifier.
+            messages: Dictionaries with ``role`` and ``content`` and optional
+                ``importance`` and ``metadata``.
+            
+        Returns:
+            Created context messages.
+        """
+        with self._lock:
+            context = self.active_contexts.get(conversation_id)
+            if not context:
+                raise ValueError(f"No context found for conversation {conversation_id}")
+            
+            token_counts = self._count_tokens(
+                [msg["content"] for msg in messages], context.model_name
+            )
+            created = []
+            for msg, token_count in zip(messages, token_counts):
+                message = ContextMessage(
+                    role=msg["role"],
+                    content=msg["content"],
+                    timestamp=datetime.now(),
+                    importance=msg.get("importance", MessageImportance.MEDIUM),
+                    token_count=token_count,
+                    message_id=f"{conversation_id}_{len(context.messages)}",
+                    metadata=msg.get("metadata")
+                )
+                context.add_message(message)
+                created.append(message)
+            return created
+    
     def get_messages_for_model(self, conversation_id: str) -> List[Dict[str, str]]:
         """
         Get messages formatted for model consumption.
         
+        Never waits on background summarization: a summary that has finished
+        is swapped in, one still in flight leaves the placeholder in place.
+        
         Args:
             conversation_id: Conversation identifier.
             
@@ -625,6 +1088,7 @@ class AsyncStreamingHandler:
         self.start_time = None
         self.chunk_count = 0
         self.total_tokens = 0
+        self._token_counter = get_tokenizer_service().incremental()
         self._lock = asyncio.Lock()
     
     async def start_streaming(self) -> None:
@@ -635,6 +1099,7 @@ class AsyncStreamingHandler:
             self.complete_response = ""
             self.chunk_count = 0
             self.total_tokens = 0
+            self._token_counter.reset()
     
     async def process_chunk(self, chunk: str) -> str:
         """Process streaming chunk asynchronously."""
@@ -642,7 +1107,7 @@ class AsyncStreamingHandler:
             self.chunk_count += 1
             self.buffer += chunk
             self.complete_response += chunk
-            self.total_tokens = len(self.complete_response.split()) * 1.3
+            self.total_tokens = self._token_counter.append(chunk)
             
             if self.callback:
                 try:
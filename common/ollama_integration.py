@@ -13,12 +13,26 @@ import time
 import logging
 import requests
 import hashlib
+import re
 import statistics
+import threading
+import asyncio
+import functools
+import weakref
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Any, Optional, Union, Tuple, Callable
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Iterator, AsyncIterator
 from enum import Enum
 from pathlib import Path
+from contextlib import asynccontextmanager
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
 # Import caching system
 try:
@@ -35,7 +49,8 @@ try:
         ContextStrategy, 
         MessageImportance,
         StreamingResponseHandler,
-        AsyncStreamingHandler
+        AsyncStreamingHandler,
+        RollingSummarizer
     )
     CONTEXT_MANAGEMENT_AVAILABLE = True
 except ImportError:
@@ -186,10 +201,29 @@ class TaskCharacteristics:
             requires_creativity=requires_creativity
         )
 
+def _performance_metrics(result: Dict[str, Any], model: str, execution_time: float) -> Dict[str, Any]:
+    """Build the performance block attached to non-streaming Ollama responses."""
+    prompt_tokens = result.get("prompt_eval_count", 0)
+    completion_tokens = result.get("eval_count", 0)
+    
+    return {
+        "execution_time_seconds": execution_time,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "tokens_per_second": completion_tokens / execution_time if execution_time > 0 else 0,
+        "model_name": model,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 class OllamaClient:
     """Enhanced client for interacting with Ollama API with health monitoring."""
     
-    def __init__(self, base_url: str = None, timeout: int = 30):
+    def __init__(self, base_url: str = None, timeout: int = 30,
+                 pool_size: int = 10, max_retries: int = 3,
+                 retry_backoff: float = 0.3, health_check_ttl: float = 60.0,
+                 models_cache_ttl: float = 30.0):
         """
         Initialize the Ollama client.
         
@@ -197,16 +231,66 @@ class OllamaClient:
             base_url: Base URL for the Ollama API. If None, uses the OLLAMA_BASE_URL
                       environment variable or defaults to http://localhost:11434.
             timeout: Request timeout in seconds.
+            pool_size: Maximum keep-alive connections kept open to the server.
+            max_retries: Retries for connection errors, plus 502/503/504 responses
+                         on idempotent methods (generation POSTs are not resent).
+            retry_backoff: Backoff factor between retries in seconds.
+            health_check_ttl: Seconds a health check result is reused.
+            models_cache_ttl: Seconds the model list from /api/tags is reused.
         """
         self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.api_url = f"{self.base_url}/api"
         self.timeout = timeout
+        self.pool_size = pool_size
+        self.health_check_ttl = health_check_ttl
+        self.models_cache_ttl = models_cache_ttl
+        
+        # One pooled keep-alive session shared by all calls on this client.
+        # Connect errors are retried for every method since nothing reached the
+        # server; status retries keep urllib3's idempotent-only default so a 5xx
+        # after a generation POST is not replayed at full cost.
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
         self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
         self.session.timeout = timeout
+        
+        self._stats_lock = threading.Lock()
+        self._request_count = 0
+        self._health_checks = 0
+        self._health_check_cache_hits = 0
+        self._models_cache: Optional[List[Dict[str, Any]]] = None
+        self._models_cache_time = 0.0
+        self._models_cache_hits = 0
+        self._models_cache_misses = 0
+        
         self._last_health_check = None
         self._is_healthy = False
         self._check_connection()
     
+    def _count_request(self) -> None:
+        """Count a request sent through the pooled session."""
+        with self._stats_lock:
+            self._request_count += 1
+    
+    def _record_health(self, healthy: bool) -> None:
+        """Record the outcome of a health probe."""
+        self._is_healthy = healthy
+        self._last_health_check = datetime.now()
+    
     def _check_connection(self) -> bool:
         """
         Check if Ollama is running and accessible.
@@ -215,15 +299,11 @@ class OllamaClient:
             True if connection is successful, raises an exception otherwise.
         """
         try:
-            response = self.session.get(f"{self.api_url}/tags", timeout=self.timeout)
-            response.raise_for_status()
-            self._is_healthy = True
-            self._last_health_check = datetime.now()
+            self._fetch_models()
             logger.info(f"Successfully connected to Ollama at {self.base_url}")
             return True
         except requests.exceptions.RequestException as e:
-            self._is_healthy = False
-            self._last_health_check = datetime.now()
+            self._record_health(False)
             logger.error(f"Failed to connect to Ollama at {self.base_url}: {e}")
             raise ConnectionError(f"Could not connect to Ollama at {self.base_url}. "
                                  "Make sure Ollama is running and accessible.")
@@ -241,18 +321,16 @@ class OllamaClient:
         # Skip if recently checked and not forced
         if not force and self._last_health_check:
             time_since_check = datetime.now() - self._last_health_check
-            if time_since_check < timedelta(minutes=1):
+            if time_since_check < timedelta(seconds=self.health_check_ttl):
+                with self._stats_lock:
+                    self._health_check_cache_hits += 1
                 return self._is_healthy
         
         try:
-            response = self.session.get(f"{self.api_url}/tags", timeout=5)
-            response.raise_for_status()
-            self._is_healthy = True
-            self._last_health_check = datetime.now()
+            self._fetch_models(timeout=5)
             return True
         except requests.exceptions.RequestException as e:
-            self._is_healthy = False
-            self._last_health_check = datetime.now()
+            self._record_health(False)
             logger.warning(f"Health check failed for Ollama at {self.base_url}: {e}")
             return False
     
@@ -265,31 +343,105 @@ class OllamaClient:
         """
         return self._is_healthy
     
-    def list_models(self) -> List[Dict[str, Any]]:
+    def _fetch_models(self, timeout: float = None) -> List[Dict[str, Any]]:
+        """
+        Fetch the model list from /api/tags and refresh the caches.
+        
+        A successful fetch doubles as a health check.
+        
+        Args:
+            timeout: Request timeout; defaults to the client timeout.
+            
+        Returns:
+            List of model information dictionaries.
+        """
+        with self._stats_lock:
+            self._health_checks += 1
+        self._count_request()
+        
+        response = self.session.get(f"{self.api_url}/tags", timeout=timeout or self.timeout)
+        response.raise_for_status()
+        models = response.json().get("models", [])
+        
+        # Enhance model information
+        checked_at = datetime.now().isoformat()
+        enhanced_models = []
+        for model in models:
+            enhanced_model = model.copy()
+            enhanced_model['health_status'] = 'available'
+            enhanced_model['last_health_check'] = checked_at
+            enhanced_models.append(enhanced_model)
+        
+        with self._stats_lock:
+            self._models_cache = enhanced_models
+            self._models_cache_time = time.monotonic()
+        self._record_health(True)
+        return enhanced_models
+    
+    def list_models(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """
         List all available models with enhanced information.
         
+        Args:
+            force_refresh: Bypass the model list cache.
+            
         Returns:
             List of model information dictionaries.
         """
+        with self._stats_lock:
+            cached = self._models_cache
+            fresh = (cached is not None and
+                     time.monotonic() - self._models_cache_time < self.models_cache_ttl)
+            if fresh and not force_refresh:
+                self._models_cache_hits += 1
+                return [model.copy() for model in cached]
+            self._models_cache_misses += 1
+        
         try:
-            response = self.session.get(f"{self.api_url}/tags", timeout=self.timeout)
-            response.raise_for_status()
-            models = response.json().get("models", [])
-            
-            # Enhance model information
-            enhanced_models = []
-            for model in models:
-                enhanced_model = model.copy()
-                enhanced_model['health_status'] = 'available'
-                enhanced_model['last_health_check'] = datetime.now().isoformat()
-                enhanced_models.append(enhanced_model)
-            
-            return enhanced_models
+            return self._fetch_models()
         except requests.exceptions.RequestException as e:
+            self._record_health(False)
             logger.error(f"Failed to list models: {e}")
             return []
     
+    def invalidate_models_cache(self) -> None:
+        """Drop the cached model list so the next lookup hits the server."""
+        with self._stats_lock:
+            self._models_cache = None
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool and client-side cache statistics.
+        
+        Returns:
+            Dictionary with pool usage, request counts and cache hit counters.
+        """
+        pools = []
+        for pool_key in list(self._adapter.poolmanager.pools.keys()):
+            pool = self._adapter.poolmanager.pools.get(pool_key)
+            if pool is None:
+                continue
+            pools.append({
+                "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle_connections": pool.pool.qsize() if pool.pool is not None else 0,
+                "max_size": self.pool_size
+            })
+        
+        with self._stats_lock:
+            return {
+                "pool_size": self.pool_size,
+                "pools": pools,
+                "requests_sent": self._request_count,
+                "health_checks": self._health_checks,
+                "health_check_cache_hits": self._health_check_cache_hits,
+                "models_cache_hits": self._models_cache_hits,
+                "models_cache_misses": self._models_cache_misses,
+                "is_healthy": self._is_healthy,
+                "last_health_check": self._last_health_check.isoformat() if self._last_health_check else None
+            }
+    
     def get_model_info(self, model_name: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed information about a specific model.
@@ -301,6 +453,7 @@ class OllamaClient:
             Model information dictionary or None if not found.
         """
         try:
+            self._count_request()
             response = self.session.post(
                 f"{self.api_url}/show",
                 json={"name": model_name},
@@ -323,6 +476,11 @@ class OllamaClient:
             True if model is available, False otherwise.
         """
         models = self.list_models()
+        if any(model['name'] == model_name for model in models):
+            return True
+        
+        # The cached list may predate a pull; refresh once before giving up
+        models = self.list_models(force_refresh=True)
         return any(model['name'] == model_name for model in models)
     
     def pull_model(self, model_name: str) -> bool:
@@ -337,11 +495,13 @@ class OllamaClient:
         """
         logger.info(f"Pulling model: {model_name}")
         try:
-            response = requests.post(
+            self._count_request()
+            response = self.session.post(
                 f"{self.api_url}/pull",
                 json={"name": model_name}
             )
             response.raise_for_status()
+            self.invalidate_models_cache()
             logger.info(f"Successfully pulled model: {model_name}")
             return True
         except requests.exceptions.RequestException as e:
@@ -392,6 +552,7 @@ class OllamaClient:
         start_time = time.time()
         
         try:
+            self._count_request()
             response = self.session.post(
                 f"{self.api_url}/generate",
                 json=payload,
@@ -406,20 +567,7 @@ class OllamaClient:
                 result = response.json()
                 
                 # Add enhanced performance metrics
-                execution_time = time.time() - start_time
-                prompt_tokens = result.get("prompt_eval_count", 0)
-                completion_tokens = result.get("eval_count", 0)
-                total_tokens = prompt_tokens + completion_tokens
-                
-                result["performance"] = {
-                    "execution_time_seconds": execution_time,
-                    "prompt_tokens": prompt_tokens,
-                    "completion_tokens": completion_tokens,
-                    "total_tokens": total_tokens,
-                    "tokens_per_second": completion_tokens / execution_time if execution_time > 0 else 0,
-                    "model_name": model,
-                    "timestamp": datetime.now().isoformat()
-                }
+                result["performance"] = _performance_metrics(result, model, time.time() - start_time)
                 
                 return result
                 
@@ -470,6 +618,7 @@ class OllamaClient:
         start_time = time.time()
         
         try:
+            self._count_request()
             response = self.session.post(
                 f"{self.api_url}/chat",
                 json=payload,
@@ -484,20 +633,7 @@ class OllamaClient:
                 result = response.json()
                 
                 # Add enhanced performance metrics
-                execution_time = time.time() - start_time
-                prompt_tokens = result.get("prompt_eval_count", 0)
-                completion_tokens = result.get("eval_count", 0)
-                total_tokens = prompt_tokens + completion_tokens
-                
-                result["performance"] = {
-                    "execution_time_seconds": execution_time,
-                    "prompt_tokens": prompt_tokens,
-                    "completion_tokens": completion_tokens,
-                    "total_tokens": total_tokens,
-                    "tokens_per_second": completion_tokens / execution_time if execution_time > 0 else 0,
-                    "model_name": model,
-                    "timestamp": datetime.now().isoformat()
-                }
+                result["performance"] = _performance_metrics(result, model, time.time() - start_time)
                 
                 return result
                 
@@ -550,6 +686,307 @@ class OllamaClient:
         }
 
 
+@dataclass
+class _LoopResources:
+    """HTTP session and per-model limiters bound to one event loop."""
+    session: Optional['aiohttp.ClientSession'] = None
+    semaphores: Dict[str, asyncio.Semaphore] = field(default_factory=dict)
+    waiting: Dict[str, int] = field(default_factory=dict)
+
+
+class AsyncOllamaClient:
+    """
+    Asyncio client for the Ollama API with bounded per-model concurrency.
+    
+    Mirrors OllamaClient.generate/chat plus streaming variants. Each model gets
+    its own semaphore, so when more than max_concurrent_per_model requests target
+    one model the rest wait in FIFO order instead of piling onto the server.
+    The session and semaphores are kept per running event loop, so one client
+    can serve successive asyncio.run() calls.
+    """
+    
+    def __init__(self, base_url: str = None, timeout: int = 30,
+                 max_concurrent_per_model: int = 4, pool_size: int = 10,
+                 models_cache_ttl: float = 30.0):
+        """
+        Initialize the async Ollama client.
+        
+        Args:
+            base_url: Base URL for the Ollama API. If None, uses the OLLAMA_BASE_URL
+                      environment variable or defaults to http://localhost:11434.
+            timeout: Request timeout in seconds for non-streaming calls.
+            max_concurrent_per_model: In-flight requests allowed per model.
+            pool_size: Maximum keep-alive connections kept open to the server.
+            models_cache_ttl: Seconds the model list from /api/tags is reused.
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for AsyncOllamaClient. Install with: pip install aiohttp")
+        
+        self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.api_url = f"{self.base_url}/api"
+        self.timeout = timeout
+        self.max_concurrent_per_model = max_concurrent_per_model
+        self.pool_size = pool_size
+        self.models_cache_ttl = models_cache_ttl
+        
+        # Sessions and semaphores bind to the loop they are created in, so each
+        # running loop gets its own set (e.g. successive asyncio.run() calls)
+        self._loop_resources: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources]' = (
+            weakref.WeakKeyDictionary()
+        )
+        self._models_cache: Optional[List[Dict[str, Any]]] = None
+        self._models_cache_time = 0.0
+    
+    async def __aenter__(self) -> 'AsyncOllamaClient':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    def _resources(self) -> '_LoopResources':
+        """Get the session and semaphores belonging to the running loop."""
+        loop = asyncio.get_running_loop()
+        resources = self._loop_resources.get(loop)
+        if resources is None:
+            # Loops that have been closed can no longer use their session
+            for stale in [l for l in self._loop_resources if l.is_closed()]:
+                del self._loop_resources[stale]
+            resources = _LoopResources()
+            self._loop_resources[loop] = resources
+        return resources
+    
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """Get the running loop's session, creating it on first use."""
+        resources = self._resources()
+        if resources.session is None or resources.session.closed:
+            resources.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return resources.session
+    
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        """Get the running loop's concurrency limiter for a model."""
+        semaphores = self._resources().semaphores
+        semaphore = semaphores.get(model)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_per_model)
+            semaphores[model] = semaphore
+        return semaphore
+    
+    @asynccontextmanager
+    async def _limited(self, model: str):
+        """Hold one of the model's concurrency slots, counting queued waiters."""
+        semaphore = self._semaphore(model)
+        waiting = self._resources().waiting
+        waiting[model] = waiting.get(model, 0) + 1
+        try:
+            await semaphore.acquire()
+        finally:
+            waiting[model] -= 1
+        
+        try:
+            yield
+        finally:
+            semaphore.release()
+    
+    async def close(self) -> None:
+        """Close the running loop's HTTP session."""
+        resources = self._loop_resources.pop(asyncio.get_running_loop(), None)
+        if resources is not None and resources.session is not None and not resources.session.closed:
+            await resources.session.close()
+    
+    def get_concurrency_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-model concurrency usage.
+        
+        Returns:
+            Mapping of model name to in-flight and queued request counts,
+            summed over the event loops using this client.
+        """
+        stats: Dict[str, Dict[str, int]] = {}
+        for resources in list(self._loop_resources.values()):
+            for model, semaphore in resources.semaphores.items():
+                entry = stats.setdefault(model, {"in_flight": 0, "queued": 0,
+                                                 "limit": self.max_concurrent_per_model})
+                entry["in_flight"] += self.max_concurrent_per_model - semaphore._value
+                entry["queued"] += resources.waiting.get(model, 0)
+        return stats
+    
+    async def list_models(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        List available models (cached for models_cache_ttl seconds).
+        
+        Args:
+            force_refresh: Bypass the model list cache.
+            
+        Returns:
+            List of model information dictionaries.
+        """
+        fresh = (self._models_cache is not None and
+                 time.monotonic() - self._models_cache_time < self.models_cache_ttl)
+        if fresh and not force_refresh:
+            return self._models_cache
+        
+        try:
+            async with self._get_session().get(f"{self.api_url}/tags") as response:
+                response.raise_for_status()
+                data = await response.json()
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to list models: {e}")
+            return []
+        
+        self._models_cache = data.get("models", [])
+        self._models_cache_time = time.monotonic()
+        return self._models_cache
+    
+    async def is_model_available(self, model_name: str) -> bool:
+        """
+        Check if a specific model is available.
+        
+        Args:
+            model_name: Name of the model to check.
+            
+        Returns:
+            True if model is available, False otherwise.
+        """
+        if any(model['name'] == model_name for model in await self.list_models()):
+            return True
+        
+        # The cached list may predate a pull; refresh once before giving up
+        return any(model['name'] == model_name for model in await self.list_models(force_refresh=True))
+    
+    async def _post(self, endpoint: str, model: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a non-streaming request under the model's concurrency limit."""
+        if not await self.is_model_available(model):
+            raise ValueError(f"Model {model} is not available. "
+                             f"Available models: {[m['name'] for m in await self.list_models()]}")
+        
+        async with self._limited(model):
+            start_time = time.time()
+            try:
+                async with self._get_session().post(f"{self.api_url}/{endpoint}", json=payload) as response:
+                    response.raise_for_status()
+                    result = await response.json()
+            except asyncio.TimeoutError:
+                logger.error(f"Timeout calling {endpoint} with model {model}")
+                raise TimeoutError(f"Request timed out after {self.timeout} seconds")
+        
+        result["performance"] = _performance_metrics(result, model, time.time() - start_time)
+        return result
+    
+    async def _stream(self, endpoint: str, model: str, payload: Dict[str, Any],
+                      content_of: Callable[[Dict[str, Any]], Optional[str]]) -> AsyncIterator[str]:
+        """POST a streaming request and yield text chunks under the model's limit."""
+        async with self._limited(model):
+            timeout = aiohttp.ClientTimeout(total=None)
+            async with self._get_session().post(f"{self.api_url}/{endpoint}", json=payload,
+                                                timeout=timeout) as response:
+                response.raise_for_status()
+                async for line in response.content:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        chunk_data = json.loads(line.decode('utf-8'))
+                    except json.JSONDecodeError:
+                        continue
+                    
+                    content = content_of(chunk_data)
+                    if content:
+                        yield content
+                    if chunk_data.get('done', False):
+                        break
+    
+    @staticmethod
+    def _options(temperature: float, max_tokens: int,
+                 stop_sequences: Optional[List[str]]) -> Dict[str, Any]:
+        """Build the sampling fields shared by generate and chat payloads."""
+        options = {"temperature": temperature, "num_predict": max_tokens}
+        if stop_sequences:
+            options["stop"] = stop_sequences
+        return options
+    
+    async def generate(self, model: str, prompt: str, system_prompt: str = None,
+                       temperature: float = 0.7, max_tokens: int = 2048,
+                       stop_sequences: List[str] = None) -> Dict[str, Any]:
+        """
+        Generate text using the specified model.
+        
+        Args:
+            model: Name of the model to use.
+            prompt: The prompt to generate from.
+            system_prompt: Optional system prompt.
+            temperature: Sampling temperature.
+            max_tokens: Maximum number of tokens to generate.
+            stop_sequences: Optional list of stop sequences.
+            
+        Returns:
+            Dictionary containing the generated text and metadata.
+        """
+        payload = {"model": model, "prompt": prompt, "stream": False,
+                   **self._options(temperature, max_tokens, stop_sequences)}
+        if system_prompt:
+            payload["system"] = system_prompt
+        
+        return await self._post("generate", model, payload)
+    
+    async def chat(self, model: str, messages: List[Dict[str, str]],
+                   temperature: float = 0.7, max_tokens: int = 2048,
+                   stop_sequences: List[str] = None) -> Dict[str, Any]:
+        """
+        Chat with the specified model.
+        
+        Args:
+            model: Name of the model to use.
+            messages: List of message dictionaries with 'role' and 'content' keys.
+            temperature: Sampling temperature.
+            max_tokens: Maximum number of tokens to generate.
+            stop_sequences: Optional list of stop sequences.
+            
+        Returns:
+            Dictionary containing the chat response and metadata.
+        """
+        payload = {"model": model, "messages": messages, "stream": False,
+                   **self._options(temperature, max_tokens, stop_sequences)}
+        
+        return await self._post("chat", model, payload)
+    
+    async def generate_stream(self, model: str, prompt: str, system_prompt: str = None,
+                              temperature: float = 0.7, max_tokens: int = 2048,
+                              stop_sequences: List[str] = None) -> AsyncIterator[str]:
+        """
+        Stream generated text chunks from the specified model.
+        
+        Yields:
+            Response chunks as they arrive.
+        """
+        payload = {"model": model, "prompt": prompt, "stream": True,
+                   **self._options(temperature, max_tokens, stop_sequences)}
+        if system_prompt:
+            payload["system"] = system_prompt
+        
+        async for chunk in self._stream("generate", model, payload,
+                                        lambda data: data.get("response")):
+            yield chunk
+    
+    async def chat_stream(self, model: str, messages: List[Dict[str, str]],
+                          temperature: float = 0.7, max_tokens: int = 2048,
+                          stop_sequences: List[str] = None) -> AsyncIterator[str]:
+        """
+        Stream chat response chunks from the specified model.
+        
+        Yields:
+            Response chunks as they arrive.
+        """
+        payload = {"model": model, "messages": messages, "stream": True,
+                   **self._options(temperature, max_tokens, stop_sequences)}
+        
+        async for chunk in self._stream("chat", model, payload,
+                                        lambda data: data.get("message", {}).get("content")):
+            yield chunk
+
+
 class EnhancedOllamaManager:
     """Enhanced manager for Ollama models with intelligent routing and performance profiling."""
     
@@ -1249,6 +1686,7 @@ class EnhancedAgentInterface:
             self.context_manager = get_context_manager()
             self.max_context_tokens = max_context_tokens or 4096
             self._active_conversations = {}
+            self._summarizer = None
         else:
             self.context_manager = None
             self.max_context_tokens = None
@@ -1260,32 +1698,36 @@ class EnhancedAgentInterface:
         # Ensure model is available
         self.ollama_manager.ensure_models_available([self.model])
     
-    def generate(self, prompt: str, system_prompt: str = None, task_type: TaskType = None, 
-                use_cache: bool = True, **kwargs) -> str:
+    def _select_models(self, routing_text: str, task_type: TaskType = None) -> Tuple[str, List[str]]:
         """
-        Generate text using intelligent model selection with caching and fallback.
+        Select the primary model and fallbacks for a request.
         
         Args:
-            prompt: The prompt to generate from.
-            system_prompt: Optional system prompt.
+            routing_text: Text used for intelligent routing.
             task_type: Optional task type for better model selection.
-            use_cache: Whether to use caching for this request.
-            **kwargs: Additional parameters to override defaults.
             
         Returns:
-            Generated text.
+            Tuple of (selected model, fallback models).
         """
-        # Get optimal model for this specific task
-        if task_type or len(prompt) > 100:  # Use intelligent routing for substantial prompts
-            recommendations = self.ollama_manager.get_model_recommendations(prompt, task_type)
-            selected_model = recommendations["primary_recommendation"]
-            fallback_models = recommendations["fallback_options"]
-        else:
-            selected_model = self.model
-            fallback_models = self.ollama_manager.get_fallback_models(
-                selected_model, 
-                task_type or TaskType.GENERAL
-            )
+        # Use intelligent routing for substantial prompts
+        if task_type or len(routing_text) > 100:
+            recommendations = self.ollama_manager.get_model_recommendations(routing_text, task_type)
+            return recommendations["primary_recommendation"], recommendations["fallback_options"]
+        
+        return self.model, self.ollama_manager.get_fallback_models(
+            self.model, 
+            task_type or TaskType.GENERAL
+        )
+    
+    def _prepare_generate(self, prompt: str, system_prompt: Optional[str],
+                          task_type: Optional[TaskType], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolve models, parameters and the cache context for a generate call.
+        
+        Returns:
+            Dictionary with models_to_try, params, system_prompt and cache_context.
+        """
+        selected_model, fallback_models = self._select_models(prompt, task_type)
         
         # Merge parameters
         params = self.params.copy()
@@ -1304,107 +1746,271 @@ class EnhancedAgentInterface:
             "role": self.role
         }
         
+        return {
+            "models_to_try": [selected_model] + fallback_models,
+            "params": params,
+            "system_prompt": system_prompt,
+            "cache_context": cache_context
+        }
+    
+    def _get_cached_generation(self, prompt: str, model_name: str,
+                               cache_context: Dict[str, Any], use_cache: bool) -> Optional[str]:
+        """Look up a generate response in the cache."""
+        if not (self.enable_caching and use_cache and self.cache):
+            return None
+        
+        cached_response = self.cache.get(prompt, model_name, cache_context)
+        if cached_response:
+            logger.debug(f"Cache hit for model {model_name}")
+            # Update cache stats for performance tracking
+            if hasattr(self.cache.stats, 'avg_response_time_cached'):
+                # This is a cache hit, so response time is near zero
+                self.cache.stats.avg_response_time_cached = 0.1  # Minimal time for cache lookup
+        return cached_response
+    
+    def _complete_generation(self, prompt: str, model_name: str, result: Dict[str, Any],
+                             execution_time: float, task_type: Optional[TaskType],
+                             params: Dict[str, Any], cache_context: Dict[str, Any],
+                             use_cache: bool) -> str:
+        """
+        Record performance and cache a successful generate result.
+        
+        Returns:
+            Generated text.
+        """
+        performance = result.get("performance", {})
+        tokens_per_second = performance.get("tokens_per_second", 0)
+        quality_score = self._assess_response_quality(result["response"])
+        
+        self.ollama_manager.record_performance(
+            model_name=model_name,
+            task_type=task_type or TaskType.GENERAL,
+            execution_time=execution_time,
+            tokens_per_second=tokens_per_second,
+            success=True,
+            quality_score=quality_score
+        )
+        
+        # Cache the response if caching is enabled
+        if use_cache and not params.get("stream", False):
+            self._cache_generation(prompt, model_name, result["response"], execution_time,
+                                   tokens_per_second, quality_score, task_type, cache_context)
+        
+        # Update cache stats for uncached response time
+        if self.enable_caching and self.cache:
+            # Update running average of uncached response times
+            current_avg = self.cache.stats.avg_response_time_uncached
+            total_requests = self.cache.stats.total_requests
+            if total_requests > 0:
+                self.cache.stats.avg_response_time_uncached = (
+                    (current_avg * (total_requests - 1) + execution_time) / total_requests
+                )
+            else:
+                self.cache.stats.avg_response_time_uncached = execution_time
+        
+        logger.info(f"Successfully generated text using model {model_name}")
+        return result["response"]
+    
+    def _cache_generation(self, prompt: str, model_name: str, response: str,
+                          execution_time: float, tokens_per_second: float,
+                          quality_score: float, task_type: Optional[TaskType],
+                          cache_context: Dict[str, Any], streamed: bool = False) -> None:
+        """Cache a generated response if caching is enabled and quality is good."""
+        if not (self.enable_caching and self.cache and quality_score >= 6.0):
+            return
+        
+        # Determine TTL based on task type and quality
+        ttl_seconds = self._calculate_cache_ttl(task_type, quality_score, execution_time)
+        
+        metadata = {
+            "execution_time": execution_time,
+            "tokens_per_second": tokens_per_second,
+            "quality_score": quality_score,
+            "task_type": task_type.value if task_type else None,
+            "role": self.role
+        }
+        if streamed:
+            metadata["streamed"] = True
+        
+        self.cache.put(
+            prompt=prompt,
+            model_name=model_name,
+            response=response,
+            metadata=metadata,
+            context=cache_context,
+            performance_score=quality_score,
+            ttl_seconds=ttl_seconds
+        )
+        
+        logger.debug(f"Cached response for model {model_name} with TTL {ttl_seconds}s")
+    
+    def _record_failure(self, model_name: str, task_type: Optional[TaskType]) -> None:
+        """Record a failed model call."""
+        self.ollama_manager.record_performance(
+            model_name=model_name,
+            task_type=task_type or TaskType.GENERAL,
+            execution_time=0,
+            tokens_per_second=0,
+            success=False,
+            quality_score=0
+        )
+    
+    def generate(self, prompt: str, system_prompt: str = None, task_type: TaskType = None, 
+                use_cache: bool = True, **kwargs) -> str:
+        """
+        Generate text using intelligent model selection with caching and fallback.
+        
+        Args:
+            prompt: The prompt to generate from.
+            system_prompt: Optional system prompt.
+            task_type: Optional task type for better model selection.
+            use_cache: Whether to use caching for this request.
+            **kwargs: Additional parameters to override defaults.
+            
+        Returns:
+            Generated text.
+        """
+        plan = self._prepare_generate(prompt, system_prompt, task_type, kwargs)
+        
         # Check cache first if enabled
-        if self.enable_caching and use_cache and self.cache:
-            cached_response = self.cache.get(prompt, selected_model, cache_context)
-            if cached_response:
-                logger.debug(f"Cache hit for model {selected_model}")
-                # Update cache stats for performance tracking
-                if hasattr(self.cache.stats, 'avg_response_time_cached'):
-                    # This is a cache hit, so response time is near zero
-                    self.cache.stats.avg_response_time_cached = 0.1  # Minimal time for cache lookup
-                return cached_response
+        cached_response = self._get_cached_generation(
+            prompt, plan["models_to_try"][0], plan["cache_context"], use_cache
+        )
+        if cached_response:
+            return cached_response
+        
+        def call_models() -> str:
+            return self._generate_with_fallback(prompt, plan, task_type, use_cache)
+        
+        # Identical concurrent misses share a single upstream call
+        if self._coalescing_enabled(use_cache):
+            return self.cache.coalesce(
+                prompt, plan["models_to_try"][0], call_models, plan["cache_context"]
+            )
+        return call_models()
+    
+    def _coalescing_enabled(self, use_cache: bool) -> bool:
+        """Whether misses should be deduplicated through the cache."""
+        return bool(self.enable_caching and use_cache and self.cache and
+                    hasattr(self.cache, "coalesce"))
+    
+    def _generate_with_fallback(self, prompt: str, plan: Dict[str, Any],
+                                task_type: Optional[TaskType], use_cache: bool) -> str:
+        """Call the primary model, then fallbacks, until one succeeds."""
+        params = plan["params"]
         
         # Try primary model first, then fallbacks
-        models_to_try = [selected_model] + fallback_models
         last_error = None
         
-        for model_name in models_to_try:
+        for model_name in plan["models_to_try"]:
             try:
                 start_time = time.time()
                 
                 result = self.client.generate(
                     model=model_name,
                     prompt=prompt,
-                    system_prompt=system_prompt,
+                    system_prompt=plan["system_prompt"],
                     temperature=params.get("temperature", 0.7),
                     max_tokens=params.get("max_tokens", 2048),
                     stop_sequences=params.get("stop_sequences"),
                     stream=params.get("stream", False)
                 )
                 
-                # Record performance
-                execution_time = time.time() - start_time
-                performance = result.get("performance", {})
-                tokens_per_second = performance.get("tokens_per_second", 0)
-                quality_score = self._assess_response_quality(result["response"])
-                
-                self.ollama_manager.record_performance(
-                    model_name=model_name,
-                    task_type=task_type or TaskType.GENERAL,
-                    execution_time=execution_time,
-                    tokens_per_second=tokens_per_second,
-                    success=True,
-                    quality_score=quality_score
+                return self._complete_generation(
+                    prompt, model_name, result, time.time() - start_time,
+                    task_type, params, plan["cache_context"], use_cache
                 )
                 
-                # Cache the response if caching is enabled and response quality is good
-                if (self.enable_caching and use_cache and self.cache and 
-                    quality_score >= 6.0 and not params.get("stream", False)):
-                    
-                    # Determine TTL based on task type and quality
-                    ttl_seconds = self._calculate_cache_ttl(task_type, quality_score, execution_time)
-                    
-                    self.cache.put(
-                        prompt=prompt,
-                        model_name=model_name,
-                        response=result["response"],
-                        metadata={
-                            "execution_time": execution_time,
-                            "tokens_per_second": tokens_per_second,
-                            "quality_score": quality_score,
-                            "task_type": task_type.value if task_type else None,
-                            "role": self.role
-                        },
-                        context=cache_context,
-                        performance_score=quality_score,
-                        ttl_seconds=ttl_seconds
-                    )
-                    
-                    logger.debug(f"Cached response for model {model_name} with TTL {ttl_seconds}s")
-                
-                # Update cache stats for uncached response time
-                if self.enable_caching and self.cache:
-                    # Update running average of uncached response times
-                    current_avg = self.cache.stats.avg_response_time_uncached
-                    total_requests = self.cache.stats.total_requests
-                    if total_requests > 0:
-                        self.cache.stats.avg_response_time_uncached = (
-                            (current_avg * (total_requests - 1) + execution_time) / total_requests
-                        )
-                    else:
-                        self.cache.stats.avg_response_time_uncached = execution_time
-                
-                logger.info(f"Successfully generated text using model {model_name}")
-                return result["response"]
-                
             except Exception as e:
                 last_error = e
                 logger.warning(f"Failed to generate with model {model_name}: {e}")
+                self._record_failure(model_name, task_type)
+                continue
+        
+        # If all models failed, raise the last error
+        raise RuntimeError(f"All models failed. Last error: {last_error}")
+    
+    @property
+    def async_client(self) -> 'AsyncOllamaClient':
+        """Async client sharing this agent's server settings (created lazily)."""
+        if getattr(self, "_async_client", None) is None:
+            self._async_client = AsyncOllamaClient(
+                base_url=getattr(self.client, "base_url", None),
+                timeout=getattr(self.client, "timeout", 30)
+            )
+        return self._async_client
+    
+    async def _run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run cache and performance-tracker disk I/O in the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(fn, *args))
+    
+    async def agenerate(self, prompt: str, system_prompt: str = None, task_type: TaskType = None,
+                        use_cache: bool = True, **kwargs) -> str:
+        """
+        Async counterpart of generate using AsyncOllamaClient.
+        
+        Shares the cache, model routing and performance recording with generate.
+        
+        Args:
+            prompt: The prompt to generate from.
+            system_prompt: Optional system prompt.
+            task_type: Optional task type for better model selection.
+            use_cache: Whether to use caching for this request.
+            **kwargs: Additional parameters to override defaults.
+            
+        Returns:
+            Generated text.
+        """
+        plan = self._prepare_generate(prompt, system_prompt, task_type, kwargs)
+        
+        cached_response = await self._run_blocking(
+            self._get_cached_generation,
+            prompt, plan["models_to_try"][0], plan["cache_context"], use_cache
+        )
+        if cached_response:
+            return cached_response
+        
+        async def call_models() -> str:
+            return await self._agenerate_with_fallback(prompt, plan, task_type, use_cache)
+        
+        if self._coalescing_enabled(use_cache):
+            return await self.cache.acoalesce(
+                prompt, plan["models_to_try"][0], call_models, plan["cache_context"]
+            )
+        return await call_models()
+    
+    async def _agenerate_with_fallback(self, prompt: str, plan: Dict[str, Any],
+                                       task_type: Optional[TaskType], use_cache: bool) -> str:
+        """Async counterpart of _generate_with_fallback."""
+        params = plan["params"]
+        last_error = None
+        
+        for model_name in plan["models_to_try"]:
+            try:
+                start_time = time.time()
                 
-                # Record failure
-                self.ollama_manager.record_performance(
-                    model_name=model_name,
-                    task_type=task_type or TaskType.GENERAL,
-                    execution_time=0,
-                    tokens_per_second=0,
-                    success=False,
-                    quality_score=0
+                result = await self.async_client.generate(
+                    model=model_name,
+                    prompt=prompt,
+                    system_prompt=plan["system_prompt"],
+                    temperature=params.get("temperature", 0.7),
+                    max_tokens=params.get("max_tokens", 2048),
+                    stop_sequences=params.get("stop_sequences")
+                )
+                
+                return await self._run_blocking(
+                    self._complete_generation,
+                    prompt, model_name, result, time.time() - start_time,
+                    task_type, params, plan["cache_context"], use_cache
                 )
                 
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Failed to generate with model {model_name}: {e}")
+                await self._run_blocking(self._record_failure, model_name, task_type)
                 continue
         
-        # If all models failed, raise the last error
         raise RuntimeError(f"All models failed. Last error: {last_error}")
     
     def _calculate_cache_ttl(self, task_type: Optional[TaskType], quality_score: float, 
@@ -1485,52 +2091,74 @@ class EnhancedAgentInterface:
         
         return max(0.0, min(10.0, score))
     
+    def _replay_cached_stream(self, response: str, streaming_handler: 'StreamingResponseHandler',
+                              pacing_seconds: float = 0.0) -> Iterator[str]:
+        """
+        Replay a cached response as a stream of word-sized chunks.
+        
+        Chunks go through the streaming handler, so callbacks fire exactly as
+        they would for a live stream. The first chunk is yielded immediately.
+        
+        Args:
+            response: Cached response text.
+            streaming_handler: Handler that tracks chunks and invokes the callback.
+            pacing_seconds: Optional delay between chunks to mimic live output.
+            
+        Yields:
+            Response chunks.
+        """
+        for index, chunk in enumerate(re.findall(r'\S+\s*|\s+', response)):
+            if pacing_seconds and index:
+                time.sleep(pacing_seconds)
+            yield streaming_handler.process_chunk(chunk)
+        
+        streaming_handler.finish_streaming()
+    
     def generate_streaming(self, prompt: str, system_prompt: str = None, 
                           task_type: TaskType = None, callback: Callable[[str], None] = None,
+                          use_cache: bool = True, replay_pacing: float = 0.0,
                           **kwargs) -> Iterator[str]:
         """
         Generate text with streaming response.
         
+        Completed streams are cached like generate responses (and share their
+        entries); cache hits are replayed as a chunked stream.
+        
         Args:
             prompt: The prompt to generate from.
             system_prompt: Optional system prompt.
             task_type: Optional task type for better model selection.
             callback: Optional callback for each chunk.
+            use_cache: Whether to use caching for this request.
+            replay_pacing: Seconds to wait between chunks when replaying a cache hit.
             **kwargs: Additional parameters.
             
         Yields:
             Response chunks as they arrive.
         """
-        # Get optimal model for this task
-        if task_type or len(prompt) > 100:
-            recommendations = self.ollama_manager.get_model_recommendations(prompt, task_type)
-            selected_model = recommendations["primary_recommendation"]
-            fallback_models = recommendations["fallback_options"]
-        else:
-            selected_model = self.model
-            fallback_models = self.ollama_manager.get_fallback_models(
-                selected_model, 
-                task_type or TaskType.GENERAL
-            )
-        
-        # Merge parameters
-        params = self.params.copy()
-        params.update(kwargs)
+        plan = self._prepare_generate(prompt, system_prompt, task_type, kwargs)
+        params = plan["params"]
         params["stream"] = True  # Force streaming
-        
-        # Add role-specific system prompt if not provided
-        if not system_prompt and "system_prompt" in params:
-            system_prompt = params["system_prompt"]
+        system_prompt = plan["system_prompt"]
         
         # Initialize streaming handler
         streaming_handler = StreamingResponseHandler(callback)
         streaming_handler.start_streaming()
         
+        # Replay cache hits without touching the model
+        cached_response = self._get_cached_generation(
+            prompt, plan["models_to_try"][0], plan["cache_context"], use_cache
+        )
+        if cached_response:
+            yield from self._replay_cached_stream(cached_response, streaming_handler, replay_pacing)
+            return
+        
         # Try primary model first, then fallbacks
-        models_to_try = [selected_model] + fallback_models
         last_error = None
         
-        for model_name in models_to_try:
+        for model_name in plan["models_to_try"]:
+            # A fallback after partial output would cache a spliced response
+            cacheable = streaming_handler.chunk_count == 0
             try:
                 start_time = time.time()
                 
@@ -1551,6 +2179,7 @@ class EnhancedAgentInterface:
                 response.raise_for_status()
                 
                 # Process streaming response
+                completed = False
                 for line in response.iter_lines():
                     if line:
                         try:
@@ -1561,38 +2190,38 @@ class EnhancedAgentInterface:
                                 yield processed_chunk
                             
                             if chunk_data.get('done', False):
+                                completed = True
                                 break
                         except json.JSONDecodeError:
                             continue
                 
                 # Record successful streaming
                 stats = streaming_handler.finish_streaming()
+                quality_score = self._assess_response_quality(stats["complete_response"])
                 self.ollama_manager.record_performance(
                     model_name=model_name,
                     task_type=task_type or TaskType.GENERAL,
                     execution_time=stats["duration_seconds"],
                     tokens_per_second=stats["tokens_per_second"],
                     success=True,
-                    quality_score=self._assess_response_quality(stats["complete_response"])
+                    quality_score=quality_score
                 )
                 
+                # Only complete streams are written to the cache
+                if use_cache and completed and cacheable:
+                    self._cache_generation(
+                        prompt, model_name, stats["complete_response"], time.time() - start_time,
+                        stats["tokens_per_second"], quality_score, task_type,
+                        plan["cache_context"], streamed=True
+                    )
+                
                 logger.info(f"Successfully completed streaming generation with model {model_name}")
                 return
                 
             except Exception as e:
                 last_error = e
                 logger.warning(f"Failed to stream with model {model_name}: {e}")
-                
-                # Record failure
-                self.ollama_manager.record_performance(
-                    model_name=model_name,
-                    task_type=task_type or TaskType.GENERAL,
-                    execution_time=0,
-                    tokens_per_second=0,
-                    success=False,
-                    quality_score=0
-                )
-                
+                self._record_failure(model_name, task_type)
                 continue
         
         # If all models failed, raise the last error
@@ -1618,12 +2247,14 @@ class EnhancedAgentInterface:
         if conversation_id is None:
             conversation_id = f"{self.role}_{int(time.time())}"
         
-        # Create context window
+        # Create context window; summarizing contexts get an LLM-backed summarizer
+        strategy = context_strategy or ContextStrategy.SLIDING_WINDOW
         context = self.context_manager.create_context(
             conversation_id=conversation_id,
             model_name=self.model,
             max_tokens=max_tokens or self.max_context_tokens,
-            strategy=context_strategy or ContextStrategy.SLIDING_WINDOW
+            strategy=strategy,
+            summarizer=self._get_summarizer() if strategy == ContextStrategy.SUMMARIZE_OLDEST else None
         )
         
         self._active_conversations[conversation_id] = {
@@ -1635,6 +2266,29 @@ class EnhancedAgentInterface:
         logger.info(f"Started conversation {conversation_id} with context management")
         return conversation_id
     
+    def _get_summarizer(self) -> 'RollingSummarizer':
+        """Get the background summarizer shared by this agent's conversations."""
+        if self._summarizer is None:
+            self._summarizer = RollingSummarizer(self.summarize_messages)
+        return self._summarizer
+    
+    def summarize_messages(self, previous_summary: Optional[str], messages: List[Any]) -> str:
+        """
+        Fold conversation messages into a running summary.
+        
+        Args:
+            previous_summary: Summary of earlier messages, if any.
+            messages: Context messages to add to the summary.
+            
+        Returns:
+            Updated summary.
+        """
+        return self.generate(
+            RollingSummarizer.build_prompt(previous_summary, messages),
+            system_prompt="You write concise, factual summaries of conversations for later reference.",
+            task_type=TaskType.DOCUMENTATION
+        )
+    
     def chat_with_context(self, conversation_id: str, message: str,
                          task_type: TaskType = None, importance: MessageImportance = None,
                          use_cache: bool = True, **kwargs) -> str:
@@ -1683,6 +2337,7 @@ class EnhancedAgentInterface:
                                    task_type: TaskType = None, 
                                    importance: MessageImportance = None,
                                    callback: Callable[[str], None] = None,
+                                   use_cache: bool = True,
                                    **kwargs) -> Iterator[str]:
         """
         Chat with streaming and context management.
@@ -1693,7 +2348,8 @@ class EnhancedAgentInterface:
             task_type: Optional task type.
             importance: Message importance level.
             callback: Optional callback for chunks.
-            **kwargs: Additional parameters.
+            use_cache: Whether to use caching (short conversations only, as in chat).
+            **kwargs: Additional parameters (e.g. replay_pacing).
             
         Yields:
             Response chunks as they arrive.
@@ -1721,6 +2377,7 @@ class EnhancedAgentInterface:
             prompt=conversation_text, 
             task_type=task_type, 
             callback=callback,
+            use_cache=use_cache and len(messages) <= 5,
             **kwargs
         ):
             complete_response += chunk
@@ -1797,19 +2454,13 @@ class EnhancedAgentInterface:
         logger.info(f"Ended conversation {conversation_id}")
         return context_cleared
     
-    def chat(self, messages: List[Dict[str, str]], task_type: TaskType = None, 
-            use_cache: bool = True, **kwargs) -> str:
+    def _prepare_chat(self, messages: List[Dict[str, str]], task_type: Optional[TaskType],
+                      kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Chat with intelligent model selection, caching, and fallback.
+        Resolve models, parameters and the cache key text for a chat call.
         
-        Args:
-            messages: List of message dictionaries with 'role' and 'content' keys.
-            task_type: Optional task type for better model selection.
-            use_cache: Whether to use caching for this request.
-            **kwargs: Additional parameters to override defaults.
-            
         Returns:
-            Model's response text.
+            Dictionary with conversation_text, models_to_try, params and cache_context.
         """
         # Extract user content for model recommendation and caching
         user_content = " ".join([msg["content"] for msg in messages if msg["role"] == "user"])
@@ -1818,16 +2469,7 @@ class EnhancedAgentInterface:
         conversation_text = " ".join([f"{msg['role']}: {msg['content']}" for msg in messages[-3:]])  # Last 3 messages
         
         # Get optimal model for this conversation
-        if task_type or len(user_content) > 100:
-            recommendations = self.ollama_manager.get_model_recommendations(user_content, task_type)
-            selected_model = recommendations["primary_recommendation"]
-            fallback_models = recommendations["fallback_options"]
-        else:
-            selected_model = self.model
-            fallback_models = self.ollama_manager.get_fallback_models(
-                selected_model, 
-                task_type or TaskType.GENERAL
-            )
+        selected_model, fallback_models = self._select_models(user_content, task_type)
         
         # Merge parameters
         params = self.params.copy()
@@ -1842,18 +2484,122 @@ class EnhancedAgentInterface:
             "conversation_length": len(messages)
         }
         
+        return {
+            "conversation_text": conversation_text,
+            "models_to_try": [selected_model] + fallback_models,
+            "params": params,
+            "cache_context": cache_context
+        }
+    
+    def _get_cached_chat(self, plan: Dict[str, Any], use_cache: bool) -> Optional[str]:
+        """Look up a chat response in the cache (keyed by conversation text)."""
+        if not (self.enable_caching and use_cache and self.cache):
+            return None
+        
+        selected_model = plan["models_to_try"][0]
+        cached_response = self.cache.get(plan["conversation_text"], selected_model, plan["cache_context"])
+        if cached_response:
+            logger.debug(f"Cache hit for chat with model {selected_model}")
+        return cached_response
+    
+    def _complete_chat(self, messages: List[Dict[str, str]], model_name: str,
+                       result: Dict[str, Any], execution_time: float,
+                       task_type: Optional[TaskType], plan: Dict[str, Any],
+                       use_cache: bool) -> str:
+        """
+        Record performance and cache a successful chat result.
+        
+        Returns:
+            Model's response text.
+        """
+        params = plan["params"]
+        performance = result.get("performance", {})
+        tokens_per_second = performance.get("tokens_per_second", 0)
+        
+        response_content = result.get("message", {}).get("content", result.get("response", ""))
+        quality_score = self._assess_response_quality(response_content)
+        
+        self.ollama_manager.record_performance(
+            model_name=model_name,
+            task_type=task_type or TaskType.GENERAL,
+            execution_time=execution_time,
+            tokens_per_second=tokens_per_second,
+            success=True,
+            quality_score=quality_score
+        )
+        
+        # Cache the response if caching is enabled and response quality is good
+        # Note: Chat responses are cached more conservatively due to context sensitivity
+        if (self.enable_caching and use_cache and self.cache and 
+            quality_score >= 7.0 and not params.get("stream", False) and
+            len(messages) <= 5):  # Only cache short conversations
+            
+            # Shorter TTL for chat responses due to context sensitivity
+            ttl_seconds = self._calculate_cache_ttl(task_type, quality_score, execution_time) // 2
+            
+            self.cache.put(
+                prompt=plan["conversation_text"],
+                model_name=model_name,
+                response=response_content,
+                metadata={
+                    "execution_time": execution_time,
+                    "tokens_per_second": tokens_per_second,
+                    "quality_score": quality_score,
+                    "task_type": task_type.value if task_type else None,
+                    "role": self.role,
+                    "conversation_length": len(messages),
+                    "is_chat": True
+                },
+                context=plan["cache_context"],
+                performance_score=quality_score,
+                ttl_seconds=ttl_seconds
+            )
+            
+            logger.debug(f"Cached chat response for model {model_name} with TTL {ttl_seconds}s")
+        
+        logger.info(f"Successfully completed chat using model {model_name}")
+        return response_content
+    
+    def chat(self, messages: List[Dict[str, str]], task_type: TaskType = None, 
+            use_cache: bool = True, **kwargs) -> str:
+        """
+        Chat with intelligent model selection, caching, and fallback.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys.
+            task_type: Optional task type for better model selection.
+            use_cache: Whether to use caching for this request.
+            **kwargs: Additional parameters to override defaults.
+            
+        Returns:
+            Model's response text.
+        """
+        plan = self._prepare_chat(messages, task_type, kwargs)
+        
         # Check cache first if enabled (use conversation text as prompt)
-        if self.enable_caching and use_cache and self.cache:
-            cached_response = self.cache.get(conversation_text, selected_model, cache_context)
-            if cached_response:
-                logger.debug(f"Cache hit for chat with model {selected_model}")
-                return cached_response
+        cached_response = self._get_cached_chat(plan, use_cache)
+        if cached_response:
+            return cached_response
+        
+        def call_models() -> str:
+            return self._chat_with_fallback(messages, plan, task_type, use_cache)
+        
+        # Identical concurrent misses share a single upstream call
+        if self._coalescing_enabled(use_cache):
+            return self.cache.coalesce(
+                plan["conversation_text"], plan["models_to_try"][0], call_models, plan["cache_context"]
+            )
+        return call_models()
+    
+    def _chat_with_fallback(self, messages: List[Dict[str, str]], plan: Dict[str, Any],
+                            task_type: Optional[TaskType], use_cache: bool) -> str:
+        """Call the primary model, then fallbacks, until one succeeds."""
+        params = plan["params"]
         
         # Try primary model first, then fallbacks
-        models_to_try = [selected_model] + fallback_models
         last_error = None
         
-        for model_name in models_to_try:
+        for model_name in plan["models_to_try"]:
             try:
                 start_time = time.time()
                 
@@ -1866,72 +2612,81 @@ class EnhancedAgentInterface:
                     stream=params.get("stream", False)
                 )
                 
-                # Record performance
-                execution_time = time.time() - start_time
-                performance = result.get("performance", {})
-                tokens_per_second = performance.get("tokens_per_second", 0)
-                
-                response_content = result.get("message", {}).get("content", result.get("response", ""))
-                quality_score = self._assess_response_quality(response_content)
-                
-                self.ollama_manager.record_performance(
-                    model_name=model_name,
-                    task_type=task_type or TaskType.GENERAL,
-                    execution_time=execution_time,
-                    tokens_per_second=tokens_per_second,
-                    success=True,
-                    quality_score=quality_score
+                return self._complete_chat(
+                    messages, model_name, result, time.time() - start_time,
+                    task_type, plan, use_cache
                 )
                 
-                # Cache the response if caching is enabled and response quality is good
-                # Note: Chat responses are cached more conservatively due to context sensitivity
-                if (self.enable_caching and use_cache and self.cache and 
-                    quality_score >= 7.0 and not params.get("stream", False) and
-                    len(messages) <= 5):  # Only cache short conversations
-                    
-                    # Shorter TTL for chat responses due to context sensitivity
-                    ttl_seconds = self._calculate_cache_ttl(task_type, quality_score, execution_time) // 2
-                    
-                    self.cache.put(
-                        prompt=conversation_text,
-                        model_name=model_name,
-                        response=response_content,
-                        metadata={
-                            "execution_time": execution_time,
-                            "tokens_per_second": tokens_per_second,
-                            "quality_score": quality_score,
-                            "task_type": task_type.value if task_type else None,
-                            "role": self.role,
-                            "conversation_length": len(messages),
-                            "is_chat": True
-                        },
-                        context=cache_context,
-                        performance_score=quality_score,
-                        ttl_seconds=ttl_seconds
-                    )
-                    
-                    logger.debug(f"Cached chat response for model {model_name} with TTL {ttl_seconds}s")
-                
-                logger.info(f"Successfully completed chat using model {model_name}")
-                return response_content
-                
             except Exception as e:
                 last_error = e
                 logger.warning(f"Failed to chat with model {model_name}: {e}")
+                self._record_failure(model_name, task_type)
+                continue
+        
+        # If all models failed, raise the last error
+        raise RuntimeError(f"All models failed. Last error: {last_error}")
+    
+    async def achat(self, messages: List[Dict[str, str]], task_type: TaskType = None,
+                    use_cache: bool = True, **kwargs) -> str:
+        """
+        Async counterpart of chat using AsyncOllamaClient.
+        
+        Shares the cache, model routing and performance recording with chat.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys.
+            task_type: Optional task type for better model selection.
+            use_cache: Whether to use caching for this request.
+            **kwargs: Additional parameters to override defaults.
+            
+        Returns:
+            Model's response text.
+        """
+        plan = self._prepare_chat(messages, task_type, kwargs)
+        
+        cached_response = await self._run_blocking(self._get_cached_chat, plan, use_cache)
+        if cached_response:
+            return cached_response
+        
+        async def call_models() -> str:
+            return await self._achat_with_fallback(messages, plan, task_type, use_cache)
+        
+        if self._coalescing_enabled(use_cache):
+            return await self.cache.acoalesce(
+                plan["conversation_text"], plan["models_to_try"][0], call_models, plan["cache_context"]
+            )
+        return await call_models()
+    
+    async def _achat_with_fallback(self, messages: List[Dict[str, str]], plan: Dict[str, Any],
+                                   task_type: Optional[TaskType], use_cache: bool) -> str:
+        """Async counterpart of _chat_with_fallback."""
+        params = plan["params"]
+        last_error = None
+        
+        for model_name in plan["models_to_try"]:
+            try:
+                start_time = time.time()
                 
-                # Record failure
-                self.ollama_manager.record_performance(
-                    model_name=model_name,
-                    task_type=task_type or TaskType.GENERAL,
-                    execution_time=0,
-                    tokens_per_second=0,
-                    success=False,
-                    quality_score=0
+                result = await self.async_client.chat(
+                    model=model_name,
+                    messages=messages,
+                    temperature=params.get("temperature", 0.7),
+                    max_tokens=params.get("max_tokens", 2048),
+                    stop_sequences=params.get("stop_sequences")
                 )
                 
+                return await self._run_blocking(
+                    self._complete_chat,
+                    messages, model_name, result, time.time() - start_time,
+                    task_type, plan, use_cache
+                )
+                
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Failed to chat with model {model_name}: {e}")
+                await self._run_blocking(self._record_failure, model_name, task_type)
                 continue
         
-        # If all models failed, raise the last error
         raise RuntimeError(f"All models failed. Last error: {last_error}")
     
     def get_model_status(self) -> Dict[str, Any]:
@@ -1952,6 +2707,10 @@ class EnhancedAgentInterface:
             "context_management_enabled": self.enable_context_management
         }
         
+        # Add connection pool statistics from the shared client
+        if hasattr(self.client, "get_pool_stats"):
+            status["connection_pool"] = self.client.get_pool_stats()
+        
         # Add cache statistics if caching is enabled
         if self.enable_caching and self.cache:
             cache_stats = self.cache.get_stats()
@@ -1960,7 +2719,8 @@ class EnhancedAgentInterface:
                 "total_requests": cache_stats.total_requests,
                 "cache_size": cache_stats.cache_size,
                 "total_size_mb": cache_stats.total_size_bytes / (1024 * 1024),
-                "performance_improvement": cache_stats.performance_improvement
+                "performance_improvement": cache_stats.performance_improvement,
+                "coalesced_requests": cache_stats.coalesced_requests
             }
         
         # Add context management statistics if enabled
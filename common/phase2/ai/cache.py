@@ -1,6 +1,7 @@
 """Embedding Cache for Phase 2 AI Services
 
-Provides LRU cache with disk persistence for embeddings.
+Provides LRU cache with disk persistence for embeddings, and an in-memory
+LRU cache for evaluation results.
 """
 
 import os
@@ -8,10 +9,13 @@ import json
 import hashlib
 import pickle
 import time
-from typing import List, Optional, Dict, Any
+import threading
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 from collections import OrderedDict
 
+from ..diff_entities import EvaluationResult
+
 
 class EmbeddingCache:
     """LRU cache for embeddings with disk persistence."""
@@ -205,6 +209,68 @@ class EmbeddingCache:
         }
 
 
+class EvaluationCache:
+    """
+    In-memory LRU cache of evaluation results.
+    
+    Keyed by (source hash, target hash, method, model), so repeated diffs
+    with identical content reuse an earlier embedding or LLM judgment.
+    Hits are returned as copies marked ``cached`` with zero cost and latency,
+    since serving them spends nothing.
+    """
+    
+    def __init__(self, max_items: int = 1024):
+        self.max_items = max_items
+        self._results: OrderedDict[Tuple[str, str, str, str], EvaluationResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash artifact content for use in cache keys."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[EvaluationResult]:
+        """Get a cached result, or None on a miss."""
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+        
+        cached = result.model_copy(deep=True, update={"cost": 0.0, "latency_ms": 0})
+        cached.metadata["cached"] = True
+        return cached
+    
+    def put(self, key: Tuple[str, str, str, str], result: EvaluationResult) -> None:
+        """Store a result, evicting the least recently used beyond max_items."""
+        with self._lock:
+            self._results[key] = result.model_copy(deep=True)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_items:
+                self._results.popitem(last=False)
+    
+    def clear(self):
+        """Clear all cached results."""
+        with self._lock:
+            self._results.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "items": len(self._results),
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
 def embed_cosine(embed_client, cache: EmbeddingCache, text1: str, text2: str, model: str = "default") -> float:
     """Compute cosine similarity between two texts using cached embeddings."""
     import math
@@ -6,11 +6,14 @@ Provides semantic equivalence evaluation using multiple methods.
 import json
 import time
 import re
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 
 from .clients import LLMClient, EmbeddingClient
-from .cache import EmbeddingCache, embed_cosine
+from .cache import EmbeddingCache, EvaluationCache, embed_cosine
+from .decision_rules import DecisionRuleEngine, decision_engine
 from .metrics import judge_metrics
 from .prompt_guard import prompt_guard
 from ..enums import EquivalenceMethod, ArtifactType
@@ -21,14 +24,16 @@ class BudgetEnforcer:
     """Enforces cost and latency budgets for AI operations."""
     
     def __init__(self, max_cost_usd: float = 0.10, max_latency_ms: int = 5000, 
-                 max_tokens_per_request: int = 8000):
+                 max_tokens_per_request: int = 8000, max_concurrent_requests: int = 2):
         self.max_cost_usd = max_cost_usd
         self.max_latency_ms = max_latency_ms
         self.max_tokens_per_request = max_tokens_per_request
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
         
         self.total_cost = 0.0
         self.total_latency = 0.0
         self.request_count = 0
+        self._lock = threading.Lock()
     
     def check_request_budget(self, estimated_tokens: int) -> bool:
         """Check if request is within budget before making it."""
@@ -36,12 +41,13 @@ class BudgetEnforcer:
     
     def record_request(self, cost_usd: float, latency_ms: int) -> bool:
         """Record request cost and latency. Returns True if still within budget."""
-        self.total_cost += cost_usd
-        self.total_latency += latency_ms
-        self.request_count += 1
-        
-        return (self.total_cost <= self.max_cost_usd and 
-                latency_ms <= self.max_latency_ms)
+        with self._lock:
+            self.total_cost += cost_usd
+            self.total_latency += latency_ms
+            self.request_count += 1
+            
+            return (self.total_cost <= self.max_cost_usd and 
+                    latency_ms <= self.max_latency_ms)
     
     def is_budget_exceeded(self) -> bool:
         """Check if budget is exceeded."""
@@ -60,25 +66,53 @@ class BudgetEnforcer:
 
 
 class EquivalenceRunner:
-    """Runs equivalence evaluation using multiple methods."""
+    """
+    Runs equivalence evaluation using multiple methods.
+    
+    Methods are planned cheapest first. Deterministic methods run in order
+    and stop the evaluation once the decision rule for the artifact type is
+    conclusive; the remaining expensive methods (embeddings, LLM judge) run
+    concurrently on a worker pool kept by the runner and sized by the budget's
+    ``max_concurrent_requests``, with their results memoized across identical
+    diffs. Call ``close`` to stop the pool.
+    """
+    
+    # Relative cost used to order methods; AI-backed methods start at EXPENSIVE_COST
+    METHOD_COSTS = {
+        EquivalenceMethod.EXACT: 0,
+        EquivalenceMethod.CANONICAL_JSON: 1,
+        EquivalenceMethod.AST_NORMALIZED: 1,
+        EquivalenceMethod.COSINE_SIMILARITY: 10,
+        EquivalenceMethod.LLM_RUBRIC_JUDGE: 100,
+    }
+    EXPENSIVE_COST = 10
     
     def __init__(self, llm_client: Optional[LLMClient] = None, 
                  embedding_client: Optional[EmbeddingClient] = None,
                  embedding_cache: Optional[EmbeddingCache] = None,
                  budgets: Optional[Dict[str, Any]] = None,
-                 sandbox_enabled: bool = True):
+                 sandbox_enabled: bool = True,
+                 result_cache: Optional[EvaluationCache] = None,
+                 rule_engine: Optional[DecisionRuleEngine] = None,
+                 short_circuit: bool = True):
         self.llm_client = llm_client
         self.embedding_client = embedding_client
         self.embedding_cache = embedding_cache or EmbeddingCache()
+        self.result_cache = result_cache or EvaluationCache()
+        self.rule_engine = rule_engine or decision_engine
         self.sandbox_enabled = sandbox_enabled
+        self.short_circuit = short_circuit
         
         # Default budgets
         default_budgets = {
             "max_cost_usd": 0.10,
             "max_latency_ms": 5000,
-            "max_tokens_per_request": 8000
+            "max_tokens_per_request": 8000,
+            "max_concurrent_requests": 2
         }
         self.budgets = {**default_budgets, **(budgets or {})}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         
         # Load rubric prompt template
         self.rubric_template = self._load_rubric_template()
@@ -110,8 +144,16 @@ TARGET:
 >>>"""
     
     def run(self, diff, source_text: str, target_text: str, artifact_type: ArtifactType, 
-            methods: List[EquivalenceMethod]) -> Evaluation:
-        """Run equivalence evaluation using specified methods."""
+            methods: List[EquivalenceMethod], short_circuit: Optional[bool] = None) -> Evaluation:
+        """
+        Run equivalence evaluation using specified methods.
+        
+        Args:
+            short_circuit: Stop once cheap methods are conclusive; defaults to
+                the runner's setting. Pass False to collect every method's result.
+        """
+        if short_circuit is None:
+            short_circuit = self.short_circuit
         
         evaluation = create_evaluation(
             diff_id=diff.id,
@@ -123,57 +165,45 @@ TARGET:
         evaluation.status = EvaluationStatus.RUNNING
         budget_enforcer = BudgetEnforcer(**self.budgets)
         
+        plan = self.plan_methods(methods)
+        evaluation.metadata["plan"] = [method.value for method in plan]
+        content_hashes = (EvaluationCache.content_hash(source_text), EvaluationCache.content_hash(target_text))
+        rule_id = self.rule_engine.get_default_rule_id(artifact_type)
+        
         try:
-            for method in methods:
-                try:
-                    with judge_metrics.time_evaluation(method, artifact_type.value):
-                        result = self._run_method(method, source_text, target_text, 
-                                                artifact_type, budget_enforcer)
-                        evaluation.add_result(result)
-                        
-                        # Record metrics
-                        judge_metrics.record_evaluation(
-                            method=method,
-                            artifact_type=artifact_type.value,
-                            status="completed",
-                            equivalent=result.equivalent,
-                            confidence=result.confidence,
-                            similarity_score=result.similarity_score,
-                            cost=result.cost,
-                            provider=getattr(self.llm_client, 'provider_id', 'unknown')
-                        )
-                        
-                        # Check budget after each method
-                        if budget_enforcer.is_budget_exceeded():
-                            evaluation.metadata["budget_exceeded"] = True
-                            evaluation.metadata["downgrade"] = "budget_exceeded"
-                            judge_metrics.record_budget_downgrade("budget_exceeded")
-                            break
-                            
-                except Exception as e:
-                    # Record failed method but continue with others
-                    error_result = EvaluationResult(
-                        method=method,
-                        equivalent=False,
-                        confidence=0.0,
-                        similarity_score=0.0,
-                        reasoning=f"Method failed: {str(e)[:100]}",
-                        cost=0.0,
-                        latency_ms=0
-                    )
-                    evaluation.add_result(error_result)
-                    
-                    judge_metrics.record_evaluation(
-                        method=method,
-                        artifact_type=artifact_type.value,
-                        status="failed",
-                        equivalent=False,
-                        confidence=0.0,
-                        cost=0.0
-                    )
-            
-            # Add budget stats to metadata
+            cheap = [m for m in plan if self.METHOD_COSTS.get(m, self.EXPENSIVE_COST) < self.EXPENSIVE_COST]
+            expensive = plan[len(cheap):]
+            
+            for index, method in enumerate(cheap):
+                evaluation.add_result(self._evaluate_method(
+                    method, source_text, target_text, artifact_type, budget_enforcer, content_hashes
+                ))
+                
+                # Check budget after each method
+                if self._check_budget(evaluation, budget_enforcer):
+                    expensive = []
+                    break
+                
+                if short_circuit and self._is_conclusive(rule_id, evaluation.results):
+                    skipped = cheap[index + 1:] + expensive
+                    if skipped:
+                        evaluation.metadata["short_circuit"] = {
+                            "decided_by": method.value,
+                            "rule_id": rule_id,
+                            "skipped_methods": [m.value for m in skipped]
+                        }
+                    expensive = []
+                    break
+            
+            for result in self._evaluate_concurrently(expensive, source_text, target_text,
+                                                      artifact_type, budget_enforcer, content_hashes):
+                evaluation.add_result(result)
+            if expensive:
+                self._check_budget(evaluation, budget_enforcer)
+            
+            # Add budget and cache stats to metadata
             evaluation.metadata["budget_stats"] = budget_enforcer.get_stats()
+            evaluation.metadata["cache_stats"] = self.result_cache.get_stats()
             
             return evaluation.complete(success=True)
             
@@ -182,6 +212,138 @@ TARGET:
             evaluation.metadata["budget_stats"] = budget_enforcer.get_stats()
             return evaluation.complete(success=False)
     
+    def plan_methods(self, methods: List[EquivalenceMethod]) -> List[EquivalenceMethod]:
+        """Order methods cheapest first, dropping repeats; ties keep the caller's order."""
+        unique = list(dict.fromkeys(methods))
+        return sorted(unique, key=lambda m: self.METHOD_COSTS.get(m, self.EXPENSIVE_COST))
+    
+    def _is_conclusive(self, rule_id: str, results: List[EvaluationResult]) -> bool:
+        """
+        Whether the decision rule already accepts the results so far.
+        
+        Only a positive decision is final: a failed exact or structural
+        match can still be overturned by the semantic methods.
+        """
+        return self.rule_engine.apply_rule(rule_id, results)["equivalent"]
+    
+    def _check_budget(self, evaluation: Evaluation, budget_enforcer: BudgetEnforcer) -> bool:
+        """Flag the evaluation as downgraded if the budget is exceeded."""
+        if not budget_enforcer.is_budget_exceeded():
+            return False
+        
+        evaluation.metadata["budget_exceeded"] = True
+        evaluation.metadata["downgrade"] = "budget_exceeded"
+        judge_metrics.record_budget_downgrade("budget_exceeded")
+        return True
+    
+    def _evaluate_concurrently(self, methods: List[EquivalenceMethod], source: str, target: str,
+                               artifact_type: ArtifactType, budget_enforcer: BudgetEnforcer,
+                               content_hashes: Tuple[str, str]) -> List[EvaluationResult]:
+        """Run independent methods in parallel, returning results in plan order."""
+        if len(methods) <= 1 or budget_enforcer.max_concurrent_requests <= 1:
+            return [self._evaluate_method(m, source, target, artifact_type, budget_enforcer, content_hashes)
+                    for m in methods]
+        
+        # The pool is sized by max_concurrent_requests and shared by every run
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self._evaluate_method, m, source, target, artifact_type,
+                            budget_enforcer, content_hashes)
+            for m in methods
+        ]
+        return [future.result() for future in futures]
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the runner's worker pool, created on first concurrent evaluation."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.budgets["max_concurrent_requests"]),
+                    thread_name_prefix="judge"
+                )
+            return self._executor
+    
+    def close(self):
+        """Shut down the runner's worker pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+    
+    def _cache_key(self, method: EquivalenceMethod, content_hashes: Tuple[str, str]) -> Optional[Tuple[str, str, str, str]]:
+        """Result cache key, or None for methods too cheap to be worth caching."""
+        if self.METHOD_COSTS.get(method, self.EXPENSIVE_COST) < self.EXPENSIVE_COST:
+            return None
+        
+        if method == EquivalenceMethod.COSINE_SIMILARITY:
+            model = getattr(self.embedding_client, 'model', None)
+        elif method == EquivalenceMethod.LLM_RUBRIC_JUDGE:
+            model = getattr(self.llm_client, 'model', None)
+        else:
+            model = None
+        return (*content_hashes, method.value, str(model))
+    
+    @staticmethod
+    def _is_cacheable(result: EvaluationResult) -> bool:
+        """
+        Whether a result is a real judgment worth reusing.
+        
+        Errors and unparseable LLM output may be transient, and their
+        fail-closed verdicts would otherwise stick to the pair.
+        """
+        if "error" in result.metadata:
+            return False
+        return "parse_error" not in (result.metadata.get("violations") or [])
+    
+    def _evaluate_method(self, method: EquivalenceMethod, source: str, target: str,
+                         artifact_type: ArtifactType, budget_enforcer: BudgetEnforcer,
+                         content_hashes: Tuple[str, str]) -> EvaluationResult:
+        """Run one method with caching and metrics; failures become error results."""
+        try:
+            with judge_metrics.time_evaluation(method, artifact_type.value):
+                cache_key = self._cache_key(method, content_hashes)
+                result = None
+                if cache_key:
+                    result = self.result_cache.get(cache_key)
+                    judge_metrics.update_cache_hit_rate("evaluation", self.result_cache.get_stats()["hit_rate"])
+                if result is None:
+                    result = self._run_method(method, source, target, artifact_type, budget_enforcer)
+                    if cache_key and self._is_cacheable(result):
+                        self.result_cache.put(cache_key, result)
+                
+                # Record metrics
+                judge_metrics.record_evaluation(
+                    method=method,
+                    artifact_type=artifact_type.value,
+                    status="completed",
+                    equivalent=result.equivalent,
+                    confidence=result.confidence,
+                    similarity_score=result.similarity_score,
+                    cost=result.cost,
+                    provider=getattr(self.llm_client, 'provider_id', 'unknown')
+                )
+                return result
+                
+        except Exception as e:
+            # Record failed method but continue with others
+            judge_metrics.record_evaluation(
+                method=method,
+                artifact_type=artifact_type.value,
+                status="failed",
+                equivalent=False,
+                confidence=0.0,
+                cost=0.0
+            )
+            return EvaluationResult(
+                method=method,
+                equivalent=False,
+                confidence=0.0,
+                similarity_score=0.0,
+                reasoning=f"Method failed: {str(e)[:100]}",
+                cost=0.0,
+                latency_ms=0
+            )
+    
     def _run_method(self, method: EquivalenceMethod, source: str, target: str, 
                    artifact_type: ArtifactType, budget_enforcer: BudgetEnforcer) -> EvaluationResult:
         """Run a single equivalence method."""
@@ -300,7 +462,8 @@ TARGET:
                 similarity_score=0.0,
                 reasoning=f"Embedding error: {e}",
                 cost=0.0,
-                latency_ms=latency_ms
+                latency_ms=latency_ms,
+                metadata={"error": str(e)}
             )
     
     def _llm_rubric_judge(self, source: str, target: str, artifact_type: ArtifactType, 
@@ -355,6 +518,15 @@ TARGET:
             
             # Parse response
             parsed = self._parse_llm_response(response["text"])
+            metadata = {
+                "model": response["model"],
+                "provider": response["provider"],
+                "tokens": response["tokens"],
+                "violations": parsed.get("violations", [])
+            }
+            if "error" in parsed:
+                # Fail-closed verdicts from unparseable output are errors, not judgments
+                metadata["error"] = parsed["error"]
             
             return EvaluationResult(
                 method=EquivalenceMethod.LLM_RUBRIC_JUDGE,
@@ -364,12 +536,7 @@ TARGET:
                 reasoning=parsed["reasoning"],
                 cost=response["cost_usd"],
                 latency_ms=response["latency_ms"],
-                metadata={
-                    "model": response["model"],
-                    "provider": response["provider"],
-                    "tokens": response["tokens"],
-                    "violations": parsed.get("violations", [])
-                }
+                metadata=metadata
             )
             
         except Exception as e:
@@ -381,7 +548,8 @@ TARGET:
                 similarity_score=0.0,
                 reasoning=f"LLM judge error: {e}",
                 cost=0.0,
-                latency_ms=latency_ms
+                latency_ms=latency_ms,
+                metadata={"error": str(e)}
             )
     
     def _ast_normalized(self, source: str, target: str, start_time: float) -> EvaluationResult:
@@ -461,7 +629,8 @@ TARGET:
                 "equivalent": False,
                 "confidence": 0.0,
                 "reasoning": f"Parse error: {str(e)[:100]}",
-                "violations": ["parse_error"]
+                "violations": ["parse_error"],
+                "error": "parse_error"
             }
     
     def _extract_json(self, text: str) -> str:
@@ -473,8 +642,8 @@ TARGET:
         if match:
             return match.group(0)
         
-        # Fallback: return fail-closed JSON
-        return '{"equivalent": false, "confidence": 0.0, "reasoning": "no-json-found"}'
+        # The caller fails closed and marks the result as a parse error
+        raise ValueError("no-json-found")
     
     def _calibrate_similarity_confidence(self, similarity: float) -> float:
         """Map cosine similarity to confidence using calibrated function."""
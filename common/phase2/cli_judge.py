@@ -131,7 +131,8 @@ def run_shadow_evaluation(run_id: Optional[str] = None, dataset_path: Optional[s
         embedding_client=embed_client,
         embedding_cache=embedding_cache,
         budgets=budgets,
-        sandbox_enabled=True
+        sandbox_enabled=True,
+        short_circuit=False  # Shadow stats need every method's result
     )
     
     # Load evaluation data
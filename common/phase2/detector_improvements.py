@@ -15,7 +15,7 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 from enum import Enum
 
-from .detectors import MismatchDetector, DetectorResult
+from .detectors import MismatchDetector, DetectorResult, ComparisonView
 from .enums import ArtifactType, MismatchType
 from .diff_entities import create_diff, DiffType
 
@@ -36,8 +36,9 @@ class NewlineDetector(MismatchDetector):
         start_time = datetime.utcnow()
         
         # Normalize newlines for comparison
-        source_normalized = self._normalize_newlines(source_content)
-        target_normalized = self._normalize_newlines(target_content)
+        view = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
+        source_normalized = self._normalize_final_newline(view.source.eol_normalized)
+        target_normalized = self._normalize_final_newline(view.target.eol_normalized)
         
         # If normalized versions are identical, it's a newline difference
         if source_normalized == target_normalized and source_content != target_content:
@@ -65,14 +66,8 @@ class NewlineDetector(MismatchDetector):
         
         return None
     
-    def _normalize_newlines(self, content: str) -> str:
-        """Normalize newline endings."""
-        # Convert CRLF to LF
-        normalized = content.replace('\r\n', '\n')
-        # Convert standalone CR to LF
-        normalized = normalized.replace('\r', '\n')
-        
-        # Normalize final newline if configured
+    def _normalize_final_newline(self, normalized: str) -> str:
+        """Normalize the final newline of LF-normalized content if configured."""
         if self.config["normalize_final_newline"]:
             normalized = normalized.rstrip('\n') + '\n' if normalized else ''
         
@@ -185,8 +180,9 @@ class ULPNumericDetector(MismatchDetector):
         start_time = datetime.utcnow()
         
         # Extract numbers from both contents
-        source_numbers = self._extract_numbers(source_content)
-        target_numbers = self._extract_numbers(target_content)
+        view = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
+        source_numbers = view.source.numbers
+        target_numbers = view.target.numbers
         
         if len(source_numbers) != len(target_numbers):
             return None
@@ -262,21 +258,6 @@ class ULPNumericDetector(MismatchDetector):
         max_val = max(abs(a), abs(b))
         return diff <= max_val * self.config["rel_epsilon"]
     
-    def _extract_numbers(self, content: str) -> List[float]:
-        """Extract all numbers from content."""
-        # Enhanced regex for floating point numbers
-        number_pattern = r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?'
-        matches = re.findall(number_pattern, content)
-        
-        numbers = []
-        for match in matches:
-            try:
-                numbers.append(float(match))
-            except ValueError:
-                continue
-        
-        return numbers
-    
     def _create_ulp_diff(self, source: str, target: str, ulp_diffs: List, artifact_type: ArtifactType):
         """Create a diff for ULP numeric changes."""
         diff = create_diff("source", "target", DiffType.NUMERIC, artifact_type)
@@ -459,6 +440,7 @@ class VersionedDetectorRegistry:
         
         # Run detectors with short-circuit option
         short_circuit = kwargs.get('short_circuit', True)
+        kwargs["view"] = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
         
         for detector in detectors:
             try:
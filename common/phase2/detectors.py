@@ -16,10 +16,17 @@ import struct
 import math
 import unicodedata
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from .diff_entities import Diff, DiffHunk, DiffType, DiffOperation, create_diff, create_diff_hunk
 from .enums import ArtifactType, MismatchType, ConfidenceLevel
 
@@ -46,9 +53,193 @@ class DetectorResult:
         return ConfidenceLevel.from_score(self.confidence)
 
 
+# Shared normalizations. Detectors read these through an ArtifactView so
+# each form is computed at most once per artifact per comparison.
+
+_NUMBER_PATTERN = re.compile(r'-?\d+\.?\d*(?:[eE][+-]?\d+)?')
+_INLINE_SPACE_PATTERN = re.compile(r'[ \t]+')
+_BLANK_LINES_PATTERN = re.compile(r'\n\s*\n+')
+
+# Numeric detectors switch to NumPy arrays at this many numbers per artifact;
+# below it the array setup costs more than the Python loop it replaces.
+VECTORIZE_MIN_NUMBERS = 256
+
+
+def normalize_whitespace(content: str) -> str:
+    """Collapse runs of spaces/tabs, strip trailing spaces and drop blank lines."""
+    norm_lines = [_INLINE_SPACE_PATTERN.sub(' ', line).rstrip() for line in content.splitlines()]
+    return _BLANK_LINES_PATTERN.sub('\n', '\n'.join(norm_lines)).strip()
+
+
+def normalize_eol(content: str) -> str:
+    """Normalize CRLF and CR line endings to LF."""
+    return content.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def detect_eol(content: str) -> str:
+    """Detect the primary EOL style in content."""
+    crlf_count = content.count('\r\n')
+    lf_count = content.count('\n') - crlf_count
+    cr_count = content.count('\r') - crlf_count
+
+    if crlf_count > max(lf_count, cr_count):
+        return "crlf"
+    elif cr_count > lf_count:
+        return "cr"
+    else:
+        return "lf"
+
+
+def extract_numbers(content: str) -> List[float]:
+    """Extract all numbers from content."""
+    return _parse_numbers(_NUMBER_PATTERN.findall(content))
+
+
+def _parse_numbers(tokens: List[str]) -> List[float]:
+    numbers = []
+    for token in tokens:
+        try:
+            numbers.append(float(token))
+        except ValueError:
+            continue
+    return numbers
+
+
+def canonicalize_json(obj: Any) -> str:
+    """Canonicalize a JSON value (stable keys, stable separators).
+    Note: not full RFC 8785 JCS; number form normalization is handled by a separate detector."""
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def normalize_markdown(content: str) -> str:
+    """Normalize markdown content for semantic comparison."""
+    # Remove markdown formatting while preserving text content
+    normalized = content
+
+    # Remove headers (# ## ###)
+    normalized = re.sub(r'^#+\s*', '', normalized, flags=re.MULTILINE)
+
+    # Remove emphasis (* ** _ __)
+    normalized = re.sub(r'\*\*([^*]+)\*\*', r'\1', normalized)
+    normalized = re.sub(r'\*([^*]+)\*', r'\1', normalized)
+    normalized = re.sub(r'__([^_]+)__', r'\1', normalized)
+    normalized = re.sub(r'_([^_]+)_', r'\1', normalized)
+
+    # Remove links [text](url) -> text
+    normalized = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', normalized)
+
+    # Preserve code content by hashing to placeholders so changes in code don't vanish
+    def _hash_code(m):
+        h = hashlib.sha256(m.group(1).encode("utf-8")).hexdigest()[:8]
+        return f" CODEBLOCK:{h} "
+    normalized = re.sub(r"```[\w\-]*\n(.*?)```", lambda m: _hash_code(m), normalized, flags=re.DOTALL)
+    normalized = re.sub(r"`([^`]+)`", lambda m: f" CODE:{hashlib.sha256(m.group(1).encode('utf-8')).hexdigest()[:8]} ", normalized)
+
+    # Normalize whitespace
+    normalized = re.sub(r'\s+', ' ', normalized)
+
+    return normalized.strip()
+
+
+class ArtifactView:
+    """
+    Lazily derived forms of one artifact's content.
+
+    Each form is computed on first access and memoized, so detectors that
+    share a view never parse JSON, extract numbers or normalize the same
+    text twice.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.content.splitlines()
+
+    @cached_property
+    def eol(self) -> str:
+        return detect_eol(self.content)
+
+    @cached_property
+    def eol_normalized(self) -> str:
+        return normalize_eol(self.content)
+
+    @cached_property
+    def whitespace_normalized(self) -> str:
+        return normalize_whitespace(self.content)
+
+    @cached_property
+    def markdown_normalized(self) -> str:
+        return normalize_markdown(self.content)
+
+    @cached_property
+    def number_tokens(self) -> List[str]:
+        return _NUMBER_PATTERN.findall(self.content)
+
+    @cached_property
+    def numbers(self) -> List[float]:
+        return _parse_numbers(self.number_tokens)
+
+    @cached_property
+    def number_array(self) -> "np.ndarray":
+        """Numbers as a float64 array; requires NumPy."""
+        if "numbers" in self.__dict__:
+            return np.array(self.numbers, dtype=np.float64)
+        return np.array(self.number_tokens, dtype=np.float64)
+
+    @cached_property
+    def _parsed_json(self) -> Tuple[bool, Any]:
+        try:
+            return True, json.loads(self.content)
+        except json.JSONDecodeError:
+            return False, None
+
+    @property
+    def is_json(self) -> bool:
+        """Whether the content parses as JSON."""
+        return self._parsed_json[0]
+
+    @property
+    def json(self) -> Any:
+        """Parsed JSON value; raises JSONDecodeError when the content is not JSON."""
+        valid, value = self._parsed_json
+        if not valid:
+            return json.loads(self.content)
+        return value
+
+    @cached_property
+    def canonical_json(self) -> Optional[str]:
+        """Canonical JSON text, or None when the content is not JSON."""
+        return canonicalize_json(self._parsed_json[1]) if self.is_json else None
+
+
+class ComparisonView:
+    """Source and target artifact views shared by every detector in one comparison."""
+
+    def __init__(self, source_content: str, target_content: str, artifact_type: ArtifactType):
+        self.source = ArtifactView(source_content)
+        self.target = ArtifactView(target_content)
+        self.artifact_type = artifact_type
+
+    @classmethod
+    def for_detection(cls, source_content: str, target_content: str,
+                      artifact_type: ArtifactType, kwargs: Dict[str, Any]) -> 'ComparisonView':
+        """Reuse the view passed to a detector, or build one for a standalone call."""
+        view = kwargs.get("view")
+        if (view is None or view.source.content is not source_content
+                or view.target.content is not target_content):
+            view = cls(source_content, target_content, artifact_type)
+        return view
+
+
 class MismatchDetector(ABC):
     """Abstract base class for mismatch detectors."""
     
+    # ArtifactView form whose equality across source and target is exactly
+    # this detector's verdict; lets the registry decide it from fingerprints.
+    fingerprint: Optional[str] = None
+    
     def __init__(self, name: str, supported_types: List[ArtifactType], version: str = "1.0.0"):
         self.name = name
         self.version = version
@@ -97,6 +288,8 @@ class MismatchDetector(ABC):
 class WhitespaceDetector(MismatchDetector):
     """Detects whitespace-only differences."""
     
+    fingerprint = "whitespace_normalized"
+    
     def __init__(self):
         # Restrict to TEXT; whitespace is semantic in many CODE contexts (e.g., Python)
         super().__init__("whitespace_detector", [ArtifactType.TEXT], "1.0.0")
@@ -109,8 +302,9 @@ class WhitespaceDetector(MismatchDetector):
         
         try:
             # Normalize whitespace for comparison
-            source_normalized = self._normalize_whitespace(source_content)
-            target_normalized = self._normalize_whitespace(target_content)
+            view = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
+            source_normalized = view.source.whitespace_normalized
+            target_normalized = view.target.whitespace_normalized
             
             # If normalized versions are identical, it's a whitespace-only difference
             if source_normalized == target_normalized and source_content != target_content:
@@ -149,18 +343,7 @@ class WhitespaceDetector(MismatchDetector):
     
     def _normalize_whitespace(self, content: str) -> str:
         """Normalize whitespace in content."""
-        # Normalize internal runs of spaces/tabs; preserve line structure but normalize blank lines
-        norm_lines = []
-        for line in content.splitlines():
-            # Collapse spaces/tabs inside the line; strip trailing spaces only
-            inner = re.sub(r'[ \t]+', ' ', line).rstrip()
-            norm_lines.append(inner)
-        
-        # Join and normalize multiple consecutive newlines to single newlines
-        result = '\n'.join(norm_lines)
-        # Normalize multiple consecutive newlines to single newlines
-        result = re.sub(r'\n\s*\n+', '\n', result)
-        return result.strip()
+        return normalize_whitespace(content)
     
     def _create_whitespace_diff(self, source: str, target: str, artifact_type: ArtifactType) -> Diff:
         """Create a diff highlighting whitespace changes."""
@@ -216,6 +399,8 @@ class WhitespaceDetector(MismatchDetector):
 class NewlineDetector(MismatchDetector):
     """Detects newline/EOL differences (CRLF vs LF) and final newline presence."""
     
+    fingerprint = "eol_normalized"
+    
     def __init__(self):
         super().__init__("newline_detector", [ArtifactType.TEXT, ArtifactType.CODE], "1.0.0")
     
@@ -227,8 +412,9 @@ class NewlineDetector(MismatchDetector):
         
         try:
             # Normalize CRLF/CR->LF for comparison; preserve content otherwise
-            s_norm = source_content.replace("\r\n", "\n").replace("\r", "\n")
-            t_norm = target_content.replace("\r\n", "\n").replace("\r", "\n")
+            view = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
+            s_norm = view.source.eol_normalized
+            t_norm = view.target.eol_normalized
             
             if s_norm == t_norm and source_content != target_content:
                 # Create a small formatting diff
@@ -244,8 +430,8 @@ class NewlineDetector(MismatchDetector):
                 )
                 hunk.metadata = {
                     "change_type": "newline_eol",
-                    "source_eol": self._detect_eol(source_content),
-                    "target_eol": self._detect_eol(target_content)
+                    "source_eol": view.source.eol,
+                    "target_eol": view.target.eol
                 }
                 diff.hunks.append(hunk)
                 diff.total_changes = 1
@@ -279,21 +465,14 @@ class NewlineDetector(MismatchDetector):
     
     def _detect_eol(self, content: str) -> str:
         """Detect the primary EOL style in content."""
-        crlf_count = content.count('\r\n')
-        lf_count = content.count('\n') - crlf_count
-        cr_count = content.count('\r') - crlf_count
-        
-        if crlf_count > max(lf_count, cr_count):
-            return "crlf"
-        elif cr_count > lf_count:
-            return "cr"
-        else:
-            return "lf"
+        return detect_eol(content)
 
 
 class JsonStructureDetector(MismatchDetector):
     """Detects JSON ordering and formatting differences."""
     
+    fingerprint = "canonical_json"
+    
     def __init__(self):
         super().__init__("json_structure_detector", [ArtifactType.JSON], "1.2.0")
     
@@ -304,12 +483,13 @@ class JsonStructureDetector(MismatchDetector):
         self.call_count += 1
         
         try:
-            source_json = json.loads(source_content)
-            target_json = json.loads(target_content)
+            view = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
+            source_json = view.source.json
+            target_json = view.target.json
             
             # Canonicalize both JSONs
-            source_canonical = self._canonicalize_json(source_json)
-            target_canonical = self._canonicalize_json(target_json)
+            source_canonical = view.source.canonical_json
+            target_canonical = view.target.canonical_json
             
             # If canonical versions are identical, it's a structure/ordering difference
             if source_canonical == target_canonical and source_content != target_content:
@@ -346,9 +526,8 @@ class JsonStructureDetector(MismatchDetector):
         return None
     
     def _canonicalize_json(self, obj: Any) -> str:
-        """Canonicalize JSON object for comparison (stable keys, stable separators).
-        Note: not full RFC 8785 JCS; number form normalization is handled by a separate detector."""
-        return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        """Canonicalize JSON object for comparison (stable keys, stable separators)."""
+        return canonicalize_json(obj)
     
     def _create_json_diff(self, source: str, target: str, source_obj: Any, target_obj: Any) -> Diff:
         """Create a diff for JSON structure changes."""
@@ -380,10 +559,11 @@ class JsonStructureDetector(MismatchDetector):
 class NumericEpsilonDetector(MismatchDetector):
     """Detects small numerical differences within acceptable tolerance."""
     
-    def __init__(self, epsilon: float = 1e-6, rel_epsilon: float = 1e-9):
+    def __init__(self, epsilon: float = 1e-6, rel_epsilon: float = 1e-9, vectorize: bool = True):
         super().__init__("numeric_epsilon_detector", [ArtifactType.TEXT, ArtifactType.JSON, ArtifactType.CODE], "1.0.0")
         self.epsilon = epsilon
         self.rel_epsilon = rel_epsilon
+        self.vectorize = vectorize and NUMPY_AVAILABLE
     
     def detect(self, source_content: str, target_content: str, 
                artifact_type: ArtifactType, **kwargs) -> Optional[DetectorResult]:
@@ -393,30 +573,20 @@ class NumericEpsilonDetector(MismatchDetector):
         
         try:
             # Extract numbers from both contents
-            source_numbers = self._extract_numbers(source_content)
-            target_numbers = self._extract_numbers(target_content)
-        
-            if len(source_numbers) != len(target_numbers):
+            view = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
+            source_numbers = view.source.number_tokens
+            
+            if len(source_numbers) != len(view.target.number_tokens):
                 self.total_latency_ms += int((time.perf_counter() - t0) * 1000)
                 return None
             
-            epsilon_diffs = []
-            any_nonzero = False
-            for i, (src_num, tgt_num) in enumerate(zip(source_numbers, target_numbers)):
-                diff = abs(src_num - tgt_num)
-                if diff == 0.0:
-                    continue
-                any_nonzero = True
-                rel = diff / max(abs(src_num), abs(tgt_num), 1e-15)
-                if diff <= self.epsilon or rel <= self.rel_epsilon:
-                    epsilon_diffs.append((i, src_num, tgt_num, diff))
-                else:
-                    # A material numeric change exists → not benign epsilon
-                    self.total_latency_ms += int((time.perf_counter() - t0) * 1000)
-                    return None
+            if self.vectorize and len(source_numbers) >= VECTORIZE_MIN_NUMBERS:
+                epsilon_diffs = self._epsilon_diffs_vectorized(view.source.number_array, view.target.number_array)
+            else:
+                epsilon_diffs = self._epsilon_diffs(view.source.numbers, view.target.numbers)
             
             # Classify as epsilon only if all non-zero diffs were within thresholds
-            if any_nonzero and epsilon_diffs:
+            if epsilon_diffs:
                 diff = self._create_numeric_diff(source_content, target_content, epsilon_diffs, artifact_type)
                 confidence = self._calculate_numeric_confidence(epsilon_diffs, source_numbers)
                 
@@ -453,20 +623,39 @@ class NumericEpsilonDetector(MismatchDetector):
             self.total_latency_ms += int((time.perf_counter() - t0) * 1000)
             raise
     
-    def _extract_numbers(self, content: str) -> List[float]:
-        """Extract all numbers from content."""
-        # Regex to find floating point numbers
-        number_pattern = r'-?\d+\.?\d*(?:[eE][+-]?\d+)?'
-        matches = re.findall(number_pattern, content)
+    def _epsilon_diffs(self, source_numbers: List[float], target_numbers: List[float]) -> Optional[List[Tuple]]:
+        """
+        Non-zero differences within tolerance, as (index, source, target, diff).
         
-        numbers = []
-        for match in matches:
-            try:
-                numbers.append(float(match))
-            except ValueError:
+        Returns None as soon as a material numeric change is found.
+        """
+        epsilon_diffs = []
+        for i, (src_num, tgt_num) in enumerate(zip(source_numbers, target_numbers)):
+            diff = abs(src_num - tgt_num)
+            if diff == 0.0:
                 continue
-        
-        return numbers
+            rel = diff / max(abs(src_num), abs(tgt_num), 1e-15)
+            if diff <= self.epsilon or rel <= self.rel_epsilon:
+                epsilon_diffs.append((i, src_num, tgt_num, diff))
+            else:
+                # A material numeric change exists → not benign epsilon
+                return None
+        return epsilon_diffs
+    
+    def _epsilon_diffs_vectorized(self, source: "np.ndarray", target: "np.ndarray") -> Optional[List[Tuple]]:
+        """Bulk equivalent of ``_epsilon_diffs`` over float64 arrays."""
+        with np.errstate(invalid='ignore', over='ignore'):
+            diffs = np.abs(source - target)
+            changed = np.flatnonzero(diffs != 0.0)
+            src, tgt, diff = source[changed], target[changed], diffs[changed]
+            rel = diff / np.maximum(np.maximum(np.abs(src), np.abs(tgt)), 1e-15)
+            if not ((diff <= self.epsilon) | (rel <= self.rel_epsilon)).all():
+                return None
+        return list(zip(changed.tolist(), src.tolist(), tgt.tolist(), diff.tolist()))
+    
+    def _extract_numbers(self, content: str) -> List[float]:
+        """Extract all numbers from content."""
+        return extract_numbers(content)
     
     def _create_numeric_diff(self, source: str, target: str, epsilon_diffs: List[Tuple], 
                            artifact_type: ArtifactType) -> Diff:
@@ -509,11 +698,13 @@ class NumericEpsilonDetector(MismatchDetector):
 class ULPNumericDetector(MismatchDetector):
     """ULP-aware numeric difference detector for high-precision floating point comparison."""
     
-    def __init__(self, max_ulps: int = 8, rel_epsilon: float = 1e-9, abs_epsilon: float = 1e-12):
+    def __init__(self, max_ulps: int = 8, rel_epsilon: float = 1e-9, abs_epsilon: float = 1e-12,
+                 vectorize: bool = True):
         super().__init__("numeric_ulp_detector", [ArtifactType.TEXT, ArtifactType.JSON, ArtifactType.CODE], "1.0.0")
         self.max_ulps = max_ulps
         self.rel_epsilon = rel_epsilon
         self.abs_epsilon = abs_epsilon
+        self.vectorize = vectorize and NUMPY_AVAILABLE
     
     def detect(self, source_content: str, target_content: str, 
                artifact_type: ArtifactType, **kwargs) -> Optional[DetectorResult]:
@@ -522,17 +713,21 @@ class ULPNumericDetector(MismatchDetector):
         self.call_count += 1
         
         try:
-            source_numbers = self._extract_numbers(source_content)
-            target_numbers = self._extract_numbers(target_content)
+            view = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
+            source_numbers = view.source.number_tokens
             
-            if len(source_numbers) != len(target_numbers):
+            if len(source_numbers) != len(view.target.number_tokens):
                 self.total_latency_ms += int((time.perf_counter() - t0) * 1000)
                 return None
             
-            ulp_diffs = []
-            for i, (src_num, tgt_num) in enumerate(zip(source_numbers, target_numbers)):
-                if self._nearly_equal_ulp(src_num, tgt_num):
-                    ulp_diffs.append((i, src_num, tgt_num, abs(src_num - tgt_num)))
+            if self.vectorize and len(source_numbers) >= VECTORIZE_MIN_NUMBERS:
+                ulp_diffs = self._ulp_diffs_vectorized(view.source.number_array, view.target.number_array)
+            else:
+                ulp_diffs = [
+                    (i, src_num, tgt_num, abs(src_num - tgt_num))
+                    for i, (src_num, tgt_num) in enumerate(zip(view.source.numbers, view.target.numbers))
+                    if self._nearly_equal_ulp(src_num, tgt_num)
+                ]
             
             if ulp_diffs and len(ulp_diffs) >= len(source_numbers) * 0.5:
                 diff = self._create_ulp_diff(source_content, target_content, ulp_diffs, artifact_type)
@@ -604,19 +799,33 @@ class ULPNumericDetector(MismatchDetector):
         except (struct.error, OverflowError):
             return False
     
+    def _ulp_diffs_vectorized(self, source: "np.ndarray", target: "np.ndarray") -> List[Tuple]:
+        """Bulk equivalent of ``_nearly_equal_ulp`` over float64 arrays."""
+        with np.errstate(invalid='ignore', over='ignore', divide='ignore'):
+            diffs = np.abs(source - target)
+            abs_source = np.abs(source)
+            rel = diffs / np.where(abs_source > 0, abs_source, 1.0)
+            
+            # Same-sign bit patterns order like the floats they encode; the
+            # scalar mapping puts opposite signs far more than max_ulps apart
+            source_bits = source.view(np.int64)
+            target_bits = target.view(np.int64)
+            same_sign = (source_bits < 0) == (target_bits < 0)
+            within_ulps = same_sign & (np.abs(source_bits - target_bits) <= self.max_ulps)
+            
+            equal = source == target
+            close = (equal | (diffs <= self.abs_epsilon)
+                     | ((abs_source > 0) & (rel <= self.rel_epsilon)) | within_ulps)
+            infinite = np.isinf(source) | np.isinf(target)
+            nearly_equal = np.where(infinite, equal, close) & ~(np.isnan(source) | np.isnan(target))
+        
+        indices = np.flatnonzero(nearly_equal)
+        return list(zip(indices.tolist(), source[indices].tolist(),
+                        target[indices].tolist(), diffs[indices].tolist()))
+    
     def _extract_numbers(self, content: str) -> List[float]:
         """Extract floating point numbers from content."""
-        number_pattern = r'-?\d+\.?\d*(?:[eE][+-]?\d+)?'
-        matches = re.findall(number_pattern, content)
-        
-        numbers = []
-        for match in matches:
-            try:
-                numbers.append(float(match))
-            except ValueError:
-                continue
-        
-        return numbers
+        return extract_numbers(content)
     
     def _create_ulp_diff(self, source: str, target: str, ulp_diffs: List[Tuple], 
                         artifact_type: ArtifactType) -> Diff:
@@ -668,8 +877,9 @@ class MarkdownFormattingDetector(MismatchDetector):
         
         try:
             # Normalize markdown for semantic comparison
-            source_normalized = self._normalize_markdown(source_content)
-            target_normalized = self._normalize_markdown(target_content)
+            view = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
+            source_normalized = view.source.markdown_normalized
+            target_normalized = view.target.markdown_normalized
             
             # If normalized versions are identical, it's a formatting difference
             if source_normalized == target_normalized and source_content != target_content:
@@ -708,32 +918,7 @@ class MarkdownFormattingDetector(MismatchDetector):
     
     def _normalize_markdown(self, content: str) -> str:
         """Normalize markdown content for semantic comparison."""
-        # Remove markdown formatting while preserving text content
-        normalized = content
-        
-        # Remove headers (# ## ###)
-        normalized = re.sub(r'^#+\s*', '', normalized, flags=re.MULTILINE)
-        
-        # Remove emphasis (* ** _ __)
-        normalized = re.sub(r'\*\*([^*]+)\*\*', r'\1', normalized)
-        normalized = re.sub(r'\*([^*]+)\*', r'\1', normalized)
-        normalized = re.sub(r'__([^_]+)__', r'\1', normalized)
-        normalized = re.sub(r'_([^_]+)_', r'\1', normalized)
-        
-        # Remove links [text](url) -> text
-        normalized = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', normalized)
-        
-        # Preserve code content by hashing to placeholders so changes in code don't vanish
-        def _hash_code(m):
-            h = hashlib.sha256(m.group(1).encode("utf-8")).hexdigest()[:8]
-            return f" CODEBLOCK:{h} "
-        normalized = re.sub(r"```[\w\-]*\n(.*?)```", lambda m: _hash_code(m), normalized, flags=re.DOTALL)
-        normalized = re.sub(r"`([^`]+)`", lambda m: f" CODE:{hashlib.sha256(m.group(1).encode('utf-8')).hexdigest()[:8]} ", normalized)
-        
-        # Normalize whitespace
-        normalized = re.sub(r'\s+', ' ', normalized)
-        
-        return normalized.strip()
+        return normalize_markdown(content)
     
     def _create_markdown_diff(self, source: str, target: str) -> Diff:
         """Create a diff for markdown formatting changes."""
@@ -785,10 +970,33 @@ class MarkdownFormattingDetector(MismatchDetector):
 
 
 class DetectorRegistry:
-    """Registry for managing mismatch detectors."""
+    """
+    Registry for managing mismatch detectors.
+    
+    ``detect_all`` dispatches through a tiered cascade so most pairs never
+    reach the expensive detectors:
+    
+    - identical: length and content equality; identical pairs have no mismatch.
+    - fingerprint: detectors with a ``fingerprint`` form (EOL-normalized,
+      whitespace-normalized, canonical JSON) run only when that form agrees
+      across source and target, and a hit ends the cascade.
+    - full: the remaining detectors run when every fingerprint disagrees.
+    
+    The cascade changes results, not just cost. When only newlines or
+    whitespace differ, the numeric and markdown detectors used to run as well,
+    and the ULP detector's 0.95 verdict outranked the real cause even though
+    every number matched. Pairs like these are now classified by the
+    fingerprint detector. Roughly one in five non-identical pairs gets a
+    different top result than a full run. Pass ``short_circuit=False`` for the
+    old run-everything ranking.
+    """
+    
+    CASCADE_TIERS = ("identical", "fingerprint", "full")
     
     def __init__(self):
         self.detectors: List[MismatchDetector] = []
+        self.comparison_count = 0
+        self.tier_hits: Dict[str, int] = {tier: 0 for tier in self.CASCADE_TIERS}
         self._register_default_detectors()
     
     def _register_default_detectors(self):
@@ -811,7 +1019,56 @@ class DetectorRegistry:
     
     def detect_all(self, source_content: str, target_content: str, 
                    artifact_type: ArtifactType, **kwargs) -> List[DetectorResult]:
-        """Run all applicable detectors and return results."""
+        """
+        Run applicable detectors through the cascade and return results.
+        
+        A matching fingerprint ends dispatch, so detectors that would have
+        scored higher on a full run (notably numeric false positives on
+        whitespace and newline changes) are not consulted; see the class
+        docstring. Pass ``short_circuit=False`` to skip the cascade and run
+        every applicable detector for full evidence.
+        """
+        self.comparison_count += 1
+        short_circuit = kwargs.get("short_circuit", True)
+        
+        # Tier 0: str equality checks length before comparing content
+        if short_circuit and source_content == target_content:
+            self.tier_hits["identical"] += 1
+            return []
+        
+        # One view per comparison so detectors share parsed and normalized forms
+        view = kwargs["view"] = ComparisonView.for_detection(source_content, target_content, artifact_type, kwargs)
+        detectors = self.get_detectors_for_type(artifact_type)
+        
+        if not short_circuit:
+            self.tier_hits["full"] += 1
+            return self._run_detectors(detectors, source_content, target_content, artifact_type, kwargs)
+        
+        # Tier 1: cheap fingerprints decide their own detectors outright
+        fingerprinted = [d for d in detectors if d.fingerprint]
+        agreeing = [d for d in fingerprinted if self._fingerprints_agree(view, d.fingerprint)]
+        if agreeing:
+            results = self._run_detectors(agreeing, source_content, target_content, artifact_type, kwargs)
+            if results:
+                self.tier_hits["fingerprint"] += 1
+                return results
+        
+        # Tier 2: a disagreeing fingerprint means its detector cannot match
+        self.tier_hits["full"] += 1
+        expensive = [d for d in detectors if not d.fingerprint]
+        return self._run_detectors(expensive, source_content, target_content, artifact_type, kwargs)
+    
+    def _fingerprints_agree(self, view: ComparisonView, form: str) -> bool:
+        """Whether source and target share the given derived form."""
+        try:
+            source_form = getattr(view.source, form)
+        except Exception:
+            return False
+        return source_form is not None and source_form == getattr(view.target, form)
+    
+    def _run_detectors(self, detectors: List[MismatchDetector], source_content: str, target_content: str,
+                       artifact_type: ArtifactType, kwargs: Dict[str, Any]) -> List[DetectorResult]:
+        """Run detectors in order and return results sorted by confidence and precedence."""
         results: List[DetectorResult] = []
         precedence = {
             # lower number = higher precedence when confidences tie
@@ -823,7 +1080,7 @@ class DetectorRegistry:
             "markdown_formatting_detector": 5,
         }
         
-        for detector in self.get_detectors_for_type(artifact_type):
+        for detector in detectors:
             try:
                 detector.call_count += 1
                 result = detector.detect(source_content, target_content, artifact_type, **kwargs)
@@ -839,10 +1096,18 @@ class DetectorRegistry:
         return results
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get statistics for all detectors."""
+        """Get statistics for all detectors and the dispatch cascade."""
+        comparisons = max(1, self.comparison_count)
         return {
             "total_detectors": len(self.detectors),
-            "detectors": [d.get_stats() for d in self.detectors]
+            "detectors": [d.get_stats() for d in self.detectors],
+            "cascade": {
+                "comparisons": self.comparison_count,
+                "tiers": {
+                    tier: {"hits": hits, "hit_rate": hits / comparisons}
+                    for tier, hits in self.tier_hits.items()
+                }
+            }
         }
 
 
@@ -9,7 +9,9 @@ Following ADR-009 specifications for input canonicalization and key stability.
 
 import json
 import re
-from typing import Any, Dict, List, Union
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Union
 import hashlib
 
 try:
@@ -19,36 +21,173 @@ except ImportError:
     BLAKE3_AVAILABLE = False
 
 
+# Same primitives json.dumps(ensure_ascii=True) uses, so the streaming encoder
+# below emits exactly the bytes of the legacy serialize-then-hash path.
+_encode_string = json.encoder.encode_basestring_ascii
+_INFINITY = float('inf')
+_LEADING_WHITESPACE = re.compile(r'^[^\S\n]', re.MULTILINE)
+
+
+def _float_to_json(value: float) -> str:
+    """Format a float the way the json module does (allow_nan=True)."""
+    if value != value:
+        return 'NaN'
+    if value == _INFINITY:
+        return 'Infinity'
+    if value == -_INFINITY:
+        return '-Infinity'
+    return float.__repr__(value)
+
+
 class CanonicalHasher:
     """Generates stable hashes for inputs across platforms and Python versions."""
     
-    def __init__(self, use_blake3: bool = True):
+    # Buffered output is pushed into the hash function in blocks of this size
+    HASH_BLOCK_SIZE = 64 * 1024
+    # Strings at least this long have their encoded form memoized
+    STRING_MEMO_MIN_LENGTH = 256
+    
+    def __init__(self, use_blake3: bool = True, string_memo_size: int = 256):
         """
         Initialize canonical hasher.
         
         Args:
             use_blake3: Use BLAKE3 if available, fallback to SHA256
+            string_memo_size: Number of long normalized strings to remember
+                across calls (0 disables the memo)
         """
         self.use_blake3 = use_blake3 and BLAKE3_AVAILABLE
+        self.string_memo_size = string_memo_size
+        self._string_memo: "OrderedDict[str, str]" = OrderedDict()
+        self._memo_lock = threading.Lock()
     
     def hash_input(self, data: Any) -> str:
         """
         Generate canonical hash for any input data.
         
+        The canonical JSON form is produced in a single pass and fed to the
+        hash function incrementally; it is never materialized as one string.
+        
         Args:
             data: Input data to hash (dict, list, str, etc.)
             
         Returns:
             Hex-encoded hash string
         """
-        canonical_bytes = self._canonicalize_to_bytes(data)
+        hasher = blake3.blake3() if self.use_blake3 else hashlib.sha256()
+        buffer: List[str] = []
+        buffered = 0
+        
+        def write(piece: str):
+            nonlocal buffered
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= self.HASH_BLOCK_SIZE:
+                hasher.update(''.join(buffer).encode('ascii'))
+                buffer.clear()
+                buffered = 0
+        
+        self._encode_canonical(data, write, {})
+        if buffer:
+            hasher.update(''.join(buffer).encode('ascii'))
+        
+        return hasher.hexdigest()
+    
+    def _encode_canonical(self, data: Any, write: Callable[[str], None], seen: Dict[int, str]):
+        """
+        Write the canonical JSON encoding of data, equivalent to
+        json.dumps(self._canonicalize_structure(data), ...) in _canonicalize_json.
         
-        if self.use_blake3:
-            hasher = blake3.blake3()
-            hasher.update(canonical_bytes)
-            return hasher.hexdigest()
+        Args:
+            data: Value to encode
+            write: Sink receiving ASCII output fragments
+            seen: Encoded strings from this call, keyed by object identity
+        """
+        if isinstance(data, dict):
+            if not data:
+                write('{}')
+                return
+            write('{')
+            first = True
+            for key, value in sorted(data.items()):
+                if isinstance(key, str):
+                    key = _encode_string(key)
+                elif isinstance(key, float):
+                    key = '"' + _float_to_json(key) + '"'
+                elif key is True:
+                    key = '"true"'
+                elif key is False:
+                    key = '"false"'
+                elif key is None:
+                    key = '"null"'
+                elif isinstance(key, int):
+                    key = '"' + int.__repr__(key) + '"'
+                else:
+                    raise TypeError(
+                        f'keys must be str, int, float, bool or None, not {key.__class__.__name__}'
+                    )
+                write(key + ':' if first else ',' + key + ':')
+                first = False
+                self._encode_canonical(value, write, seen)
+            write('}')
+        elif isinstance(data, (list, tuple)):
+            if not data:
+                write('[]')
+                return
+            write('[')
+            first = True
+            for item in data:
+                if not first:
+                    write(',')
+                first = False
+                self._encode_canonical(item, write, seen)
+            write(']')
+        elif isinstance(data, str):
+            write(self._encode_normalized_string(data, seen))
+        elif isinstance(data, float):
+            write(_float_to_json(round(data, 6)))
+        elif data is None:
+            write('null')
+        elif data is True:
+            write('true')
+        elif data is False:
+            write('false')
+        elif isinstance(data, int):
+            write(int.__repr__(data))
         else:
-            return hashlib.sha256(canonical_bytes).hexdigest()
+            # Serializer output is not canonicalized, matching json.dumps(default=...)
+            write(json.dumps(
+                self._json_serializer(data),
+                ensure_ascii=True,
+                sort_keys=True,
+                separators=(',', ':'),
+                default=self._json_serializer
+            ))
+    
+    def _encode_normalized_string(self, text: str, seen: Dict[int, str]) -> str:
+        """Normalize and JSON-encode a string, memoizing repeated long inputs."""
+        encoded = seen.get(id(text))
+        if encoded is not None:
+            return encoded
+        
+        if len(text) < self.STRING_MEMO_MIN_LENGTH or not self.string_memo_size:
+            encoded = _encode_string(self._normalize_string(text))
+        else:
+            # Dict lookup short-circuits on identity, so repeated prompt objects
+            # are found without rescanning them
+            with self._memo_lock:
+                encoded = self._string_memo.get(text)
+                if encoded is not None:
+                    self._string_memo.move_to_end(text)
+            if encoded is None:
+                encoded = _encode_string(self._normalize_string(text))
+                with self._memo_lock:
+                    self._string_memo[text] = encoded
+                    while len(self._string_memo) > self.string_memo_size:
+                        self._string_memo.popitem(last=False)
+        
+        seen[id(text)] = encoded
+        return encoded
     
     def _canonicalize_to_bytes(self, data: Any) -> bytes:
         """Convert data to canonical byte representation."""
@@ -108,11 +247,16 @@ class CanonicalHasher:
         - Collapse multiple spaces to single space
         """
         # Normalize line endings
-        text = re.sub(r'\r\n|\r', '\n', text)
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
         
         # Trim whitespace
         text = text.strip()
         
+        # Nothing below changes text without runs of spaces or indented lines
+        if '  ' not in text and not _LEADING_WHITESPACE.search(text):
+            return text
+        
         # Collapse multiple spaces (but preserve intentional formatting)
         # Only collapse spaces that aren't part of code indentation
         lines = text.split('\n')
@@ -143,6 +287,10 @@ class CanonicalHasher:
             return str(obj)
 
 
+# Shared by the module-level helpers so the string memo spans a whole run
+_default_hasher = CanonicalHasher()
+
+
 class IOKey:
     """Represents a unique key for IO operations in record-replay."""
     
@@ -207,8 +355,7 @@ def create_io_key(event_type: str,
     Returns:
         IOKey for this operation
     """
-    hasher = CanonicalHasher()
-    input_fingerprint = hasher.hash_input(input_data)
+    input_fingerprint = _default_hasher.hash_input(input_data)
     
     return IOKey(
         event_type=event_type,
@@ -223,16 +370,14 @@ def create_io_key(event_type: str,
 # Convenience functions
 def hash_prompt(prompt: str, **params) -> str:
     """Hash a prompt with parameters for consistent lookup."""
-    hasher = CanonicalHasher()
     data = {"prompt": prompt, "params": params}
-    return hasher.hash_input(data)
+    return _default_hasher.hash_input(data)
 
 
 def hash_tool_call(tool_name: str, **kwargs) -> str:
     """Hash a tool call with arguments for consistent lookup."""
-    hasher = CanonicalHasher()
     data = {"tool": tool_name, "args": kwargs}
-    return hasher.hash_input(data)
+    return _default_hasher.hash_input(data)
 
 
 def normalize_json_for_comparison(data: Any) -> str:
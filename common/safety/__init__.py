@@ -5,8 +5,9 @@ filesystem access controls, and security policy enforcement.
 """
 from .execute import (
     ExecutionSandbox, ExecutionContext, ExecutionResult, ExecutionStatus,
-    SandboxType, get_sandbox, execute_code_safely
+    SandboxType, WarmPool, get_sandbox, execute_code_safely
 )
+from .images import ImageCache
 from .fs import (
     FilesystemAccessController, FilesystemPolicy, AccessType, AccessResult,
     FileOperation, get_fs_controller, safe_open, safe_read, safe_write,
@@ -31,6 +32,8 @@ __all__ = [
     'ExecutionResult',
     'ExecutionStatus',
     'SandboxType',
+    'WarmPool',
+    'ImageCache',
     'get_sandbox',
     'execute_code_safely',
     
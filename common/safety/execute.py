@@ -17,12 +17,19 @@ from dataclasses import dataclass, field
 from enum import Enum
 import logging
 import shutil
+import select
+import weakref
 import docker
 from docker.errors import DockerException, ContainerError, ImageNotFound
 import psutil
 
+from .images import ImageCache
+
 logger = logging.getLogger(__name__)
 
+# CFS scheduler period used for cpu.max and Docker CPU quotas, in microseconds
+CFS_PERIOD_US = 100000
+
 class ExecutionStatus(str, Enum):
     """Execution status enumeration."""
     SUCCESS = "success"
@@ -71,77 +78,423 @@ class ExecutionResult:
     container_id: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+def _read_int_file(path: str) -> Optional[int]:
+    """Read a single integer from a cgroup-style file."""
+    try:
+        with open(path, 'rb') as f:
+            return int(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _read_keyed_file(path: str) -> Dict[str, int]:
+    """Read a flat-keyed cgroup file such as cpu.stat or memory.events."""
+    values = {}
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    values[parts[0].decode()] = int(parts[1])
+    except (OSError, ValueError):
+        pass
+    return values
+
+def _read_high_water_mark_mb(pid: int) -> Optional[float]:
+    """Peak resident memory the kernel has recorded for a live process (Linux)."""
+    try:
+        with open(f"/proc/{pid}/status", 'rb') as f:
+            for line in f:
+                if line.startswith(b"VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+class CgroupV2:
+    """
+    Per-execution cgroup v2 groups under a delegated parent group.
+    
+    Each execution gets its own child group with memory.max and cpu.max set
+    from its limits, so the kernel enforces them and memory.peak and cpu.stat
+    give exact usage instead of sampled values.
+    """
+    
+    def __init__(self, root: str):
+        self.root = root
+        self._counter = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def detect(cls) -> Optional['CgroupV2']:
+        """
+        Find a cgroup v2 group this process may create execution groups in.
+        
+        AI_DEV_SQUAD_SANDBOX_CGROUP names a delegated group explicitly;
+        otherwise the process's own group is used if it already delegates
+        the memory controller to its children and is writable.
+        """
+        root = os.environ.get("AI_DEV_SQUAD_SANDBOX_CGROUP")
+        if not root:
+            try:
+                with open("/proc/self/cgroup") as f:
+                    own = next((line.strip()[3:] for line in f if line.startswith("0::")), None)
+                with open("/proc/self/mountinfo") as f:
+                    mounts = [line.split()[4] for line in f if " - cgroup2 " in line]
+            except OSError:
+                return None
+            if own is None or not mounts:
+                return None
+            root = os.path.join(mounts[0], own.lstrip("/"))
+        
+        try:
+            with open(os.path.join(root, "cgroup.subtree_control")) as f:
+                controllers = f.read().split()
+        except OSError:
+            return None
+        if "memory" not in controllers or not os.access(root, os.W_OK):
+            return None
+        return cls(root)
+    
+    def create(self, max_memory_mb: int, max_cpu_percent: int) -> Optional[str]:
+        """Create a group for one execution; None if the kernel refuses."""
+        with self._lock:
+            self._counter += 1
+            name = f"ai_dev_squad_{os.getpid()}_{self._counter}"
+        path = os.path.join(self.root, name)
+        try:
+            os.mkdir(path)
+            with open(os.path.join(path, "memory.max"), 'w') as f:
+                f.write(str(max_memory_mb * 1024 * 1024))
+        except OSError as e:
+            logger.debug(f"Could not create execution cgroup: {e}")
+            self.remove(path)
+            return None
+        
+        for filename, value in (("memory.swap.max", "0"),
+                                ("cpu.max", f"{max(1000, max_cpu_percent * CFS_PERIOD_US // 100)} {CFS_PERIOD_US}")):
+            try:
+                with open(os.path.join(path, filename), 'w') as f:
+                    f.write(value)
+            except OSError:
+                pass
+        return path
+    
+    @staticmethod
+    def read(path: str) -> Tuple[Optional[int], Optional[int], int]:
+        """Read (peak memory bytes, CPU microseconds, OOM kills) for a group."""
+        peak = _read_int_file(os.path.join(path, "memory.peak"))
+        if peak is None:
+            peak = _read_int_file(os.path.join(path, "memory.current"))
+        cpu_usec = _read_keyed_file(os.path.join(path, "cpu.stat")).get("usage_usec")
+        oom_kills = _read_keyed_file(os.path.join(path, "memory.events")).get("oom_kill", 0)
+        return peak, cpu_usec, oom_kills
+    
+    @staticmethod
+    def remove(path: str):
+        """Kill anything left in a group and remove it."""
+        try:
+            with open(os.path.join(path, "cgroup.kill"), 'w') as f:
+                f.write("1")
+        except OSError:
+            pass
+        for _ in range(10):
+            try:
+                os.rmdir(path)
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                time.sleep(0.01)
+        shutil.rmtree(path, ignore_errors=True)
+
+def _join_cgroup(path: str):
+    """Move the calling process into a cgroup (run in the child before exec)."""
+    with open(os.path.join(path, "cgroup.procs"), 'w') as f:
+        f.write("0")
+
+def _child_setup(cgroup_path: Optional[str]):
+    """Pre-exec hook: own session, and the execution's cgroup when there is one."""
+    if not cgroup_path:
+        return os.setsid
+    
+    def setup():
+        os.setsid()
+        _join_cgroup(cgroup_path)
+    return setup
+
+def _docker_cgroup_files(container_id: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Locate a container's peak memory and CPU usage files on the host.
+    
+    Returns:
+        (peak memory file, CPU usage file); either is None when not found.
+    """
+    candidates = [
+        (f"/sys/fs/cgroup/system.slice/docker-{container_id}.scope/memory.peak",
+         f"/sys/fs/cgroup/system.slice/docker-{container_id}.scope/cpu.stat"),
+        (f"/sys/fs/cgroup/docker/{container_id}/memory.peak",
+         f"/sys/fs/cgroup/docker/{container_id}/cpu.stat"),
+        (f"/sys/fs/cgroup/memory/docker/{container_id}/memory.max_usage_in_bytes",
+         f"/sys/fs/cgroup/cpuacct/docker/{container_id}/cpuacct.usage"),
+    ]
+    for memory_file, cpu_file in candidates:
+        if os.path.exists(memory_file):
+            return memory_file, cpu_file if os.path.exists(cpu_file) else None
+    return None, None
+
+class ResourceMonitorService:
+    """
+    Single background sampler shared by every running sandbox.
+    
+    Monitors register while their execution runs and are sampled together
+    in one batch per interval; the thread sleeps while nothing is
+    registered. Where the kernel keeps exact counters (cgroup v2, a
+    container's cgroup, VmHWM) those are read instead of sampled values.
+    """
+    
+    _DETECT = object()
+    
+    def __init__(self, interval: float = 0.05, cgroups: Any = _DETECT):
+        """
+        Args:
+            interval: Seconds between sampling batches.
+            cgroups: CgroupV2 parent for per-execution groups; detected by
+                default, None disables cgroup placement.
+        """
+        self.interval = interval
+        self.cgroups: Optional[CgroupV2] = CgroupV2.detect() if cgroups is self._DETECT else cgroups
+        self._monitors: set = set()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"batches": 0, "samples": 0, "registered": 0}
+    
+    def register(self, monitor: 'ResourceMonitor'):
+        """Start sampling a monitor."""
+        with self._cond:
+            self._monitors.add(monitor)
+            self.stats["registered"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+    
+    def unregister(self, monitor: 'ResourceMonitor'):
+        """Stop sampling a monitor."""
+        with self._cond:
+            self._monitors.discard(monitor)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._monitors:
+                    self._cond.wait()
+                monitors = list(self._monitors)
+            
+            for monitor in monitors:
+                try:
+                    monitor.sample()
+                except Exception as e:
+                    logger.warning(f"Resource monitoring error: {e}")
+                    self.unregister(monitor)
+            
+            with self._cond:
+                self.stats["batches"] += 1
+                self.stats["samples"] += len(monitors)
+            time.sleep(self.interval)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sampling statistics."""
+        with self._cond:
+            return {
+                **self.stats,
+                "active": len(self._monitors),
+                "interval": self.interval,
+                "cgroup_root": self.cgroups.root if self.cgroups else None
+            }
+
+_monitor_service: Optional[ResourceMonitorService] = None
+_monitor_service_lock = threading.Lock()
+
+def get_resource_monitor_service() -> ResourceMonitorService:
+    """Get the shared resource monitor service."""
+    global _monitor_service
+    with _monitor_service_lock:
+        if _monitor_service is None:
+            _monitor_service = ResourceMonitorService()
+        return _monitor_service
+
 class ResourceMonitor:
     """Monitor resource usage during execution."""
     
-    def __init__(self, max_memory_mb: int, max_cpu_percent: int):
+    def __init__(self, max_memory_mb: int, max_cpu_percent: int,
+                 service: Optional[ResourceMonitorService] = None):
         self.max_memory_mb = max_memory_mb
         self.max_cpu_percent = max_cpu_percent
         self.monitoring = False
         self.peak_memory_mb = 0.0
         self.peak_cpu_percent = 0.0
+        self.cpu_time_seconds = 0.0
         self.violations = []
-        self._monitor_thread = None
+        self.cgroup_path: Optional[str] = None
+        self._service = service
         self._process = None
+        self._psutil_process = None
+        self._container_files: Tuple[Optional[str], Optional[str]] = (None, None)
+        self._last_cpu: Optional[Tuple[float, float]] = None
+        self._started_at = None
+        self._lock = threading.Lock()
+    
+    @property
+    def service(self) -> ResourceMonitorService:
+        if self._service is None:
+            self._service = get_resource_monitor_service()
+        return self._service
+    
+    def attach_cgroup(self) -> Optional[str]:
+        """
+        Create a cgroup for the execution about to start, if supported.
+        
+        The sandbox moves the process into the returned group before it runs
+        any code; the kernel then enforces the memory and CPU limits.
+        """
+        cgroups = self.service.cgroups
+        if cgroups is not None:
+            self.cgroup_path = cgroups.create(self.max_memory_mb, self.max_cpu_percent)
+        return self.cgroup_path
     
     def start_monitoring(self, process_or_container):
         """Start monitoring resource usage."""
         self.monitoring = True
         self._process = process_or_container
-        self._monitor_thread = threading.Thread(target=self._monitor_loop)
-        self._monitor_thread.daemon = True
-        self._monitor_thread.start()
+        self._started_at = time.time()
+        if hasattr(process_or_container, 'stats'):
+            self._container_files = _docker_cgroup_files(str(getattr(process_or_container, 'id', '')))
+        self.service.register(self)
     
     def stop_monitoring(self):
         """Stop monitoring resource usage."""
-        self.monitoring = False
-        if self._monitor_thread:
-            self._monitor_thread.join(timeout=1.0)
+        if self._process is not None:
+            self.service.unregister(self)
+        with self._lock:
+            self._final_sample()
+            self.monitoring = False
+        if self.cgroup_path:
+            CgroupV2.remove(self.cgroup_path)
+            self.cgroup_path = None
     
-    def _monitor_loop(self):
-        """Main monitoring loop."""
-        while self.monitoring:
-            try:
-                if hasattr(self._process, 'stats'):  # Docker container
-                    self._monitor_docker_container()
-                else:  # Process
-                    self._monitor_process()
-                time.sleep(0.1)  # Monitor every 100ms
-            except Exception as e:
-                logger.warning(f"Resource monitoring error: {e}")
-                break
+    def record_exit_usage(self, max_rss_bytes: int, cpu_seconds: float):
+        """Record exact usage reported for an exited process (from wait4 rusage)."""
+        with self._lock:
+            self._check_memory(max_rss_bytes / (1024 * 1024))
+            self.cpu_time_seconds = max(self.cpu_time_seconds, cpu_seconds)
+    
+    def sample(self):
+        """Take one sample; called by the shared monitor service."""
+        with self._lock:
+            if not self.monitoring:
+                return
+            if self.cgroup_path:
+                self._monitor_cgroup()
+            elif hasattr(self._process, 'stats'):  # Docker container
+                self._monitor_docker_container()
+            else:  # Process
+                self._monitor_process()
+            if not self.monitoring and self._process is not None:
+                self.service.unregister(self)
+    
+    def _final_sample(self):
+        """Fold in exact final counters and the average CPU over the run."""
+        if self.cgroup_path:
+            self._monitor_cgroup(final=True)
+        elif self._container_files[0]:
+            self._monitor_docker_container()
+        elif self._process is not None and hasattr(self._process, 'pid') and not hasattr(self._process, 'stats'):
+            high_water = _read_high_water_mark_mb(self._process.pid)
+            if high_water is not None:
+                self._check_memory(high_water)
+        
+        if self._started_at and self.cpu_time_seconds:
+            elapsed = time.time() - self._started_at
+            if elapsed > 0:
+                self.peak_cpu_percent = max(self.peak_cpu_percent,
+                                            self.cpu_time_seconds / elapsed * 100.0)
+    
+    def _check_memory(self, memory_mb: float) -> bool:
+        self.peak_memory_mb = max(self.peak_memory_mb, memory_mb)
+        if memory_mb > self.max_memory_mb:
+            message = f"Memory limit exceeded: {memory_mb:.1f}MB > {self.max_memory_mb}MB"
+            if not any(v.startswith("Memory limit exceeded") for v in self.violations):
+                self.violations.append(message)
+            self.monitoring = False
+            return False
+        return True
+    
+    def _record_cpu(self, cpu_seconds: float):
+        """
+        Record CPU from a cumulative counter of a throttled cgroup.
+        
+        The kernel enforces cpu.max / the container's CPU quota per CFS
+        period, so usage is measured over at least one full period (shorter
+        windows can read above the quota) and is recorded, never a violation.
+        """
+        self.cpu_time_seconds = max(self.cpu_time_seconds, cpu_seconds)
+        now = time.time()
+        if self._last_cpu is None:
+            self._last_cpu = (now, cpu_seconds)
+            return
+        last_time, last_seconds = self._last_cpu
+        if now - last_time < CFS_PERIOD_US / 1e6:
+            return
+        self._last_cpu = (now, cpu_seconds)
+        cpu_percent = (cpu_seconds - last_seconds) / (now - last_time) * 100.0
+        self.peak_cpu_percent = max(self.peak_cpu_percent, cpu_percent)
+    
+    def _monitor_cgroup(self, final: bool = False):
+        """Read exact usage from the execution's cgroup."""
+        peak, cpu_usec, oom_kills = CgroupV2.read(self.cgroup_path)
+        if peak is not None:
+            self._check_memory(peak / (1024 * 1024))
+        if oom_kills and not any(v.startswith("Memory limit exceeded") for v in self.violations):
+            self.violations.append(f"Memory limit exceeded: killed at {self.max_memory_mb}MB")
+            self.monitoring = False
+        if cpu_usec is not None:
+            if final:
+                self.cpu_time_seconds = max(self.cpu_time_seconds, cpu_usec / 1e6)
+            else:
+                self._record_cpu(cpu_usec / 1e6)
     
     def _monitor_docker_container(self):
         """Monitor Docker container resources."""
+        memory_file, cpu_file = self._container_files
+        if memory_file:
+            # The container's own cgroup keeps the exact peak
+            peak = _read_int_file(memory_file)
+            if peak is not None and not self._check_memory(peak / (1024 * 1024)):
+                return
+            if cpu_file:
+                if cpu_file.endswith("cpu.stat"):
+                    usage = _read_keyed_file(cpu_file).get("usage_usec")
+                    cpu_seconds = usage / 1e6 if usage is not None else None
+                else:
+                    usage = _read_int_file(cpu_file)
+                    cpu_seconds = usage / 1e9 if usage is not None else None
+                if cpu_seconds is not None:
+                    self._record_cpu(cpu_seconds)
+            return
+        
         try:
-            stats = self._process.stats(stream=False)
-            
-            # Memory usage
-            memory_usage = stats['memory_stats'].get('usage', 0)
-            memory_mb = memory_usage / (1024 * 1024)
-            self.peak_memory_mb = max(self.peak_memory_mb, memory_mb)
+            stats = self._process.stats(stream=False, one_shot=True)
             
-            if memory_mb > self.max_memory_mb:
-                self.violations.append(f"Memory limit exceeded: {memory_mb:.1f}MB > {self.max_memory_mb}MB")
-                self.monitoring = False
+            # Memory usage; cgroup v1 daemons also report the exact peak
+            memory_stats = stats['memory_stats']
+            memory_usage = max(memory_stats.get('usage', 0), memory_stats.get('max_usage', 0))
+            if not self._check_memory(memory_usage / (1024 * 1024)):
                 return
             
-            # CPU usage
-            cpu_stats = stats.get('cpu_stats', {})
-            precpu_stats = stats.get('precpu_stats', {})
-            
-            if cpu_stats and precpu_stats:
-                cpu_delta = cpu_stats['cpu_usage']['total_usage'] - precpu_stats['cpu_usage']['total_usage']
-                system_delta = cpu_stats['system_cpu_usage'] - precpu_stats['system_cpu_usage']
-                
-                if system_delta > 0:
-                    cpu_percent = (cpu_delta / system_delta) * 100.0
-                    self.peak_cpu_percent = max(self.peak_cpu_percent, cpu_percent)
-                    
-                    if cpu_percent > self.max_cpu_percent:
-                        self.violations.append(f"CPU limit exceeded: {cpu_percent:.1f}% > {self.max_cpu_percent}%")
-                        self.monitoring = False
-                        return
+            # CPU usage; the container's CPU quota throttles it, so it is recorded only
+            total_usage = stats.get('cpu_stats', {}).get('cpu_usage', {}).get('total_usage')
+            if total_usage is not None:
+                self._record_cpu(total_usage / 1e9)
         
         except Exception as e:
             logger.debug(f"Docker monitoring error: {e}")
@@ -152,34 +505,407 @@ class ResourceMonitor:
             if not self._process or self._process.poll() is not None:
                 return
             
-            process = psutil.Process(self._process.pid)
+            if self._psutil_process is None:
+                self._psutil_process = psutil.Process(self._process.pid)
+            process = self._psutil_process
             
-            # Memory usage
-            memory_info = process.memory_info()
-            memory_mb = memory_info.rss / (1024 * 1024)
-            self.peak_memory_mb = max(self.peak_memory_mb, memory_mb)
-            
-            if memory_mb > self.max_memory_mb:
-                self.violations.append(f"Memory limit exceeded: {memory_mb:.1f}MB > {self.max_memory_mb}MB")
-                self.monitoring = False
+            # Memory usage; the kernel's high-water mark also covers spikes
+            # between samples
+            memory_mb = process.memory_info().rss / (1024 * 1024)
+            high_water = _read_high_water_mark_mb(self._process.pid)
+            if not self._check_memory(max(memory_mb, high_water or 0.0)):
                 return
             
-            # CPU usage
-            cpu_percent = process.cpu_percent()
-            self.peak_cpu_percent = max(self.peak_cpu_percent, cpu_percent)
-            
-            if cpu_percent > self.max_cpu_percent:
-                self.violations.append(f"CPU limit exceeded: {cpu_percent:.1f}% > {self.max_cpu_percent}%")
-                self.monitoring = False
-                return
+            # CPU usage is recorded only: a plain process cannot be throttled,
+            # and a busy single-threaded snippet would otherwise always fail
+            self.peak_cpu_percent = max(self.peak_cpu_percent, process.cpu_percent())
         
         except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
             logger.debug(f"Process monitoring error: {e}")
 
+# Fork server run by each warm subprocess worker. It imports the interpreter
+# and common modules once, then forks a fresh child per snippet, so every
+# snippet still gets its own process and session but skips interpreter
+# startup. Requests and replies are JSON lines on the worker's stdin/stdout.
+_ZYGOTE_SOURCE = r'''
+import json, os, runpy, sys, traceback
+for name in ("json", "re", "math", "random", "collections", "itertools", "functools",
+             "datetime", "typing", "dataclasses", "pathlib", "io", "time", "string"):
+    try:
+        __import__(name)
+    except ImportError:
+        pass
+
+ctrl_in = os.fdopen(os.dup(0), "r")
+ctrl_out = os.fdopen(os.dup(1), "w")
+devnull = os.open(os.devnull, os.O_RDWR)
+os.dup2(devnull, 0)
+os.dup2(devnull, 1)
+
+def run(job):
+    os.setsid()
+    if job.get("cgroup"):
+        with open(os.path.join(job["cgroup"], "cgroup.procs"), "w") as f:
+            f.write("0")
+    ctrl_in.close()
+    ctrl_out.close()
+    os.chdir(job["cwd"])
+    for fd, path in ((1, job["stdout"]), (2, job["stderr"])):
+        target = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.dup2(target, fd)
+        os.close(target)
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+    os.environ.clear()
+    os.environ.update(job["env"])
+    sys.argv = [job["path"]]
+    sys.path[0] = job["cwd"]
+    try:
+        runpy.run_path(job["path"], run_name="__main__")
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException as e:
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != job["path"]:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb)
+        return 1
+
+for line in ctrl_in:
+    job = json.loads(line)
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            code = run(job)
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(code)
+    ctrl_out.write(json.dumps({"pid": pid}) + "\n")
+    ctrl_out.flush()
+    _, status, usage = os.wait4(pid, 0)
+    ctrl_out.write(json.dumps({
+        "exit_code": os.waitstatus_to_exitcode(status),
+        "max_rss_bytes": usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024),
+        "cpu_seconds": usage.ru_utime + usage.ru_stime
+    }) + "\n")
+    ctrl_out.flush()
+'''
+
+class _ForkedProcess:
+    """Process handle for a snippet forked by a zygote worker."""
+    
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.returncode: Optional[int] = None
+    
+    def poll(self) -> Optional[int]:
+        return self.returncode
+    
+    def kill_group(self, sig: int):
+        """Signal the snippet's session; the pid doubles as its group id."""
+        for kill in (os.killpg, os.kill):
+            try:
+                kill(self.pid, sig)
+                return
+            except (ProcessLookupError, PermissionError):
+                continue
+
+class _ZygoteWorker:
+    """Warm Python fork server that runs one snippet at a time."""
+    
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", _ZYGOTE_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+            start_new_session=True
+        )
+        self.executions = 0
+        self._buffer = b""
+    
+    def alive(self) -> bool:
+        return self.process.poll() is None
+    
+    def start(self, job: Dict[str, Any]) -> _ForkedProcess:
+        """Send a job and wait for the forked child's pid."""
+        self.executions += 1
+        self.process.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+        message = self.read_message(timeout=10)
+        if message is None or "pid" not in message:
+            raise RuntimeError("Sandbox worker did not start the snippet")
+        return _ForkedProcess(message["pid"])
+    
+    def read_message(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Read one reply, or return None if none arrives within the timeout."""
+        deadline = time.time() + timeout
+        stdout = self.process.stdout
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.time()
+            if remaining <= 0 or not select.select([stdout], [], [], remaining)[0]:
+                return None
+            chunk = os.read(stdout.fileno(), 65536)
+            if not chunk:
+                raise RuntimeError("Sandbox worker exited unexpectedly")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+    
+    def close(self):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except Exception:
+            self.process.kill()
+
+# Run as the sandbox user in a pooled container before it is paused again.
+# kill -1 signals every process the user may signal except PID 1 and the shell
+# itself; the user's scratch locations are then emptied. Exits non-zero when
+# anything survives, so the container is retired instead of reused.
+_CONTAINER_RESET_SCRIPT = r'''
+kill -9 -1 2>/dev/null
+sleep 0.05
+kill -9 -1 2>/dev/null
+status=0
+uid=$(id -u)
+for dir in /tmp /var/tmp /dev/shm "$HOME"; do
+    case "$dir" in ""|/) continue ;; esac
+    [ -d "$dir" ] || continue
+    find "$dir" -mindepth 1 -user "$uid" -delete || status=1
+done
+for entry in /proc/[0-9]*; do
+    case "${entry#/proc/}" in 1|$$) continue ;; esac
+    read -r _ _ state _ 2>/dev/null < "$entry/stat" || continue
+    [ "$state" = Z ] || status=1
+done
+exit $status
+'''
+
+class _ContainerWorker:
+    """Pre-created container kept paused between executions."""
+    
+    def __init__(self, sandbox: 'DockerSandbox', image: str, context: ExecutionContext):
+        self.workspace = tempfile.mkdtemp(prefix="ai_dev_squad_warm_")
+        self.container = sandbox._create_container(image, context, self.workspace)
+        self.executions = 0
+        try:
+            # Start from the same state every later execution will see
+            if not self._reset_container():
+                raise RuntimeError("Warm container could not be reset")
+            self.container.pause()
+        except Exception:
+            self.close()
+            raise
+    
+    def alive(self) -> bool:
+        try:
+            self.container.reload()
+            return self.container.status in ("running", "paused")
+        except Exception:
+            return False
+    
+    def resume(self):
+        self.executions += 1
+        self.container.unpause()
+    
+    def _reset_container(self) -> bool:
+        """Kill leftover processes and clear /tmp and $HOME inside the container."""
+        result = self.container.exec_run(["sh", "-c", _CONTAINER_RESET_SCRIPT], user='1000:1000')
+        return result.exit_code == 0
+    
+    def suspend(self) -> bool:
+        """
+        Reset the container to its fresh state and pause it.
+        
+        Returns:
+            False if the container is unfit for reuse (e.g. a process or file
+            left by the snippet could not be removed).
+        """
+        try:
+            for entry in os.scandir(self.workspace):
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+            if not self._reset_container():
+                logger.debug("Warm container left state behind; retiring it")
+                return False
+            self.container.pause()
+            return True
+        except Exception as e:
+            logger.debug(f"Warm container could not be reset: {e}")
+            return False
+    
+    def close(self):
+        try:
+            self.container.remove(force=True)
+        except Exception as e:
+            logger.warning(f"Failed to remove container: {e}")
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+class WarmPool:
+    """
+    Pool of pre-started sandbox workers.
+    
+    Workers are handed out warm and recycled after a number of executions,
+    or straight away when an execution timed out, violated a resource limit
+    or left the worker in an unknown state. Replacements are started in the
+    background so the next acquire is again a hit. Idle workers are closed
+    on shutdown, when the pool is garbage collected, or at interpreter exit.
+    """
+    
+    def __init__(self, factory, size: int = 2, max_executions: int = 50):
+        self.factory = factory
+        self.size = size
+        self.max_executions = max_executions
+        self._idle: List[Any] = []
+        self._starting = 0
+        self._busy = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "workers_started": 0,
+            "workers_recycled": 0,
+            "recycle_reasons": {}
+        }
+        self._finalizer = weakref.finalize(self, WarmPool._close_workers, self._idle)
+    
+    @staticmethod
+    def _close_workers(workers: List[Any]):
+        # Runs without the pool (and its lock); acquire may pop concurrently
+        while True:
+            try:
+                worker = workers.pop()
+            except IndexError:
+                return
+            worker.close()
+    
+    def warm(self):
+        """Start workers in the background until the pool is full."""
+        with self._lock:
+            missing = self.size - len(self._idle) - self._starting - self._busy
+            self._starting += max(0, missing)
+        for _ in range(missing):
+            threading.Thread(target=self._start_idle_worker, daemon=True).start()
+    
+    def _start_worker(self):
+        worker = self.factory()
+        with self._lock:
+            self.stats["workers_started"] += 1
+        return worker
+    
+    def _start_idle_worker(self):
+        try:
+            worker = self._start_worker()
+        except Exception as e:
+            logger.warning(f"Failed to start warm sandbox worker: {e}")
+            with self._lock:
+                self._starting -= 1
+            return
+        with self._lock:
+            self._starting -= 1
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(worker)
+                return
+        worker.close()
+    
+    def acquire(self):
+        """Get a warm worker, starting one inline if none is idle."""
+        while True:
+            with self._lock:
+                worker = self._idle.pop() if self._idle else None
+            if worker is None:
+                break
+            if worker.alive():
+                with self._lock:
+                    self.stats["hits"] += 1
+                    self._busy += 1
+                return worker
+            self._recycle(worker, "died")
+        
+        with self._lock:
+            self.stats["misses"] += 1
+            self._busy += 1
+        self.warm()
+        try:
+            return self._start_worker()
+        except Exception:
+            with self._lock:
+                self._busy -= 1
+            raise
+    
+    def release(self, worker, recycle_reason: Optional[str] = None):
+        """
+        Return a worker to the pool.
+        
+        Args:
+            worker: Worker obtained from acquire.
+            recycle_reason: Why the worker must not be reused, if it must not.
+        """
+        if recycle_reason is None and worker.executions >= self.max_executions:
+            recycle_reason = "max_executions"
+        with self._lock:
+            self._busy -= 1
+        if recycle_reason is None:
+            with self._lock:
+                if not self._closed and len(self._idle) < self.size:
+                    self._idle.append(worker)
+                    return
+            worker.close()
+            return
+        self._recycle(worker, recycle_reason)
+        self.warm()
+    
+    def _recycle(self, worker, reason: str):
+        with self._lock:
+            self.stats["workers_recycled"] += 1
+            reasons = self.stats["recycle_reasons"]
+            reasons[reason] = reasons.get(reason, 0) + 1
+        worker.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool hit/miss and recycling statistics."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "recycle_reasons": dict(self.stats["recycle_reasons"]),
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "idle_workers": len(self._idle),
+                "size": self.size,
+                "max_executions": self.max_executions
+            }
+    
+    def shutdown(self):
+        """Stop all idle workers."""
+        with self._lock:
+            self._closed = True
+        self._finalizer()
+
 class DockerSandbox:
     """Docker-based execution sandbox."""
     
-    def __init__(self):
+    def __init__(self, pool_size: int = 2, max_executions_per_worker: int = 50,
+                 prewarm_languages: Tuple[str, ...] = ('python',)):
+        """
+        Args:
+            pool_size: Paused containers to keep per image and limit set;
+                0 disables the pool.
+            max_executions_per_worker: Executions before a container is recycled.
+            prewarm_languages: Languages whose base image pool (with default
+                limits) is filled in the background on construction.
+        """
         self.client = None
         self.base_images = {
             'python': 'python:3.11-slim',
@@ -187,7 +913,32 @@ class DockerSandbox:
             'bash': 'ubuntu:22.04',
             'shell': 'ubuntu:22.04'
         }
+        self.pool_size = pool_size
+        self.max_executions_per_worker = max_executions_per_worker
+        self.pools: Dict[Tuple, WarmPool] = {}
+        self._pools_lock = threading.Lock()
+        self._image_cache: Optional[ImageCache] = None
         self._initialize_docker()
+        
+        if self.is_available() and self.pool_size > 0 and prewarm_languages:
+            threading.Thread(target=self._prewarm, args=(prewarm_languages,),
+                             name="sandbox-prewarm", daemon=True).start()
+    
+    def _prewarm(self, languages: Tuple[str, ...]):
+        """Fill the pools used by default executions so the first one is warm."""
+        for language in languages:
+            try:
+                image = self._get_or_build_image(language, [])
+                self._get_pool(image, ExecutionContext(code="", language=language)).warm()
+            except Exception as e:
+                logger.warning(f"Failed to prewarm {language} sandbox containers: {e}")
+    
+    def close(self):
+        """Remove the paused warm containers and their workspaces."""
+        with self._pools_lock:
+            pools = list(self.pools.values())
+        for pool in pools:
+            pool.shutdown()
     
     def _initialize_docker(self):
         """Initialize Docker client."""
@@ -214,17 +965,27 @@ class DockerSandbox:
         
         start_time = time.time()
         container = None
+        worker = None
+        pool = None
+        recycle_reason = None
         monitor = ResourceMonitor(context.max_memory_mb, context.max_cpu_percent)
         
         try:
-            # Prepare execution environment
-            temp_dir = self._prepare_execution_environment(context)
-            
             # Get or build image
             image = self._get_or_build_image(context.language, context.requirements)
             
-            # Create container
-            container = self._create_container(image, context, temp_dir)
+            if self.pool_size > 0:
+                # Take a paused container created with the same image and limits
+                pool = self._get_pool(image, context)
+                worker = pool.acquire()
+                recycle_reason = "error"
+                self._prepare_execution_environment(context, worker.workspace)
+                worker.resume()
+                container = worker.container
+            else:
+                # Prepare execution environment and create container
+                temp_dir = self._prepare_execution_environment(context)
+                container = self._create_container(image, context, temp_dir)
             
             # Start monitoring
             monitor.start_monitoring(container)
@@ -243,6 +1004,11 @@ class DockerSandbox:
                 result.status = ExecutionStatus.RESOURCE_LIMIT
                 result.error_message = "; ".join(monitor.violations)
             
+            if result.status in (ExecutionStatus.TIMEOUT, ExecutionStatus.RESOURCE_LIMIT,
+                                 ExecutionStatus.DOCKER_ERROR):
+                recycle_reason = result.status.value
+            else:
+                recycle_reason = None
             return result
         
         except Exception as e:
@@ -255,15 +1021,55 @@ class DockerSandbox:
         
         finally:
             monitor.stop_monitoring()
-            if container:
+            if worker is not None:
+                if recycle_reason is None and not worker.suspend():
+                    recycle_reason = "reset_failed"
+                pool.release(worker, recycle_reason)
+            elif container:
                 try:
                     container.remove(force=True)
                 except Exception as e:
                     logger.warning(f"Failed to remove container: {e}")
     
-    def _prepare_execution_environment(self, context: ExecutionContext) -> str:
+    def _get_pool(self, image: str, context: ExecutionContext) -> WarmPool:
+        """Get the warm container pool for an image and set of limits."""
+        key = (image, context.max_memory_mb, context.max_cpu_percent,
+               context.network_enabled, tuple(sorted(context.environment.items())))
+        with self._pools_lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                limits = ExecutionContext(
+                    code="",
+                    language=context.language,
+                    environment=dict(context.environment),
+                    max_memory_mb=context.max_memory_mb,
+                    max_cpu_percent=context.max_cpu_percent,
+                    network_enabled=context.network_enabled
+                )
+                pool = WarmPool(lambda: _ContainerWorker(self, image, limits),
+                                self.pool_size, self.max_executions_per_worker)
+                self.pools[key] = pool
+            return pool
+    
+    def get_pool_stats(self) -> List[Dict[str, Any]]:
+        """Get warm container pool statistics, one entry per image and limit set."""
+        with self._pools_lock:
+            pools = list(self.pools.items())
+        return [
+            {
+                "image": key[0],
+                "max_memory_mb": key[1],
+                "max_cpu_percent": key[2],
+                "network_enabled": key[3],
+                **pool.get_stats()
+            }
+            for key, pool in pools
+        ]
+    
+    def _prepare_execution_environment(self, context: ExecutionContext,
+                                       temp_dir: Optional[str] = None) -> str:
         """Prepare temporary directory with code and files."""
-        temp_dir = tempfile.mkdtemp(prefix="ai_dev_squad_")
+        temp_dir = temp_dir or tempfile.mkdtemp(prefix="ai_dev_squad_")
         
         # Write main code file
         code_file = self._get_code_filename(context.language)
@@ -303,6 +1109,13 @@ class DockerSandbox:
         }
         return extensions.get(language, 'main.txt')
     
+    @property
+    def image_cache(self) -> ImageCache:
+        """Content-addressed cache for images with extra requirements."""
+        if self._image_cache is None:
+            self._image_cache = ImageCache(self.client)
+        return self._image_cache
+    
     def _get_or_build_image(self, language: str, requirements: List[str]) -> str:
         """Get or build Docker image for execution."""
         base_image = self.base_images.get(language, 'ubuntu:22.04')
@@ -317,40 +1130,36 @@ class DockerSandbox:
                 self.client.images.pull(base_image)
                 return base_image
         
-        # Build custom image with requirements
-        dockerfile_content = self._generate_dockerfile(language, base_image, requirements)
-        
-        # Create temporary directory for build context
-        build_dir = tempfile.mkdtemp(prefix="ai_dev_squad_build_")
-        dockerfile_path = os.path.join(build_dir, 'Dockerfile')
-        
-        try:
-            with open(dockerfile_path, 'w') as f:
-                f.write(dockerfile_content)
-            
-            # Build image
-            image_tag = f"ai-dev-squad-{language}-{hash(tuple(requirements)) % 10000}"
-            
-            try:
-                # Check if image already exists
-                self.client.images.get(image_tag)
-                return image_tag
-            except ImageNotFound:
-                logger.info(f"Building custom image: {image_tag}")
-                self.client.images.build(
-                    path=build_dir,
-                    tag=image_tag,
-                    rm=True,
-                    forcerm=True
-                )
-                return image_tag
-        
-        finally:
-            shutil.rmtree(build_dir, ignore_errors=True)
+        # Custom images are tagged by content and built once per requirement set
+        return self.image_cache.get_or_build(
+            language, base_image, requirements, self._generate_dockerfile
+        )
     
-    def _generate_dockerfile(self, language: str, base_image: str, requirements: List[str]) -> str:
-        """Generate Dockerfile for custom image."""
-        if language == 'python':
+    def _generate_dockerfile(self, language: str, base_image: str, requirements: List[str],
+                             wheelhouse: bool = False) -> str:
+        """
+        Generate Dockerfile for custom image.
+        
+        With ``wheelhouse`` the build context carries prebuilt wheels for
+        every Python requirement, so nothing is downloaded or compiled.
+        """
+        if language == 'python' and wheelhouse:
+            return f"""
+FROM {base_image}
+
+# Install Python requirements from prebuilt wheels
+COPY requirements.txt /tmp/requirements.txt
+COPY wheels /tmp/wheels
+RUN pip install --no-cache-dir --no-index --find-links /tmp/wheels -r /tmp/requirements.txt
+
+# Set working directory
+WORKDIR /workspace
+
+# Create non-root user
+RUN useradd -m -u 1000 sandbox
+USER sandbox
+"""
+        elif language == 'python':
             return f"""
 FROM {base_image}
 
@@ -415,8 +1224,8 @@ USER sandbox
             'environment': context.environment,
             'mem_limit': f"{context.max_memory_mb}m",
             'memswap_limit': f"{context.max_memory_mb}m",
-            'cpu_period': 100000,
-            'cpu_quota': int(100000 * context.max_cpu_percent / 100),
+            'cpu_period': CFS_PERIOD_US,
+            'cpu_quota': int(CFS_PERIOD_US * context.max_cpu_percent / 100),
             'network_disabled': not context.network_enabled,
             'user': '1000:1000',  # Run as non-root user
             'security_opt': ['no-new-privileges:true'],
@@ -503,8 +1312,30 @@ USER sandbox
 class SubprocessSandbox:
     """Subprocess-based execution sandbox (fallback when Docker is unavailable)."""
     
+    def __init__(self, pool_size: int = 2, max_executions_per_worker: int = 50,
+                 prewarm: bool = True):
+        """
+        Args:
+            pool_size: Warm Python workers to keep; 0 disables the pool.
+            max_executions_per_worker: Executions before a worker is recycled.
+            prewarm: Start the warm workers in the background on construction.
+        """
+        self.pool = None
+        if pool_size > 0 and hasattr(os, "fork"):
+            self.pool = WarmPool(_ZygoteWorker, pool_size, max_executions_per_worker)
+            if prewarm:
+                self.pool.warm()
+    
+    def close(self):
+        """Stop the warm workers."""
+        if self.pool is not None:
+            self.pool.shutdown()
+    
     def execute(self, context: ExecutionContext) -> ExecutionResult:
         """Execute code in subprocess."""
+        if self.pool is not None and context.language == 'python':
+            return self._execute_warm(context)
+        
         start_time = time.time()
         temp_dir = None
         process = None
@@ -525,7 +1356,7 @@ class SubprocessSandbox:
                 stderr=subprocess.PIPE,
                 env={**os.environ, **context.environment},
                 text=True,
-                preexec_fn=os.setsid if os.name != 'nt' else None
+                preexec_fn=_child_setup(monitor.attach_cgroup()) if os.name != 'nt' else None
             )
             
             # Start monitoring
@@ -595,6 +1426,119 @@ class SubprocessSandbox:
             if temp_dir:
                 shutil.rmtree(temp_dir, ignore_errors=True)
     
+    def _execute_warm(self, context: ExecutionContext) -> ExecutionResult:
+        """Execute Python code in a child forked by a warm zygote worker."""
+        start_time = time.time()
+        temp_dir = None
+        worker = None
+        child = None
+        recycle_reason = None
+        monitor = ResourceMonitor(context.max_memory_mb, context.max_cpu_percent)
+        
+        try:
+            temp_dir = self._prepare_execution_environment(context)
+            # Output is captured next to, not inside, the snippet's workspace
+            stdout_path = temp_dir + ".stdout"
+            stderr_path = temp_dir + ".stderr"
+            
+            worker = self.pool.acquire()
+            child = worker.start({
+                "path": os.path.join(temp_dir, self._get_code_filename(context.language)),
+                "cwd": temp_dir,
+                "env": {**os.environ, **context.environment},
+                "stdout": stdout_path,
+                "stderr": stderr_path,
+                "cgroup": monitor.attach_cgroup()
+            })
+            monitor.start_monitoring(child)
+            
+            # Wait for completion; unlike a plain subprocess the snippet is
+            # killed as soon as it breaks a resource limit
+            deadline = start_time + context.timeout_seconds
+            message = None
+            while message is None:
+                message = worker.read_message(timeout=0.1)
+                if message is not None:
+                    continue
+                if recycle_reason:
+                    if time.time() > deadline + 10:
+                        raise RuntimeError("Sandbox worker did not reap the killed snippet")
+                    continue
+                if time.time() > deadline:
+                    recycle_reason = "timeout"
+                    child.kill_group(signal.SIGTERM)
+                    message = worker.read_message(timeout=5)
+                    if message is None:
+                        child.kill_group(signal.SIGKILL)
+                elif monitor.violations:
+                    recycle_reason = "resource_limit"
+                    child.kill_group(signal.SIGKILL)
+            child.returncode = message["exit_code"]
+            monitor.record_exit_usage(message["max_rss_bytes"], message["cpu_seconds"])
+            monitor.stop_monitoring()
+            
+            stdout = self._read_output(stdout_path)
+            stderr = self._read_output(stderr_path)
+            if recycle_reason == "timeout":
+                return ExecutionResult(
+                    status=ExecutionStatus.TIMEOUT,
+                    stdout=stdout,
+                    stderr=stderr,
+                    error_message=f"Execution timed out after {context.timeout_seconds} seconds",
+                    execution_time=time.time() - start_time
+                )
+            
+            if monitor.violations:
+                recycle_reason = "resource_limit"
+                status = ExecutionStatus.RESOURCE_LIMIT
+                error_message = "; ".join(monitor.violations)
+            elif child.returncode == 0:
+                status = ExecutionStatus.SUCCESS
+                error_message = None
+            else:
+                status = ExecutionStatus.FAILURE
+                error_message = None
+            
+            return ExecutionResult(
+                status=status,
+                stdout=stdout,
+                stderr=stderr,
+                exit_code=child.returncode,
+                execution_time=time.time() - start_time,
+                memory_usage_mb=monitor.peak_memory_mb,
+                cpu_usage_percent=monitor.peak_cpu_percent,
+                error_message=error_message
+            )
+        
+        except Exception as e:
+            logger.error(f"Subprocess execution error: {e}")
+            recycle_reason = "error"
+            if child is not None and child.returncode is None:
+                child.kill_group(signal.SIGKILL)
+            return ExecutionResult(
+                status=ExecutionStatus.SYSTEM_ERROR,
+                error_message=str(e),
+                execution_time=time.time() - start_time
+            )
+        
+        finally:
+            monitor.stop_monitoring()
+            if worker is not None:
+                self.pool.release(worker, recycle_reason)
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                for path in (temp_dir + ".stdout", temp_dir + ".stderr"):
+                    if os.path.exists(path):
+                        os.unlink(path)
+    
+    def _read_output(self, path: str) -> str:
+        """Read captured output written by a forked snippet."""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
+    
     def _prepare_execution_environment(self, context: ExecutionContext) -> str:
         """Prepare temporary directory with code and files."""
         temp_dir = tempfile.mkdtemp(prefix="ai_dev_squad_subprocess_")
@@ -639,15 +1583,35 @@ class SubprocessSandbox:
 class ExecutionSandbox:
     """Main execution sandbox that chooses between Docker and subprocess."""
     
-    def __init__(self, sandbox_type: Optional[SandboxType] = None):
+    def __init__(self, sandbox_type: Optional[SandboxType] = None,
+                 pool_size: int = 2, max_executions_per_worker: int = 50):
+        """
+        Args:
+            sandbox_type: Preferred sandbox; falls back to subprocess without Docker.
+            pool_size: Warm workers (zygote processes or paused containers)
+                kept per pool; 0 starts a fresh interpreter or container per call.
+            max_executions_per_worker: Executions before a worker is recycled.
+        """
         self.sandbox_type = sandbox_type or SandboxType.DOCKER
-        self.docker_sandbox = DockerSandbox()
-        self.subprocess_sandbox = SubprocessSandbox()
+        # Only the sandbox that will serve executions is prewarmed
+        self.docker_sandbox = DockerSandbox(
+            pool_size, max_executions_per_worker,
+            prewarm_languages=('python',) if self.sandbox_type == SandboxType.DOCKER else ()
+        )
+        self.subprocess_sandbox = SubprocessSandbox(pool_size, max_executions_per_worker, prewarm=False)
         
         # Auto-detect best available sandbox
         if self.sandbox_type == SandboxType.DOCKER and not self.docker_sandbox.is_available():
             logger.warning("Docker not available, falling back to subprocess sandbox")
             self.sandbox_type = SandboxType.SUBPROCESS
+        
+        if self.sandbox_type == SandboxType.SUBPROCESS and self.subprocess_sandbox.pool is not None:
+            self.subprocess_sandbox.pool.warm()
+    
+    def close(self):
+        """Stop the warm workers of both sandboxes."""
+        self.docker_sandbox.close()
+        self.subprocess_sandbox.close()
     
     def execute_code(self, 
                     code: str,
@@ -702,12 +1666,29 @@ class ExecutionSandbox:
         """Check if Docker sandbox is available."""
         return self.docker_sandbox.is_available()
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get warm worker pool hit/miss and recycling statistics."""
+        subprocess_pool = self.subprocess_sandbox.pool
+        docker_pools = self.docker_sandbox.get_pool_stats()
+        pools = docker_pools + ([subprocess_pool.get_stats()] if subprocess_pool else [])
+        hits = sum(pool["hits"] for pool in pools)
+        misses = sum(pool["misses"] for pool in pools)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'workers_recycled': sum(pool["workers_recycled"] for pool in pools),
+            'subprocess': subprocess_pool.get_stats() if subprocess_pool else None,
+            'docker': docker_pools
+        }
+    
     def get_sandbox_info(self) -> Dict[str, Any]:
         """Get information about the current sandbox."""
         return {
             'type': self.sandbox_type.value,
             'docker_available': self.is_docker_available(),
-            'supported_languages': ['python', 'javascript', 'bash', 'shell']
+            'supported_languages': ['python', 'javascript', 'bash', 'shell'],
+            'pool': self.get_pool_stats()
         }
 
 # Global sandbox instance
@@ -717,6 +1698,8 @@ def get_sandbox(sandbox_type: Optional[SandboxType] = None) -> ExecutionSandbox:
     """Get the global sandbox instance."""
     global _sandbox
     if _sandbox is None or (sandbox_type and _sandbox.sandbox_type != sandbox_type):
+        if _sandbox is not None:
+            _sandbox.close()
         _sandbox = ExecutionSandbox(sandbox_type)
     return _sandbox
 
@@ -0,0 +1,430 @@
+"""
+Sandbox Image Cache for AI Dev Squad Comparison
+This module builds and caches Docker images for sandbox executions that need
+extra packages. Images are tagged by content, built once per requirement set
+across every process sharing the Docker daemon, and garbage collected LRU.
+"""
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+from docker.errors import DockerException, ImageNotFound
+
+from common.caching import SingleFlight
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+def normalize_requirements(requirements: List[str]) -> List[str]:
+    """Sorted, de-duplicated requirement specifiers; order and repeats do not change an image."""
+    return sorted({req.strip() for req in requirements if req and req.strip()})
+
+class ImageCache:
+    """
+    Content-addressed cache of sandbox images.
+
+    An image's tag is a digest of the language, the base image's content
+    digest, the sorted requirements and the Dockerfile, so identical
+    requirement sets map to the same image in every process and different
+    ones never collide. Builds of the same tag are de-duplicated within the
+    process and, through a lock file, across processes; with a registry
+    configured they are shared across hosts as well. Python wheels are kept
+    in a wheelhouse shared by all builds for a base image, so a package is
+    downloaded and compiled once.
+    """
+
+    def __init__(self,
+                 client,
+                 cache_dir: Optional[str] = None,
+                 max_images: int = 50,
+                 max_size_mb: int = 20 * 1024,
+                 min_idle_seconds: int = 3600,
+                 registry: Optional[str] = None):
+        """
+        Initialize image cache.
+
+        Args:
+            client: Docker client.
+            cache_dir: Directory for the image index, lock files and wheelhouse.
+            max_images: Cached images kept before LRU collection.
+            max_size_mb: Total size of cached images kept before LRU collection.
+            min_idle_seconds: Images used more recently than this are never collected.
+            registry: Optional registry to pull prebuilt images from and push
+                new ones to; defaults to AI_DEV_SQUAD_IMAGE_REGISTRY.
+        """
+        self.client = client
+        self.cache_dir = Path(cache_dir or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "images"
+        ))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / "locks").mkdir(exist_ok=True)
+        self.max_images = max_images
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.min_idle_seconds = min_idle_seconds
+        self.registry = registry or os.environ.get("AI_DEV_SQUAD_IMAGE_REGISTRY")
+
+        self.db_path = self.cache_dir / "images.db"
+        self._init_database()
+
+        self._single_flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._resolved: Dict[str, str] = {}  # request key -> tag
+        self._touched: Dict[str, float] = {}
+        self.stats = {
+            "hits": 0,
+            "builds": 0,
+            "coalesced": 0,
+            "registry_pulls": 0,
+            "wheel_prefetch_failures": 0,
+            "images_collected": 0
+        }
+
+    def _init_database(self) -> None:
+        """Initialize the image index."""
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS images (
+                    tag TEXT PRIMARY KEY,
+                    language TEXT NOT NULL,
+                    requirements TEXT NOT NULL,
+                    base_digest TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_images_last_used ON images(last_used)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _file_lock(self, name: str):
+        """Hold an exclusive lock shared by every process using this cache directory."""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(self.cache_dir / "locks" / f"{name}.lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def image_tag(self, language: str, base_digest: str, requirements: List[str],
+                  dockerfile: str) -> str:
+        """Deterministic content-addressed tag for an image."""
+        payload = json.dumps({
+            "language": language,
+            "base": base_digest,
+            "requirements": normalize_requirements(requirements),
+            "dockerfile": dockerfile
+        }, sort_keys=True)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"ai-dev-squad-{language}:{digest[:32]}"
+
+    def _base_digest(self, base_image: str) -> str:
+        """Content digest (image ID) of a base image, pulling it if missing."""
+        try:
+            return self.client.images.get(base_image).id
+        except ImageNotFound:
+            logger.info(f"Pulling base image: {base_image}")
+            return self.client.images.pull(base_image).id
+
+    def get_or_build(self, language: str, base_image: str, requirements: List[str],
+                     dockerfile_fn: Callable[..., str]) -> str:
+        """
+        Get the image for a requirement set, building it at most once.
+
+        Args:
+            language: Sandbox language.
+            base_image: Base image name.
+            requirements: Package requirements.
+            dockerfile_fn: Called as ``dockerfile_fn(language, base_image,
+                requirements, wheelhouse=...)`` to render the Dockerfile.
+
+        Returns:
+            Image tag.
+        """
+        requirements = normalize_requirements(requirements)
+        request_key = json.dumps([language, base_image, requirements])
+
+        with self._lock:
+            tag = self._resolved.get(request_key)
+        if tag is not None:
+            with self._lock:
+                self.stats["hits"] += 1
+            self._touch(tag)
+            return tag
+
+        base_digest = self._base_digest(base_image)
+        wheelhouse = language == "python"
+        dockerfile = dockerfile_fn(language, base_image, requirements, wheelhouse=wheelhouse)
+        tag = self.image_tag(language, base_digest, requirements, dockerfile)
+
+        # The tag returned is the one actually built, which differs when the
+        # wheel prefetch fails
+        (tag, built), shared = self._single_flight.do(
+            tag, lambda: self._ensure_image(tag, language, base_image, base_digest,
+                                            requirements, dockerfile_fn, wheelhouse)
+        )
+        with self._lock:
+            self._resolved[request_key] = tag
+            if shared:
+                self.stats["coalesced"] += 1
+            elif not built:
+                self.stats["hits"] += 1
+        self._touch(tag, force=True)
+        return tag
+
+    def _ensure_image(self, tag: str, language: str, base_image: str, base_digest: str,
+                      requirements: List[str], dockerfile_fn: Callable[..., str],
+                      wheelhouse: bool) -> Tuple[str, bool]:
+        """Make sure an image exists locally; returns its tag and whether this call built it."""
+        if self._image_exists(tag):
+            return tag, False
+
+        with self._file_lock(tag.split(":")[-1]):
+            # Another process may have finished the build while we waited
+            if self._image_exists(tag) or self._pull_from_registry(tag):
+                return tag, False
+
+            tag, built = self._build(tag, language, base_image, base_digest, requirements,
+                                     dockerfile_fn, wheelhouse)
+
+        if built:
+            self.collect_garbage(keep={tag})
+        return tag, built
+
+    def _image_exists(self, tag: str) -> bool:
+        try:
+            self.client.images.get(tag)
+            return True
+        except ImageNotFound:
+            return False
+
+    def _pull_from_registry(self, tag: str) -> bool:
+        """Fetch an image another host already built."""
+        if not self.registry:
+            return False
+        remote = f"{self.registry}/{tag}"
+        try:
+            image = self.client.images.pull(remote)
+        except DockerException:
+            return False
+        image.tag(*tag.split(":"))
+        with self._lock:
+            self.stats["registry_pulls"] += 1
+        self._record(tag, image)
+        return True
+
+    def _build(self, tag: str, language: str, base_image: str, base_digest: str,
+               requirements: List[str], dockerfile_fn: Callable[..., str],
+               wheelhouse: bool) -> Tuple[str, bool]:
+        """
+        Build an image from a fresh build context.
+
+        Returns:
+            The tag of the image, which is the fallback Dockerfile's tag when
+            the wheel prefetch failed, and whether it had to be built.
+        """
+        build_dir = tempfile.mkdtemp(prefix="ai_dev_squad_build_")
+        try:
+            if language == "python":
+                with open(os.path.join(build_dir, "requirements.txt"), "w") as f:
+                    f.write("\n".join(requirements) + "\n")
+            elif language == "javascript":
+                with open(os.path.join(build_dir, "package.json"), "w") as f:
+                    json.dump({
+                        "name": "ai-dev-squad-execution",
+                        "version": "1.0.0",
+                        "dependencies": {req: "latest" for req in requirements}
+                    }, f, indent=2)
+
+            if wheelhouse and not self._prefetch_wheels(base_digest, build_dir):
+                # A different Dockerfile is a different image, so it is found
+                # or built under its own content-addressed tag
+                dockerfile = dockerfile_fn(language, base_image, requirements, wheelhouse=False)
+                tag = self.image_tag(language, base_digest, requirements, dockerfile)
+                if self._image_exists(tag) or self._pull_from_registry(tag):
+                    return tag, False
+            else:
+                dockerfile = dockerfile_fn(language, base_image, requirements, wheelhouse=wheelhouse)
+            with open(os.path.join(build_dir, "Dockerfile"), "w") as f:
+                f.write(dockerfile)
+
+            logger.info(f"Building custom image: {tag}")
+            image, _ = self.client.images.build(
+                path=build_dir,
+                tag=tag,
+                rm=True,
+                forcerm=True,
+                labels={
+                    "ai-dev-squad.requirements": ",".join(requirements),
+                    "ai-dev-squad.base-digest": base_digest
+                }
+            )
+            with self._lock:
+                self.stats["builds"] += 1
+            self._record(tag, image, language, requirements, base_digest)
+
+            if self.registry:
+                try:
+                    remote_repo, remote_tag = f"{self.registry}/{tag}".rsplit(":", 1)
+                    image.tag(remote_repo, remote_tag)
+                    self.client.images.push(remote_repo, tag=remote_tag)
+                except DockerException as e:
+                    logger.warning(f"Failed to push {tag} to {self.registry}: {e}")
+            return tag, True
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    def _prefetch_wheels(self, base_digest: str, build_dir: str) -> bool:
+        """
+        Resolve wheels for the build through the shared wheelhouse.
+
+        pip runs inside the base image, so wheels match its interpreter and
+        platform. Wheels already in the wheelhouse are reused; new ones are
+        added to it for later builds.
+        """
+        wheelhouse = self.cache_dir / "wheels" / base_digest.replace("sha256:", "")[:16]
+        wheelhouse.mkdir(parents=True, exist_ok=True)
+        wheels_dir = os.path.join(build_dir, "wheels")
+        os.makedirs(wheels_dir)
+
+        try:
+            self.client.containers.run(
+                base_digest,
+                ["pip", "wheel", "--quiet", "--wheel-dir", "/out",
+                 "--find-links", "/wheelhouse", "-r", "/build/requirements.txt"],
+                volumes={
+                    str(wheelhouse): {"bind": "/wheelhouse", "mode": "ro"},
+                    build_dir: {"bind": "/build", "mode": "ro"},
+                    wheels_dir: {"bind": "/out", "mode": "rw"}
+                },
+                remove=True
+            )
+        except DockerException as e:
+            logger.warning(f"Wheel prefetch failed, building without the wheelhouse: {e}")
+            with self._lock:
+                self.stats["wheel_prefetch_failures"] += 1
+            shutil.rmtree(wheels_dir, ignore_errors=True)
+            return False
+
+        with self._file_lock("wheelhouse"):
+            for name in os.listdir(wheels_dir):
+                target = wheelhouse / name
+                if not target.exists():
+                    shutil.copy2(os.path.join(wheels_dir, name), target)
+        return True
+
+    def _record(self, tag: str, image, language: Optional[str] = None,
+                requirements: Optional[List[str]] = None, base_digest: str = "") -> None:
+        """Add an image to the index."""
+        labels = (image.attrs.get("Config") or {}).get("Labels") or {}
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO images
+                (tag, language, requirements, base_digest, size_bytes, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                tag,
+                language or tag.split(":")[0].replace("ai-dev-squad-", ""),
+                ",".join(requirements) if requirements is not None else labels.get("ai-dev-squad.requirements", ""),
+                base_digest or labels.get("ai-dev-squad.base-digest", ""),
+                int(image.attrs.get("Size", 0)),
+                now,
+                now
+            ))
+
+    def _touch(self, tag: str, force: bool = False) -> None:
+        """Mark an image as used; index writes are throttled to one a minute."""
+        now = time.time()
+        with self._lock:
+            if not force and now - self._touched.get(tag, 0) < 60:
+                return
+            self._touched[tag] = now
+        with self._connect() as conn:
+            conn.execute("UPDATE images SET last_used = ? WHERE tag = ?", (now, tag))
+
+    def collect_garbage(self, keep: Optional[set] = None) -> List[str]:
+        """
+        Remove least recently used images over the count or size budget.
+
+        Args:
+            keep: Tags never to remove in this pass.
+
+        Returns:
+            Removed tags.
+        """
+        keep = keep or set()
+        removed = []
+        with self._file_lock("gc"):
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT tag, size_bytes, last_used FROM images ORDER BY last_used ASC"
+                ).fetchall()
+
+            count = len(rows)
+            total = sum(row[1] for row in rows)
+            cutoff = time.time() - self.min_idle_seconds
+            for tag, size_bytes, last_used in rows:
+                if count <= self.max_images and total <= self.max_size_bytes:
+                    break
+                if tag in keep or last_used > cutoff:
+                    continue
+                try:
+                    self.client.images.remove(tag)
+                except ImageNotFound:
+                    pass
+                except DockerException as e:
+                    logger.debug(f"Image {tag} not collected: {e}")
+                    continue
+                with self._connect() as conn:
+                    conn.execute("DELETE FROM images WHERE tag = ?", (tag,))
+                removed.append(tag)
+                count -= 1
+                total -= size_bytes
+
+        if removed:
+            logger.info(f"Collected {len(removed)} unused sandbox images")
+            with self._lock:
+                self.stats["images_collected"] += len(removed)
+                self._resolved = {k: v for k, v in self._resolved.items() if v not in removed}
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get image cache statistics."""
+        with self._connect() as conn:
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM images"
+            ).fetchone()
+        with self._lock:
+            return {
+                **self.stats,
+                "cached_images": count,
+                "cached_size_mb": total / (1024 * 1024),
+                "registry": self.registry
+            }
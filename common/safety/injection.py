@@ -7,16 +7,37 @@ import re
 import json
 import yaml
 import hashlib
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Set, Tuple, Union, Callable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Output filtering patterns: (pattern, replacement, description)
+_OUTPUT_FILTER_PATTERNS = [
+    # Credential patterns
+    (re.compile(r'(password|api[_\s]?key|secret|token)\s*[:=]\s*["\']?([a-zA-Z0-9_\-\.]{8,})["\']?', re.IGNORECASE),
+     r'\1: [REDACTED]', "Credential redaction"),
+    
+    # System path disclosure
+    (re.compile(r'(/etc/|/root/|C:\\Windows\\|C:\\Users\\)', re.IGNORECASE),
+     '[SYSTEM_PATH]', "System path redaction"),
+    
+    # IP address patterns (private ranges)
+    (re.compile(r'\b(192\.168\.|10\.|172\.(1[6-9]|2[0-9]|3[01])\.)[\d\.]+\b', re.IGNORECASE),
+     '[PRIVATE_IP]', "Private IP redaction"),
+    
+    # Error stack traces with paths
+    (re.compile(r'File\s+"([^"]*[/\\][^"]*)"', re.IGNORECASE),
+     'File "[REDACTED_PATH]"', "File path redaction"),
+]
+
 class InjectionType(str, Enum):
     """Prompt injection attack type enumeration."""
     DIRECT_INJECTION = "direct_injection"
@@ -55,6 +76,9 @@ class InjectionPattern:
     action: FilterAction = FilterAction.BLOCK
     case_sensitive: bool = False
     regex_flags: int = 0
+    # Literal prefilter: the pattern can only match text containing one of
+    # these (empty = always scan). Compared lowercase unless case_sensitive.
+    keywords: List[str] = field(default_factory=list)
     compiled_pattern: Optional[re.Pattern] = field(default=None, init=False)
     
     def __post_init__(self):
@@ -98,12 +122,34 @@ class PromptInjectionGuard:
     """
     
     def __init__(self, patterns_file: Optional[str] = None, 
-                 llm_judge: Optional[Callable] = None):
+                 llm_judge: Optional[Callable] = None,
+                 verdict_cache_size: int = 1024):
         self.patterns: List[InjectionPattern] = []
         self.llm_judge = llm_judge
         self.audit_log: List[InjectionEvent] = []
         self.enabled = True
         
+        # Compiled patterns with their prefilter keywords, rebuilt whenever
+        # the pattern list changes
+        self._scanner_signature: Optional[Tuple[int, ...]] = None
+        self._scan_entries: List[Tuple[InjectionPattern, List[str]]] = []
+        
+        # LRU of recent verdicts keyed by content hash
+        self.verdict_cache_size = verdict_cache_size
+        self._verdict_cache: "OrderedDict[bytes, InjectionDetection]" = OrderedDict()
+        self._verdict_lock = threading.Lock()
+        
+        # Scan performance counters
+        self._scan_stats = {
+            'scans': 0,
+            'bytes_scanned': 0,
+            'scan_seconds': 0.0,
+            # Pattern evaluations avoided because no trigger keyword occurred
+            'prefilter_skips': 0,
+            'verdict_cache_hits': 0,
+            'verdict_cache_misses': 0
+        }
+        
         # Load default patterns
         self._load_default_patterns()
         
@@ -123,7 +169,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.DIRECT_INJECTION,
                 threat_level=ThreatLevel.HIGH,
                 description="Attempts to ignore previous instructions",
-                action=FilterAction.BLOCK
+                action=FilterAction.BLOCK,
+                keywords=["ignore"]
             ),
             InjectionPattern(
                 name="forget_context",
@@ -131,7 +178,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.CONTEXT_MANIPULATION,
                 threat_level=ThreatLevel.HIGH,
                 description="Attempts to clear context or memory",
-                action=FilterAction.BLOCK
+                action=FilterAction.BLOCK,
+                keywords=["forget"]
             ),
             InjectionPattern(
                 name="new_instructions",
@@ -139,7 +187,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.INSTRUCTION_OVERRIDE,
                 threat_level=ThreatLevel.MEDIUM,
                 description="Attempts to provide new instructions",
-                action=FilterAction.FLAG
+                action=FilterAction.FLAG,
+                keywords=["instruction", "rule", "guideline", "prompt"]
             ),
             
             # Role hijacking
@@ -149,7 +198,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.ROLE_HIJACKING,
                 threat_level=ThreatLevel.HIGH,
                 description="Attempts to change AI role or identity",
-                action=FilterAction.BLOCK
+                action=FilterAction.BLOCK,
+                keywords=["now"]
             ),
             InjectionPattern(
                 name="pretend_to_be",
@@ -157,7 +207,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.ROLE_HIJACKING,
                 threat_level=ThreatLevel.MEDIUM,
                 description="Attempts to make AI pretend to be something else",
-                action=FilterAction.FLAG
+                action=FilterAction.FLAG,
+                keywords=["pretend"]
             ),
             
             # System prompt extraction
@@ -167,7 +218,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.SYSTEM_PROMPT_EXTRACTION,
                 threat_level=ThreatLevel.MEDIUM,
                 description="Attempts to extract system prompt",
-                action=FilterAction.BLOCK
+                action=FilterAction.BLOCK,
+                keywords=["prompt", "instruction", "guideline"]
             ),
             InjectionPattern(
                 name="initial_instructions",
@@ -175,7 +227,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.SYSTEM_PROMPT_EXTRACTION,
                 threat_level=ThreatLevel.MEDIUM,
                 description="Attempts to access initial instructions",
-                action=FilterAction.FLAG
+                action=FilterAction.FLAG,
+                keywords=["instruction", "prompt", "message"]
             ),
             
             # Code injection
@@ -185,7 +238,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.CODE_INJECTION,
                 threat_level=ThreatLevel.CRITICAL,
                 description="Attempts to execute arbitrary code",
-                action=FilterAction.BLOCK
+                action=FilterAction.BLOCK,
+                keywords=["code", "script", "command"]
             ),
             InjectionPattern(
                 name="system_commands",
@@ -193,7 +247,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.CODE_INJECTION,
                 threat_level=ThreatLevel.CRITICAL,
                 description="Dangerous system command patterns",
-                action=FilterAction.BLOCK
+                action=FilterAction.BLOCK,
+                keywords=["import", "subprocess.", "os.system", "exec(", "eval("]
             ),
             
             # Credential extraction
@@ -203,7 +258,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.CREDENTIAL_EXTRACTION,
                 threat_level=ThreatLevel.CRITICAL,
                 description="Attempts to extract credentials",
-                action=FilterAction.BLOCK
+                action=FilterAction.BLOCK,
+                keywords=["password", "api", "secret", "token"]
             ),
             
             # Jailbreak attempts
@@ -213,7 +269,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.JAILBREAK_ATTEMPT,
                 threat_level=ThreatLevel.HIGH,
                 description="Common jailbreak attempt phrases",
-                action=FilterAction.BLOCK
+                action=FilterAction.BLOCK,
+                keywords=["jailbreak", "bypass", "ignore", "disable"]
             ),
             InjectionPattern(
                 name="hypothetical_scenario",
@@ -221,7 +278,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.JAILBREAK_ATTEMPT,
                 threat_level=ThreatLevel.MEDIUM,
                 description="Hypothetical scenario jailbreak attempts",
-                action=FilterAction.FLAG
+                action=FilterAction.FLAG,
+                keywords=["ignore", "bypass", "disable"]
             ),
             
             # Output manipulation
@@ -231,7 +289,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.OUTPUT_MANIPULATION,
                 threat_level=ThreatLevel.LOW,
                 description="Attempts to override output format",
-                action=FilterAction.SANITIZE
+                action=FilterAction.SANITIZE,
+                keywords=["only", "just"]
             ),
             
             # Context manipulation
@@ -241,7 +300,8 @@ class PromptInjectionGuard:
                 injection_type=InjectionType.CONTEXT_MANIPULATION,
                 threat_level=ThreatLevel.MEDIUM,
                 description="Attempts to reset conversation context",
-                action=FilterAction.FLAG
+                action=FilterAction.FLAG,
+                keywords=["conversation", "chat", "context"]
             )
         ]
         
@@ -280,7 +340,8 @@ class PromptInjectionGuard:
                             threat_level=ThreatLevel(pattern_data['threat_level']),
                             description=pattern_data['description'],
                             action=FilterAction(pattern_data.get('action', 'block')),
-                            case_sensitive=pattern_data.get('case_sensitive', False)
+                            case_sensitive=pattern_data.get('case_sensitive', False),
+                            keywords=pattern_data.get('keywords', [])
                         )
                         self.patterns.append(pattern)
                     except Exception as e:
@@ -295,6 +356,74 @@ class PromptInjectionGuard:
         """Calculate hash of input text for tracking."""
         return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
     
+    def _refresh_scanner(self):
+        """Rebuild the scan table if patterns were added or replaced."""
+        signature = tuple(id(p.compiled_pattern) for p in self.patterns)
+        if signature == self._scanner_signature:
+            return
+        
+        self._scan_entries = [
+            (pattern, [kw if pattern.case_sensitive else kw.lower() for kw in pattern.keywords])
+            for pattern in self.patterns
+            if pattern.compiled_pattern
+        ]
+        self._scanner_signature = signature
+        with self._verdict_lock:
+            self._verdict_cache.clear()
+    
+    def _scan(self, text: str) -> List[InjectionPattern]:
+        """Return the patterns that match somewhere in text, in pattern order."""
+        # Literal prefilter: one lowercase copy, then substring checks. Plain
+        # lowercasing only mirrors IGNORECASE exactly for ASCII text, so other
+        # text goes straight to the regexes.
+        lowered = text.lower() if text.isascii() else None
+        matched = []
+        skipped = 0
+        
+        for pattern, keywords in self._scan_entries:
+            if keywords and lowered is not None:
+                haystack = text if pattern.case_sensitive else lowered
+                if not any(kw in haystack for kw in keywords):
+                    skipped += 1
+                    continue
+            
+            if pattern.compiled_pattern.search(text):
+                matched.append(pattern)
+        
+        self._scan_stats['prefilter_skips'] += skipped
+        return matched
+    
+    def _cached_verdict(self, key: bytes) -> Optional[InjectionDetection]:
+        """Return a copy of a cached verdict, if any."""
+        with self._verdict_lock:
+            cached = self._verdict_cache.get(key)
+            if cached is None:
+                self._scan_stats['verdict_cache_misses'] += 1
+                return None
+            self._verdict_cache.move_to_end(key)
+            self._scan_stats['verdict_cache_hits'] += 1
+        
+        return replace(
+            cached,
+            patterns_matched=list(cached.patterns_matched),
+            blocked_content=list(cached.blocked_content),
+            metadata={**cached.metadata, 'injection_types': list(cached.metadata['injection_types'])}
+        )
+    
+    def _store_verdict(self, key: bytes, detection: InjectionDetection):
+        """Remember a verdict, evicting the least recently used."""
+        if self.verdict_cache_size <= 0:
+            return
+        with self._verdict_lock:
+            self._verdict_cache[key] = replace(
+                detection,
+                patterns_matched=list(detection.patterns_matched),
+                blocked_content=list(detection.blocked_content),
+                metadata={**detection.metadata, 'injection_types': list(detection.metadata['injection_types'])}
+            )
+            while len(self._verdict_cache) > self.verdict_cache_size:
+                self._verdict_cache.popitem(last=False)
+    
     def detect_injection(self, text: str) -> InjectionDetection:
         """
         Detect prompt injection attempts in input text.
@@ -308,36 +437,38 @@ class PromptInjectionGuard:
         if not self.enabled or not text:
             return InjectionDetection(detected=False)
         
-        matched_patterns = []
+        self._refresh_scanner()
+        
+        encoded = text.encode('utf-8', 'surrogatepass')
+        cache_key = hashlib.blake2b(encoded, digest_size=16).digest()
+        cached = self._cached_verdict(cache_key)
+        if cached is not None:
+            return cached
+        
+        scan_start = time.perf_counter()
+        matched_patterns = self._scan(text)
         blocked_content = []
         max_threat_level = ThreatLevel.LOW
         total_confidence = 0.0
         
-        # Check against all patterns
-        for pattern in self.patterns:
-            if not pattern.compiled_pattern:
-                continue
+        for pattern in matched_patterns:
+            # Track blocked content for sanitization; only these need every match
+            if pattern.action in [FilterAction.BLOCK, FilterAction.SANITIZE]:
+                matches = pattern.compiled_pattern.findall(text)
+                blocked_content.extend(matches if isinstance(matches[0], str) else [match[0] for match in matches])
             
-            matches = pattern.compiled_pattern.findall(text)
-            if matches:
-                matched_patterns.append(pattern)
-                
-                # Track blocked content for sanitization
-                if pattern.action in [FilterAction.BLOCK, FilterAction.SANITIZE]:
-                    blocked_content.extend(matches if isinstance(matches[0], str) else [match[0] for match in matches])
-                
-                # Update threat level (take highest)
-                if self._threat_level_value(pattern.threat_level) > self._threat_level_value(max_threat_level):
-                    max_threat_level = pattern.threat_level
-                
-                # Add to confidence score
-                confidence_boost = {
-                    ThreatLevel.LOW: 0.2,
-                    ThreatLevel.MEDIUM: 0.4,
-                    ThreatLevel.HIGH: 0.7,
-                    ThreatLevel.CRITICAL: 1.0
-                }[pattern.threat_level]
-                total_confidence += confidence_boost
+            # Update threat level (take highest)
+            if self._threat_level_value(pattern.threat_level) > self._threat_level_value(max_threat_level):
+                max_threat_level = pattern.threat_level
+            
+            # Add to confidence score
+            confidence_boost = {
+                ThreatLevel.LOW: 0.2,
+                ThreatLevel.MEDIUM: 0.4,
+                ThreatLevel.HIGH: 0.7,
+                ThreatLevel.CRITICAL: 1.0
+            }[pattern.threat_level]
+            total_confidence += confidence_boost
         
         # Cap confidence at 1.0
         total_confidence = min(total_confidence, 1.0)
@@ -350,7 +481,7 @@ class PromptInjectionGuard:
         if detected and any(p.action == FilterAction.SANITIZE for p in matched_patterns):
             sanitized_input = self._sanitize_input(text, matched_patterns)
         
-        return InjectionDetection(
+        detection = InjectionDetection(
             detected=detected,
             patterns_matched=matched_patterns,
             threat_level=max_threat_level,
@@ -362,6 +493,13 @@ class PromptInjectionGuard:
                 'injection_types': list(set(p.injection_type.value for p in matched_patterns))
             }
         )
+        
+        self._scan_stats['scans'] += 1
+        self._scan_stats['bytes_scanned'] += len(encoded)
+        self._scan_stats['scan_seconds'] += time.perf_counter() - scan_start
+        
+        self._store_verdict(cache_key, detection)
+        return detection
     
     def _threat_level_value(self, threat_level: ThreatLevel) -> int:
         """Convert threat level to numeric value for comparison."""
@@ -507,28 +645,9 @@ class PromptInjectionGuard:
         filtered_text = text
         was_filtered = False
         
-        # Define output filtering patterns
-        output_patterns = [
-            # Credential patterns
-            (r'(password|api[_\s]?key|secret|token)\s*[:=]\s*["\']?([a-zA-Z0-9_\-\.]{8,})["\']?', 
-             r'\1: [REDACTED]', "Credential redaction"),
-            
-            # System path disclosure
-            (r'(/etc/|/root/|C:\\Windows\\|C:\\Users\\)', 
-             '[SYSTEM_PATH]', "System path redaction"),
-            
-            # IP address patterns (private ranges)
-            (r'\b(192\.168\.|10\.|172\.(1[6-9]|2[0-9]|3[01])\.)[\d\.]+\b', 
-             '[PRIVATE_IP]', "Private IP redaction"),
-            
-            # Error stack traces with paths
-            (r'File\s+"([^"]*[/\\][^"]*)"', 
-             'File "[REDACTED_PATH]"', "File path redaction"),
-        ]
-        
-        for pattern, replacement, description in output_patterns:
-            if re.search(pattern, filtered_text, re.IGNORECASE):
-                filtered_text = re.sub(pattern, replacement, filtered_text, flags=re.IGNORECASE)
+        for pattern, replacement, description in _OUTPUT_FILTER_PATTERNS:
+            if pattern.search(filtered_text):
+                filtered_text = pattern.sub(replacement, filtered_text)
                 was_filtered = True
                 logger.info(f"Output filtered: {description}")
         
@@ -632,7 +751,8 @@ class PromptInjectionGuard:
             'threat_levels': {},
             'injection_types': {},
             'actions_taken': {},
-            'patterns_loaded': len(self.patterns)
+            'patterns_loaded': len(self.patterns),
+            'scan_performance': self._scan_performance()
         }
         
         # Count by threat level, injection type, and action
@@ -649,6 +769,20 @@ class PromptInjectionGuard:
         
         return stats
     
+    def _scan_performance(self) -> Dict[str, Any]:
+        """Summarize scanner throughput and cache effectiveness."""
+        scan_stats = dict(self._scan_stats)
+        lookups = scan_stats['verdict_cache_hits'] + scan_stats['verdict_cache_misses']
+        scan_stats['throughput_mb_per_sec'] = (
+            scan_stats['bytes_scanned'] / scan_stats['scan_seconds'] / (1024 * 1024)
+            if scan_stats['scan_seconds'] > 0 else 0.0
+        )
+        scan_stats['verdict_cache_hit_rate'] = (
+            scan_stats['verdict_cache_hits'] / lookups if lookups > 0 else 0.0
+        )
+        scan_stats['verdict_cache_size'] = len(self._verdict_cache)
+        return scan_stats
+    
     def add_custom_pattern(self, pattern: InjectionPattern):
         """
         Add a custom injection detection pattern.
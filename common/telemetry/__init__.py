@@ -44,6 +44,7 @@ from .cost_tracker import (
     ModelPricing,
     TokenUsage,
     CostEntry,
+    CostLedger,
     UsageStats,
     TokenCounter,
     BudgetManager,
@@ -96,6 +97,7 @@ __all__ = [
     "ModelPricing",
     "TokenUsage",
     "CostEntry",
+    "CostLedger",
     "UsageStats",
     "TokenCounter",
     "BudgetManager",
@@ -7,15 +7,22 @@ real-time monitoring, budget alerts, and cost optimization recommendations.
 """
 
 import json
+import shutil
+import tempfile
 import time
 import threading
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union, Callable
 from collections import defaultdict
 
+from common.tokenization import TokenizerService, get_tokenizer_service
+
 from .schema import EventType, LogLevel, create_event
 from .logger import get_logger
 
@@ -189,11 +196,431 @@ class UsageStats:
             time_stat["duration_ms"] += entry.duration_ms
 
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROS_PER_HOUR = 3600 * 1_000_000
+_MICROS_PER_MINUTE = 60 * 1_000_000
+# Rollup granularities, coarsest first
+_ROLLUP_LEVELS = (_MICROS_PER_HOUR, _MICROS_PER_MINUTE)
+_STAT_FIELDS = ("cost_usd", "tokens", "input_tokens", "output_tokens", "requests", "duration_ms")
+
+
+def _to_micros(ts: datetime) -> int:
+    """Convert a (naive UTC or aware) datetime to integer epoch microseconds."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = ts - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(micros: int) -> datetime:
+    """Convert epoch microseconds back to a naive UTC datetime."""
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+class _LedgerSegment:
+    """A run of cost entries stored column-wise and sorted by timestamp."""
+    
+    # Column name -> array typecode, in on-disk order
+    COLUMNS = (
+        ("timestamps", "q"),
+        ("model_ids", "l"),
+        ("provider_ids", "l"),
+        ("input_tokens", "q"),
+        ("output_tokens", "q"),
+        ("costs", "d"),
+        ("durations", "d"),
+    )
+    
+    def __init__(self, segment_id: int):
+        self.segment_id = segment_id
+        self.count = 0
+        self.t_min: Optional[int] = None
+        self.t_max: Optional[int] = None
+        self.path: Optional[Path] = None
+        self.columns: Optional[Dict[str, array]] = {
+            name: array(code) for name, code in self.COLUMNS
+        }
+        self.entries: Optional[List[CostEntry]] = []
+    
+    @property
+    def resident(self) -> bool:
+        return self.columns is not None
+    
+    def append(self, ts: int, row: Tuple, entry: CostEntry):
+        """Insert a row, keeping the segment sorted by timestamp."""
+        columns = self.columns
+        timestamps = columns["timestamps"]
+        if not timestamps or ts >= timestamps[-1]:
+            timestamps.append(ts)
+            for (name, _), value in zip(self.COLUMNS[1:], row):
+                columns[name].append(value)
+            self.entries.append(entry)
+        else:
+            # Entries recorded concurrently can arrive slightly out of order
+            pos = bisect_right(timestamps, ts)
+            timestamps.insert(pos, ts)
+            for (name, _), value in zip(self.COLUMNS[1:], row):
+                columns[name].insert(pos, value)
+            self.entries.insert(pos, entry)
+        
+        self.count += 1
+        self.t_min = ts if self.t_min is None else min(self.t_min, ts)
+        self.t_max = ts if self.t_max is None else max(self.t_max, ts)
+    
+    def overlaps(self, lo: int, hi: int) -> bool:
+        return self.count > 0 and self.t_min <= hi and self.t_max >= lo
+    
+    def spill(self, directory: Path):
+        """Write columns and entry details to disk and release them from RAM."""
+        base = directory / f"segment-{self.segment_id:06d}"
+        with open(base.with_suffix(".cols"), "wb") as f:
+            for name, _ in self.COLUMNS:
+                self.columns[name].tofile(f)
+        with open(base.with_suffix(".jsonl"), "w") as f:
+            for entry in self.entries:
+                f.write(json.dumps(_entry_details(entry), default=str) + "\n")
+        
+        self.path = base
+        self.columns = None
+        self.entries = None
+    
+    def load_columns(self) -> Dict[str, array]:
+        """Return the segment columns, reading them from disk if spilled."""
+        if self.columns is not None:
+            return self.columns
+        
+        columns = {}
+        with open(self.path.with_suffix(".cols"), "rb") as f:
+            for name, code in self.COLUMNS:
+                column = array(code)
+                column.fromfile(f, self.count)
+                columns[name] = column
+        return columns
+    
+    def iter_entries(
+        self,
+        lo: int,
+        hi: int,
+        entry_factory: Callable[[Dict[str, Any]], CostEntry]
+    ) -> Iterator[CostEntry]:
+        """Yield entries with lo <= timestamp <= hi in timestamp order."""
+        timestamps = self.load_columns()["timestamps"]
+        start = bisect_left(timestamps, lo)
+        stop = bisect_right(timestamps, hi)
+        if start >= stop:
+            return
+        
+        if self.entries is not None:
+            yield from self.entries[start:stop]
+            return
+        
+        with open(self.path.with_suffix(".jsonl"), "r") as f:
+            for index, line in enumerate(f):
+                if index >= stop:
+                    break
+                if index >= start:
+                    yield entry_factory(json.loads(line))
+
+
+def _entry_details(entry: CostEntry) -> Dict[str, Any]:
+    """Flatten a cost entry into the fields needed to rebuild it."""
+    return {
+        "timestamp": entry.timestamp.isoformat(),
+        "model_name": entry.tokens.model_name,
+        "provider": entry.tokens.provider.value,
+        "input_tokens": entry.tokens.input_tokens,
+        "output_tokens": entry.tokens.output_tokens,
+        "cost_usd": entry.cost_usd,
+        "duration_ms": entry.duration_ms,
+        "session_id": entry.tokens.session_id,
+        "agent_id": entry.tokens.agent_id,
+        "task_id": entry.tokens.task_id,
+        "framework": entry.tokens.framework,
+        "metadata": entry.metadata,
+    }
+
+
+class CostLedger:
+    """Append-only, time-indexed columnar store for cost entries.
+    
+    Entries are appended to fixed-size segments whose columns are kept in
+    typed arrays sorted by timestamp, so range lookups are binary searches.
+    Per-(hour, model, provider) and per-(minute, model, provider) rollups
+    are maintained on append; a range query reads whole hours, then whole
+    minutes, from the rollups and only scans rows in the partial minutes at
+    either end of the range.
+    
+    Once more than ``max_resident_entries`` rows are held in memory, the
+    oldest full segments are spilled to ``spill_dir`` (a temporary
+    directory by default) and only their rollups stay resident.
+    
+    The ledger does no locking of its own; CostTracker serializes access.
+    """
+    
+    def __init__(
+        self,
+        segment_size: int = 10_000,
+        max_resident_entries: int = 100_000,
+        spill_dir: Optional[str] = None,
+        entry_factory: Optional[Callable[[Dict[str, Any]], CostEntry]] = None
+    ):
+        self.segment_size = max(1, segment_size)
+        self.max_resident_entries = max_resident_entries
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.entry_factory = entry_factory or _default_entry_factory
+        
+        self.segments: List[_LedgerSegment] = [_LedgerSegment(0)]
+        self.total_entries = 0
+        self.resident_entries = 0
+        self.spilled_segments = 0
+        
+        # Interned model/provider labels referenced by the id columns
+        self._labels: List[str] = []
+        self._label_ids: Dict[str, int] = {}
+        
+        # granularity -> bucket start (epoch micros) -> {(model, provider): stats}
+        # where stats is [cost, tokens, input, output, requests, duration]
+        self._rollups: Dict[int, Dict[int, Dict[Tuple[str, str], List[Union[int, float]]]]] = {
+            granularity: {} for granularity in _ROLLUP_LEVELS
+        }
+        # granularity -> sorted bucket starts
+        self._buckets: Dict[int, List[int]] = {granularity: [] for granularity in _ROLLUP_LEVELS}
+    
+    def __len__(self) -> int:
+        return self.total_entries
+    
+    def _label_id(self, label: str) -> int:
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = len(self._labels)
+            self._labels.append(label)
+            self._label_ids[label] = label_id
+        return label_id
+    
+    def append(self, entry: CostEntry):
+        """Add an entry to the active segment and update the rollups."""
+        ts = _to_micros(entry.timestamp)
+        model = entry.tokens.model_name
+        provider = entry.tokens.provider.value
+        
+        segment = self.segments[-1]
+        if segment.count >= self.segment_size:
+            segment = _LedgerSegment(len(self.segments))
+            self.segments.append(segment)
+        segment.append(ts, (
+            self._label_id(model),
+            self._label_id(provider),
+            entry.tokens.input_tokens,
+            entry.tokens.output_tokens,
+            entry.cost_usd,
+            entry.duration_ms,
+        ), entry)
+        
+        key = (model, provider)
+        for granularity in _ROLLUP_LEVELS:
+            bucket = ts - ts % granularity
+            rollup = self._rollups[granularity]
+            cells = rollup.get(bucket)
+            if cells is None:
+                cells = rollup[bucket] = {}
+                buckets = self._buckets[granularity]
+                if not buckets or bucket > buckets[-1]:
+                    buckets.append(bucket)
+                else:
+                    insort(buckets, bucket)
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = [0.0, 0, 0, 0, 0, 0.0]
+            cell[0] += entry.cost_usd
+            cell[1] += entry.tokens.total_tokens
+            cell[2] += entry.tokens.input_tokens
+            cell[3] += entry.tokens.output_tokens
+            cell[4] += 1
+            cell[5] += entry.duration_ms
+        
+        self.total_entries += 1
+        self.resident_entries += 1
+        if self.resident_entries > self.max_resident_entries:
+            self._spill()
+    
+    def _spill(self):
+        """Spill the oldest full resident segments until RAM is within bounds."""
+        if self.spill_dir is None:
+            self.spill_dir = Path(tempfile.mkdtemp(prefix="cost_ledger_"))
+            weakref.finalize(self, shutil.rmtree, str(self.spill_dir), True)
+        else:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        
+        for segment in self.segments[:-1]:
+            if self.resident_entries <= self.max_resident_entries:
+                break
+            if segment.resident:
+                segment.spill(self.spill_dir)
+                self.resident_entries -= segment.count
+                self.spilled_segments += 1
+    
+    def _scan(self, lo: int, hi: int) -> Iterator[Tuple[int, str, str, List[Union[int, float]]]]:
+        """Aggregate rows with lo <= ts <= hi into (hour, model, provider, stats)."""
+        cells: Dict[Tuple[int, int, int], List[Union[int, float]]] = {}
+        for segment in self.segments:
+            if not segment.overlaps(lo, hi):
+                continue
+            columns = segment.load_columns()
+            timestamps = columns["timestamps"]
+            model_ids = columns["model_ids"]
+            provider_ids = columns["provider_ids"]
+            input_tokens = columns["input_tokens"]
+            output_tokens = columns["output_tokens"]
+            costs = columns["costs"]
+            durations = columns["durations"]
+            for i in range(bisect_left(timestamps, lo), bisect_right(timestamps, hi)):
+                ts = timestamps[i]
+                key = (ts - ts % _MICROS_PER_HOUR, model_ids[i], provider_ids[i])
+                cell = cells.get(key)
+                if cell is None:
+                    cell = cells[key] = [0.0, 0, 0, 0, 0, 0.0]
+                cell[0] += costs[i]
+                cell[1] += input_tokens[i] + output_tokens[i]
+                cell[2] += input_tokens[i]
+                cell[3] += output_tokens[i]
+                cell[4] += 1
+                cell[5] += durations[i]
+        
+        labels = self._labels
+        for (hour, model_id, provider_id), cell in cells.items():
+            yield hour, labels[model_id], labels[provider_id], cell
+    
+    def _iter_range(
+        self,
+        lo: int,
+        hi: int,
+        level: int = 0
+    ) -> Iterator[Tuple[int, str, str, List[Union[int, float]]]]:
+        """Cover [lo, hi] with whole rollup buckets, refining at the edges."""
+        if level == len(_ROLLUP_LEVELS):
+            yield from self._scan(lo, hi)
+            return
+        
+        granularity = _ROLLUP_LEVELS[level]
+        first_full = -(-lo // granularity) * granularity
+        last_full = (hi + 1) // granularity * granularity - granularity
+        if first_full > last_full:
+            yield from self._iter_range(lo, hi, level + 1)
+            return
+        
+        if lo < first_full:
+            yield from self._iter_range(lo, first_full - 1, level + 1)
+        buckets = self._buckets[granularity]
+        rollup = self._rollups[granularity]
+        for index in range(bisect_left(buckets, first_full), bisect_right(buckets, last_full)):
+            bucket = buckets[index]
+            hour = bucket - bucket % _MICROS_PER_HOUR
+            for (model, provider), cell in rollup[bucket].items():
+                yield hour, model, provider, cell
+        if hi >= last_full + granularity:
+            yield from self._iter_range(last_full + granularity, hi, level + 1)
+    
+    def iter_cells(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[Tuple[int, str, str, List[Union[int, float]]]]:
+        """Yield (hour, model, provider, stats) contributions for a time range.
+        
+        Buckets lying entirely inside [start, end] come from the rollups;
+        rows in partially covered minutes are scanned from the columns.
+        """
+        hours = self._buckets[_MICROS_PER_HOUR]
+        if not hours:
+            return
+        lo = _to_micros(start) if start is not None else hours[0]
+        hi = _to_micros(end) if end is not None else hours[-1] + _MICROS_PER_HOUR - 1
+        if lo <= hi:
+            yield from self._iter_range(lo, hi)
+    
+    def aggregate(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        key_func: Optional[Callable[[int, str, str], str]] = None
+    ) -> Tuple[int, Dict[str, Dict[str, Union[int, float]]]]:
+        """Sum stats over a time range, grouped by ``key_func(hour, model, provider)``.
+        
+        Returns the number of entries in range and the grouped stats.
+        """
+        groups: Dict[str, List[Union[int, float]]] = {}
+        count = 0
+        for hour, model, provider, cell in self.iter_cells(start, end):
+            key = key_func(hour, model, provider) if key_func else "total"
+            acc = groups.get(key)
+            if acc is None:
+                acc = groups[key] = [0.0, 0, 0, 0, 0, 0.0]
+            for i in range(6):
+                acc[i] += cell[i]
+            count += cell[4]
+        
+        return count, {
+            key: dict(zip(_STAT_FIELDS, acc)) for key, acc in groups.items()
+        }
+    
+    def iter_entries(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[CostEntry]:
+        """Yield stored entries in [start, end], reading spilled segments from disk."""
+        lo = _to_micros(start) if start is not None else -(1 << 62)
+        hi = _to_micros(end) if end is not None else 1 << 62
+        for segment in self.segments:
+            if segment.overlaps(lo, hi):
+                yield from segment.iter_entries(lo, hi, self.entry_factory)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get storage statistics for the ledger."""
+        return {
+            "total_entries": self.total_entries,
+            "resident_entries": self.resident_entries,
+            "segments": len(self.segments),
+            "spilled_segments": self.spilled_segments,
+            "rollup_hours": len(self._buckets[_MICROS_PER_HOUR]),
+            "rollup_minutes": len(self._buckets[_MICROS_PER_MINUTE]),
+            "spill_dir": str(self.spill_dir) if self.spill_dir else None,
+        }
+
+
+def _default_entry_factory(details: Dict[str, Any]) -> CostEntry:
+    """Rebuild a CostEntry from spilled details with placeholder pricing."""
+    try:
+        provider = ModelProvider(details["provider"])
+    except ValueError:
+        provider = ModelProvider.UNKNOWN
+    timestamp = datetime.fromisoformat(details["timestamp"])
+    return CostEntry(
+        cost_usd=details["cost_usd"],
+        tokens=TokenUsage(
+            input_tokens=details["input_tokens"],
+            output_tokens=details["output_tokens"],
+            total_tokens=details["input_tokens"] + details["output_tokens"],
+            model_name=details["model_name"],
+            provider=provider,
+            timestamp=timestamp,
+            session_id=details.get("session_id"),
+            agent_id=details.get("agent_id"),
+            task_id=details.get("task_id"),
+            framework=details.get("framework"),
+        ),
+        duration_ms=details["duration_ms"],
+        pricing_model=ModelPricing(model_name=details["model_name"], provider=provider),
+        timestamp=timestamp,
+        metadata=details.get("metadata") or {},
+    )
+
+
 class TokenCounter:
-    """Token counting utilities for different model types."""
+    """Token counting for different model types via the shared tokenizer service."""
     
-    def __init__(self):
-        self.encoding_cache = {}
+    def __init__(self, tokenizer: Optional[TokenizerService] = None):
+        self.tokenizer = tokenizer or get_tokenizer_service()
     
     def count_tokens(
         self,
@@ -202,61 +629,19 @@ class TokenCounter:
         provider: ModelProvider = ModelProvider.UNKNOWN
     ) -> int:
         """Count tokens in text for a specific model."""
-        
-        # For now, use a simple approximation
-        # In production, you'd use model-specific tokenizers
-        if provider == ModelProvider.OPENAI:
-            return self._count_openai_tokens(text, model_name)
-        elif provider == ModelProvider.ANTHROPIC:
-            return self._count_anthropic_tokens(text, model_name)
-        elif provider == ModelProvider.OLLAMA:
-            return self._count_ollama_tokens(text, model_name)
-        else:
-            return self._count_generic_tokens(text)
+        return max(1, self.tokenizer.count(text, model_name, provider.value))
     
-    def _count_openai_tokens(self, text: str, model_name: str) -> int:
-        """Count tokens for OpenAI models."""
-        try:
-            import tiktoken
-            
-            # Get encoding for model
-            if model_name not in self.encoding_cache:
-                if "gpt-4" in model_name.lower():
-                    encoding = tiktoken.encoding_for_model("gpt-4")
-                elif "gpt-3.5" in model_name.lower():
-                    encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-                else:
-                    encoding = tiktoken.get_encoding("cl100k_base")
-                self.encoding_cache[model_name] = encoding
-            
-            encoding = self.encoding_cache[model_name]
-            return len(encoding.encode(text))
-            
-        except ImportError:
-            # Fallback to approximation if tiktoken not available
-            return self._count_generic_tokens(text)
-    
-    def _count_anthropic_tokens(self, text: str, model_name: str) -> int:
-        """Count tokens for Anthropic models."""
-        try:
-            import anthropic
-            
-            # Anthropic uses a different tokenizer
-            # For now, use approximation
-            return self._count_generic_tokens(text)
-            
-        except ImportError:
-            return self._count_generic_tokens(text)
-    
-    def _count_ollama_tokens(self, text: str, model_name: str) -> int:
-        """Count tokens for Ollama models."""
-        # Ollama models vary, use generic approximation
-        return self._count_generic_tokens(text)
-    
-    def _count_generic_tokens(self, text: str) -> int:
-        """Generic token counting approximation."""
-        # Rough approximation: 1 token ≈ 4 characters for English text
-        return max(1, len(text) // 4)
+    def count_tokens_batch(
+        self,
+        texts: List[str],
+        model_name: str,
+        provider: ModelProvider = ModelProvider.UNKNOWN
+    ) -> List[int]:
+        """Count tokens for many texts destined for the same model."""
+        return [
+            max(1, count)
+            for count in self.tokenizer.count_batch(texts, model_name, provider.value)
+        ]
 
 
 class BudgetManager:
@@ -349,13 +734,19 @@ class CostTracker:
         self,
         pricing_file: Optional[str] = None,
         enable_real_time_tracking: bool = True,
-        enable_budget_alerts: bool = True
+        enable_budget_alerts: bool = True,
+        spill_dir: Optional[str] = None,
+        max_resident_entries: int = 100_000
     ):
         self.pricing_models: Dict[str, ModelPricing] = {}
         self.token_counter = TokenCounter()
         self.budget_manager = BudgetManager()
         self.usage_stats = UsageStats()
-        self.cost_entries: List[CostEntry] = []
+        self.ledger = CostLedger(
+            max_resident_entries=max_resident_entries,
+            spill_dir=spill_dir,
+            entry_factory=self._rebuild_entry
+        )
         
         # Thread safety
         self.lock = threading.Lock()
@@ -374,6 +765,21 @@ class CostTracker:
         if enable_budget_alerts:
             self.budget_manager.add_alert_callback(self._handle_budget_alert)
     
+    @property
+    def cost_entries(self) -> List[CostEntry]:
+        """All tracked entries in timestamp order, including spilled ones."""
+        with self.lock:
+            return list(self.ledger.iter_entries())
+    
+    def _rebuild_entry(self, details: Dict[str, Any]) -> CostEntry:
+        """Rebuild a spilled entry, attaching the current pricing model."""
+        entry = _default_entry_factory(details)
+        pricing_key = f"{entry.tokens.provider.value}:{entry.tokens.model_name}"
+        pricing_model = self.pricing_models.get(pricing_key)
+        if pricing_model:
+            entry.pricing_model = pricing_model
+        return entry
+    
     def _load_default_pricing(self):
         """Load default pricing models for common providers."""
         
@@ -524,7 +930,7 @@ class CostTracker:
         
         # Update statistics
         with self.lock:
-            self.cost_entries.append(cost_entry)
+            self.ledger.append(cost_entry)
             self.usage_stats.add_entry(cost_entry)
         
         # Update budgets
@@ -597,166 +1003,53 @@ class CostTracker:
     ) -> Dict[str, Any]:
         """Get usage summary with optional filtering and grouping."""
         
-        with self.lock:
-            filtered_entries = self.cost_entries
-            
-            # Apply date filters
-            if start_date:
-                filtered_entries = [e for e in filtered_entries if e.timestamp >= start_date]
-            if end_date:
-                filtered_entries = [e for e in filtered_entries if e.timestamp <= end_date]
-            
-            if not filtered_entries:
-                return {"total_entries": 0, "summary": {}}
-            
-            # Calculate summary based on grouping
-            if group_by == "total":
-                return self._calculate_total_summary(filtered_entries)
-            elif group_by == "model":
-                return self._calculate_model_summary(filtered_entries)
-            elif group_by == "provider":
-                return self._calculate_provider_summary(filtered_entries)
-            elif group_by == "day":
-                return self._calculate_daily_summary(filtered_entries)
-            elif group_by == "hour":
-                return self._calculate_hourly_summary(filtered_entries)
-            else:
-                return self._calculate_total_summary(filtered_entries)
-    
-    def _calculate_total_summary(self, entries: List[CostEntry]) -> Dict[str, Any]:
-        """Calculate total summary across all entries."""
-        
-        total_cost = sum(e.cost_usd for e in entries)
-        total_tokens = sum(e.tokens.total_tokens for e in entries)
-        total_input_tokens = sum(e.tokens.input_tokens for e in entries)
-        total_output_tokens = sum(e.tokens.output_tokens for e in entries)
-        total_duration = sum(e.duration_ms for e in entries)
-        
-        return {
-            "total_entries": len(entries),
-            "summary": {
-                "total_cost_usd": round(total_cost, 4),
-                "total_tokens": total_tokens,
-                "total_input_tokens": total_input_tokens,
-                "total_output_tokens": total_output_tokens,
-                "total_requests": len(entries),
-                "total_duration_ms": total_duration,
-                "average_cost_per_request": round(total_cost / len(entries), 4) if entries else 0,
-                "average_tokens_per_request": total_tokens // len(entries) if entries else 0,
-                "cost_per_1k_tokens": round((total_cost / total_tokens) * 1000, 4) if total_tokens > 0 else 0
-            }
-        }
-    
-    def _calculate_model_summary(self, entries: List[CostEntry]) -> Dict[str, Any]:
-        """Calculate summary grouped by model."""
-        
-        model_stats = defaultdict(lambda: {
-            "cost_usd": 0.0, "tokens": 0, "input_tokens": 0,
-            "output_tokens": 0, "requests": 0, "duration_ms": 0.0
-        })
-        
-        for entry in entries:
-            model = entry.tokens.model_name
-            stats = model_stats[model]
-            stats["cost_usd"] += entry.cost_usd
-            stats["tokens"] += entry.tokens.total_tokens
-            stats["input_tokens"] += entry.tokens.input_tokens
-            stats["output_tokens"] += entry.tokens.output_tokens
-            stats["requests"] += 1
-            stats["duration_ms"] += entry.duration_ms
-        
-        # Round costs
-        for stats in model_stats.values():
-            stats["cost_usd"] = round(stats["cost_usd"], 4)
-        
-        return {
-            "total_entries": len(entries),
-            "summary": dict(model_stats)
+        key_funcs = {
+            "model": lambda hour, model, provider: model,
+            "provider": lambda hour, model, provider: provider,
+            "day": lambda hour, model, provider: _from_micros(hour).strftime("%Y-%m-%d"),
+            "hour": lambda hour, model, provider: _from_micros(hour).strftime("%Y-%m-%d %H:00"),
         }
-    
-    def _calculate_provider_summary(self, entries: List[CostEntry]) -> Dict[str, Any]:
-        """Calculate summary grouped by provider."""
-        
-        provider_stats = defaultdict(lambda: {
-            "cost_usd": 0.0, "tokens": 0, "input_tokens": 0,
-            "output_tokens": 0, "requests": 0, "duration_ms": 0.0
-        })
+        key_func = key_funcs.get(group_by)
         
-        for entry in entries:
-            provider = entry.tokens.provider.value
-            stats = provider_stats[provider]
-            stats["cost_usd"] += entry.cost_usd
-            stats["tokens"] += entry.tokens.total_tokens
-            stats["input_tokens"] += entry.tokens.input_tokens
-            stats["output_tokens"] += entry.tokens.output_tokens
-            stats["requests"] += 1
-            stats["duration_ms"] += entry.duration_ms
-        
-        # Round costs
-        for stats in provider_stats.values():
-            stats["cost_usd"] = round(stats["cost_usd"], 4)
+        with self.lock:
+            count, groups = self.ledger.aggregate(start_date, end_date, key_func)
         
-        return {
-            "total_entries": len(entries),
-            "summary": dict(provider_stats)
-        }
-    
-    def _calculate_daily_summary(self, entries: List[CostEntry]) -> Dict[str, Any]:
-        """Calculate summary grouped by day."""
+        if not count:
+            return {"total_entries": 0, "summary": {}}
         
-        daily_stats = defaultdict(lambda: {
-            "cost_usd": 0.0, "tokens": 0, "input_tokens": 0,
-            "output_tokens": 0, "requests": 0, "duration_ms": 0.0
-        })
+        if key_func is None:
+            return self._calculate_total_summary(count, groups["total"])
         
-        for entry in entries:
-            day = entry.timestamp.strftime("%Y-%m-%d")
-            stats = daily_stats[day]
-            stats["cost_usd"] += entry.cost_usd
-            stats["tokens"] += entry.tokens.total_tokens
-            stats["input_tokens"] += entry.tokens.input_tokens
-            stats["output_tokens"] += entry.tokens.output_tokens
-            stats["requests"] += 1
-            stats["duration_ms"] += entry.duration_ms
-        
-        # Round costs and sort by date
-        for stats in daily_stats.values():
+        # Round costs; time buckets are reported in chronological order
+        for stats in groups.values():
             stats["cost_usd"] = round(stats["cost_usd"], 4)
-        
-        sorted_daily = dict(sorted(daily_stats.items()))
+        if group_by in ("day", "hour"):
+            groups = dict(sorted(groups.items()))
         
         return {
-            "total_entries": len(entries),
-            "summary": sorted_daily
+            "total_entries": count,
+            "summary": groups
         }
     
-    def _calculate_hourly_summary(self, entries: List[CostEntry]) -> Dict[str, Any]:
-        """Calculate summary grouped by hour."""
+    def _calculate_total_summary(self, count: int, totals: Dict[str, Union[int, float]]) -> Dict[str, Any]:
+        """Calculate total summary from aggregated totals."""
         
-        hourly_stats = defaultdict(lambda: {
-            "cost_usd": 0.0, "tokens": 0, "input_tokens": 0,
-            "output_tokens": 0, "requests": 0, "duration_ms": 0.0
-        })
-        
-        for entry in entries:
-            hour = entry.timestamp.strftime("%Y-%m-%d %H:00")
-            stats = hourly_stats[hour]
-            stats["cost_usd"] += entry.cost_usd
-            stats["tokens"] += entry.tokens.total_tokens
-            stats["input_tokens"] += entry.tokens.input_tokens
-            stats["output_tokens"] += entry.tokens.output_tokens
-            stats["requests"] += 1
-            stats["duration_ms"] += entry.duration_ms
-        
-        # Round costs and sort by time
-        for stats in hourly_stats.values():
-            stats["cost_usd"] = round(stats["cost_usd"], 4)
-        
-        sorted_hourly = dict(sorted(hourly_stats.items()))
+        total_cost = totals["cost_usd"]
+        total_tokens = totals["tokens"]
         
         return {
-            "total_entries": len(entries),
-            "summary": sorted_hourly
+            "total_entries": count,
+            "summary": {
+                "total_cost_usd": round(total_cost, 4),
+                "total_tokens": total_tokens,
+                "total_input_tokens": totals["input_tokens"],
+                "total_output_tokens": totals["output_tokens"],
+                "total_requests": count,
+                "total_duration_ms": totals["duration_ms"],
+                "average_cost_per_request": round(total_cost / count, 4) if count else 0,
+                "average_tokens_per_request": total_tokens // count if count else 0,
+                "cost_per_1k_tokens": round((total_cost / total_tokens) * 1000, 4) if total_tokens > 0 else 0
+            }
         }
     
     def get_cost_optimization_recommendations(self) -> List[Dict[str, Any]]:
@@ -765,16 +1058,15 @@ class CostTracker:
         recommendations = []
         
         with self.lock:
-            if not self.cost_entries:
+            stats = self.usage_stats
+            if not stats.total_requests:
                 return recommendations
             
-            # Analyze model usage
-            model_costs = defaultdict(float)
-            model_requests = defaultdict(int)
-            
-            for entry in self.cost_entries:
-                model_costs[entry.tokens.model_name] += entry.cost_usd
-                model_requests[entry.tokens.model_name] += 1
+            # Analyze model usage from the running per-model totals
+            model_costs = {
+                model: model_stat["cost_usd"]
+                for model, model_stat in stats.model_stats.items()
+            }
             
             # Recommend cheaper alternatives for expensive models
             for model, cost in model_costs.items():
@@ -799,7 +1091,7 @@ class CostTracker:
                         })
             
             # Recommend local models for high-volume usage
-            total_api_cost = sum(e.cost_usd for e in self.cost_entries if e.cost_usd > 0)
+            total_api_cost = stats.total_cost_usd
             if total_api_cost > 50.0:  # If spending more than $50 on API calls
                 recommendations.append({
                     "type": "local_deployment",
@@ -811,7 +1103,7 @@ class CostTracker:
                 })
             
             # Recommend prompt optimization
-            avg_input_tokens = sum(e.tokens.input_tokens for e in self.cost_entries) / len(self.cost_entries)
+            avg_input_tokens = stats.total_input_tokens / stats.total_requests
             if avg_input_tokens > 1000:
                 recommendations.append({
                     "type": "prompt_optimization",
@@ -867,13 +1159,7 @@ class CostTracker:
         """Export usage data to file."""
         
         with self.lock:
-            filtered_entries = self.cost_entries
-            
-            # Apply date filters
-            if start_date:
-                filtered_entries = [e for e in filtered_entries if e.timestamp >= start_date]
-            if end_date:
-                filtered_entries = [e for e in filtered_entries if e.timestamp <= end_date]
+            filtered_entries = list(self.ledger.iter_entries(start_date, end_date))
             
             if format.lower() == "json":
                 self._export_json(filtered_entries, file_path)
@@ -13,9 +13,15 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, TextIO, Union
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
 from logging.handlers import RotatingFileHandler
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .schema import BaseEvent, EventType, LogLevel, create_event
 
 
@@ -47,6 +53,38 @@ class JSONLinesFormatter(logging.Formatter):
         return json.dumps(event_data, default=str, separators=(',', ':'))
 
 
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+
+def _encode_json_line(event_data: Dict[str, Any]) -> str:
+    """Encode an event the same way JSONLinesFormatter does."""
+    return _json_encoder.encode(event_data)
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def _encode_fast_json_line(event_data: Dict[str, Any]) -> str:
+        """Encode an event with orjson, falling back to json on odd payloads."""
+        try:
+            return orjson.dumps(event_data, default=str, option=_ORJSON_OPTIONS).decode('utf-8')
+        except (TypeError, orjson.JSONEncodeError):
+            return _json_encoder.encode(event_data)
+
+
+_LEVEL_NUMBERS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+}
+
+# Marks the end of the processing queue; the writer drains everything queued
+# before it and then exits.
+_STOP = object()
+
+
 class EventBuffer:
     """Thread-safe buffer for event aggregation and batch processing."""
     
@@ -167,8 +205,22 @@ class StructuredLogger:
         backup_count: int = 5,
         buffer_size: int = 1000,
         flush_interval: float = 5.0,
-        enable_console: bool = True
+        enable_console: bool = True,
+        max_queue_size: int = 10000,
+        batch_size: int = 512,
+        enqueue_timeout: Optional[float] = 0.1,
+        fast_json: bool = True
     ):
+        """
+        Args:
+            max_queue_size: Bound on events waiting for the writer thread
+                (0 means unbounded).
+            batch_size: Maximum events serialized into a single write.
+            enqueue_timeout: How long ``log_event`` blocks when the queue is
+                full before dropping the event. ``None`` blocks until there
+                is room; ``0`` drops immediately.
+            fast_json: Serialize with orjson when it is installed.
+        """
         self.name = name
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
@@ -201,9 +253,25 @@ class StructuredLogger:
         self.event_filter = EventFilter()
         
         # Background processing
-        self.processing_queue = Queue()
+        self.processing_queue = Queue(maxsize=max_queue_size)
         self.processing_thread = None
         self.stop_processing = threading.Event()
+        self.batch_size = max(1, batch_size)
+        self.enqueue_timeout = enqueue_timeout
+        self._encode = (
+            _encode_fast_json_line if fast_json and ORJSON_AVAILABLE
+            else _encode_json_line
+        )
+        
+        # Writer accounting
+        self._stats_lock = threading.Lock()
+        self.events_queued = 0
+        self.events_dropped = 0
+        self.events_written = 0
+        self.events_filtered = 0
+        self.batches_written = 0
+        self.bytes_written = 0
+        self.max_queue_depth = 0
         
         # Session tracking
         self.session_id = None
@@ -221,29 +289,50 @@ class StructuredLogger:
         self.processing_thread.start()
     
     def _process_events(self):
-        """Background event processing loop."""
-        while not self.stop_processing.is_set():
+        """Background writer loop.
+        
+        Blocks until an event arrives, then drains whatever else is already
+        queued (up to ``batch_size``) and writes the whole batch at once.
+        """
+        queue = self.processing_queue
+        while True:
+            item = queue.get()
+            batch = []
+            stopping = item is _STOP
+            if not stopping:
+                batch.append(item)
+            taken = 1
+            
+            while not stopping and len(batch) < self.batch_size:
+                try:
+                    item = queue.get_nowait()
+                except Empty:
+                    break
+                taken += 1
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+            
             try:
-                # Process queued events
-                while True:
-                    try:
-                        event_data = self.processing_queue.get_nowait()
-                        if self.event_filter.should_process(event_data):
-                            self._write_event(event_data)
-                    except Empty:
-                        break
-                
-                # Sleep briefly to avoid busy waiting
-                time.sleep(0.1)
-                
+                if batch:
+                    self._write_batch(batch)
             except Exception as e:
                 # Log processing errors to standard logger
                 logging.getLogger("telemetry_error").error(
                     f"Error in event processing: {e}"
                 )
+            finally:
+                for _ in range(taken):
+                    queue.task_done()
+            
+            if stopping:
+                return
     
-    def _write_event(self, event_data: Dict[str, Any]):
-        """Write event to log with proper formatting."""
+    def _prepare_event(self, event_data: Dict[str, Any]) -> Optional[str]:
+        """Filter an event, attach session context and encode it as a line."""
+        if not self.event_filter.should_process(event_data):
+            return None
         
         # Add session context if available
         if self.session_id:
@@ -251,36 +340,115 @@ class StructuredLogger:
         if self.correlation_id:
             event_data['correlation_id'] = self.correlation_id
         
-        # Create log record with event data
-        record = logging.LogRecord(
-            name=self.name,
-            level=getattr(logging, event_data.get('level', 'INFO')),
-            pathname="",
-            lineno=0,
-            msg="",
-            args=(),
-            exc_info=None
-        )
-        record.event_data = event_data
+        return self._encode(event_data)
+    
+    def _write_batch(self, events: List[Dict[str, Any]]):
+        """Serialize a batch of events and hand it to every handler."""
+        accepted = []
+        lines = []
+        levels = []
+        filtered = 0
+        for event_data in events:
+            line = self._prepare_event(event_data)
+            if line is None:
+                filtered += 1
+                continue
+            accepted.append(event_data)
+            lines.append(line)
+            levels.append(_LEVEL_NUMBERS.get(event_data.get('level', 'INFO'), logging.INFO))
         
-        # Log the event
-        self.logger.handle(record)
+        written_bytes = 0
+        if lines:
+            payload = '\n'.join(lines) + '\n'
+            written_bytes = len(payload)
+            for handler in self.logger.handlers:
+                if isinstance(handler, logging.StreamHandler) and handler.level <= min(levels):
+                    self._emit_payload(handler, payload)
+                else:
+                    self._emit_records(handler, accepted, levels)
+        
+        with self._stats_lock:
+            self.events_written += len(lines)
+            self.events_filtered += filtered
+            self.bytes_written += written_bytes
+            if lines:
+                self.batches_written += 1
+    
+    def _emit_payload(self, handler: logging.StreamHandler, payload: str):
+        """Write pre-encoded JSON lines to a stream handler in one call."""
+        handler.acquire()
+        try:
+            if isinstance(handler, RotatingFileHandler) and handler.maxBytes > 0:
+                if handler.stream is None:
+                    handler.stream = handler._open()
+                handler.stream.seek(0, 2)
+                if handler.stream.tell() + len(payload) >= handler.maxBytes and handler.stream.tell() > 0:
+                    handler.doRollover()
+            elif isinstance(handler, logging.FileHandler) and handler.stream is None:
+                handler.stream = handler._open()
+            handler.stream.write(payload)
+            handler.flush()
+        except Exception as e:
+            logging.getLogger("telemetry_error").error(
+                f"Error writing event batch: {e}"
+            )
+        finally:
+            handler.release()
+    
+    def _emit_records(self, handler: logging.Handler, events: List[Dict[str, Any]], levels: List[int]):
+        """Fallback for handlers that need one LogRecord per event."""
+        for event_data, levelno in zip(events, levels):
+            if levelno < handler.level:
+                continue
+            record = logging.LogRecord(
+                name=self.name,
+                level=levelno,
+                pathname="",
+                lineno=0,
+                msg="",
+                args=(),
+                exc_info=None
+            )
+            record.event_data = event_data
+            handler.handle(record)
+    
+    def _write_event(self, event_data: Dict[str, Any]):
+        """Write a single event to log with proper formatting."""
+        self._write_batch([event_data])
     
     def set_session_context(self, session_id: str, correlation_id: Optional[str] = None):
         """Set session context for all subsequent events."""
         self.session_id = session_id
         self.correlation_id = correlation_id
     
-    def log_event(self, event: Union[BaseEvent, Dict[str, Any]]):
-        """Log a structured event."""
+    def log_event(self, event: Union[BaseEvent, Dict[str, Any]]) -> bool:
+        """Log a structured event. Returns False if the event was dropped."""
         
         if isinstance(event, BaseEvent):
             event_data = event.to_dict()
         else:
             event_data = event
         
-        # Queue event for processing
-        self.processing_queue.put(event_data)
+        # Queue event for processing, applying backpressure when the writer
+        # falls behind and dropping once the wait exceeds enqueue_timeout
+        try:
+            if self.enqueue_timeout is None:
+                self.processing_queue.put(event_data)
+            elif self.enqueue_timeout <= 0:
+                self.processing_queue.put_nowait(event_data)
+            else:
+                self.processing_queue.put(event_data, timeout=self.enqueue_timeout)
+        except Full:
+            with self._stats_lock:
+                self.events_dropped += 1
+            return False
+        
+        depth = self.processing_queue.qsize()
+        with self._stats_lock:
+            self.events_queued += 1
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+        return True
     
     def log_agent_start(
         self,
@@ -471,25 +639,67 @@ class StructuredLogger:
         """Get the event filter for configuration."""
         return self.event_filter
     
-    def flush(self):
-        """Flush all pending events."""
-        # Process any remaining events in queue
-        while not self.processing_queue.empty():
-            try:
-                event_data = self.processing_queue.get_nowait()
-                if self.event_filter.should_process(event_data):
-                    self._write_event(event_data)
-            except Empty:
-                break
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get writer throughput, batching and drop statistics."""
+        with self._stats_lock:
+            batches = self.batches_written
+            return {
+                'events_queued': self.events_queued,
+                'events_dropped': self.events_dropped,
+                'events_written': self.events_written,
+                'events_filtered': self.events_filtered,
+                'batches_written': batches,
+                'avg_batch_size': self.events_written / batches if batches else 0.0,
+                'bytes_written': self.bytes_written,
+                'queue_depth': self.processing_queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'queue_capacity': self.processing_queue.maxsize,
+                'fast_json': self._encode is not _encode_json_line,
+            }
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been written, then flush handlers.
+        
+        Returns False if ``timeout`` elapsed before the queue drained.
+        """
+        queue = self.processing_queue
+        drained = True
+        if self.processing_thread is not None and self.processing_thread.is_alive():
+            deadline = None if timeout is None else time.monotonic() + timeout
+            with queue.all_tasks_done:
+                while queue.unfinished_tasks:
+                    if deadline is None:
+                        queue.all_tasks_done.wait()
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        drained = False
+                        break
+                    queue.all_tasks_done.wait(remaining)
+        else:
+            # No writer thread: drain inline
+            batch = []
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except Empty:
+                    break
+                queue.task_done()
+                if item is not _STOP:
+                    batch.append(item)
+            if batch:
+                self._write_batch(batch)
         
         # Flush logger handlers
         for handler in self.logger.handlers:
             handler.flush()
+        return drained
     
     def close(self):
         """Close the logger and cleanup resources."""
         self.stop_processing.set()
-        if self.processing_thread:
+        if self.processing_thread and self.processing_thread.is_alive():
+            self.processing_queue.put(_STOP)
             self.processing_thread.join(timeout=5.0)
         
         self.flush()
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Shared Tokenizer Service for AI Dev Squad
+
+This module provides token counting shared by cost tracking and context
+management. Real tokenizers are loaded lazily per model family (tiktoken for
+OpenAI models, local HuggingFace ``tokenizer.json`` files for open-weight
+families), counts are memoized by content hash, and a pretokenizer-based
+estimate is used when no tokenizer is available for a family.
+"""
+
+import os
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Callable
+
+# Configure logging
+logger = logging.getLogger("ai_dev_squad.tokenization")
+
+# Environment variable pointing at a directory of local tokenizer files
+TOKENIZER_DIR_ENV = "AI_DEV_SQUAD_TOKENIZER_DIR"
+DEFAULT_TOKENIZER_DIR = Path.home() / ".cache" / "ai_dev_squad" / "tokenizers"
+
+# Model name fragments -> tokenizer family, checked in order
+MODEL_FAMILIES = (
+    ("gpt-4o", "openai-o200k"),
+    ("gpt-4.1", "openai-o200k"),
+    ("o1", "openai-o200k"),
+    ("o3", "openai-o200k"),
+    ("gpt-", "openai"),
+    ("text-embedding", "openai"),
+    ("claude", "anthropic"),
+    ("codellama", "llama"),
+    ("llama", "llama"),
+    ("mixtral", "mistral"),
+    ("mistral", "mistral"),
+    ("codestral", "mistral"),
+    ("qwen", "qwen"),
+    ("gemma", "gemma"),
+    ("phi", "phi"),
+    ("deepseek", "deepseek"),
+    ("starcoder", "starcoder"),
+)
+
+# Provider -> family for models whose names are not recognized
+PROVIDER_FAMILIES = {
+    "openai": "openai",
+    "azure_openai": "openai",
+    "anthropic": "anthropic",
+}
+
+TIKTOKEN_ENCODINGS = {
+    "openai": "cl100k_base",
+    "openai-o200k": "o200k_base",
+}
+
+# Mirrors the shape of the cl100k pretokenizer: contractions, letter runs
+# with one leading non-letter, short digit groups, punctuation runs and
+# whitespace runs. Every character is matched by exactly one alternative.
+_PRETOKEN_PATTERN = re.compile(
+    r"'(?:s|t|re|ve|m|ll|d)"
+    r"|[^\r\n\w]?[^\W\d]+"
+    r"|\d{1,3}"
+    r"| ?[^\s\w]+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate BPE token count without a tokenizer.
+
+    Splits text the way BPE pretokenizers do, then charges short words one
+    token, long words roughly one token per seven characters, punctuation
+    about one token per two characters and non-ASCII letters one token each.
+    Unlike word counting this tracks code, where most tokens are symbols.
+
+    Args:
+        text: Text to estimate tokens for.
+
+    Returns:
+        Estimated token count.
+    """
+    tokens = 0
+    for piece in _PRETOKEN_PATTERN.findall(text):
+        last = piece[-1]
+        if last.isalpha() or last == "_":
+            word = piece.lstrip()
+            if not word[0].isalpha() and word[0] != "_":
+                word = word[1:]
+            if word.isascii():
+                tokens += max(1, (len(word) + 3) // 7) + word.count("_")
+            else:
+                tokens += len(word)
+        elif last.isdigit():
+            tokens += 1
+        elif piece.isspace():
+            tokens += 1
+        else:
+            tokens += (len(piece.strip()) + 1) // 2 or 1
+    return tokens
+
+
+class _Tokenizer:
+    """A loaded tokenizer backend exposing single and batch counting."""
+
+    def __init__(self,
+                 name: str,
+                 count: Callable[[str], int],
+                 count_batch: Optional[Callable[[List[str]], List[int]]] = None):
+        self.name = name
+        self.count = count
+        self.count_batch = count_batch or (lambda texts: [count(text) for text in texts])
+
+
+_ESTIMATOR = _Tokenizer("estimate", estimate_tokens)
+
+
+class TokenizerService:
+    """
+    Token counting service shared across the platform.
+
+    Tokenizers are resolved per model family on first use and cached; a
+    family with no available tokenizer falls back to ``estimate_tokens``.
+    Counts are memoized in a bounded LRU keyed by family and a BLAKE2b
+    digest of the text, so repeated prompts and messages are counted once.
+    """
+
+    def __init__(self,
+                 tokenizer_dir: Optional[str] = None,
+                 cache_size: int = 8192):
+        """
+        Initialize tokenizer service.
+
+        Args:
+            tokenizer_dir: Directory holding ``<family>/tokenizer.json`` or
+                ``<family>.json`` files. Defaults to the directory named by
+                ``AI_DEV_SQUAD_TOKENIZER_DIR`` or ``~/.cache/ai_dev_squad/tokenizers``.
+            cache_size: Maximum number of memoized counts.
+        """
+        self.tokenizer_dir = Path(
+            tokenizer_dir or os.environ.get(TOKENIZER_DIR_ENV) or DEFAULT_TOKENIZER_DIR
+        )
+        self.cache_size = cache_size
+        self._tokenizers: Dict[str, _Tokenizer] = {}
+        self._family_cache: Dict[tuple, str] = {}
+        self._counts: "OrderedDict[tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def family_for(self, model_name: str = "", provider: Optional[str] = None) -> str:
+        """
+        Resolve the tokenizer family for a model.
+
+        Args:
+            model_name: Model name, e.g. ``llama3.1:8b`` or ``gpt-4``.
+            provider: Optional provider name used when the model is unknown.
+
+        Returns:
+            Tokenizer family name.
+        """
+        key = (model_name, provider)
+        family = self._family_cache.get(key)
+        if family is None:
+            lowered = (model_name or "").lower()
+            family = next(
+                (fam for fragment, fam in MODEL_FAMILIES if fragment in lowered),
+                PROVIDER_FAMILIES.get((provider or "").lower(), "generic")
+            )
+            self._family_cache[key] = family
+        return family
+
+    def _tokenizer_for(self, family: str) -> _Tokenizer:
+        """Get the tokenizer for a family, loading it on first use."""
+        tokenizer = self._tokenizers.get(family)
+        if tokenizer is not None:
+            return tokenizer
+
+        with self._load_lock:
+            tokenizer = self._tokenizers.get(family)
+            if tokenizer is None:
+                tokenizer = self._load_tokenizer(family)
+                self._tokenizers[family] = tokenizer
+                logger.debug(f"Using {tokenizer.name} tokenizer for {family} models")
+        return tokenizer
+
+    def _load_tokenizer(self, family: str) -> _Tokenizer:
+        """Load the best available tokenizer for a family."""
+        for path in (self.tokenizer_dir / family / "tokenizer.json",
+                     self.tokenizer_dir / f"{family}.json"):
+            if path.is_file():
+                try:
+                    from tokenizers import Tokenizer
+                    hf_tokenizer = Tokenizer.from_file(str(path))
+                    return _Tokenizer(
+                        f"tokenizers:{path}",
+                        lambda text: len(hf_tokenizer.encode(text, add_special_tokens=False).ids),
+                        lambda texts: [
+                            len(encoding.ids)
+                            for encoding in hf_tokenizer.encode_batch(texts, add_special_tokens=False)
+                        ]
+                    )
+                except ImportError:
+                    logger.debug("tokenizers package not installed; cannot load %s", path)
+                    break
+                except Exception as e:
+                    logger.warning(f"Failed to load tokenizer {path}: {e}")
+
+        encoding_name = TIKTOKEN_ENCODINGS.get(family)
+        if encoding_name:
+            try:
+                import tiktoken
+                encoding = tiktoken.get_encoding(encoding_name)
+                return _Tokenizer(
+                    f"tiktoken:{encoding_name}",
+                    lambda text: len(encoding.encode(text, disallowed_special=())),
+                    lambda texts: [
+                        len(tokens) for tokens in encoding.encode_batch(texts, disallowed_special=())
+                    ]
+                )
+            except ImportError:
+                pass
+            except Exception as e:
+                logger.warning(f"Failed to load tiktoken encoding {encoding_name}: {e}")
+
+        return _ESTIMATOR
+
+    def _cache_key(self, family: str, text: str) -> tuple:
+        return (family, hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest())
+
+    def count(self,
+              text: str,
+              model_name: str = "",
+              provider: Optional[str] = None,
+              use_cache: bool = True) -> int:
+        """
+        Count tokens in text for a model.
+
+        Args:
+            text: Text to count.
+            model_name: Model the text is destined for.
+            provider: Optional provider name.
+            use_cache: Whether to memoize the count.
+
+        Returns:
+            Token count.
+        """
+        if not text:
+            return 0
+
+        family = self.family_for(model_name, provider)
+        if not use_cache:
+            return self._tokenizer_for(family).count(text)
+
+        key = self._cache_key(family, text)
+        with self._lock:
+            cached = self._counts.get(key)
+            if cached is not None:
+                self._counts.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        count = self._tokenizer_for(family).count(text)
+        self._store(key, count)
+        return count
+
+    def count_batch(self,
+                    texts: Iterable[str],
+                    model_name: str = "",
+                    provider: Optional[str] = None) -> List[int]:
+        """
+        Count tokens for many texts, tokenizing cache misses in one batch.
+
+        Args:
+            texts: Texts to count.
+            model_name: Model the texts are destined for.
+            provider: Optional provider name.
+
+        Returns:
+            Token counts in input order.
+        """
+        texts = list(texts)
+        family = self.family_for(model_name, provider)
+        counts: List[Optional[int]] = [0] * len(texts)
+        missing: Dict[tuple, List[int]] = {}
+
+        with self._lock:
+            for index, text in enumerate(texts):
+                if not text:
+                    continue
+                key = self._cache_key(family, text)
+                cached = self._counts.get(key)
+                if cached is not None:
+                    self._counts.move_to_end(key)
+                    self.hits += 1
+                    counts[index] = cached
+                else:
+                    missing.setdefault(key, []).append(index)
+            self.misses += len(missing)
+
+        if missing:
+            keys = list(missing)
+            batch = [texts[missing[key][0]] for key in keys]
+            for key, count in zip(keys, self._tokenizer_for(family).count_batch(batch)):
+                self._store(key, count)
+                for index in missing[key]:
+                    counts[index] = count
+
+        return counts
+
+    def _store(self, key: tuple, count: int) -> None:
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+
+    def incremental(self, model_name: str = "", provider: Optional[str] = None) -> 'IncrementalTokenCounter':
+        """Create an incremental counter for text that grows by appending."""
+        return IncrementalTokenCounter(self, model_name, provider)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get tokenizer service statistics.
+
+        Returns:
+            Cache and backend statistics.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "cache_entries": len(self._counts),
+                "cache_size": self.cache_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "tokenizers": {family: tok.name for family, tok in self._tokenizers.items()},
+                "tokenizer_dir": str(self.tokenizer_dir),
+            }
+
+    def clear_cache(self) -> None:
+        """Clear memoized counts."""
+        with self._lock:
+            self._counts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class IncrementalTokenCounter:
+    """
+    Running token count for text that only grows at the end.
+
+    Text is committed up to the last single space that separates two
+    non-space characters - a pretoken boundary for BPE tokenizers - so each
+    append only re-tokenizes the short uncommitted tail.
+    """
+
+    def __init__(self, service: TokenizerService, model_name: str = "", provider: Optional[str] = None):
+        self.service = service
+        self.model_name = model_name
+        self.provider = provider
+        self.committed_tokens = 0
+        self.tail = ""
+        self.total = 0
+
+    def append(self, text: str) -> int:
+        """
+        Append text and return the updated total.
+
+        Args:
+            text: Text appended to the end of the stream.
+
+        Returns:
+            Token count of everything appended so far.
+        """
+        tail = self.tail + text
+        boundary = self._last_boundary(tail)
+        if boundary > 0:
+            self.committed_tokens += self.service.count(
+                tail[:boundary], self.model_name, self.provider, use_cache=False
+            )
+            tail = tail[boundary:]
+
+        self.tail = tail
+        self.total = self.committed_tokens + self.service.count(
+            tail, self.model_name, self.provider, use_cache=False
+        )
+        return self.total
+
+    @staticmethod
+    def _last_boundary(text: str) -> int:
+        index = text.rfind(" ", 0, len(text) - 1)
+        while index > 0:
+            if not text[index - 1].isspace() and not text[index + 1].isspace():
+                return index
+            index = text.rfind(" ", 0, index)
+        return 0
+
+    def reset(self) -> None:
+        """Reset the counter to empty text."""
+        self.committed_tokens = 0
+        self.tail = ""
+        self.total = 0
+
+
+# Global tokenizer service instance
+_global_tokenizer_service: Optional[TokenizerService] = None
+
+
+def get_tokenizer_service() -> TokenizerService:
+    """Get the global tokenizer service instance."""
+    global _global_tokenizer_service
+    if _global_tokenizer_service is None:
+        _global_tokenizer_service = TokenizerService()
+    return _global_tokenizer_service
+
+
+def configure_tokenizer_service(tokenizer_dir: Optional[str] = None,
+                                cache_size: int = 8192) -> TokenizerService:
+    """
+    Configure the global tokenizer service.
+
+    Args:
+        tokenizer_dir: Directory of local tokenizer files.
+        cache_size: Maximum number of memoized counts.
+
+    Returns:
+        Configured tokenizer service.
+    """
+    global _global_tokenizer_service
+    _global_tokenizer_service = TokenizerService(
+        tokenizer_dir=tokenizer_dir,
+        cache_size=cache_size
+    )
+    return _global_tokenizer_service
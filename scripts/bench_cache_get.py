@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark IntelligentCache Lookups
+
+Fills an IntelligentCache and times repeated exact-match gets, reporting
+p50/p99 latency for three configurations: a new SQLite connection per call
+(how the cache used to work), a persistent per-thread connection, and the
+persistent connection with the in-process hot tier in front of it.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.caching import IntelligentCache
+
+
+class ConnectPerCallCache(IntelligentCache):
+    """IntelligentCache that opens and closes a connection for every query."""
+
+    @contextmanager
+    def _get_db_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+CONFIGURATIONS = {
+    "connect_per_call": (ConnectPerCallCache, 0),
+    "persistent": (IntelligentCache, 0),
+    "hot_tier": (IntelligentCache, 1024),
+}
+
+
+def bench_configuration(name: str, cache_dir: str, entries: int, rounds: int) -> Dict[str, Any]:
+    """Fill one cache and time every get over several rounds."""
+    cache_class, hot_entries = CONFIGURATIONS[name]
+    cache = cache_class(cache_dir=os.path.join(cache_dir, name), hot_cache_entries=hot_entries)
+    prompts = [f"benchmark prompt {i}" for i in range(entries)]
+    for prompt in prompts:
+        cache.put(prompt, "model", "response " * 50)
+
+    samples: List[float] = []
+    for _ in range(rounds):
+        for prompt in prompts:
+            start = time.perf_counter()
+            cache.get(prompt, "model")
+            samples.append(time.perf_counter() - start)
+    cache.close()
+
+    samples.sort()
+    return {
+        "configuration": name,
+        "gets": len(samples),
+        "p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+        "p99_us": round(samples[int(len(samples) * 0.99)] * 1e6, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark IntelligentCache get latency")
+    parser.add_argument("--entries", type=int, default=200, help="Entries stored in each cache")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over every entry")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="bench_cache_get_")
+    try:
+        results = [bench_configuration(name, cache_dir, args.entries, args.rounds)
+                   for name in CONFIGURATIONS]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'configuration':<18} {'gets':>7} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for result in results:
+        print(f"{result['configuration']:<18} {result['gets']:>7} "
+              f"{result['p50_us']:>10.1f} {result['p99_us']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark ContextWindow Trimming
+
+Appends a long stream of messages to a ContextWindow under each context
+strategy and reports throughput, so trimming cost regressions show up as a
+drop in messages per second as the conversation grows.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.context_management import (
+    ContextMessage,
+    ContextStrategy,
+    ContextWindow,
+    MessageImportance,
+)
+
+
+def build_messages(count: int, seed: int) -> List[ContextMessage]:
+    """Build a reproducible conversation with mixed roles and importance."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    importances = list(MessageImportance)
+    messages = [ContextMessage(
+        role="system",
+        content="You are a helpful assistant",
+        timestamp=start,
+        importance=MessageImportance.CRITICAL,
+        token_count=20,
+    )]
+    for i in range(1, count):
+        messages.append(ContextMessage(
+            role="user" if i % 2 else "assistant",
+            content=f"message {i}",
+            timestamp=start + timedelta(seconds=i),
+            importance=rng.choice(importances[1:]),
+            token_count=rng.randint(5, 200),
+        ))
+    return messages
+
+
+def bench_strategy(strategy: ContextStrategy, messages: List[ContextMessage], max_tokens: int) -> Dict[str, Any]:
+    """Append every message under one strategy and time it."""
+    window = ContextWindow(
+        messages=[],
+        max_tokens=max_tokens,
+        current_tokens=0,
+        strategy=strategy,
+        model_name="bench",
+    )
+
+    # Time each quarter separately: flat numbers mean trimming stays O(1)
+    quarter = max(1, len(messages) // 4)
+    quarter_seconds = []
+    started = time.perf_counter()
+    for offset in range(0, len(messages), quarter):
+        quarter_start = time.perf_counter()
+        for message in messages[offset:offset + quarter]:
+            window.add_message(message)
+        quarter_seconds.append(time.perf_counter() - quarter_start)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "strategy": strategy.value,
+        "messages": len(messages),
+        "seconds": round(elapsed, 4),
+        "messages_per_second": round(len(messages) / elapsed) if elapsed else None,
+        "quarter_seconds": [round(seconds, 4) for seconds in quarter_seconds],
+        "final_messages": len(window.messages),
+        "final_tokens": window.current_tokens,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ContextWindow trimming strategies")
+    parser.add_argument("--messages", type=int, default=100_000, help="Messages appended per strategy")
+    parser.add_argument("--max-tokens", type=int, default=32_768, help="Context window size")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for strategy in ContextStrategy:
+        messages = build_messages(args.messages, args.seed)
+        results.append(bench_strategy(strategy, messages, args.max_tokens))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'strategy':<18} {'seconds':>9} {'msg/s':>10} {'kept':>7}  quarters (s)")
+    for result in results:
+        quarters = " ".join(f"{seconds:.3f}" for seconds in result["quarter_seconds"])
+        print(f"{result['strategy']:<18} {result['seconds']:>9.3f} "
+              f"{result['messages_per_second']:>10} {result['final_messages']:>7}  {quarters}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
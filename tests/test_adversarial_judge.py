@@ -312,7 +312,8 @@ class TestAdversarialJudge:
                     EquivalenceMethod.EXACT,
                     EquivalenceMethod.COSINE_SIMILARITY,  # Will fail
                     EquivalenceMethod.LLM_RUBRIC_JUDGE
-                ]
+                ],
+                short_circuit=False
             )
             
             # Should have results for all methods
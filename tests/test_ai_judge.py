@@ -6,14 +6,15 @@ Tests equivalence evaluation with mock providers.
 import pytest
 import json
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 from common.phase2.ai.clients import LLMClient, EmbeddingClient, OpenAIAdapter, OllamaAdapter
 from common.phase2.ai.judge import EquivalenceRunner, BudgetEnforcer
-from common.phase2.ai.cache import EmbeddingCache, embed_cosine
+from common.phase2.ai.cache import EmbeddingCache, EvaluationCache, embed_cosine
 from common.phase2.enums import EquivalenceMethod, ArtifactType
-from common.phase2.diff_entities import EvaluationStatus
+from common.phase2.diff_entities import EvaluationResult, EvaluationStatus
 
 
 class MockLLMClient(LLMClient):
@@ -412,7 +413,8 @@ class TestEquivalenceRunner:
                     EquivalenceMethod.EXACT,
                     EquivalenceMethod.COSINE_SIMILARITY,
                     EquivalenceMethod.LLM_RUBRIC_JUDGE
-                ]
+                ],
+                short_circuit=False
             )
             
             assert len(evaluation.results) == 3
@@ -446,7 +448,8 @@ class TestEquivalenceRunner:
                     EquivalenceMethod.EXACT,
                     EquivalenceMethod.COSINE_SIMILARITY,  # Will fail
                     EquivalenceMethod.LLM_RUBRIC_JUDGE
-                ]
+                ],
+                short_circuit=False
             )
             
             # Should have 3 results, with cosine similarity showing failure
@@ -462,6 +465,162 @@ class TestEquivalenceRunner:
             assert llm_result.equivalent is True
 
 
+class TestEquivalencePlanner:
+    """Test method planning, short-circuiting and result caching."""
+    
+    def create_runner(self, temp_dir, **kwargs):
+        runner = EquivalenceRunner(
+            llm_client=MockLLMClient(),
+            embedding_client=MockEmbeddingClient(),
+            embedding_cache=EmbeddingCache(cache_dir=temp_dir),
+            **kwargs
+        )
+        runner.rubric_template = "SOURCE: {SOURCE_TEXT}\nTARGET: {TARGET_TEXT}"
+        return runner
+    
+    def run(self, runner, source, target, methods, artifact_type=ArtifactType.TEXT):
+        return runner.run(
+            diff=TestEquivalenceRunner().create_mock_diff(),
+            source_text=source,
+            target_text=target,
+            artifact_type=artifact_type,
+            methods=methods
+        )
+    
+    def test_methods_planned_by_cost(self):
+        runner = EquivalenceRunner()
+        plan = runner.plan_methods([
+            EquivalenceMethod.LLM_RUBRIC_JUDGE,
+            EquivalenceMethod.COSINE_SIMILARITY,
+            EquivalenceMethod.CANONICAL_JSON,
+            EquivalenceMethod.EXACT,
+            EquivalenceMethod.EXACT
+        ])
+        
+        assert plan == [
+            EquivalenceMethod.EXACT,
+            EquivalenceMethod.CANONICAL_JSON,
+            EquivalenceMethod.COSINE_SIMILARITY,
+            EquivalenceMethod.LLM_RUBRIC_JUDGE
+        ]
+    
+    def test_conclusive_cheap_method_skips_expensive(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = self.create_runner(temp_dir)
+            evaluation = self.run(
+                runner, '{"b": 2, "a": 1}', '{"a": 1, "b": 2}',
+                [EquivalenceMethod.LLM_RUBRIC_JUDGE, EquivalenceMethod.EXACT, EquivalenceMethod.CANONICAL_JSON],
+                artifact_type=ArtifactType.JSON
+            )
+            
+            assert [r.method for r in evaluation.results] == [EquivalenceMethod.EXACT, EquivalenceMethod.CANONICAL_JSON]
+            assert evaluation.metadata["short_circuit"]["decided_by"] == "canonical_json"
+            assert evaluation.metadata["short_circuit"]["skipped_methods"] == ["llm_rubric_judge"]
+            assert runner.llm_client.call_count == 0
+    
+    def test_expensive_methods_run_concurrently(self):
+        started = {"embed": threading.Event(), "chat": threading.Event()}
+        
+        def rendezvous(name, other, call):
+            # Each client waits for the other to start, so a sequential run fails
+            def wrapper(*args, **kwargs):
+                started[name].set()
+                if not started[other].wait(timeout=5):
+                    raise RuntimeError(f"{other} never started")
+                return call(*args, **kwargs)
+            return wrapper
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = self.create_runner(temp_dir)
+            runner.embedding_client.embed = rendezvous("embed", "chat", runner.embedding_client.embed)
+            runner.llm_client.chat = rendezvous("chat", "embed", runner.llm_client.chat)
+            
+            evaluation = self.run(runner, "hello world", "hello there",
+                                  [EquivalenceMethod.LLM_RUBRIC_JUDGE, EquivalenceMethod.COSINE_SIMILARITY])
+            
+            assert [r.method for r in evaluation.results] == [
+                EquivalenceMethod.COSINE_SIMILARITY, EquivalenceMethod.LLM_RUBRIC_JUDGE
+            ]
+            assert all("error" not in r.metadata for r in evaluation.results)
+    
+    def test_results_cached_across_identical_diffs(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = self.create_runner(temp_dir)
+            methods = [EquivalenceMethod.EXACT, EquivalenceMethod.LLM_RUBRIC_JUDGE]
+            
+            first = self.run(runner, "Hello world", "Hi there, world!", methods)
+            second = self.run(runner, "Hello world", "Hi there, world!", methods)
+            
+            assert runner.llm_client.call_count == 1
+            cached = second.results[1]
+            assert cached.metadata["cached"] is True
+            assert cached.cost == 0.0
+            assert cached.equivalent == first.results[1].equivalent
+            assert "cached" not in first.results[1].metadata
+            assert runner.result_cache.get_stats()["hits"] == 1
+    
+    def test_cache_keyed_by_model(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = self.create_runner(temp_dir)
+            self.run(runner, "a", "b", [EquivalenceMethod.LLM_RUBRIC_JUDGE])
+            runner.llm_client.model = "other-model"
+            self.run(runner, "a", "b", [EquivalenceMethod.LLM_RUBRIC_JUDGE])
+            
+            assert runner.llm_client.call_count == 2
+    
+    def test_errors_not_cached(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = self.create_runner(temp_dir)
+            runner.llm_client.chat = Mock(side_effect=RuntimeError("LLM service down"))
+            self.run(runner, "a", "b", [EquivalenceMethod.LLM_RUBRIC_JUDGE])
+            
+            assert runner.result_cache.get_stats()["items"] == 0
+    
+    def test_parse_errors_not_cached(self):
+        garbled = {"text": "I think they are the same??", "tokens": {"prompt": 10, "completion": 5, "total": 15},
+                   "latency_ms": 100, "cost_usd": 0.001, "model": "mock-model", "provider": "mock"}
+        valid = dict(garbled, text=json.dumps({"equivalent": True, "confidence": 0.9, "reasoning": "same"}))
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = self.create_runner(temp_dir)
+            runner.llm_client.chat = Mock(side_effect=[garbled, valid])
+            
+            first = self.run(runner, "a", "b", [EquivalenceMethod.LLM_RUBRIC_JUDGE])
+            second = self.run(runner, "a", "b", [EquivalenceMethod.LLM_RUBRIC_JUDGE])
+            
+            assert first.results[0].equivalent is False
+            assert first.results[0].metadata["error"] == "parse_error"
+            assert "parse_error" in first.results[0].metadata["violations"]
+            # The fail-closed verdict was not reused; the LLM was asked again
+            assert runner.llm_client.chat.call_count == 2
+            assert second.results[0].equivalent is True
+            assert "cached" not in second.results[0].metadata
+    
+    def test_worker_pool_reused_across_runs(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = self.create_runner(temp_dir)
+            methods = [EquivalenceMethod.LLM_RUBRIC_JUDGE, EquivalenceMethod.COSINE_SIMILARITY]
+            
+            self.run(runner, "hello world", "hello there", methods)
+            executor = runner._executor
+            self.run(runner, "hello world", "hello there", methods)
+            
+            assert executor is not None
+            assert runner._executor is executor
+            runner.close()
+            assert runner._executor is None
+    
+    def test_cache_evicts_least_recently_used(self):
+        cache = EvaluationCache(max_items=2)
+        result = EvaluationResult(method=EquivalenceMethod.EXACT, equivalent=True,
+                                  confidence=1.0, similarity_score=1.0)
+        for key in ("a", "b", "c"):
+            cache.put((key, key, "exact", "none"), result)
+        
+        assert cache.get(("a", "a", "exact", "none")) is None
+        assert cache.get(("c", "c", "exact", "none")).metadata["cached"] is True
+
+
 class TestCosineEmbedding:
     """Test cosine similarity utility."""
     
@@ -23,6 +23,8 @@ from common.caching import (
     CacheEntry,
     CacheStats,
     PromptSimilarityCalculator,
+    PromptMinHasher,
+    SingleFlight,
     IntelligentCache,
     get_cache,
     configure_cache
@@ -206,6 +208,49 @@ class TestPromptSimilarityCalculator(unittest.TestCase):
         if len(similar) > 1:
             self.assertGreaterEqual(similar[0][1], similar[1][1])
 
+class TestPromptMinHasher(unittest.TestCase):
+    """Test MinHash signatures and LSH band keys."""
+    
+    def setUp(self):
+        self.hasher = PromptMinHasher()
+    
+    def test_signature_is_deterministic(self):
+        """Test that signatures are stable across hasher instances."""
+        prompt = "Write a Python function to calculate factorial"
+        self.assertEqual(self.hasher.signature(prompt), PromptMinHasher().signature(prompt))
+        self.assertEqual(len(self.hasher.signature(prompt)), self.hasher.num_perm)
+    
+    def test_similar_prompts_share_bands(self):
+        """Test that near-duplicate prompts land in a common bucket."""
+        prompt1 = "Write a Python function to calculate the factorial of a number using recursion"
+        prompt2 = "Please write a Python function to calculate the factorial of a number using recursion"
+        
+        keys1 = set(self.hasher.band_keys(self.hasher.signature(prompt1)))
+        keys2 = set(self.hasher.band_keys(self.hasher.signature(prompt2)))
+        
+        self.assertTrue(keys1 & keys2)
+    
+    def test_estimate_tracks_jaccard(self):
+        """Test that the signature estimate approximates exact Jaccard."""
+        prompt1 = "alpha beta gamma delta epsilon zeta eta theta iota kappa"
+        prompt2 = "alpha beta gamma delta epsilon zeta eta theta lambda mu"
+        
+        exact = PromptSimilarityCalculator().calculate_similarity(prompt1, prompt2)
+        estimate = PromptMinHasher.estimate_similarity(
+            self.hasher.signature(prompt1), self.hasher.signature(prompt2)
+        )
+        self.assertAlmostEqual(estimate, exact, delta=0.25)
+    
+    def test_pack_roundtrip(self):
+        """Test signature serialization."""
+        signature = self.hasher.signature("round trip prompt")
+        self.assertEqual(self.hasher.unpack(self.hasher.pack(signature)), signature)
+    
+    def test_invalid_band_configuration(self):
+        """Test that bands must divide the permutation count."""
+        with self.assertRaises(ValueError):
+            PromptMinHasher(num_perm=30, bands=8)
+
 class TestIntelligentCache(unittest.TestCase):
     """Test intelligent cache functionality."""
     
@@ -364,6 +409,251 @@ class TestIntelligentCache(unittest.TestCase):
         self.assertGreater(stats.cache_hits, 0)
         self.assertGreater(stats.cache_misses, 0)
 
+class TestCacheTiers(unittest.TestCase):
+    """Test the in-memory hot tier and batched access statistics."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_hot_tier_is_bounded(self):
+        """Test that the hot tier keeps only the most recent entries."""
+        cache = IntelligentCache(cache_dir=self.temp_dir, hot_cache_entries=2)
+        
+        for i in range(5):
+            cache.put(f"prompt_{i}", "model", f"response_{i}")
+        
+        self.assertEqual(list(cache._hot_entries), [
+            cache._generate_cache_key("prompt_3", "model"),
+            cache._generate_cache_key("prompt_4", "model"),
+        ])
+        
+        # Entries outside the hot tier are still served from SQLite
+        self.assertEqual(cache.get("prompt_0", "model"), "response_0")
+        cache.close()
+    
+    def test_access_stats_are_batched(self):
+        """Test that hits are recorded in memory and flushed in one batch."""
+        cache = IntelligentCache(cache_dir=self.temp_dir, access_flush_interval=60)
+        cache.put("prompt", "model", "response")
+        key = cache._generate_cache_key("prompt", "model")
+        
+        for _ in range(3):
+            self.assertEqual(cache.get("prompt", "model"), "response")
+        
+        self.assertEqual(cache._pending_access[key][1], 3)
+        self.assertEqual(cache._flush_access_updates(), 1)
+        
+        with cache._get_db_connection() as conn:
+            row = conn.execute("SELECT access_count FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        self.assertEqual(row['access_count'], 4)
+        cache.close()
+    
+    def test_invalidation_clears_hot_tier(self):
+        """Test that invalidated entries are not served from memory."""
+        cache = IntelligentCache(cache_dir=self.temp_dir)
+        cache.put("prompt", "model", "response")
+        self.assertEqual(cache.get("prompt", "model"), "response")
+        
+        cache.invalidate_by_model("model")
+        self.assertIsNone(cache.get("prompt", "model"))
+        cache.close()
+    
+    def test_concurrent_gets(self):
+        """Test concurrent readers on per-thread connections."""
+        import threading
+        cache = IntelligentCache(cache_dir=self.temp_dir, hot_cache_entries=0)
+        for i in range(20):
+            cache.put(f"prompt_{i}", "model", f"response_{i}")
+        
+        errors = []
+        
+        def reader():
+            try:
+                for i in range(20):
+                    if cache.get(f"prompt_{i}", "model") != f"response_{i}":
+                        errors.append(i)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.get_stats().cache_hits, 160)
+        cache.close()
+
+class TestRequestCoalescing(unittest.TestCase):
+    """Test single-flight deduplication of identical in-flight requests."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = IntelligentCache(cache_dir=self.temp_dir)
+    
+    def tearDown(self):
+        import shutil
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_concurrent_identical_requests_share_one_call(self):
+        """Test that waiting callers reuse the leader's result."""
+        import threading
+        calls = []
+        release = threading.Event()
+        
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "shared response"
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                self.cache.coalesce("same prompt", "model", compute, {"role": "dev"})
+            ))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        # Let every follower attach before the leader finishes
+        deadline = time.time() + 5
+        while self.cache._single_flight.in_flight() == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["shared response"] * 5)
+        self.assertEqual(self.cache.get_stats().coalesced_requests, 4)
+        self.assertEqual(self.cache._single_flight.in_flight(), 0)
+    
+    def test_different_keys_are_not_coalesced(self):
+        """Test that different contexts run separately."""
+        self.assertEqual(self.cache.coalesce("prompt", "model", lambda: "a", {"role": "dev"}), "a")
+        self.assertEqual(self.cache.coalesce("prompt", "model", lambda: "b", {"role": "qa"}), "b")
+        self.assertEqual(self.cache.stats.coalesced_requests, 0)
+    
+    def test_leader_errors_propagate(self):
+        """Test that a failed upstream call is not remembered."""
+        def fail():
+            raise RuntimeError("upstream down")
+        
+        with self.assertRaises(RuntimeError):
+            self.cache.coalesce("prompt", "model", fail)
+        self.assertEqual(self.cache.coalesce("prompt", "model", lambda: "ok"), "ok")
+    
+    def test_async_coalescing(self):
+        """Test single-flight for coroutine upstream calls."""
+        import asyncio
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "async response"
+        
+        async def run():
+            return await asyncio.gather(*[
+                self.cache.acoalesce("prompt", "model", compute) for _ in range(4)
+            ])
+        
+        self.assertEqual(asyncio.run(run()), ["async response"] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.stats.coalesced_requests, 3)
+    
+    def test_coalesced_counter_persists(self):
+        """Test that the coalesced counter survives a stats round trip."""
+        self.cache.stats.coalesced_requests = 7
+        self.cache._save_stats()
+        
+        reopened = IntelligentCache(cache_dir=self.temp_dir)
+        self.assertEqual(reopened.stats.coalesced_requests, 7)
+        reopened.close()
+
+class TestCacheEviction(unittest.TestCase):
+    """Test index-driven and background eviction."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_eviction_scans_use_covering_indexes(self):
+        """Test that every eviction order is served by a covering index."""
+        cache = IntelligentCache(cache_dir=self.temp_dir)
+        
+        with cache._get_db_connection() as conn:
+            for order_by in IntelligentCache._EVICTION_ORDER.values():
+                plan = " ".join(
+                    row[3] for row in conn.execute(
+                        f"EXPLAIN QUERY PLAN SELECT key, size_bytes FROM cache_entries ORDER BY {order_by}"
+                    )
+                )
+                self.assertIn("COVERING INDEX", plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+        cache.close()
+    
+    def test_evict_entries_frees_required_bytes(self):
+        """Test that a single eviction pass frees enough space in order."""
+        cache = IntelligentCache(cache_dir=self.temp_dir, strategy=CacheStrategy.LFU)
+        for i in range(5):
+            cache.put(f"prompt_{i}", "model", "x" * 1000)
+        for _ in range(3):
+            cache.get("prompt_0", "model")
+        
+        with cache._lock:
+            evicted = cache._evict_entries(1500)
+        
+        self.assertEqual(evicted, 2)
+        self.assertEqual(cache.stats.invalidations[CacheInvalidationReason.SIZE_LIMIT.value], 2)
+        self.assertEqual(cache.get("prompt_0", "model"), "x" * 1000)
+        self.assertEqual(cache.get_stats().cache_size, 3)
+        cache.close()
+    
+    def test_background_eviction_to_low_watermark(self):
+        """Test that crossing the high watermark is resolved off the put path."""
+        cache = IntelligentCache(cache_dir=self.temp_dir, max_size_mb=1)
+        
+        # Stay below the hard limit so put never evicts inline
+        for i in range(19):
+            cache.put(f"prompt_{i}", "model", "x" * 50000)
+        
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            if cache.get_stats().total_size_bytes <= cache.max_size_bytes * cache.EVICTION_LOW_WATERMARK:
+                break
+            time.sleep(0.05)
+        
+        self.assertLessEqual(
+            cache.get_stats().total_size_bytes,
+            cache.max_size_bytes * cache.EVICTION_LOW_WATERMARK
+        )
+        cache.close()
+    
+    def test_existing_entries_count_toward_size_on_open(self):
+        """Test size accounting starts from the entries already on disk."""
+        cache = IntelligentCache(cache_dir=self.temp_dir, max_size_mb=1)
+        for i in range(10):
+            cache.put(f"prompt_{i}", "model", "x" * 50000)
+        stored_bytes = cache.get_stats().total_size_bytes
+        cache.close()
+        
+        reopened = IntelligentCache(cache_dir=self.temp_dir, max_size_mb=1)
+        self.assertEqual(reopened.stats.total_size_bytes, stored_bytes)
+        self.assertEqual(reopened.stats.cache_size, 10)
+        reopened.close()
+
 class TestCacheIntegration(unittest.TestCase):
     """Test cache integration with Ollama system."""
     
@@ -445,6 +735,46 @@ class TestCacheStrategies(unittest.TestCase):
         self.assertIsNotNone(cache.get("prompt_5", "model"))
         self.assertIsNotNone(cache.get("prompt_7", "model"))
     
+    def test_similarity_based_strategy(self):
+        """Test similarity-based lookups through the LSH index."""
+        cache = IntelligentCache(
+            cache_dir=self.temp_dir,
+            strategy=CacheStrategy.SIMILARITY_BASED,
+            similarity_threshold=0.8
+        )
+        
+        cache.put("Write a Python function to calculate the factorial of a number using recursion",
+                  "model", "def factorial(n): ...", performance_score=9.0)
+        cache.put("Explain the difference between TCP and UDP networking protocols",
+                  "model", "TCP is connection oriented", performance_score=9.0)
+        
+        # Near-duplicate prompt hits the matching entry
+        self.assertEqual(
+            cache.get("Please write a Python function to calculate the factorial of a number using recursion", "model"),
+            "def factorial(n): ..."
+        )
+        
+        # Unrelated prompt and other models miss
+        self.assertIsNone(cache.get("Describe the water cycle for children", "model"))
+        self.assertIsNone(cache.get(
+            "Please write a Python function to calculate the factorial of a number using recursion", "other_model"
+        ))
+    
+    def test_similarity_index_follows_invalidation(self):
+        """Test that invalidated entries leave the LSH index."""
+        cache = IntelligentCache(
+            cache_dir=self.temp_dir,
+            strategy=CacheStrategy.SIMILARITY_BASED
+        )
+        
+        cache.put("Summarize the quarterly sales report for the board meeting",
+                  "model", "summary", performance_score=9.0)
+        cache.invalidate_by_model("model")
+        
+        self.assertIsNone(cache.get("Summarize the quarterly sales report for the board meeting today", "model"))
+        with cache._get_db_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM cache_lsh_buckets").fetchone()[0], 0)
+    
     def test_performance_based_strategy(self):
         """Test performance-based caching strategy."""
         cache = IntelligentCache(
@@ -6,7 +6,7 @@ from pathlib import Path
 import pytest
 
 from common.phase2.enums import ArtifactType
-from common.phase2.cli_analyzer import RunAnalyzer
+from common.phase2.cli_analyzer import RunAnalyzer, run_detector_benchmark
 
 
 @pytest.mark.asyncio
@@ -165,4 +165,62 @@ async def test_analyze_run_error_handling(tmp_path):
     # Should handle errors gracefully
     assert isinstance(result.errors, list)
     # Should still process valid artifacts
-    assert result.mismatches_created >= 0
\ No newline at end of file
+    assert result.mismatches_created >= 0
+
+@pytest.mark.asyncio
+async def test_analyze_run_groups_identical_content(tmp_path):
+    """Identical pairs are skipped and repeated content pairs share one detector run."""
+    artifacts = {
+        "a": {"content": "Hi,   there!", "type": "text"},
+        "b": {"content": "Hi,   there!", "type": "text"},
+        "c": {"content": "Hi, there!", "type": "text"},
+        "d": {"content": "Hi, there!", "type": "text"},
+    }
+    p = tmp_path / "duplicate_artifacts.json"
+    p.write_text(json.dumps(artifacts), encoding="utf-8")
+
+    analyzer = RunAnalyzer()
+    result = await analyzer.analyze_run(run_id="run_duplicates", artifacts_path=str(p))
+
+    assert result.pairs_total == 6
+    assert result.pairs_identical == 2
+    assert result.detector_runs == 1
+    assert result.pairs_deduplicated == 3
+    assert result.mismatches_created == 4
+    assert result.to_dict()["throughput"]["detector_runs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_run_workers_stream_jsonl(tmp_path):
+    """A process pool gives the same mismatches and streams them as JSON Lines."""
+    artifacts = {
+        f"t{i}": {"content": "Value: 1.0" + " " * i + f"\nitem {i % 3}", "type": "text"}
+        for i in range(8)
+    }
+    p = tmp_path / "artifacts.json"
+    p.write_text(json.dumps(artifacts), encoding="utf-8")
+    out = tmp_path / "results.jsonl"
+
+    serial = await RunAnalyzer().analyze_run(run_id="run_serial", artifacts_path=str(p))
+    analyzer = RunAnalyzer(workers=2, chunk_size=3)
+    calls_before = sum(d.call_count for d in analyzer.detector_registry.detectors)
+    pooled = await analyzer.analyze_run(run_id="run_pooled", artifacts_path=str(p), output_path=str(out))
+
+    assert pooled.errors == []
+    assert pooled.mismatches_created == serial.mismatches_created
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["type"] for r in records] == ["mismatch"] * pooled.mismatches_created + ["summary"]
+    assert records[-1]["throughput"]["workers"] == 2
+    # Detector counters from worker processes are merged back
+    assert sum(d.call_count for d in analyzer.detector_registry.detectors) > calls_before
+
+
+def test_detector_benchmark_reports_every_case():
+    report = run_detector_benchmark(size_kb=1, iterations=1)
+    cases = {case["case"]: case for case in report["cases"]}
+
+    assert {"whitespace", "json_ordering", "numeric_epsilon", "unrelated"} <= set(cases)
+    assert cases["json_ordering"]["detected"] == "json_ordering"
+    assert cases["unrelated"]["detected"] is None
+    for case in cases.values():
+        assert case["shared_ms"] >= 0 and case["detectors_ms"]
@@ -1,5 +1,7 @@
 """Unit tests for Phase 2 detectors based on task2.md feedback."""
 
+import json
+
 import pytest
 
 from common.phase2.enums import ArtifactType, MismatchType
@@ -8,6 +10,11 @@ from common.phase2.detectors import (
     JsonStructureDetector,
     NumericEpsilonDetector,
     MarkdownFormattingDetector,
+    ArtifactView,
+    ComparisonView,
+    DetectorRegistry,
+    ULPNumericDetector as ScalarULPNumericDetector,
+    NUMPY_AVAILABLE,
 )
 from common.phase2.detector_improvements import (
     NewlineDetector,
@@ -188,4 +195,134 @@ class TestDetectorVersioning:
         d = ULPNumericDetector()
         assert d.name == "numeric_ulp@1.0.0"
         assert hasattr(d, 'config')
-        assert 'ulps' in d.config
\ No newline at end of file
+        assert 'ulps' in d.config
+
+class TestArtifactView:
+    def test_forms_are_memoized(self):
+        view = ArtifactView("a = 1.5\r\nb = 2")
+        assert view.numbers == [1.5, 2.0]
+        assert view.numbers is view.numbers
+        assert view.eol == "crlf"
+        assert view.eol_normalized == "a = 1.5\nb = 2"
+
+    def test_invalid_json(self):
+        view = ArtifactView("{not json")
+        assert not view.is_json
+        assert view.canonical_json is None
+        with pytest.raises(json.JSONDecodeError):
+            view.json
+
+    def test_detectors_share_one_view(self):
+        src = "total 1.0 items"
+        tgt = "total 1.0000000001 items"
+        view = ComparisonView(src, tgt, ArtifactType.TEXT)
+        results = DetectorRegistry().detect_all(src, tgt, ArtifactType.TEXT, view=view)
+
+        assert results
+        # Forms computed once by the first detector that needed them
+        assert {"numbers", "eol_normalized", "whitespace_normalized"} <= set(vars(view.source))
+
+    def test_versioned_detectors_read_the_shared_view(self):
+        src = "x = 1.0\r\ny = 2.0\r\n"
+        tgt = "x = 1.0000000000000002\ny = 2.0\n"
+        view = ComparisonView(src, tgt, ArtifactType.TEXT)
+
+        assert NewlineDetector().detect(src, tgt, ArtifactType.TEXT, view=view) is None
+        res = ULPNumericDetector().detect(src, tgt, ArtifactType.TEXT, view=view)
+
+        assert res is not None
+        assert res.mismatch_type == MismatchType.NUMERIC_EPSILON
+        assert {"eol_normalized", "numbers"} <= set(vars(view.source))
+        assert {"eol_normalized", "numbers"} <= set(vars(view.target))
+
+    def test_view_for_other_content_is_ignored(self):
+        view = ComparisonView("1", "2", ArtifactType.TEXT)
+        res = NumericEpsilonDetector().detect("1.0", "1.0000000001", ArtifactType.TEXT, view=view)
+        assert res is not None
+        assert res.mismatch_type == MismatchType.NUMERIC_EPSILON
+
+
+class TestDetectionCascade:
+    def _calls(self, registry):
+        return {d.name: d.call_count for d in registry.detectors}
+
+    def test_identical_content_exits_before_detectors(self):
+        registry = DetectorRegistry()
+        assert registry.detect_all("x = 1.5\n", "x = 1.5\n", ArtifactType.TEXT) == []
+        assert not any(self._calls(registry).values())
+        assert registry.get_stats()["cascade"]["tiers"]["identical"]["hits"] == 1
+
+    def test_fingerprint_match_skips_expensive_detectors(self):
+        registry = DetectorRegistry()
+        results = registry.detect_all("a  = 1.5\n\n", "a = 1.5\n", ArtifactType.TEXT)
+
+        assert results[0].mismatch_type == MismatchType.WHITESPACE
+        calls = self._calls(registry)
+        assert calls["whitespace_detector"] > 0
+        assert calls["numeric_ulp_detector"] == calls["markdown_formatting_detector"] == 0
+        assert registry.tier_hits["fingerprint"] == 1
+
+    def test_json_canonical_fingerprint(self):
+        registry = DetectorRegistry()
+        results = registry.detect_all('{"b": 2, "a": 1}', '{"a": 1, "b": 2}', ArtifactType.JSON)
+
+        assert results[0].mismatch_type == MismatchType.JSON_ORDERING
+        assert self._calls(registry)["numeric_epsilon_detector"] == 0
+
+    def test_disagreeing_fingerprints_run_full_tier(self):
+        registry = DetectorRegistry()
+        results = registry.detect_all("value 1.0", "value 1.0000000001", ArtifactType.TEXT)
+
+        assert results[0].mismatch_type == MismatchType.NUMERIC_EPSILON
+        assert self._calls(registry)["whitespace_detector"] == 0
+        stats = registry.get_stats()["cascade"]
+        assert stats["comparisons"] == 1
+        assert stats["tiers"]["full"]["hit_rate"] == 1.0
+
+    def test_short_circuit_disabled_runs_every_detector(self):
+        registry = DetectorRegistry()
+        registry.detect_all("a  b", "a b", ArtifactType.TEXT, short_circuit=False)
+        assert all(d.call_count > 0 for d in registry.get_detectors_for_type(ArtifactType.TEXT))
+
+    @pytest.mark.parametrize("source, target, artifact_type, cascade_top", [
+        ("value 1.0\n", "value 1.0\r\n", ArtifactType.TEXT, "newline_detector"),
+        ("pi = 3.14159\n", "pi  =  3.14159\n", ArtifactType.TEXT, "whitespace_detector"),
+        ("# Title\n\nText 2.5\n", "# Title\r\n\r\nText 2.5\r\n", ArtifactType.TEXT, "newline_detector"),
+        ("def f():\n    return 1.5\n", "def f():\r\n    return 1.5\r\n", ArtifactType.CODE, "newline_detector"),
+    ])
+    def test_cascade_drops_numeric_false_positives(self, source, target, artifact_type, cascade_top):
+        # Numbers are unchanged; a full run still ranks the ULP detector first
+        registry = DetectorRegistry()
+        full = registry.detect_all(source, target, artifact_type, short_circuit=False)
+        cascade = registry.detect_all(source, target, artifact_type)
+
+        assert full[0].detector_name == "numeric_ulp_detector"
+        assert cascade[0].detector_name == cascade_top
+        assert cascade[0].mismatch_type == MismatchType.WHITESPACE
+        assert all(r.detector_name != "numeric_ulp_detector" for r in cascade)
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+class TestVectorizedNumericDetectors:
+    def _pair(self, count=400):
+        values = [i * 0.37 - 50.0 for i in range(count)] + [0.0, -0.0, 1e-320, 1e999]
+        source = " ".join(repr(v) for v in values)
+        target = " ".join(repr(v * (1 + 1e-12)) for v in values)
+        return source, target
+
+    @pytest.mark.parametrize("detector_cls", [NumericEpsilonDetector, ScalarULPNumericDetector])
+    def test_paths_agree(self, detector_cls):
+        source, target = self._pair()
+        scalar = detector_cls(vectorize=False).detect(source, target, ArtifactType.TEXT)
+        vectorized = detector_cls(vectorize=True).detect(source, target, ArtifactType.TEXT)
+
+        assert scalar is not None and vectorized is not None
+        assert vectorized.confidence == scalar.confidence
+        assert vectorized.reasoning == scalar.reasoning
+        assert [(h.source_content, h.target_content) for h in vectorized.diff.hunks] == \
+            [(h.source_content, h.target_content) for h in scalar.diff.hunks]
+
+    def test_material_change_rejected_in_bulk(self):
+        source, target = self._pair()
+        target = target.replace("-50.0", "-49.0", 1)
+        assert NumericEpsilonDetector(vectorize=True).detect(source, target, ArtifactType.TEXT) is None
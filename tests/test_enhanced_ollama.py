@@ -7,10 +7,12 @@ and fallback capabilities.
 """
 
 import unittest
+import asyncio
+import threading
 import tempfile
 import os
 import json
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime
 
 import sys
@@ -22,6 +24,8 @@ from common.ollama_integration import (
     TaskCharacteristics,
     ModelPerformance,
     ModelInfo,
+    OllamaClient,
+    AsyncOllamaClient,
     EnhancedOllamaManager,
     EnhancedAgentInterface,
     create_agent,
@@ -255,6 +259,164 @@ class TestEnhancedOllamaManager(unittest.TestCase):
         self.assertNotIn("codellama:13b", fallbacks)
         self.assertTrue(len(fallbacks) > 0)
 
+class TestOllamaClientPooling(unittest.TestCase):
+    """Test pooled sessions and client-side caching in OllamaClient."""
+    
+    def _tags_response(self, names):
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = {"models": [{"name": name} for name in names]}
+        return response
+    
+    @patch('common.ollama_integration.requests.Session.get')
+    def test_pool_configuration(self, mock_get):
+        """Test that the session mounts a sized, retrying adapter."""
+        mock_get.return_value = self._tags_response(["llama3.1:8b"])
+        
+        client = OllamaClient(pool_size=4, max_retries=2)
+        adapter = client.session.get_adapter("http://localhost:11434")
+        
+        self.assertIs(adapter, client._adapter)
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        
+        # Generation POSTs are never replayed after a 5xx
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
+        self.assertEqual(adapter.max_retries.connect, 2)
+    
+    @patch('common.ollama_integration.requests.Session.get')
+    def test_list_models_is_cached(self, mock_get):
+        """Test that model metadata is reused within the TTL."""
+        mock_get.return_value = self._tags_response(["llama3.1:8b"])
+        
+        client = OllamaClient(models_cache_ttl=60)
+        self.assertTrue(client.is_model_available("llama3.1:8b"))
+        self.assertTrue(client.is_model_available("llama3.1:8b"))
+        
+        # Only the connection check reached the server
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(client.get_pool_stats()["models_cache_hits"], 2)
+    
+    @patch('common.ollama_integration.requests.Session.get')
+    def test_missing_model_refreshes_cache(self, mock_get):
+        """Test that an unknown model triggers one refresh of the list."""
+        mock_get.return_value = self._tags_response(["llama3.1:8b"])
+        client = OllamaClient(models_cache_ttl=60)
+        
+        mock_get.return_value = self._tags_response(["llama3.1:8b", "codellama:13b"])
+        self.assertTrue(client.is_model_available("codellama:13b"))
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('common.ollama_integration.requests.Session.get')
+    def test_health_check_uses_ttl(self, mock_get):
+        """Test that health checks are served from cache within the TTL."""
+        mock_get.return_value = self._tags_response([])
+        client = OllamaClient(health_check_ttl=60)
+        
+        self.assertTrue(client.health_check())
+        self.assertEqual(mock_get.call_count, 1)
+        
+        self.assertTrue(client.health_check(force=True))
+        self.assertEqual(mock_get.call_count, 2)
+        
+        stats = client.get_pool_stats()
+        self.assertEqual(stats["health_check_cache_hits"], 1)
+        self.assertEqual(stats["health_checks"], 2)
+        self.assertTrue(stats["is_healthy"])
+
+class TestAsyncOllamaClient(unittest.IsolatedAsyncioTestCase):
+    """Test the asyncio client against a local fake Ollama server."""
+    
+    async def asyncSetUp(self):
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+        
+        self.in_flight = 0
+        self.max_in_flight = 0
+        
+        async def tags(request):
+            return web.json_response({"models": [{"name": "llama3.1:8b"}]})
+        
+        async def generate(request):
+            payload = await request.json()
+            if payload["stream"]:
+                response = web.StreamResponse()
+                await response.prepare(request)
+                for word in ("Hello", " ", "world"):
+                    await response.write(json.dumps({"response": word, "done": False}).encode() + b"\n")
+                await response.write(json.dumps({"response": "", "done": True}).encode() + b"\n")
+                return response
+            
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.05)
+            self.in_flight -= 1
+            return web.json_response({"response": f"echo: {payload['prompt']}", "eval_count": 3})
+        
+        app = web.Application()
+        app.router.add_get("/api/tags", tags)
+        app.router.add_post("/api/generate", generate)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        
+        self.client = AsyncOllamaClient(
+            base_url=str(self.server.make_url("")).rstrip("/"),
+            max_concurrent_per_model=2
+        )
+    
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+    
+    async def test_concurrency_is_bounded_per_model(self):
+        """Test that requests beyond the per-model limit queue."""
+        results = await asyncio.gather(*[
+            self.client.generate("llama3.1:8b", f"prompt {i}") for i in range(6)
+        ])
+        
+        self.assertEqual(self.max_in_flight, 2)
+        self.assertEqual([r["response"] for r in results], [f"echo: prompt {i}" for i in range(6)])
+        self.assertEqual(results[0]["performance"]["completion_tokens"], 3)
+        self.assertEqual(self.client.get_concurrency_stats()["llama3.1:8b"]["in_flight"], 0)
+    
+    async def test_generate_stream(self):
+        """Test streaming chunks from the generate endpoint."""
+        chunks = [chunk async for chunk in self.client.generate_stream("llama3.1:8b", "hi")]
+        self.assertEqual("".join(chunks), "Hello world")
+    
+    async def test_unknown_model_raises(self):
+        """Test that unavailable models are rejected before dispatch."""
+        with self.assertRaises(ValueError):
+            await self.client.generate("missing:1b", "hi")
+
+class TestAsyncOllamaClientLoops(unittest.TestCase):
+    """Test that AsyncOllamaClient resources follow the running event loop."""
+    
+    def test_successive_event_loops_get_fresh_resources(self):
+        """Test that a second asyncio.run() does not reuse loop-bound objects."""
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            self.skipTest("aiohttp not installed")
+        
+        client = AsyncOllamaClient(base_url="http://localhost:11434")
+        
+        async def grab():
+            session, semaphore = client._get_session(), client._semaphore("llama3.1:8b")
+            self.assertIs(client._get_session(), session)
+            await semaphore.acquire()
+            semaphore.release()
+            await client.close()
+            return session, semaphore
+        
+        first_session, first_semaphore = asyncio.run(grab())
+        second_session, second_semaphore = asyncio.run(grab())
+        
+        self.assertIsNot(first_session, second_session)
+        self.assertIsNot(first_semaphore, second_semaphore)
+        self.assertTrue(second_session.closed)
+
 class TestEnhancedAgentInterface(unittest.TestCase):
     """Test enhanced agent interface."""
     
@@ -325,6 +487,144 @@ class TestEnhancedAgentInterface(unittest.TestCase):
         self.assertIn("factorial", response)
         self.assertEqual(mock_client.generate.call_count, 2)  # Called twice due to fallback
     
+    @patch('common.ollama_integration.OllamaClient')
+    def test_agent_async_generate_shares_cache(self, mock_client_class):
+        """Test that agenerate records performance and reuses the shared cache."""
+        from common.caching import IntelligentCache
+        
+        mock_client = Mock()
+        mock_client.list_models.return_value = [{"name": "llama3.1:8b"}]
+        mock_client.get_model_info.return_value = {"size": 8000000000}
+        mock_client_class.return_value = mock_client
+        
+        manager = EnhancedOllamaManager(
+            config_path=self.config_path,
+            performance_db_path=self.performance_path
+        )
+        agent = EnhancedAgentInterface("developer", manager, enable_caching=False,
+                                       enable_context_management=False)
+        agent.enable_caching = True
+        agent.cache = IntelligentCache(cache_dir=os.path.join(self.temp_dir, "cache"))
+        
+        response_text = "Here is the function:\n```python\ndef add(a, b):\n    return a + b\n```"
+        agent._async_client = Mock()
+        agent._async_client.generate = AsyncMock(return_value={
+            "response": response_text,
+            "performance": {"tokens_per_second": 20.0}
+        })
+        
+        record_threads = []
+        with patch.object(manager, 'record_performance',
+                          side_effect=lambda **kwargs: record_threads.append(threading.get_ident())) as record:
+            first = asyncio.run(agent.agenerate("Add two numbers"))
+            second = asyncio.run(agent.agenerate("Add two numbers"))
+        
+        self.assertEqual(first, response_text)
+        self.assertEqual(second, response_text)
+        self.assertEqual(agent._async_client.generate.await_count, 1)
+        self.assertTrue(record.call_args.kwargs["success"])
+        # Performance tracking disk I/O runs off the event loop thread
+        self.assertNotIn(threading.get_ident(), record_threads)
+        
+        # Concurrent identical misses share one upstream call
+        async def slow_generate(**kwargs):
+            await asyncio.sleep(0.05)
+            return {"response": response_text, "performance": {}}
+        
+        async def burst():
+            return await asyncio.gather(*[agent.agenerate("Multiply two numbers") for _ in range(3)])
+        
+        agent._async_client.generate = AsyncMock(side_effect=slow_generate)
+        with patch.object(manager, 'record_performance'):
+            responses = asyncio.run(burst())
+        
+        self.assertEqual(responses, [response_text] * 3)
+        self.assertEqual(agent._async_client.generate.await_count, 1)
+        self.assertEqual(agent.cache.get_stats().coalesced_requests, 2)
+        agent.cache.close()
+    
+    @patch('common.ollama_integration.OllamaClient')
+    def test_streaming_responses_are_cached_and_replayed(self, mock_client_class):
+        """Test that completed streams are cached and hits replay through the callback."""
+        from common.caching import IntelligentCache
+        
+        mock_client = Mock()
+        mock_client.list_models.return_value = [{"name": "llama3.1:8b"}]
+        mock_client.get_model_info.return_value = {"size": 8000000000}
+        mock_client_class.return_value = mock_client
+        
+        words = ["Here ", "is ", "the ", "function:\n", "```python\n", "def add(a, b):\n",
+                 "    return a + b\n", "```"]
+        stream_response = Mock()
+        stream_response.raise_for_status.return_value = None
+        stream_response.iter_lines.side_effect = lambda: iter(
+            [json.dumps({"response": w, "done": False}).encode() for w in words] +
+            [json.dumps({"response": "", "done": True}).encode()]
+        )
+        mock_client.session.post.return_value = stream_response
+        mock_client.api_url = "http://localhost:11434/api"
+        
+        manager = EnhancedOllamaManager(
+            config_path=self.config_path,
+            performance_db_path=self.performance_path
+        )
+        agent = EnhancedAgentInterface("developer", manager, enable_caching=False,
+                                       enable_context_management=False)
+        agent.enable_caching = True
+        agent.cache = IntelligentCache(cache_dir=os.path.join(self.temp_dir, "cache"))
+        
+        live_chunks = []
+        live = list(agent.generate_streaming("Add two numbers", callback=live_chunks.append))
+        self.assertEqual(live, words + [""])
+        self.assertEqual(mock_client.session.post.call_count, 1)
+        
+        replayed_chunks = []
+        replayed = list(agent.generate_streaming("Add two numbers", callback=replayed_chunks.append))
+        
+        # The hit never reaches the model and the callback sees every chunk
+        self.assertEqual(mock_client.session.post.call_count, 1)
+        self.assertEqual("".join(replayed), "".join(words))
+        self.assertEqual(replayed_chunks, replayed)
+        self.assertGreater(len(replayed), 1)
+        
+        # Non-streaming generate shares the same cache entry
+        self.assertEqual(agent.generate("Add two numbers"), "".join(words))
+        agent.cache.close()
+    
+    @patch('common.ollama_integration.OllamaClient')
+    def test_incomplete_streams_are_not_cached(self, mock_client_class):
+        """Test that a stream abandoned by the consumer is not cached."""
+        from common.caching import IntelligentCache
+        
+        mock_client = Mock()
+        mock_client.list_models.return_value = [{"name": "llama3.1:8b"}]
+        mock_client.get_model_info.return_value = {"size": 8000000000}
+        mock_client_class.return_value = mock_client
+        
+        stream_response = Mock()
+        stream_response.raise_for_status.return_value = None
+        stream_response.iter_lines.side_effect = lambda: iter(
+            [json.dumps({"response": f"word{i} ", "done": False}).encode() for i in range(50)]
+        )
+        mock_client.session.post.return_value = stream_response
+        mock_client.api_url = "http://localhost:11434/api"
+        
+        manager = EnhancedOllamaManager(
+            config_path=self.config_path,
+            performance_db_path=self.performance_path
+        )
+        agent = EnhancedAgentInterface("developer", manager, enable_caching=False,
+                                       enable_context_management=False)
+        agent.enable_caching = True
+        agent.cache = IntelligentCache(cache_dir=os.path.join(self.temp_dir, "cache"))
+        
+        stream = agent.generate_streaming("Count words")
+        next(stream)
+        stream.close()
+        
+        self.assertEqual(agent.cache.get_stats().cache_size, 0)
+        agent.cache.close()
+    
     def test_response_quality_assessment(self):
         """Test response quality assessment."""
         agent = EnhancedAgentInterface.__new__(EnhancedAgentInterface)  # Create without __init__
@@ -8,13 +8,17 @@ including streaming support and comprehensive event tracking.
 import pytest
 import tempfile
 import json
+import time
+import zstandard as zstd
 from pathlib import Path
 from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 
 # Import components to test
-from benchmark.replay.recorder import EnhancedRecorder, RecordedEvent, StreamingChunk
-from benchmark.replay.player import EnhancedPlayer
+from benchmark.replay.recorder import (
+    EnhancedRecorder, RecordedEvent, StreamingChunk, index_path_for, dictionary_path_for
+)
+from benchmark.replay.player import EnhancedPlayer, open_jsonl_stream
 from common.replay.streaming import (
     StreamCapture, StreamReplay, StreamToken, StreamingLLMWrapper,
     capture_stream, analyze_stream_timing
@@ -149,6 +153,84 @@ class TestEnhancedRecorder:
         assert manifest.adapter_name == "test_adapter"
         assert manifest.total_events == 1
         assert not self.recorder.recording
+    
+    def _record_events(self, recorder: EnhancedRecorder, count: int):
+        """Record simple LLM call events."""
+        for i in range(count):
+            recorder.record_event(
+                event_type="llm_call",
+                agent_id="test_agent",
+                tool_name="openai",
+                inputs={"prompt": f"Summarize document {i}", "model": "gpt-4"},
+                outputs={"response": f"Summary of document {i}"},
+                duration=0.5
+            )
+    
+    def _read_events(self, recorder: EnhancedRecorder) -> list:
+        """Read back the recorder's first events file."""
+        events_file = self.temp_dir / f"{recorder.recording_id}_events_000.jsonl"
+        lines = []
+        with open_jsonl_stream(events_file) as stream:
+            for line in stream:
+                try:
+                    lines.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass
+        return lines
+    
+    def test_group_commit_frames_and_manifest_metrics(self):
+        """Test that events are committed in groups and reported per event."""
+        recorder = EnhancedRecorder(
+            output_dir=self.temp_dir,
+            adapter_name="test_adapter",
+            group_commit_events=4
+        )
+        recorder.start_recording("group_session")
+        self._record_events(recorder, 10)
+        manifest = recorder.stop_recording()
+        
+        events_file = self.temp_dir / f"{recorder.recording_id}_events_000.jsonl"
+        entries = [json.loads(line) for line in index_path_for(events_file).read_text().splitlines()]
+        
+        assert len(self._read_events(recorder)) == 10
+        assert len(entries) == 10
+        # Groups of 4, 4 and 2 events share a frame
+        assert len({entry["offset"] for entry in entries}) == 3
+        assert manifest.bytes_per_event == events_file.stat().st_size / 10
+        assert manifest.events_per_sec > 0
+        assert manifest.to_dict()["bytes_per_event"] == manifest.bytes_per_event
+        
+        # Shared frames with the default dictionary beat one frame per line
+        per_line = sum(
+            len(zstd.compress((json.dumps(event) + "\n").encode("utf-8")))
+            for event in self._read_events(recorder)
+        ) / 10
+        assert manifest.bytes_per_event < per_line
+    
+    def test_committed_groups_readable_after_crash(self):
+        """Test that committed frames survive an unfinished recording."""
+        recorder = EnhancedRecorder(
+            output_dir=self.temp_dir,
+            adapter_name="test_adapter",
+            group_commit_events=5,
+            group_commit_interval_ms=60000
+        )
+        recorder.start_recording("crash_session")
+        self._record_events(recorder, 7)
+        
+        # The first group is committed by count; the last two are still buffered
+        deadline = time.time() + 5
+        while len(self._read_events(recorder)) < 5 and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(self._read_events(recorder)) == 5
+        
+        recorder.stop_recording()
+        assert len(self._read_events(recorder)) == 7
+        
+        # A frame torn mid-write loses only its own events
+        events_file = self.temp_dir / f"{recorder.recording_id}_events_000.jsonl"
+        events_file.write_bytes(events_file.read_bytes()[:-8])
+        assert len(self._read_events(recorder)) == 5
 
 
 class TestEnhancedPlayer:
@@ -280,6 +362,87 @@ class TestEnhancedPlayer:
         assert stats["loaded_streams"] == 1
         assert stats["replay_mode"] == "strict"
         assert stats["streaming_enabled"] is True
+    
+    def _write_indexed_recording(self, recording_id: str, count: int) -> Path:
+        """Record events with EnhancedRecorder into a loadable run directory."""
+        recording_dir = self.temp_dir / recording_id
+        recorder = EnhancedRecorder(output_dir=recording_dir, adapter_name="player")
+        rec_id = recorder.start_recording("index_session")
+        for i in range(count):
+            recorder.record_event(
+                event_type="llm_call",
+                agent_id="test_agent",
+                tool_name="openai",
+                inputs={"prompt": f"prompt {i}"},
+                outputs={"response": f"response {i}"},
+                duration=0.1
+            )
+        recorder.stop_recording()
+        
+        events_file = recording_dir / f"{rec_id}_events_000.jsonl"
+        target = recording_dir / "events.jsonl.zst"
+        index_path_for(events_file).rename(index_path_for(target))
+        dictionary_path_for(events_file).rename(dictionary_path_for(target))
+        events_file.rename(target)
+        
+        import yaml
+        with open(recording_dir / "manifest.yaml", 'w') as f:
+            yaml.dump({
+                "run_id": recording_id,
+                "recording_id": recording_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "schema_version": "1.0.0",
+                "start_time": datetime.utcnow().isoformat(),
+                "adapter_name": "player",
+                "total_events": count,
+                "file_hashes": {}
+            }, f)
+        
+        return recording_dir
+    
+    def test_lazy_loading_fetches_only_requested_ios(self):
+        """Test that an indexed recording is fetched per key instead of loaded up front."""
+        recording_dir = self._write_indexed_recording("indexed_recording", 3)
+        index_lines = index_path_for(recording_dir / "events.jsonl.zst").read_text().splitlines()
+        entries = [json.loads(line) for line in index_lines]
+        
+        assert self.player.load_recording("indexed_recording")
+        assert len(self.player._recorded_ios) == 0
+        assert self.player.get_replay_statistics()["indexed_ios"] == 3
+        assert self.player.get_recorded_io_count() == 3
+        
+        with open_jsonl_stream(recording_dir / "events.jsonl.zst") as lines:
+            recorded = [json.loads(line) for line in lines]
+        target = recorded[1]
+        
+        with patch('benchmark.replay.player.create_io_key') as mock_create_key:
+            mock_key = Mock()
+            mock_key.to_string.return_value = entries[1]["key"]
+            mock_key.input_fingerprint = target["input_fingerprint"]
+            mock_create_key.return_value = mock_key
+            
+            match_found, output_data = self.player.get_recorded_output(
+                io_type="llm_call",
+                tool_name="openai",
+                input_data={"prompt": "prompt 1"},
+                call_index=target["call_index"],
+                agent_id="test_agent"
+            )
+        
+        assert match_found
+        assert output_data == {"response": "response 1"}
+        assert list(self.player._recorded_ios) == [entries[1]["key"]]
+    
+    def test_streaming_load_without_index(self):
+        """Test eager loading of a multi-frame zstd recording when lazy loading is off."""
+        self._write_indexed_recording("eager_recording", 3)
+        player = EnhancedPlayer(storage_path=self.temp_dir, lazy_loading=False)
+        
+        assert player.load_recording("eager_recording")
+        assert len(player._recorded_ios) == 3
+        assert player.get_replay_statistics()["indexed_ios"] == 0
+        outputs = sorted(io["output_data"]["response"] for io in player._recorded_ios.values())
+        assert outputs == ["response 0", "response 1", "response 2"]
 
 
 class TestStreamingSupport:
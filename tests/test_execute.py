@@ -3,6 +3,7 @@ Unit tests for the Execution Sandbox.
 These tests validate secure code execution, resource monitoring,
 and safety controls across Docker and subprocess environments.
 """
+import gc
 import pytest
 import time
 import tempfile
@@ -14,7 +15,8 @@ from docker.errors import DockerException
 from common.safety.execute import (
     ExecutionSandbox, DockerSandbox, SubprocessSandbox,
     ExecutionContext, ExecutionResult, ExecutionStatus, SandboxType,
-    ResourceMonitor, get_sandbox, execute_code_safely
+    ResourceMonitor, ResourceMonitorService, CgroupV2, WarmPool,
+    get_sandbox, execute_code_safely
 )
 
 class TestExecutionContext:
@@ -150,6 +152,108 @@ class TestResourceMonitor:
         assert monitor.peak_memory_mb >= 100.0
         assert monitor.peak_cpu_percent >= 50.0
         assert len(monitor.violations) == 0  # Within limits
+    
+    def test_docker_cpu_is_recorded_not_enforced(self):
+        """Test a CPU-bound container is recorded over a CFS period, not killed."""
+        container = Mock(spec=["stats", "id"])
+        container.id = "abc"
+        usage = {"total_usage": 0}
+        
+        def stats(**kwargs):
+            return {"memory_stats": {"usage": 10 * 1024 * 1024},
+                    "cpu_stats": {"cpu_usage": dict(usage)}}
+        container.stats.side_effect = stats
+        
+        monitor = ResourceMonitor(max_memory_mb=1024, max_cpu_percent=80)
+        monitor._process = container
+        monitor.monitoring = True
+        
+        monitor._monitor_docker_container()
+        # A reading inside the first CFS period does not produce a sample
+        usage["total_usage"] = int(0.02 * 1e9)
+        monitor._monitor_docker_container()
+        assert monitor.peak_cpu_percent == 0.0
+        
+        monitor._last_cpu = (monitor._last_cpu[0] - 0.2, 0.0)
+        usage["total_usage"] = int(0.2 * 1e9)
+        monitor._monitor_docker_container()
+        
+        assert monitor.peak_cpu_percent >= 90.0
+        assert monitor.monitoring is True
+        assert monitor.violations == []
+
+class TestResourceMonitorService:
+    """Test cases for the shared resource monitor service."""
+    
+    def test_monitors_share_one_sampler(self):
+        """Test concurrent monitors are sampled by a single thread."""
+        service = ResourceMonitorService(interval=0.01, cgroups=None)
+        monitors = [ResourceMonitor(1024, 80, service=service) for _ in range(3)]
+        processes = []
+        for monitor in monitors:
+            process = Mock(spec=["pid", "poll"])
+            process.pid = os.getpid()
+            process.poll.return_value = None
+            processes.append(process)
+            monitor.start_monitoring(process)
+        
+        time.sleep(0.1)
+        assert service.get_stats()["active"] == 3
+        for monitor in monitors:
+            monitor.stop_monitoring()
+        
+        stats = service.get_stats()
+        assert stats["active"] == 0
+        assert stats["samples"] >= 3
+        assert all(monitor.peak_memory_mb > 0 for monitor in monitors)
+    
+    def test_cgroup_usage_is_exact(self):
+        """Test cgroup counters give exact peaks and OOM kills as violations."""
+        root = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(root, "cgroup.subtree_control"), "w") as f:
+                f.write("cpu memory")
+            with patch.dict(os.environ, {"AI_DEV_SQUAD_SANDBOX_CGROUP": root}):
+                cgroups = CgroupV2.detect()
+            assert cgroups is not None
+            
+            service = ResourceMonitorService(cgroups=cgroups)
+            monitor = ResourceMonitor(max_memory_mb=64, max_cpu_percent=80, service=service)
+            path = monitor.attach_cgroup()
+            with open(os.path.join(path, "memory.max")) as f:
+                assert f.read() == str(64 * 1024 * 1024)
+            
+            with open(os.path.join(path, "memory.peak"), "w") as f:
+                f.write(str(80 * 1024 * 1024))
+            with open(os.path.join(path, "memory.events"), "w") as f:
+                f.write("oom 1\noom_kill 1\n")
+            with open(os.path.join(path, "cpu.stat"), "w") as f:
+                f.write("usage_usec 250000\n")
+            
+            monitor.stop_monitoring()
+            
+            assert monitor.peak_memory_mb == 80.0
+            assert monitor.cpu_time_seconds == 0.25
+            assert any("Memory limit exceeded" in v for v in monitor.violations)
+            assert not os.path.exists(path)
+        finally:
+            import shutil
+            shutil.rmtree(root, ignore_errors=True)
+    
+    @pytest.mark.integration
+    def test_short_memory_spike_is_reported(self):
+        """Test a spike shorter than the sampling interval still sets the peak."""
+        sandbox = SubprocessSandbox(pool_size=1)
+        if sandbox.pool is None:
+            pytest.skip("fork not available")
+        
+        result = sandbox.execute(ExecutionContext(
+            code="x = bytearray(100 * 1024 * 1024)\nfor i in range(0, len(x), 4096): x[i] = 1\n",
+            timeout_seconds=10
+        ))
+        
+        assert result.status == ExecutionStatus.SUCCESS
+        assert result.memory_usage_mb >= 100
 
 class TestSubprocessSandbox:
     """Test cases for SubprocessSandbox."""
@@ -245,6 +349,203 @@ class TestSubprocessSandbox:
         assert result.status == ExecutionStatus.TIMEOUT
         assert "timed out" in result.error_message.lower()
 
+class TestWarmPool:
+    """Test cases for warm sandbox worker pools."""
+    
+    def _worker(self):
+        worker = Mock()
+        worker.executions = 0
+        worker.alive.return_value = True
+        return worker
+    
+    def test_pool_hits_and_misses(self):
+        """Test a released worker is reused and counted as a hit."""
+        pool = WarmPool(self._worker, size=1, max_executions=10)
+        
+        worker = pool.acquire()
+        pool.release(worker)
+        assert pool.acquire() is worker
+        
+        stats = pool.get_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["workers_started"] == 1
+    
+    def test_pool_recycles_workers(self):
+        """Test workers are recycled after N executions or on violation."""
+        pool = WarmPool(self._worker, size=1, max_executions=2)
+        
+        worker = pool.acquire()
+        worker.executions = 2
+        pool.release(worker)
+        worker.close.assert_called_once()
+        
+        other = pool.acquire()
+        pool.release(other, "resource_limit")
+        other.close.assert_called_once()
+        
+        stats = pool.get_stats()
+        assert stats["recycle_reasons"] == {"max_executions": 1, "resource_limit": 1}
+    
+    @pytest.mark.integration
+    def test_warm_subprocess_execution(self):
+        """Test Python snippets run in forked children of warm workers."""
+        sandbox = SubprocessSandbox(pool_size=1, max_executions_per_worker=2)
+        if sandbox.pool is None:
+            pytest.skip("fork not available")
+        
+        results = [
+            sandbox.execute(ExecutionContext(code=f"print({i} * 2)", timeout_seconds=10))
+            for i in range(3)
+        ]
+        failure = sandbox.execute(ExecutionContext(code="raise ValueError('boom')", timeout_seconds=10))
+        
+        assert [r.stdout.strip() for r in results] == ["0", "2", "4"]
+        assert all(r.status == ExecutionStatus.SUCCESS for r in results)
+        assert failure.status == ExecutionStatus.FAILURE
+        assert failure.exit_code == 1
+        assert "ValueError: boom" in failure.stderr
+        
+        stats = sandbox.pool.get_stats()
+        assert stats["hits"] + stats["misses"] == 4
+        assert stats["recycle_reasons"].get("max_executions", 0) >= 1
+    
+    @pytest.mark.integration
+    def test_warm_subprocess_timeout_recycles_worker(self):
+        """Test a timed-out snippet is killed and its worker recycled."""
+        sandbox = SubprocessSandbox(pool_size=1)
+        if sandbox.pool is None:
+            pytest.skip("fork not available")
+        
+        result = sandbox.execute(ExecutionContext(
+            code="import time\nprint('started')\ntime.sleep(10)",
+            timeout_seconds=1
+        ))
+        
+        assert result.status == ExecutionStatus.TIMEOUT
+        assert "started" in result.stdout
+        assert sandbox.pool.get_stats()["recycle_reasons"] == {"timeout": 1}
+    
+    def test_docker_containers_are_reused(self):
+        """Test paused containers are resumed instead of created per execution."""
+        with patch('docker.from_env') as mock_docker:
+            mock_docker.return_value = Mock()
+            sandbox = DockerSandbox(pool_size=1, prewarm_languages=())
+        container = sandbox.client.containers.create.return_value
+        container.id = "0123456789abcdef"
+        container.status = "paused"
+        container.exec_run.return_value = Mock(exit_code=0)
+        
+        with patch.object(sandbox, '_get_or_build_image', return_value="python:3.11-slim"), \
+             patch.object(sandbox, '_execute_in_container',
+                          return_value=ExecutionResult(status=ExecutionStatus.SUCCESS)):
+            sandbox.execute(ExecutionContext(code="print(1)"))
+            sandbox.execute(ExecutionContext(code="print(2)"))
+        
+        assert sandbox.client.containers.create.call_count == 1
+        stats = sandbox.get_pool_stats()[0]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        
+        # Leftover processes and /tmp, $HOME files are cleared before each pause
+        reset_calls = [c for c in container.exec_run.call_args_list
+                       if c.args and c.args[0][:2] == ["sh", "-c"]]
+        assert len(reset_calls) == 3
+        assert "kill -9 -1" in reset_calls[0].args[0][2]
+    
+    def test_docker_container_retired_when_reset_fails(self):
+        """Test a container is not reused when snippet state survives the reset."""
+        with patch('docker.from_env') as mock_docker:
+            mock_docker.return_value = Mock()
+            sandbox = DockerSandbox(pool_size=1, prewarm_languages=())
+        container = sandbox.client.containers.create.return_value
+        container.id = "0123456789abcdef"
+        container.status = "paused"
+        # Fresh containers reset cleanly; the one after the snippet does not
+        container.exec_run.side_effect = [Mock(exit_code=0), Mock(exit_code=1)]
+        
+        with patch.object(sandbox, '_get_or_build_image', return_value="python:3.11-slim"), \
+             patch.object(sandbox, '_execute_in_container',
+                          return_value=ExecutionResult(status=ExecutionStatus.SUCCESS)):
+            sandbox.execute(ExecutionContext(code="import subprocess; subprocess.Popen(['sleep', '60'])"))
+        
+        stats = sandbox.get_pool_stats()[0]
+        assert stats["recycle_reasons"] == {"reset_failed": 1}
+        container.remove.assert_called_with(force=True)
+    
+    def test_docker_pool_is_prewarmed(self):
+        """Test constructing the sandbox fills the default pool in the background."""
+        with patch('docker.from_env') as mock_docker:
+            client = Mock()
+            client.containers.create.return_value.exec_run.return_value = Mock(exit_code=0)
+            mock_docker.return_value = client
+            with patch.object(DockerSandbox, '_get_or_build_image', return_value="python:3.11-slim"):
+                sandbox = DockerSandbox(pool_size=1)
+                deadline = time.time() + 5
+                while time.time() < deadline and not (
+                        sandbox.get_pool_stats() and sandbox.get_pool_stats()[0]["idle_workers"]):
+                    time.sleep(0.01)
+        
+        stats = sandbox.get_pool_stats()[0]
+        assert stats["idle_workers"] == 1
+        assert stats["misses"] == 0
+    
+    @pytest.mark.integration
+    def test_subprocess_pool_is_prewarmed(self):
+        """Test the first execution after construction is served warm."""
+        sandbox = SubprocessSandbox(pool_size=1)
+        if sandbox.pool is None:
+            pytest.skip("fork not available")
+        
+        deadline = time.time() + 10
+        while time.time() < deadline and not sandbox.pool.get_stats()["idle_workers"]:
+            time.sleep(0.01)
+        result = sandbox.execute(ExecutionContext(code="print('warm')", timeout_seconds=10))
+        
+        assert result.stdout.strip() == "warm"
+        assert sandbox.pool.get_stats()["hits"] == 1
+        assert sandbox.pool.get_stats()["misses"] == 0
+
+    def test_dropped_docker_sandbox_removes_warm_containers(self):
+        """Test paused containers and workspaces go away with their sandbox."""
+        with patch('docker.from_env') as mock_docker:
+            mock_docker.return_value = Mock()
+            sandbox = DockerSandbox(pool_size=1, prewarm_languages=())
+        container = sandbox.client.containers.create.return_value
+        container.id = "0123456789abcdef"
+        container.status = "paused"
+        container.exec_run.return_value = Mock(exit_code=0)
+        
+        with patch.object(sandbox, '_get_or_build_image', return_value="python:3.11-slim"), \
+             patch.object(sandbox, '_execute_in_container',
+                          return_value=ExecutionResult(status=ExecutionStatus.SUCCESS)):
+            sandbox.execute(ExecutionContext(code="print(1)"))
+        workspace = next(iter(sandbox.pools.values()))._idle[0].workspace
+        assert os.path.isdir(workspace)
+        container.remove.assert_not_called()
+        
+        del sandbox
+        gc.collect()
+        
+        container.remove.assert_called_once_with(force=True)
+        assert not os.path.exists(workspace)
+    
+    def test_only_selected_sandbox_is_prewarmed(self):
+        """Test the sandbox that will not serve executions starts no workers."""
+        with patch('docker.from_env') as mock_docker, \
+             patch.object(DockerSandbox, '_prewarm') as docker_prewarm, \
+             patch.object(WarmPool, 'warm') as pool_warm:
+            mock_docker.return_value = Mock()
+            docker = ExecutionSandbox(SandboxType.DOCKER)
+            docker.close()
+            assert docker_prewarm.call_count == 1
+            pool_warm.assert_not_called()
+            
+            subprocess_sandbox = ExecutionSandbox(SandboxType.SUBPROCESS)
+            subprocess_sandbox.close()
+            assert docker_prewarm.call_count == 1
+            assert pool_warm.call_count == (1 if subprocess_sandbox.subprocess_sandbox.pool else 0)
+
 class TestDockerSandbox:
     """Test cases for DockerSandbox."""
     
@@ -0,0 +1,163 @@
+"""
+Unit tests for the Sandbox Image Cache.
+These tests validate content-addressed tagging, build de-duplication
+and LRU garbage collection against a mocked Docker client.
+"""
+import pytest
+import tempfile
+import shutil
+import threading
+import time
+from unittest.mock import Mock
+from docker.errors import ImageNotFound
+
+from common.safety.images import ImageCache, normalize_requirements
+
+
+def dockerfile(language, base_image, requirements, wheelhouse=False):
+    return f"FROM {base_image}\n# wheelhouse={wheelhouse}\n"
+
+
+class FakeImages:
+    """Minimal stand-in for docker's image collection."""
+
+    def __init__(self):
+        self.tags = {}
+        self.builds = []
+        self.removed = []
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        if name.startswith("python:"):
+            return Mock(id="sha256:" + "b" * 64)
+        with self._lock:
+            if name not in self.tags:
+                raise ImageNotFound(name)
+            return self.tags[name]
+
+    def build(self, path, tag, **kwargs):
+        time.sleep(0.05)
+        image = Mock(attrs={"Size": 100 * 1024 * 1024, "Config": {"Labels": kwargs.get("labels")}})
+        with self._lock:
+            self.builds.append(tag)
+            self.tags[tag] = image
+        return image, []
+
+    def remove(self, tag):
+        with self._lock:
+            self.removed.append(tag)
+            self.tags.pop(tag, None)
+
+
+@pytest.fixture
+def cache():
+    cache_dir = tempfile.mkdtemp()
+    client = Mock()
+    client.images = FakeImages()
+    yield ImageCache(client, cache_dir=cache_dir, max_images=2, min_idle_seconds=0)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+class TestImageTags:
+    """Test cases for content-addressed tags."""
+
+    def test_requirements_are_normalized(self):
+        """Test requirement order, whitespace and repeats do not matter."""
+        assert normalize_requirements([" requests", "flask", "requests", ""]) == ["flask", "requests"]
+
+    def test_tags_are_deterministic(self, cache):
+        """Test identical sets share a tag and different sets do not collide."""
+        base = "sha256:" + "a" * 64
+        first = cache.image_tag("python", base, ["requests", "flask"], "FROM x")
+        second = cache.image_tag("python", base, ["flask", "requests"], "FROM x")
+        other = cache.image_tag("python", base, ["flask"], "FROM x")
+        rebased = cache.image_tag("python", "sha256:" + "c" * 64, ["flask", "requests"], "FROM x")
+
+        assert first == second
+        assert len({first, other, rebased}) == 3
+        assert first.startswith("ai-dev-squad-python:")
+
+
+class TestImageBuilds:
+    """Test cases for build de-duplication and collection."""
+
+    def test_concurrent_requests_build_once(self, cache):
+        """Test concurrent requests for one requirement set share a single build."""
+        cache._prefetch_wheels = Mock(return_value=True)
+        tags = []
+
+        def request():
+            tags.append(cache.get_or_build("python", "python:3.11-slim", ["requests"], dockerfile))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(tags)) == 1
+        assert cache.client.images.builds == tags[:1]
+        stats = cache.get_stats()
+        assert stats["builds"] == 1
+        assert stats["cached_images"] == 1
+
+        # Later requests are answered from memory
+        cache.get_or_build("python", "python:3.11-slim", ["requests"], dockerfile)
+        assert len(cache.client.images.builds) == 1
+
+    def test_existing_image_is_reused_by_new_process(self, cache):
+        """Test a fresh cache instance finds an image another one built."""
+        cache._prefetch_wheels = Mock(return_value=True)
+        tag = cache.get_or_build("python", "python:3.11-slim", ["requests"], dockerfile)
+
+        other = ImageCache(cache.client, cache_dir=str(cache.cache_dir))
+        assert other.get_or_build("python", "python:3.11-slim", ["requests"], dockerfile) == tag
+        assert len(cache.client.images.builds) == 1
+        assert other.get_stats()["hits"] == 1
+
+    def test_wheelhouse_fallback(self, cache):
+        """Test a failed wheel prefetch still builds, from the package index."""
+        cache._prefetch_wheels = Mock(return_value=False)
+        rendered = []
+
+        def recording_dockerfile(language, base_image, requirements, wheelhouse=False):
+            rendered.append(wheelhouse)
+            return dockerfile(language, base_image, requirements, wheelhouse)
+
+        tag = cache.get_or_build("python", "python:3.11-slim", ["requests"], recording_dockerfile)
+        assert rendered == [True, False]
+
+        # The image is tagged from the Dockerfile it was built from
+        base = "sha256:" + "b" * 64
+        fallback = dockerfile("python", "python:3.11-slim", ["requests"], wheelhouse=False)
+        assert tag == cache.image_tag("python", base, ["requests"], fallback)
+        assert cache.client.images.builds == [tag]
+
+        # A later successful prefetch builds the wheelhouse image under its own tag
+        other = ImageCache(cache.client, cache_dir=str(cache.cache_dir))
+        other._prefetch_wheels = Mock(return_value=True)
+        wheel_tag = other.get_or_build("python", "python:3.11-slim", ["requests"], dockerfile)
+        assert wheel_tag != tag
+        assert cache.client.images.builds == [tag, wheel_tag]
+
+    def test_wheelhouse_fallback_reuses_existing_image(self, cache):
+        """Test a failed prefetch reuses an image already built without wheels."""
+        cache._prefetch_wheels = Mock(return_value=False)
+        tag = cache.get_or_build("python", "python:3.11-slim", ["requests"], dockerfile)
+
+        other = ImageCache(cache.client, cache_dir=str(cache.cache_dir))
+        other._prefetch_wheels = Mock(return_value=False)
+        assert other.get_or_build("python", "python:3.11-slim", ["requests"], dockerfile) == tag
+        assert cache.client.images.builds == [tag]
+
+    def test_least_recently_used_images_are_collected(self, cache):
+        """Test images over the budget are removed oldest first."""
+        cache._prefetch_wheels = Mock(return_value=True)
+        tags = []
+        for requirements in (["a"], ["b"], ["c"]):
+            tags.append(cache.get_or_build("python", "python:3.11-slim", requirements, dockerfile))
+            time.sleep(0.01)
+
+        assert cache.client.images.removed == [tags[0]]
+        assert cache.get_stats()["cached_images"] == 2
+        assert cache.get_stats()["images_collected"] == 1
@@ -132,6 +132,60 @@ class TestCanonicalHashing:
         hash2 = hasher.hash_input(data2)
         
         assert hash1 != hash2, "Similar but different inputs should have different hashes"
+    
+    # SHA-256 fingerprints produced by the original serialize-then-hash
+    # implementation; the streaming encoder must reproduce them exactly.
+    GOLDEN_SHA256 = {
+        "prompt": "882801f7cf3c9ac44e3a287da1ba695c9fb99c9e10f8c91c42f30bc50651241e",
+        "nested": "38d7f2249b2a267b70eddec9406b9b90419a8ae0b3cb6ab013e7e0957f55e751",
+        "keys": "5657e993352f92d60b5c0d7e8ca8ed2bddad8ae7478b8dd6f740e5059b575e5c",
+        "none_key": "dcda9fcbc979e640185821ec38e3e3f8832d81a343f8b5625441eb5c64643ea5",
+        "bool_keys": "582fce49074d6f273746e6d42e329901bc40474fd0beceb0be95a148c981d7f7",
+        "unicode": "71a42855619830b2d277117f7b71ca0a272d8a9628cd2a095386fe3c016f3c9f",
+        "special": "b869fba4a9651b4cde5001f1ed7fdc1ac635d76810cf00485ef8e8279f0c4d74",
+        "default": "092239bf00db498a783f92cf0172a9ab916ce3a282485b23d68b7c5f8641645f",
+        "scalar": "090ae97e832252de5cb1c8a5eb8415edf3df762b851c1ec7d6960b0f3472575a",
+        "empty": "fc085be683f7d07ad0f4ba298541bbb5fa1fe08755bdadf3ccaa5202b42cdcd8",
+    }
+    
+    GOLDEN_INPUTS = {
+        "prompt": {"prompt": "  Hello\r\nworld   again  \r\n\tindented  line \n   \n",
+                   "temperature": 0.7000001, "max_tokens": 256},
+        "nested": {"b": [1, 2.5, None, True, False, {"z": "x", "a": ("t", 1e-7)}],
+                   "a": {"k": -0.1234565}},
+        "keys": {1: "int", 2.5: "float", 0: "zero"},
+        "none_key": {None: "none"},
+        "bool_keys": {True: "t", False: "f"},
+        "unicode": {"text": "caf\u00e9 \u2014 \U0001F600\u00a0 nbsp", "esc": "quote \" back \\ ctrl \x01"},
+        "special": [float("inf"), float("-inf"), 10**30, -0.0, 123456789.123456789],
+        "default": {"when": datetime(2024, 1, 2, 3, 4, 5), "set": {3}},
+        "scalar": "  single   line  ",
+        "empty": [{}, [], ""],
+    }
+    
+    def test_streaming_hash_matches_golden_fingerprints(self):
+        """Test that streaming canonical hashing is byte-identical to the legacy encoding."""
+        import hashlib
+        hasher = CanonicalHasher(use_blake3=False)
+        
+        for name, data in self.GOLDEN_INPUTS.items():
+            legacy = hashlib.sha256(hasher._canonicalize_to_bytes(data)).hexdigest()
+            assert legacy == self.GOLDEN_SHA256[name], f"Legacy encoding changed for {name}"
+            assert hasher.hash_input(data) == self.GOLDEN_SHA256[name], f"Hash drifted for {name}"
+    
+    def test_streaming_hash_large_and_repeated_strings(self):
+        """Test that large inputs spanning hash blocks and memoized strings hash identically."""
+        import hashlib
+        hasher = CanonicalHasher(use_blake3=False)
+        code = "def f(x):\n    return x  *  2\n\t\tpass   \n" * 5000
+        data = {"prompt": code, "history": [code, code[:300]], "system": code[:300]}
+        
+        expected = hashlib.sha256(hasher._canonicalize_to_bytes(data)).hexdigest()
+        
+        assert hasher.hash_input(data) == expected
+        # Second call is served from the string memo and must not drift
+        assert hasher.hash_input(data) == expected
+        assert CanonicalHasher(use_blake3=False, string_memo_size=0).hash_input(data) == expected
 
 
 class TestEventOrdering:
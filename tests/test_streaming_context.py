@@ -10,6 +10,7 @@ import unittest
 import tempfile
 import os
 import time
+import threading
 import asyncio
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
@@ -25,6 +26,8 @@ from common.context_management import (
     StreamingResponseHandler,
     AsyncStreamingHandler,
     ContextManager,
+    RollingSummarizer,
+    SUMMARY_TOKEN_SHARE,
     get_context_manager,
     configure_context_manager
 )
@@ -264,6 +267,41 @@ class TestContextWindow(unittest.TestCase):
         self.assertIn("strategy", summary)
         self.assertIn("importance_distribution", summary)
 
+    def test_long_conversation_token_accounting(self):
+        """Test every strategy keeps token totals exact over long conversations."""
+        importances = [MessageImportance.LOW, MessageImportance.MEDIUM, MessageImportance.HIGH]
+        for strategy in ContextStrategy:
+            context = ContextWindow(
+                messages=[],
+                max_tokens=500,
+                current_tokens=0,
+                strategy=strategy,
+                model_name="test_model"
+            )
+            context.add_message(ContextMessage(
+                role="system",
+                content="System prompt",
+                timestamp=datetime.now(),
+                importance=MessageImportance.CRITICAL,
+                token_count=20
+            ))
+            for i in range(2000):
+                context.add_message(ContextMessage(
+                    role="user" if i % 2 else "assistant",
+                    content=f"Message {i}",
+                    timestamp=datetime.now(),
+                    importance=importances[i % 3],
+                    token_count=10 + i % 37
+                ))
+
+            with self.subTest(strategy=strategy):
+                self.assertEqual(context.current_tokens, sum(msg.token_count for msg in context.messages))
+                self.assertLessEqual(context.current_tokens, context.max_tokens)
+                self.assertEqual(context.messages[0].content, "System prompt")
+                self.assertEqual(context.messages[-1].content, "Message 1999")
+                summaries = [msg for msg in context.messages if msg.message_id and msg.message_id.startswith("summary_")]
+                self.assertLessEqual(len(summaries), 1)
+
 class TestStreamingResponseHandler(unittest.TestCase):
     """Test streaming response handler."""
     
@@ -537,6 +575,118 @@ class TestContextManager(unittest.TestCase):
             self.assertIn("message_count", summary)
             self.assertIn("current_tokens", summary)
 
+class TestRollingSummarizer(unittest.TestCase):
+    """Test background rolling summarization."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.calls = []
+        self.release = None
+        self.failures = 0
+        
+        def summarize(previous, messages):
+            if self.release is not None:
+                self.release.wait(5)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("model unavailable")
+            self.calls.append((previous, [msg.content for msg in messages]))
+            return (previous or "") + "".join(f"<{msg.content}>" for msg in messages)
+        
+        self.summarizer = RollingSummarizer(summarize)
+        self.context_manager = ContextManager(token_estimator=lambda text: 10)
+        self.context_manager.create_context(
+            "conv", "test_model", max_tokens=45,
+            strategy=ContextStrategy.SUMMARIZE_OLDEST, summarizer=self.summarizer
+        )
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        if self.release is not None:
+            self.release.set()
+        self.summarizer.shutdown()
+    
+    def test_summaries_merge_into_previous(self):
+        """Test each batch is merged into the previous summary."""
+        for i in range(12):
+            self.context_manager.add_message("conv", "user", f"m{i}")
+            self.assertTrue(self.summarizer.flush(timeout=5))
+        
+        self.assertGreater(len(self.calls), 1)
+        for (_, batch), (previous, _) in zip(self.calls, self.calls[1:]):
+            self.assertTrue(previous.endswith(f"<{batch[-1]}>"))
+        
+        messages = self.context_manager.get_messages_for_model("conv")
+        self.assertIn("<m0>", messages[0]["content"])
+        context = self.context_manager.get_context("conv")
+        self.assertEqual(context.current_tokens, sum(msg.token_count for msg in context.messages))
+    
+    def test_get_messages_does_not_block(self):
+        """Test reading the context never waits on a running summary."""
+        self.release = threading.Event()
+        for i in range(8):
+            self.context_manager.add_message("conv", "user", f"m{i}")
+        
+        started = time.time()
+        messages = self.context_manager.get_messages_for_model("conv")
+        self.assertLess(time.time() - started, 1)
+        self.assertIn("messages exchanged", messages[0]["content"])
+        
+        self.release.set()
+        self.assertTrue(self.summarizer.flush(timeout=5))
+        messages = self.context_manager.get_messages_for_model("conv")
+        self.assertIn("<m0>", messages[0]["content"])
+    
+    def test_failed_batch_is_folded_into_next(self):
+        """Test messages from a failed summary are covered by the next one."""
+        self.failures = 1
+        for i in range(12):
+            self.context_manager.add_message("conv", "user", f"m{i}")
+            self.assertTrue(self.summarizer.flush(timeout=5))
+        
+        self.assertEqual(self.summarizer.get_stats()["failures"], 1)
+        self.assertEqual(self.calls[0][1][0], "m0")
+        messages = self.context_manager.get_messages_for_model("conv")
+        self.assertIn("<m0>", messages[0]["content"])
+        self.assertNotIn("not yet summarized", messages[0]["content"])
+    
+    def test_summary_is_capped_to_token_share(self):
+        """Test a growing summary is trimmed to its share of the window."""
+        manager = ContextManager(token_estimator=lambda text: len(text.split()))
+        context = manager.create_context(
+            "long", "test_model", max_tokens=40,
+            strategy=ContextStrategy.SUMMARIZE_OLDEST,
+            summarizer=RollingSummarizer(lambda previous, messages: (previous or "") + " fact" * 50)
+        )
+        self.addCleanup(context.summarizer.shutdown)
+        for i in range(30):
+            manager.add_message("long", "user", "word " * 8)
+            self.assertTrue(context.summarizer.flush(timeout=5))
+        
+        manager.get_messages_for_model("long")
+        self.assertIsNotNone(context.summary_text)
+        self.assertLessEqual(len(context.summary_text.split()), 40 * SUMMARY_TOKEN_SHARE)
+        self.assertLessEqual(context.current_tokens, context.max_tokens)
+    
+    def test_summaries_are_cached_by_message_range(self):
+        """Test an identical message range is only summarized once."""
+        self.context_manager.create_context(
+            "replay", "test_model", max_tokens=45,
+            strategy=ContextStrategy.SUMMARIZE_OLDEST, summarizer=self.summarizer
+        )
+        for conversation_id in ("conv", "replay"):
+            for i in range(8):
+                self.context_manager.add_message(conversation_id, "user", f"m{i}")
+                self.assertTrue(self.summarizer.flush(timeout=5))
+        
+        stats = self.summarizer.get_stats()
+        self.assertEqual(stats["cache_hits"], stats["summaries_generated"])
+        self.assertEqual(
+            self.context_manager.get_messages_for_model("conv"),
+            self.context_manager.get_messages_for_model("replay")
+        )
+
+
 class TestContextManagerSingleton(unittest.TestCase):
     """Test context manager singleton functionality."""
     
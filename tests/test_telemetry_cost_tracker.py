@@ -18,6 +18,7 @@ from common.telemetry.cost_tracker import (
     ModelPricing,
     TokenUsage,
     CostEntry,
+    CostLedger,
     UsageStats,
     TokenCounter,
     BudgetManager,
@@ -595,6 +596,142 @@ class TestCostTracker(TestCase):
             os.unlink(temp_file)
 
 
+class TestCostLedger(TestCase):
+    """Test cases for the columnar cost entry store."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = datetime(2024, 1, 1)
+        self.pricing = ModelPricing(model_name="gpt-4", provider=ModelProvider.OPENAI)
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _make_entry(self, offset: timedelta, model_name: str, input_tokens: int) -> CostEntry:
+        timestamp = self.base + offset
+        return CostEntry(
+            cost_usd=input_tokens / 1000,
+            tokens=TokenUsage(
+                input_tokens=input_tokens,
+                output_tokens=10,
+                total_tokens=input_tokens + 10,
+                model_name=model_name,
+                provider=ModelProvider.OPENAI,
+                timestamp=timestamp,
+                session_id="session_%d" % input_tokens
+            ),
+            duration_ms=100.0,
+            pricing_model=self.pricing,
+            timestamp=timestamp
+        )
+    
+    def _fill(self, ledger: CostLedger):
+        entries = []
+        for i in range(300):
+            # One entry every 37 seconds over about three hours, slightly out of order
+            offset = timedelta(seconds=i * 37 - (5 if i % 10 == 3 else 0))
+            entry = self._make_entry(offset, "gpt-4" if i % 3 else "gpt-3.5-turbo", 100 + i)
+            ledger.append(entry)
+            entries.append(entry)
+        return entries
+    
+    def test_range_aggregate_matches_scan(self):
+        """Test range aggregates agree with a brute-force filter at odd boundaries."""
+        
+        ledger = CostLedger(segment_size=50)
+        entries = self._fill(ledger)
+        
+        ranges = [
+            (None, None),
+            (self.base + timedelta(minutes=7, seconds=3), self.base + timedelta(hours=2, minutes=1)),
+            (self.base + timedelta(hours=1), self.base + timedelta(hours=2) - timedelta(microseconds=1)),
+            (self.base + timedelta(seconds=370), self.base + timedelta(seconds=370)),
+            (self.base + timedelta(hours=5), None),
+        ]
+        for start, end in ranges:
+            expected = [
+                e for e in entries
+                if (start is None or e.timestamp >= start) and (end is None or e.timestamp <= end)
+            ]
+            count, groups = ledger.aggregate(start, end, lambda hour, model, provider: model)
+            
+            self.assertEqual(count, len(expected))
+            for model in ("gpt-4", "gpt-3.5-turbo"):
+                model_entries = [e for e in expected if e.tokens.model_name == model]
+                if not model_entries:
+                    self.assertNotIn(model, groups)
+                    continue
+                self.assertEqual(groups[model]["requests"], len(model_entries))
+                self.assertEqual(
+                    groups[model]["input_tokens"],
+                    sum(e.tokens.input_tokens for e in model_entries)
+                )
+                self.assertAlmostEqual(
+                    groups[model]["cost_usd"],
+                    sum(e.cost_usd for e in model_entries)
+                )
+    
+    def test_spill_bounds_resident_entries(self):
+        """Test old segments spill to disk without changing query results."""
+        
+        ledger = CostLedger(segment_size=50, max_resident_entries=100, spill_dir=self.temp_dir)
+        entries = self._fill(ledger)
+        
+        stats = ledger.get_statistics()
+        self.assertEqual(stats["total_entries"], 300)
+        self.assertLessEqual(stats["resident_entries"], 100)
+        self.assertGreater(stats["spilled_segments"], 0)
+        
+        start = self.base + timedelta(minutes=10, seconds=11)
+        end = self.base + timedelta(minutes=50)
+        expected = sorted(
+            (e.timestamp, e.tokens.session_id) for e in entries
+            if start <= e.timestamp <= end
+        )
+        
+        count, groups = ledger.aggregate(start, end)
+        self.assertEqual(count, len(expected))
+        
+        restored = list(ledger.iter_entries(start, end))
+        self.assertEqual(sorted((e.timestamp, e.tokens.session_id) for e in restored), expected)
+    
+    def test_tracker_summary_uses_ledger(self):
+        """Test CostTracker summaries and exports read through the ledger."""
+        
+        tracker = CostTracker(
+            enable_real_time_tracking=False,
+            spill_dir=self.temp_dir,
+            max_resident_entries=1
+        )
+        tracker.ledger.segment_size = 2
+        
+        for i in range(10):
+            tracker.track_llm_usage(
+                model_name="gpt-3.5-turbo",
+                provider="openai",
+                input_tokens=1000,
+                output_tokens=500,
+                duration_ms=100.0
+            )
+        
+        self.assertGreater(tracker.ledger.get_statistics()["spilled_segments"], 0)
+        self.assertEqual(len(tracker.cost_entries), 10)
+        
+        summary = tracker.get_usage_summary(
+            start_date=datetime.utcnow() - timedelta(hours=1),
+            group_by="hour"
+        )
+        self.assertEqual(summary["total_entries"], 10)
+        self.assertEqual(sum(s["tokens"] for s in summary["summary"].values()), 15000)
+        
+        # Spilled entries keep their pricing model
+        self.assertEqual(tracker.cost_entries[0].pricing_model.model_name, "gpt-3.5-turbo")
+        self.assertGreater(tracker.cost_entries[0].pricing_model.input_cost_per_1k_tokens, 0)
+
+
 class TestGlobalCostTracking(TestCase):
     """Test cases for global cost tracking configuration."""
     
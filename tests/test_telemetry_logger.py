@@ -567,10 +567,117 @@ class TestStructuredLogger(TestCase):
             error_event = json.loads(lines[0])
             self.assertEqual(error_event["event_type"], "task.fail")
             self.assertEqual(error_event["level"], "ERROR")
-        
+
+        # Clean up
+        logger.close()
+
+    def test_flush_waits_for_queue_to_drain(self):
+        """Test flush returns only after every queued event is on disk."""
+        logger = StructuredLogger(
+            name="test_logger",
+            log_dir=str(self.log_dir),
+            enable_console=False,
+            batch_size=64
+        )
+
+        for i in range(1000):
+            logger.log_event({"event_type": "system.log", "level": "INFO", "seq": i})
+
+        self.assertTrue(logger.flush(timeout=10.0))
+
+        log_file = self.log_dir / "test_logger.jsonl"
+        with open(log_file, 'r') as f:
+            seqs = [json.loads(line)["seq"] for line in f]
+
+        self.assertEqual(seqs, list(range(1000)))
+
+        stats = logger.get_statistics()
+        self.assertEqual(stats["events_written"], 1000)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertLessEqual(stats["avg_batch_size"], 64)
+        self.assertGreaterEqual(stats["batches_written"], 1000 / 64)
+
+        # Clean up
+        logger.close()
+
+    def test_batches_single_write_per_batch(self):
+        """Test queued events are written with one call per batch."""
+        logger = StructuredLogger(
+            name="test_logger",
+            log_dir=str(self.log_dir),
+            enable_console=False
+        )
+
+        # Hold the handler lock so events pile up behind the writer
+        handler = logger.logger.handlers[0]
+        handler.acquire()
+        try:
+            for i in range(200):
+                logger.log_event({"event_type": "system.log", "level": "INFO", "seq": i})
+            time.sleep(0.1)
+        finally:
+            handler.release()
+        logger.flush()
+
+        stats = logger.get_statistics()
+        self.assertEqual(stats["events_written"], 200)
+        self.assertLessEqual(stats["batches_written"], 3)
+
+        # Clean up
+        logger.close()
+
+    def test_full_queue_drops_and_counts(self):
+        """Test events are dropped and counted when the queue is full."""
+        logger = StructuredLogger(
+            name="test_logger",
+            log_dir=str(self.log_dir),
+            enable_console=False,
+            max_queue_size=10,
+            enqueue_timeout=0
+        )
+
+        handler = logger.logger.handlers[0]
+        handler.acquire()
+        try:
+            results = [
+                logger.log_event({"event_type": "system.log", "level": "INFO", "seq": i})
+                for i in range(100)
+            ]
+        finally:
+            handler.release()
+        logger.flush()
+
+        stats = logger.get_statistics()
+        self.assertIn(False, results)
+        self.assertEqual(stats["events_dropped"], results.count(False))
+        self.assertEqual(stats["events_queued"], results.count(True))
+        self.assertEqual(stats["events_written"], results.count(True))
+        self.assertLessEqual(stats["max_queue_depth"], 10)
+
         # Clean up
         logger.close()
 
+    def test_plain_json_encoder_matches_formatter(self):
+        """Test the fallback encoder writes what JSONLinesFormatter would."""
+        logger = StructuredLogger(
+            name="test_logger",
+            log_dir=str(self.log_dir),
+            enable_console=False,
+            fast_json=False
+        )
+
+        event = {"event_type": "system.log", "level": "INFO", "message": "café", "n": 1.5}
+        logger.log_event(dict(event))
+        logger.close()
+
+        record = MagicMock()
+        record.event_data = event
+        expected = JSONLinesFormatter().format(record)
+
+        log_file = self.log_dir / "test_logger.jsonl"
+        with open(log_file, 'r') as f:
+            self.assertEqual(f.read(), expected + "\n")
+
 
 class TestGlobalLogger(TestCase):
     """Test cases for global logger functions."""
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the Shared Tokenizer Service
+
+This test suite covers token estimation, memoized and batch counting,
+incremental counting and model family resolution.
+"""
+
+import unittest
+import tempfile
+import os
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import common.tokenization as tokenization
+from common.tokenization import (
+    TokenizerService,
+    estimate_tokens,
+    get_tokenizer_service,
+    configure_tokenizer_service
+)
+from common.context_management import ContextManager, ContextStrategy
+
+
+class TestEstimateTokens(unittest.TestCase):
+    """Test the tokenizer-free estimate."""
+
+    def test_prose_is_roughly_one_token_per_word(self):
+        """Test short English words count as one token each."""
+        self.assertEqual(estimate_tokens("This is a test"), 4)
+
+    def test_code_counts_symbols(self):
+        """Test code is not undercounted the way word splitting does."""
+        code = "x = {'a': [1, 2, 3]}\nif x['a'][0] >= 1:\n    print(x)"
+        word_estimate = int(len(code.split()) * 1.3)
+        self.assertGreater(estimate_tokens(code), word_estimate * 1.3)
+
+    def test_empty_text(self):
+        """Test empty text has no tokens."""
+        self.assertEqual(estimate_tokens(""), 0)
+
+
+class TestTokenizerService(unittest.TestCase):
+    """Test tokenizer service behavior."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.service = TokenizerService(tokenizer_dir=self.temp_dir, cache_size=3)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_family_resolution(self):
+        """Test models map to tokenizer families."""
+        self.assertEqual(self.service.family_for("llama3.1:8b"), "llama")
+        self.assertEqual(self.service.family_for("codellama:13b"), "llama")
+        self.assertEqual(self.service.family_for("gpt-4"), "openai")
+        self.assertEqual(self.service.family_for("gpt-4o-mini"), "openai-o200k")
+        self.assertEqual(self.service.family_for("my-finetune", "openai"), "openai")
+        self.assertEqual(self.service.family_for("unknown_model"), "generic")
+
+    def test_counts_are_memoized(self):
+        """Test repeated texts are served from the cache."""
+        first = self.service.count("hello world", "llama3")
+        second = self.service.count("hello world", "llama3")
+
+        self.assertEqual(first, second)
+        stats = self.service.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_cache_is_bounded(self):
+        """Test the count cache evicts least recently used entries."""
+        for i in range(10):
+            self.service.count(f"message {i}")
+
+        self.assertEqual(self.service.get_stats()["cache_entries"], 3)
+
+    def test_batch_matches_single_counts(self):
+        """Test batch counting agrees with one-at-a-time counting."""
+        texts = ["def f(x):\n    return x", "", "hello world", "hello world", "日本語"]
+        batch = self.service.count_batch(texts, "llama3")
+
+        self.assertEqual(batch, [estimate_tokens(text) for text in texts])
+        self.assertEqual(self.service.get_stats()["misses"], 3)
+
+    def test_local_tokenizer_file_is_used(self):
+        """Test a local tokenizer file is loaded lazily for its family."""
+        try:
+            from tokenizers import Tokenizer
+            from tokenizers.models import WordLevel
+            from tokenizers.pre_tokenizers import Whitespace
+        except ImportError:
+            self.skipTest("tokenizers not installed")
+
+        tokenizer = Tokenizer(WordLevel({"hello": 0, "[UNK]": 1}, unk_token="[UNK]"))
+        tokenizer.pre_tokenizer = Whitespace()
+        os.makedirs(os.path.join(self.temp_dir, "llama"))
+        tokenizer.save(os.path.join(self.temp_dir, "llama", "tokenizer.json"))
+
+        self.assertEqual(self.service.count("hello there friend", "llama3"), 3)
+        self.assertTrue(self.service.get_stats()["tokenizers"]["llama"].startswith("tokenizers:"))
+
+    def test_incremental_matches_full_count(self):
+        """Test incremental counting equals counting the whole text."""
+        counter = self.service.incremental("llama3")
+        chunks = ["def ", "compute", "(a, b", "):\n", "    return ", "a + b", "  # sum", " of", " both"]
+
+        text = ""
+        for chunk in chunks:
+            text += chunk
+            self.assertEqual(counter.append(chunk), estimate_tokens(text))
+
+        self.assertLess(len(counter.tail), len(text))
+
+
+class TestGlobalTokenizerService(unittest.TestCase):
+    """Test global tokenizer service and context integration."""
+
+    def test_configure_replaces_global(self):
+        """Test configuring the global service."""
+        self.addCleanup(setattr, tokenization, "_global_tokenizer_service", get_tokenizer_service())
+        service = configure_tokenizer_service(cache_size=16)
+        self.assertIs(get_tokenizer_service(), service)
+        self.assertEqual(service.cache_size, 16)
+
+    def test_context_manager_uses_service(self):
+        """Test context token counts come from the tokenizer service."""
+        service = TokenizerService(cache_size=16)
+        manager = ContextManager(tokenizer=service)
+        manager.create_context("conv", "llama3.1:8b", max_tokens=10000)
+
+        content = "print({'key': value})"
+        message = manager.add_message("conv", "user", content)
+        created = manager.add_messages("conv", [
+            {"role": "user", "content": content},
+            {"role": "assistant", "content": "done"}
+        ])
+
+        self.assertEqual(message.token_count, estimate_tokens(content))
+        self.assertEqual([m.token_count for m in created], [estimate_tokens(content), 1])
+        self.assertGreaterEqual(service.get_stats()["hits"], 1)
+
+    def test_custom_estimator_still_wins(self):
+        """Test an explicit token estimator overrides the service."""
+        manager = ContextManager(token_estimator=lambda text: 7)
+        manager.create_context("conv", "llama3.1:8b")
+
+        self.assertEqual(manager.add_message("conv", "user", "anything").token_count, 7)
+
+    def test_summary_uses_manager_counter(self):
+        """Test summary messages are counted like every other message in the window."""
+        manager = ContextManager(token_estimator=lambda text: 7)
+        context = manager.create_context(
+            "conv", "llama3.1:8b", max_tokens=30, strategy=ContextStrategy.SUMMARIZE_OLDEST
+        )
+        for i in range(10):
+            manager.add_message("conv", "user", f"message {i} " * 20)
+
+        self.assertIsNotNone(context.summary_message)
+        self.assertEqual(context.summary_message.token_count, 7)
+        self.assertEqual(context.current_tokens, 7 * len(context.messages))
+
+
+if __name__ == "__main__":
+    # Run tests
+    unittest.main(verbosity=2)
@@ -20,7 +20,8 @@ from benchmark.verifier.code_tests import (
     CodeTestVerifier, TestFramework, TestResult, verify_function_implementation
 )
 from benchmark.verifier.lint_type import (
-    LintTypeVerifier, LintTool, quick_lint_check, comprehensive_analysis
+    LintTypeVerifier, LintTool, LintIssue, LintResult, LintResultCache, LintSeverity,
+    detect_tool_versions, quick_lint_check, comprehensive_analysis
 )
 from benchmark.verifier.semantic import (
     SemanticVerifier, SemanticIssueType, verify_algorithm_correctness
@@ -217,6 +218,112 @@ def example_function(x):
         )
 
 
+    def _fake_tool(self, calls):
+        """Stand-in tool reporting one issue per line of each file."""
+        def run(tool, code_files, strict_mode):
+            calls.append([code_file.name for code_file in code_files])
+            return {
+                str(code_file): LintResult(
+                    tool=tool,
+                    success=True,
+                    issues=[
+                        LintIssue(tool, LintSeverity.STYLE, line, 1, "X100", "style", file_path=str(code_file))
+                        for line in range(1, len(code_file.read_text().splitlines()) + 1)
+                    ]
+                )
+                for code_file in code_files
+            }
+        return run
+    
+    def test_results_are_cached(self):
+        """Test repeated analysis reuses results keyed by code and strict flag."""
+        calls = []
+        self.verifier.available_tools = {LintTool.BLACK}
+        self.verifier.cache = LintResultCache()
+        self.verifier._run_lint_tool_batch = self._fake_tool(calls)
+        
+        first = self.verifier.verify_code("x = 1\n", enable_type_checking=False)
+        second = self.verifier.verify_code("x = 1\n", enable_type_checking=False)
+        self.verifier.verify_code("x = 1\n", enable_type_checking=False, strict_mode=True)
+        
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(second.overall_score, first.overall_score)
+        self.assertEqual(second.metadata['cached_tools'], ['black'])
+        self.assertEqual(self.verifier.get_cache_stats()['hits'], 1)
+    
+    def test_batch_splits_results_per_snippet(self):
+        """Test a batch runs each tool once and maps issues back per snippet."""
+        calls = []
+        self.verifier.available_tools = {LintTool.BLACK, LintTool.ISORT}
+        self.verifier.cache = LintResultCache()
+        self.verifier._run_lint_tool_batch = self._fake_tool(calls)
+        
+        codes = ["a = 1\n", "b = 1\nc = 2\n", "a = 1\n"]
+        results = self.verifier.verify_batch(codes, enable_type_checking=False)
+        
+        # One invocation per tool, identical snippets analyzed once
+        self.assertEqual(sorted(calls), [["snippet_0.py", "snippet_1.py"]] * 2)
+        self.assertEqual([len(r.lint_results) for r in results], [2, 2, 2])
+        self.assertEqual([len(r.lint_results[0].issues) for r in results], [1, 2, 1])
+    
+    @unittest.skipUnless(LintTool.PYCODESTYLE in detect_tool_versions(),
+                         "pycodestyle not installed")
+    def test_batch_matches_single_runs(self):
+        """Test batched pycodestyle reports the same issues as separate runs."""
+        verifier = LintTypeVerifier(use_cache=False)
+        self.addCleanup(verifier.cleanup)
+        codes = ["import os,sys\n", "x = 1\n", "def f( a ):\n    return a\n"]
+        
+        batch = verifier.verify_batch(codes, enable_type_checking=False, lint_tools=[LintTool.PYCODESTYLE])
+        for code, result in zip(codes, batch):
+            single = verifier.verify_code(code, enable_type_checking=False, lint_tools=[LintTool.PYCODESTYLE])
+            self.assertEqual(
+                [(i.line, i.column, i.code) for i in result.lint_results[0].issues],
+                [(i.line, i.column, i.code) for i in single.lint_results[0].issues]
+            )
+            self.assertEqual(result.lint_results[0].success, single.lint_results[0].success)
+    
+    @unittest.skipUnless(LintTool.PYLINT in detect_tool_versions(), "pylint not installed")
+    def test_batch_pylint_ignores_similar_snippets(self):
+        """Test similar snippets get the same pylint result in a batch as alone."""
+        verifier = LintTypeVerifier(use_cache=False)
+        self.addCleanup(verifier.cleanup)
+        body = "".join(f"    total += values[{i}] * {i}\n" for i in range(8))
+        codes = [
+            f"def {name}(values):\n    total = 0\n{body}    return total\n"
+            for name in ("weighted_sum", "scaled_total")
+        ]
+        
+        batch = verifier.verify_batch(codes, enable_type_checking=False, lint_tools=[LintTool.PYLINT])
+        for code, result in zip(codes, batch):
+            single = verifier.verify_code(code, enable_type_checking=False, lint_tools=[LintTool.PYLINT])
+            self.assertEqual(
+                [(i.line, i.code) for i in result.lint_results[0].issues],
+                [(i.line, i.code) for i in single.lint_results[0].issues]
+            )
+            self.assertNotIn("duplicate-code", [i.code for i in result.lint_results[0].issues])
+            self.assertEqual(result.lint_results[0].success, single.lint_results[0].success)
+
+    @unittest.skipUnless(LintTool.PYLINT in detect_tool_versions(), "pylint not installed")
+    def test_batch_pylint_status_is_per_snippet(self):
+        """Test one snippet's pylint messages do not change another's result in a batch."""
+        verifier = LintTypeVerifier(use_cache=False)
+        self.addCleanup(verifier.cleanup)
+        # Clean, warning only, convention only, and warning plus convention
+        codes = ["x = 1\n", "import os\n", "y = 2 \n", "import sys\nz = 3 \n"]
+
+        batch = verifier.verify_batch(codes, enable_type_checking=False, lint_tools=[LintTool.PYLINT])
+        singles = [
+            verifier.verify_code(code, enable_type_checking=False, lint_tools=[LintTool.PYLINT])
+            for code in codes
+        ]
+
+        self.assertEqual([r.lint_results[0].success for r in batch],
+                         [r.lint_results[0].success for r in singles])
+        self.assertEqual([r.overall_score for r in batch], [r.overall_score for r in singles])
+        self.assertEqual([r.lint_results[0].success for r in singles], [True, True, True, False])
+
+
 class TestSemanticVerifier(unittest.TestCase):
     """Test semantic verification functionality."""
     